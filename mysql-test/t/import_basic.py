@@ -365,6 +365,40 @@ class test(mutlib.System_test):
                                      " --display={0}".format(display))
                 self.drop_db(self.server2, 'views_test')
 
+        # Test data loaded with LOAD DATA LOCAL INFILE (local_infile must
+        # be enabled on the destination server).
+        try:
+            res = self.server2.show_server_variable("local_infile")
+            local_infile = res[0][1]
+            self.server2.exec_query("SET GLOBAL local_infile = ON")
+        except UtilError as err:
+            raise MUTLibError("Cannot enable local_infile: "
+                              "{0}".format(err.errmsg))
+        try:
+            test_num += 1
+            comment = ("Test Case {0} : Testing import with RAW_CSV format "
+                       "using --bulk-load".format(test_num))
+            self.run_import_raw_csv_test(0, from_conn, to_conn,
+                                         "import_test", "customers", comment,
+                                         import_options="--bulk-load")
+            self.drop_db(self.server2, 'import_test')
+            if os.name != "posix":
+                self.replace_result(
+                    "# Importing data from std_data\\raw_data.csv.",
+                    "# Importing data from std_data/raw_data.csv.\n")
+
+            for frmt in ("CSV", "TAB"):
+                test_num += 1
+                comment = ("Test Case {0} : Testing import with {1} format "
+                           "using --bulk-load".format(test_num, frmt))
+                self.run_import_test(0, from_conn, to_conn, ['util_test'],
+                                     frmt, "BOTH", comment,
+                                     import_options="--bulk-load")
+                self.drop_db(self.server2, "util_test")
+        finally:
+            self.server2.exec_query("SET GLOBAL local_infile = "
+                                    "{0}".format(local_infile))
+
         if os.name != "posix":
             self.replace_result(
                 "# Importing data from std_data\\rpl_data.csv.",
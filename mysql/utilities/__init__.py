@@ -61,6 +61,7 @@ AVAILABLE_UTILITIES = {
     'mysqlfrm': (),
     'mysqlgrants': (),
     'mysqlindexcheck': (),
+    'mysqllogreplay': (),
     'mysqlmetagrep': (),
     'mysqlprocgrep': (),
     'mysqlreplicate': (),
@@ -72,6 +73,7 @@ AVAILABLE_UTILITIES = {
     'mysqlserverclone': (),
     'mysqlserverinfo': (),
     'mysqlslavetrx': (),
+    'mysqlslowlog': (),
     'mysqluc': (),
     'mysqluserclone': (),
 }
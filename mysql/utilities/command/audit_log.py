@@ -20,19 +20,27 @@ This file contains features to examine an audit log file, including
 searching and displaying the results.
 """
 
+import itertools
 import sys
 
 from shutil import copy
 
 from mysql.utilities.exception import UtilError
 from mysql.utilities.common.audit_log_parser import AuditLogParser
-from mysql.utilities.common.format import convert_dictionary_list, print_list
+from mysql.utilities.common.format import (convert_dictionary_list,
+                                           format_tabular_list,
+                                           format_vertical_list,
+                                           get_col_widths, print_list)
 from mysql.utilities.common.server import Server
 from mysql.utilities.common.tools import show_file_statistics, remote_copy
 
 
 _PRINT_WIDTH = 75
 
+# Number of records written at a time by output_formatted_log() (for the
+# formats other than RAW).
+_OUTPUT_BATCH_SIZE = 1000
+
 _VALID_COMMAND_OPTIONS = {
     'policies': ("ALL", "NONE", "LOGINS", "QUERIES", "DEFAULT"),
     'sizes': (0, 4294967295)
@@ -69,6 +77,39 @@ QUERY_TYPES = ["CREATE", "ALTER", "DROP", "TRUNCATE", "RENAME", "GRANT",
                "SHOW", "SET", "CALL", "PREPARE", "EXECUTE", "DEALLOCATE"]
 
 
+def _get_batches(records, size):
+    """Group the given records in batches.
+
+    Generator function that returns tuples with a list of (at most) size
+    records and a flag indicating if it is the last batch.
+
+    records[in]     iterable of records
+    size[in]        number of records of each batch
+    """
+    batch = list(itertools.islice(records, size))
+    while batch:
+        next_batch = list(itertools.islice(records, size))
+        yield batch, not next_batch
+        batch = next_batch
+
+
+def _add_columns(cols, records):
+    """Add the fields of the given records missing from the columns.
+
+    The fields are added in the order they are found in the records (as done
+    by convert_dictionary_list).
+
+    cols[in]        list of columns
+    records[in]     list of records (dictionaries)
+
+    Returns list - new list of columns, or the given one if no field is
+                   missing
+    """
+    new_cols = [key for key in convert_dictionary_list(records)[0]
+                if key not in cols]
+    return cols + new_cols if new_cols else cols
+
+
 def command_requires_log_name(command):
     """Check if the specified command requires the --audit-log-name option.
 
@@ -154,26 +195,64 @@ class AuditLog(object):
         """
         self.log.parse_log()
 
-    def output_formatted_log(self):
-        """Output the parsed log entries according to the specified format.
+    def read_header_rows(self):
+        """Read the header rows ('Audit' records) of the audit log file
+        (previously opened), and of the rotated logs if requested, used to
+        show the statistics.
+        """
+        self.log.read_logs_header_rows()
 
-        Print the entries resulting from the parsing process to the standard
-        output in the specified format. If no entries are found (i.e., none
-        match the defined search criterion) a notification message is print.
+    def output_formatted_log(self):
+        """Output the log entries matching the search criteria.
+
+        Print the entries to the standard output in the specified format
+        as they are found while parsing the log (previously opened) and the
+        rotated logs if requested (see AuditLogParser.search_logs), so the
+        entries are not kept in memory. Except for the RAW format, the
+        entries are written in batches. The columns are the fields of the
+        entries of the first batch, and are widened (with a new header) if
+        an entry of a following batch has other fields. For the GRID format
+        the column widths are also widened as needed by each batch. If no
+        entries are found (i.e., none match the defined search criterion) a
+        notification message is print.
         """
-        log_rows = self.log.retrieve_rows()
-        if log_rows:
-            out_format = self.options.get("format", "GRID")
-            if out_format == 'raw':
-                for row in log_rows:
-                    sys.stdout.write(row)
-            else:
-                # Convert the results to the appropriate format
-                cols, rows = convert_dictionary_list(log_rows)
+        out_format = self.options.get("format", "GRID")
+        records = self.log.search_logs()
+        num_rows = 0
+        if out_format == 'raw':
+            for row in records:
+                sys.stdout.write(row)
+                num_rows += 1
+        else:
+            cols = []
+            col_widths = []
+            for batch, last in _get_batches(records, _OUTPUT_BATCH_SIZE):
+                batch_cols = _add_columns(cols, batch)
+                new_header = batch_cols is not cols
+                cols = batch_cols
+                rows = [[record.get(col, None) for col in cols]
+                        for record in batch]
                 # Note: No need to sort rows, retrieved with the same order
                 # as read (i.e., sorted by timestamp)
-                print_list(sys.stdout, out_format, cols, rows)
-        else:
+                if out_format == 'vertical':
+                    format_vertical_list(sys.stdout, cols, rows,
+                                         {'start_row': num_rows,
+                                          'print_footer': last})
+                elif out_format in ('csv', 'tab'):
+                    print_list(sys.stdout, out_format, cols, rows,
+                               no_headers=not new_header)
+                else:
+                    # Widen columns if required by the values of the batch.
+                    col_widths = [
+                        max(widths) for widths in itertools.izip_longest(
+                            col_widths, get_col_widths(cols, rows),
+                            fillvalue=0)]
+                    format_tabular_list(sys.stdout, cols, rows,
+                                        {'print_header': new_header,
+                                         'print_footer': last,
+                                         'col_widths': col_widths})
+                num_rows += len(batch)
+        if not num_rows:
             # Print message notifying that no entry was found
             no_entry_msg = "#\n# No entry found!\n#"
             print no_entry_msg
@@ -199,10 +278,10 @@ class AuditLog(object):
             - Audit log entries
         """
         out_format = self.options.get("format", "GRID")
-        log_name = self.options.get("log_name", None)
         # Print file statistics:
         print "#\n# Audit Log File Statistics:\n#"
-        show_file_statistics(log_name, False, out_format)
+        for log_name in self.log.get_log_files():
+            show_file_statistics(log_name, False, out_format)
 
         # Print audit log 'AUDIT' entries
         print "\n#\n# Audit Log Startup Entries:\n#\n"
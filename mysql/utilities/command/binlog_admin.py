@@ -21,12 +21,11 @@ For example: to relocate binary log files to a new location.
 
 import logging
 import os.path
-import shutil
 
 from mysql.utilities.common.binary_log_file import (
     is_binary_log_filename, filter_binary_logs_by_sequence,
     filter_binary_logs_by_date, get_index_file, LOG_TYPE_ALL, LOG_TYPE_BIN,
-    LOG_TYPE_RELAY, move_binary_log
+    LOG_TYPE_RELAY, move_binary_logs, archive_binary_logs, ARCHIVE_MANIFEST
 )
 from mysql.utilities.common.binlog import (
     determine_purgeable_binlogs,
@@ -63,7 +62,10 @@ _COULD_NOT_FIND_BINLOG = (
     "WARNING: Could not find the given binlog name: '{bin_name}' "
     "in the binlog files listed in the {server_name}: {host}:{port}"
 )
-_ERR_MSG_MOVE_FILE = "Unable to move binary file: {filename}\n{error}"
+_INFO_MSG_ARCHIVE_FILES = "# Archiving {file_type} files..."
+_INFO_MSG_ARCHIVED_FILE = ("# - {file}: {size} bytes compressed to "
+                           "{compressed_size} bytes, events from "
+                           "{first_event} to {last_event}.")
 _INFO_MSG_APPLY_FILTERS = ("# Applying {filter_type} filter to {file_type} "
                            "files...")
 _INFO_MSG_FLUSH_LOGS = "# Flushing {log_type} logs..."
@@ -100,7 +102,7 @@ def _move_binlogs(source, destination, log_type, options, basename=None,
     destination[in]     Destination directory for the binary log files.
     log_type[in]        Type of the binary log files ('bin' or 'relay').
     options[in]         Dictionary of options (modified_before, sequence,
-                        verbosity).
+                        archive, multiprocess, verbosity).
     basename[in]        Base name for the binary log files, i.e. filename
                         without the extension (sequence number).
     index_file[in]      Path of the binary log index file. If not specified it
@@ -159,14 +161,30 @@ def _move_binlogs(source, destination, log_type, options, basename=None,
                     print(_INFO_MSG_INDEX_FILE.format(file_type=file_type,
                                                       index_file=index_file))
                     print("#")
+            if options.get('archive', False):
+                print(_INFO_MSG_ARCHIVE_FILES.format(file_type=file_type))
+                for f_name in binlog_files:
+                    print("# - {0}".format(f_name))
+                # Compress all files (removed from the index file).
+                entries = archive_binary_logs(
+                    source, destination, binlog_files, index_file,
+                    processes=options.get('multiprocess', 1))
+                if verbosity > 0:
+                    print("#")
+                    for entry in entries:
+                        # Event timestamps are unknown for invalid files.
+                        values = dict((key, 'unknown' if val is None else val)
+                                      for key, val in entry.items())
+                        print(_INFO_MSG_ARCHIVED_FILE.format(**values))
+                    print("#")
+                    print("# Archive manifest: {0}".format(
+                        os.path.join(destination, ARCHIVE_MANIFEST)))
+                return len(binlog_files)
             print(_INFO_MSG_MOVE_FILES.format(file_type=file_type))
             for f_name in binlog_files:
-                try:
-                    print("# - {0}".format(f_name))
-                    move_binary_log(source, destination, f_name, index_file)
-                except (shutil.Error, IOError) as err:
-                    raise UtilError(_ERR_MSG_MOVE_FILE.format(filename=f_name,
-                                                              error=err))
+                print("# - {0}".format(f_name))
+            # Move all files, updating the index file only once.
+            move_binary_logs(source, destination, binlog_files, index_file)
             return len(binlog_files)
         else:
             print(_INFO_MSG_NO_FILES_TO_MOVE.format(file_type=file_type))
@@ -185,7 +203,7 @@ def move_binlogs(binlog_dir, destination, options, bin_basename=None,
     destination[in]     Path of the destination directory for the binary log
                         files.
     options[in]         Dictionary of options (log_type, modified_before,
-                        sequence, verbosity).
+                        sequence, archive, multiprocess, verbosity).
     bin_basename[in]    Base name for the binlog files, i.e. filename
                         without the extension (sequence number).
     bin_index[in]       Path of the binlog index file. If not specified it is
@@ -243,7 +261,8 @@ def move_binlogs_from_server(server_cnx_val, destination, options,
     destination[in]     Path of the destination directory for the binary log
                         files.
     options[in]         Dictionary of options (log_type, skip_flush_binlogs,
-                        modified_before, sequence, verbosity).
+                        modified_before, sequence, archive, multiprocess,
+                        verbosity).
     bin_basename[in]    Base name for the binlog files, i.e., same as the
                         value for the server option --log-bin. It replaces
                         the server variable 'log_bin_basename' for versions
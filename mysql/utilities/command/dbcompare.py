@@ -19,6 +19,11 @@
 This file contains the commands for checking consistency of two databases.
 """
 
+import multiprocessing
+import os
+import StringIO
+import sys
+
 from mysql.utilities.exception import UtilDBError, UtilError
 from mysql.utilities.common.database import Database
 from mysql.utilities.common.sql_transform import quote_with_backticks
@@ -28,6 +33,7 @@ from mysql.utilities.common.dbcompare import (diff_objects, get_common_objects,
                                               server_connect,
                                               check_consistency,
                                               build_diff_list,
+                                              DEFAULT_CHUNK_SIZE,
                                               DEFAULT_SPAN_KEY_SIZE)
 from mysql.utilities.common.server import connect_servers
 
@@ -35,6 +41,9 @@ _PRINT_WIDTH = 75
 _ROW_FORMAT = "# {0:{1}} {2:{3}} {4:{5}} {6:{7}} {8:{9}}"
 _RPT_FORMAT = "{0:{1}} {2:{3}}"
 
+# Server connections (and sql_mode values) used by each worker process.
+_WORKER_SERVERS = []
+
 _ERROR_DB_DIFF = "The object definitions do not match."
 _ERROR_DB_MISSING = "The database {0} does not exist."
 _ERROR_OBJECT_LIST = "The list of objects differs among database {0} and {1}."
@@ -52,7 +61,10 @@ _DEFAULT_OPTIONS = {
     "no_row_count": False,
     "no_data": False,
     "transform": False,
-    "span_key_size": DEFAULT_SPAN_KEY_SIZE
+    "span_key_size": DEFAULT_SPAN_KEY_SIZE,
+    "algorithm": "span",
+    "chunk_size": DEFAULT_CHUNK_SIZE,
+    "multiprocess": 1
 }
 
 
@@ -374,6 +386,197 @@ def _check_option_defaults(options):
             options[opt_name] = _DEFAULT_OPTIONS[opt_name]
 
 
+def _compare_db_object(server1, server2, db1, db2, item, reporter,
+                       sql_modes, options):
+    """Compare an object common to both databases
+
+    This method performs the checks for a single object (definition, row
+    count and data consistency), reporting the results.
+
+    server1[in]       first server Server instance
+    server2[in]       second server Server instance
+    db1[in]           first database
+    db2[in]           second database
+    item[in]          object to compare, in the form (type, (name, ...))
+    reporter[in]      database compare reporter class instance
+    sql_modes[in]     tuple with the sql_mode value of server1 and server2
+    options[in]       options dictionary
+
+    Returns bool True if the object matches, False otherwise
+    """
+    quiet = options.get("quiet", False)
+    server1_sql_mode, server2_sql_mode = sql_modes
+    error_list = []
+    debug_msgs = []
+    # Set the object type
+    obj_type = item[0]
+
+    q_obj1 = "{0}.{1}".format(quote_with_backticks(db1, server1_sql_mode),
+                              quote_with_backticks(item[1][0],
+                                                   server1_sql_mode))
+    q_obj2 = "{0}.{1}".format(quote_with_backticks(db2, server2_sql_mode),
+                              quote_with_backticks(item[1][0],
+                                                   server2_sql_mode))
+
+    reporter.report_object(obj_type, item[1][0])
+
+    # Check for differences in CREATE
+    errors = _compare_objects(server1, server2, q_obj1, q_obj2,
+                              reporter, options, obj_type)
+    error_list.extend(errors)
+
+    # Check row counts
+    if obj_type == 'TABLE':
+        errors = _check_row_counts(server1, server2, q_obj1, q_obj2,
+                                   reporter, options)
+        if len(errors) != 0:
+            error_list.extend(errors)
+    else:
+        reporter.report_state("-")
+
+    # Check data consistency for tables
+    if obj_type == 'TABLE':
+        errors, debug_msgs = _check_data_consistency(server1, server2,
+                                                     q_obj1, q_obj2,
+                                                     reporter, options)
+        if len(errors) != 0:
+            error_list.extend(errors)
+    else:
+        reporter.report_state("-")
+
+    if options['verbosity'] > 0:
+        if not quiet:
+            print
+        get_create_object(server1, q_obj1, options, obj_type)
+        get_create_object(server2, q_obj2, options, obj_type)
+
+    if debug_msgs and options['verbosity'] > 2:
+        reporter.report_errors(debug_msgs)
+
+    if not quiet:
+        reporter.report_errors(error_list)
+
+    # Fail if errors are found
+    return not error_list
+
+
+def _init_compare_worker(server1_val, server2_val, db1, db2, options):
+    """Initialize a process of the pool used to compare objects.
+
+    Each worker process uses its own connection to each server, established
+    once and reused for all the objects compared by the worker.
+
+    server1_val[in]    connection values for the first server
+    server2_val[in]    connection values for the second server
+    db1[in]            the first database in the compare
+    db2[in]            the second database in the compare
+    options[in]        options dictionary
+    """
+    server1, server2 = server_connect(server1_val, server2_val, db1, db2,
+                                      options)
+    _WORKER_SERVERS[:] = [server1, server2,
+                          (server1.select_variable("SQL_MODE"),
+                           server2.select_variable("SQL_MODE"))]
+
+
+def multiprocess_object_compare_task(compare_task):
+    """Multiprocess compare object method.
+
+    This method wraps the comparison of an object to allow its concurrent
+    execution by a pool of processes (initialized by _init_compare_worker).
+    The output of the comparison is captured to be printed by the main
+    process in the original order of the objects.
+
+    compare_task[in]    dictionary of values required by a process to
+                        perform the object compare task, namely:
+                        {'db1': <first database>,
+                         'db2': <second database>,
+                         'item': <object to compare>,
+                         'options': <dict of options>,
+                        }
+
+    Returns tuple - (output, softspace flag of the output, result of
+                     _compare_db_object or None if an error occurred,
+                     error message or None)
+    """
+    server1, server2, sql_modes = _WORKER_SERVERS
+    output = StringIO.StringIO()
+    stdout = sys.stdout
+    sys.stdout = output
+    res = None
+    errmsg = None
+    # NOTE: Must handle the errors here, because the output captured before
+    # the error must be returned to the main process.
+    try:
+        res = _compare_db_object(server1, server2, compare_task['db1'],
+                                 compare_task['db2'], compare_task['item'],
+                                 _CompareDBReport(compare_task['options']),
+                                 sql_modes, compare_task['options'])
+    except UtilError:
+        _, err, _ = sys.exc_info()
+        errmsg = err.errmsg
+    except Exception:  # pylint: disable=W0703
+        # Any other error must also be reported to the main process,
+        # otherwise the captured output is lost.
+        _, err, _ = sys.exc_info()
+        errmsg = "Unexpected error comparing {0}: {1}".format(
+            compare_task['item'][1][0], err)
+    finally:
+        sys.stdout = stdout
+    return (output.getvalue(), getattr(output, 'softspace', 0), res, errmsg)
+
+
+def _compare_objects_concurrently(server1_val, server2_val, db1, db2,
+                                  objects, options):
+    """Compare the objects common to both databases concurrently.
+
+    The objects are compared by a pool of processes (one connection to each
+    server per process) and the results are printed as they are available,
+    in the original order of the objects.
+
+    server1_val[in]    connection values for the first server
+    server2_val[in]    connection values for the second server
+    db1[in]            the first database in the compare
+    db2[in]            the second database in the compare
+    objects[in]        list of objects to compare
+    options[in]        options dictionary
+
+    Returns bool True if all objects match, False otherwise
+    """
+    success = True
+    compare_tasks = [{'db1': db1, 'db2': db2, 'item': item,
+                      'options': options} for item in objects]
+    # Note: Server connection values are passed to the workers instead of
+    # server instances, otherwise a multiprocessing error is issued.
+    # The workers connect quietly, the connection messages of each worker
+    # would be mixed with the report.
+    init_options = options.copy()
+    init_options['quiet'] = True
+    workers_pool = multiprocessing.Pool(
+        processes=min(options['multiprocess'], len(objects)),
+        initializer=_init_compare_worker,
+        initargs=(server1_val, server2_val, db1, db2, init_options)
+    )
+    try:
+        for output, softspace, res, errmsg in workers_pool.imap(
+                multiprocess_object_compare_task, compare_tasks):
+            if output:
+                # Keep the same spacing of the print statements used to
+                # report the results.
+                print output,
+                sys.stdout.softspace = softspace
+            if errmsg is not None:
+                raise UtilError(errmsg)
+            if not res:
+                success = False
+        workers_pool.close()
+    finally:
+        workers_pool.terminate()
+        workers_pool.join()
+
+    return success
+
+
 def database_compare(server1_val, server2_val, db1, db2, options):
     """Perform a consistency check among two databases
 
@@ -450,65 +653,20 @@ def database_compare(server1_val, server2_val, db1, db2, options):
     reporter = _CompareDBReport(options)
     reporter.print_heading()
 
-    # Get sql_mode value from servers
-    server1_sql_mode = server1.select_variable("SQL_MODE")
-    server2_sql_mode = server2.select_variable("SQL_MODE")
-
-    # Remaining operations can occur in a loop one for each object.
-    for item in in_both:
-        error_list = []
-        debug_msgs = []
-        # Set the object type
-        obj_type = item[0]
-
-        q_obj1 = "{0}.{1}".format(quote_with_backticks(db1, server1_sql_mode),
-                                  quote_with_backticks(item[1][0],
-                                                       server1_sql_mode))
-        q_obj2 = "{0}.{1}".format(quote_with_backticks(db2, server2_sql_mode),
-                                  quote_with_backticks(item[1][0],
-                                                       server2_sql_mode))
-
-        reporter.report_object(obj_type, item[1][0])
-
-        # Check for differences in CREATE
-        errors = _compare_objects(server1, server2, q_obj1, q_obj2,
-                                  reporter, options, obj_type)
-        error_list.extend(errors)
-
-        # Check row counts
-        if obj_type == 'TABLE':
-            errors = _check_row_counts(server1, server2, q_obj1, q_obj2,
-                                       reporter, options)
-            if len(errors) != 0:
-                error_list.extend(errors)
-        else:
-            reporter.report_state("-")
-
-        # Check data consistency for tables
-        if obj_type == 'TABLE':
-            errors, debug_msgs = _check_data_consistency(server1, server2,
-                                                         q_obj1, q_obj2,
-                                                         reporter, options)
-            if len(errors) != 0:
-                error_list.extend(errors)
-        else:
-            reporter.report_state("-")
-
-        if options['verbosity'] > 0:
-            if not quiet:
-                print
-            get_create_object(server1, q_obj1, options, obj_type)
-            get_create_object(server2, q_obj2, options, obj_type)
-
-        if debug_msgs and options['verbosity'] > 2:
-            reporter.report_errors(debug_msgs)
-
-        if not quiet:
-            reporter.report_errors(error_list)
-
-        # Fail if errors are found
-        if error_list:
+    # Remaining operations can occur in a loop one for each object, or
+    # concurrently by a pool of processes (only on POSIX systems).
+    if options.get('multiprocess', 1) > 1 and os.name == 'posix' and \
+            len(in_both) > 1:
+        if not _compare_objects_concurrently(server1_val, server2_val,
+                                             db1, db2, in_both, options):
             success = False
+    else:
+        sql_modes = (server1.select_variable("SQL_MODE"),
+                     server2.select_variable("SQL_MODE"))
+        for item in in_both:
+            if not _compare_db_object(server1, server2, db1, db2, item,
+                                      reporter, sql_modes, options):
+                success = False
 
     return success
 
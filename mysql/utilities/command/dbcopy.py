@@ -24,6 +24,7 @@ import sys
 
 from mysql.utilities.exception import UtilError
 from mysql.utilities.common.database import Database
+from mysql.utilities.common.lock import SharedSnapshotLock
 from mysql.utilities.common.options import check_engine_options
 from mysql.utilities.common.server import connect_servers
 from mysql.utilities.command.dbexport import (get_change_master_command,
@@ -350,6 +351,15 @@ def copy_db(src_val, dest_val, db_list, options):
     # Turn off foreign keys if they were on at the start
     destination.disable_foreign_key_checks(True)
 
+    # Start the snapshot shared by the pool of processes used to copy the
+    # tables data before reading the GTIDs and the replication information,
+    # in order for them to match the copied data.
+    my_lock = None
+    workers_pool = None
+    if locking == 'shared-snapshot' and not skip_data and not skip_tables:
+        my_lock = get_copy_lock(source, db_list, options, True, cloning,
+                                server_values=src_val)
+
     # Get GTID commands
     if not skip_gtid:
         gtid_info = get_gtid_commands(source)
@@ -382,6 +392,11 @@ def copy_db(src_val, dest_val, db_list, options):
         rpl_info = get_change_master_command(src_val, new_opts)
         destination.exec_query("STOP SLAVE", {'fetch': False, 'commit': False})
 
+    # Release the global read lock used to share the snapshot.
+    if isinstance(my_lock, SharedSnapshotLock):
+        my_lock.release_global_lock()
+        workers_pool = my_lock.pool
+
     # Add sql_mode for copying 0 auto increment values
     if auto_increment_zero:
         sql_mode_str = destination.sql_mode("NO_AUTO_VALUE_ON_ZERO", True)
@@ -397,7 +412,7 @@ def copy_db(src_val, dest_val, db_list, options):
     new_opts['skip_events'] = True
 
     # Get the table locks unless we are cloning with lock-all
-    if not (cloning and locking == 'lock-all'):
+    if my_lock is None and not (cloning and locking == 'lock-all'):
         my_lock = get_copy_lock(source, db_list, options, True)
 
     _copy_objects(source, destination, db_list, new_opts)
@@ -426,8 +441,10 @@ def copy_db(src_val, dest_val, db_list, options):
             # Perform the copy
             # Note: No longer use threads, use multiprocessing instead.
             db.init()
-            db.copy_data(db_name[1], options, destination, connections=1,
-                         src_con_val=src_val, dest_con_val=dest_val)
+            db.copy_data(db_name[1], options, destination,
+                         connections=options.get("connections", 1),
+                         src_con_val=src_val, dest_con_val=dest_val,
+                         workers_pool=workers_pool)
 
         # If there are statements to execute after the copy, execute them here
         after_stmts = options.get("after_alter", None)
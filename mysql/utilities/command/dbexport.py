@@ -27,10 +27,13 @@ import tempfile
 
 from mysql.utilities.common.database import Database
 from mysql.utilities.common.format import (format_tabular_list,
-                                           format_vertical_list)
-from mysql.utilities.common.lock import Lock
+                                           format_vertical_list,
+                                           get_col_widths)
+from mysql.utilities.common.lock import (get_snapshot_server, Lock,
+                                         SharedSnapshotLock)
 from mysql.utilities.common.replication import negotiate_rpl_connection
-from mysql.utilities.common.server import connect_servers, Server
+from mysql.utilities.common.server import (connect_servers,
+                                           get_connection_pool, Server)
 from mysql.utilities.common.sql_transform import quote_with_backticks
 from mysql.utilities.common.table import Table
 from mysql.utilities.exception import UtilError, UtilDBError
@@ -331,15 +334,14 @@ def _export_row(data_rows, cur_table, out_format, single, skip_blobs,
                     outfile.write(row_str)
         else:
             # Generate bulk insert statements
-            data_lists = cur_table.make_bulk_insert(data_rows, q_db_name,
-                                                    skip_blobs=skip_blobs)
-            rows = data_lists[0]
-            blob_rows = data_lists[1]
-
-            if len(rows) > 0:
-                for row in rows:
-                    outfile.write("{0};\n".format(row))
-            else:
+            blob_rows = []
+            has_data = False
+            for row in cur_table.generate_bulk_insert(data_rows, q_db_name,
+                                                      skip_blobs=skip_blobs,
+                                                      blob_inserts=blob_rows):
+                outfile.write("{0};\n".format(row))
+                has_data = True
+            if not has_data:
                 outfile.write("# Table {0} has no data.\n"
                               "".format(cur_table.q_tbl_name))
         if len(blob_rows) > 0:
@@ -375,6 +377,79 @@ def _export_row(data_rows, cur_table, out_format, single, skip_blobs,
                             data_rows, list_options)
 
 
+def _export_rows_stream(cur_table, out_format, single, skip_blobs,
+                        first=False, no_headers=False, outfile=None,
+                        key_range=None):
+    """Export the rows of a table as they are retrieved from the server.
+
+    This method reads the table data in fixed-size batches through an
+    unbuffered cursor and writes each batch to the output as soon as the
+    next one arrives, keeping memory usage bounded regardless of the table
+    size. The output is the same produced by _export_row(), except for the
+    GRID format where a separator line is written between batches since the
+    column widths are only known for the rows read so far.
+
+    cur_table[in]      Table class instance
+    out_format[in]     desired output format
+    single[in]         if True, generate single INSERT statements (valid
+                       only for format=SQL)
+    skip_blobs[in]     if True, skip blob data
+    first[in]          if True, the header is printed with the first batch
+                       of rows (if chosen).
+    no_headers[in]     if True, do not print headers
+    outfile[in]        if is not None, write table data to this file.
+    key_range[in]      if is not None, only export the rows of this key range
+                       (see Table.get_key_ranges()).
+    """
+    # if outfile is not set, use stdout.
+    if outfile is None:
+        outfile = sys.stdout
+    list_options = {'none_to_null': True}
+    num_rows = 0
+    col_widths = None
+    # Keep one batch behind the cursor to know which one is the last, in
+    # order to write the footer for the GRID and VERTICAL formats.
+    prev_rows = None
+    batches = cur_table.stream_rows(key_range=key_range)
+    while True:
+        data_rows = next(batches, None)
+        if prev_rows is None:
+            if data_rows is None:
+                # Empty table, let _export_row() handle it.
+                _export_row([], cur_table, out_format, single, skip_blobs,
+                            first, no_headers, outfile)
+                break
+            prev_rows = data_rows
+            continue
+        last = data_rows is None
+        if out_format == "vertical":
+            list_options['start_row'] = num_rows
+            list_options['print_footer'] = last
+            format_vertical_list(outfile, cur_table.get_col_names(),
+                                 prev_rows, list_options)
+        elif out_format == "grid":
+            columns = cur_table.get_col_names()
+            # Widen columns if required by the values of the current batch.
+            batch_widths = get_col_widths(columns, prev_rows)
+            if col_widths is None:
+                col_widths = batch_widths
+            else:
+                col_widths = [max(widths) for widths in zip(col_widths,
+                                                            batch_widths)]
+            list_options['print_header'] = num_rows == 0
+            list_options['print_footer'] = last
+            list_options['col_widths'] = col_widths
+            format_tabular_list(outfile, columns, prev_rows, list_options)
+        else:
+            _export_row(prev_rows, cur_table, out_format, single, skip_blobs,
+                        first, no_headers, outfile)
+            first = False
+        num_rows += len(prev_rows)
+        if last:
+            break
+        prev_rows = data_rows
+
+
 def export_data(server_values, db_list, options):
     """Produce data for the tables in a database.
 
@@ -410,7 +485,8 @@ def export_data(server_values, db_list, options):
     return True
 
 
-def _export_data(source, server_values, db_list, output_file, options):
+def _export_data(source, server_values, db_list, output_file, options,
+                 workers_pool=None):
     """Export data from the specified list of databases.
 
     This private method retrieves the data for each specified databases in SQL
@@ -428,10 +504,14 @@ def _export_data(source, server_values, db_list, output_file, options):
                        skip_funcs, skip_events, skip_grants, skip_create,
                        skip_data, no_header, display, format, file_per_tbl,
                        and debug).
+    workers_pool[in]   Pool of processes sharing the snapshot of source
+                       (see SharedSnapshotLock) used for the multiprocess
+                       export. By default None, a new pool is created.
     """
     frmt = options.get("format", "sql")
     quiet = options.get("quiet", False)
     file_per_table = options.get("file_per_tbl", False)
+    chunk_size = options.get("chunk_size", 0)
     sql_mode = source.select_variable("SQL_MODE")
 
     # Get tables list.
@@ -468,17 +548,27 @@ def _export_data(source, server_values, db_list, output_file, options):
                                   "location.\n")
 
         # Check multiprocess table export (only on POSIX systems).
+        key_ranges = None
         if options['multiprocess'] > 1 and os.name == 'posix':
-            # Create export task.
+            # Split table data into key ranges exported by different workers.
+            if chunk_size > 0 and frmt in ("sql", "csv", "tab"):
+                q_tbl_name = "{0}.{1}".format(
+                    quote_with_backticks(db_name, sql_mode),
+                    quote_with_backticks(table[1], sql_mode))
+                key_ranges = Table(source, q_tbl_name).get_key_ranges(
+                    chunk_size)
+            # Create export task (one per key range, if any).
             # Note: Server connection values are passed in the task dictionary
             # instead of a server instance, otherwise a multiprocessing error
             # is issued when assigning the task to a worker.
-            export_task = {
-                'srv_con': server_values,
-                'table': table,
-                'options': options,
-            }
-            export_tbl_tasks.append(export_task)
+            for chunk in enumerate(key_ranges or [None]):
+                export_task = {
+                    'srv_con': server_values,
+                    'table': table,
+                    'options': options,
+                    'chunk': chunk if key_ranges else None,
+                }
+                export_tbl_tasks.append(export_task)
         else:
             # Export data from a table (no multiprocessing).
             _export_table_data(source, table, output_file, options)
@@ -486,23 +576,30 @@ def _export_data(source, server_values, db_list, output_file, options):
         # Print SOURCE command if --file-per-table is used and format is SQL.
         if file_per_table and frmt == 'sql':
             tbl_name = ".".join(table)
-            output_file.write(
-                "# SOURCE {0}\n".format(_generate_tbl_filename(tbl_name, frmt))
-            )
+            chunk_nums = range(len(key_ranges)) if key_ranges else [None]
+            for chunk_num in chunk_nums:
+                output_file.write("# SOURCE {0}\n".format(
+                    _generate_tbl_filename(tbl_name, frmt, chunk_num)))
 
     # Export tables concurrently.
     if export_tbl_tasks:
-        # Create process pool.
-        workers_pool = multiprocessing.Pool(
-            processes=options['multiprocess']
-        )
-        # Concurrently export tables.
-        res = workers_pool.map_async(multiprocess_tbl_export_task,
-                                     export_tbl_tasks)
-        workers_pool.close()
-        # Get list of temporary files with the exported data.
-        tmp_files_list = res.get()
-        workers_pool.join()
+        if workers_pool:
+            # Concurrently export tables using the pool of processes that
+            # share the snapshot (closed when the lock is released).
+            tmp_files_list = workers_pool.map(multiprocess_tbl_export_task,
+                                              export_tbl_tasks)
+        else:
+            # Create process pool.
+            workers_pool = multiprocessing.Pool(
+                processes=options['multiprocess']
+            )
+            # Concurrently export tables.
+            res = workers_pool.map_async(multiprocess_tbl_export_task,
+                                         export_tbl_tasks)
+            workers_pool.close()
+            # Get list of temporary files with the exported data.
+            tmp_files_list = res.get()
+            workers_pool.join()
 
         # Merge resulting temp files (if generated).
         for tmp_filename in tmp_files_list:
@@ -516,7 +613,7 @@ def _export_data(source, server_values, db_list, output_file, options):
         output_file.write("#...done.\n")
 
 
-def _export_table_data(source_srv, table, output_file, options):
+def _export_table_data(source_srv, table, output_file, options, chunk=None):
     """Export the table data.
 
     This private method retrieves the data for the specified table in SQL
@@ -532,6 +629,9 @@ def _export_table_data(source_srv, table, output_file, options):
                         skip_funcs, skip_events, skip_grants, skip_create,
                         skip_data, no_header, display, format, file_per_tbl,
                         and debug).
+    chunk[in]       Tuple with the chunk number and the key range (returned
+                    by Table.get_key_ranges()) to export only part of the
+                    table data. By default None, export all table data.
 
     return a filename if a temporary file is created to store the output result
     (used for multiprocessing) otherwise None.
@@ -542,90 +642,107 @@ def _export_table_data(source_srv, table, output_file, options):
     skip_blobs = options.get("skip_blobs", False)
     quiet = options.get("quiet", False)
     file_per_table = options.get("file_per_tbl", False)
+    stream = options.get("stream", False)
 
     # Handle source server instance or server connection values.
     # Note: For multiprocessing the use of connection values instead of a
     # server instance is required to avoid internal errors.
+    pool = None
     if isinstance(source_srv, Server):
         source = source_srv
     else:
-        # Get source server instance from connection values.
-        conn_options = {
-            'quiet': True,  # Avoid repeating output for multiprocessing.
-            'version': "5.1.30",
-        }
-        servers = connect_servers(source_srv, None, conn_options)
-        source = servers[0]
+        # Get source server instance from the connection pool of the process
+        # (connections are reused by the next tasks of worker processes).
+        pool = get_connection_pool(source_srv, {'version': "5.1.30"})
+        source = pool.get()
 
-    # Must be after the connection test to get SQL_MODE
-    sql_mode = source.select_variable("SQL_MODE")
+    try:
+        # Must be after the connection test to get SQL_MODE
+        sql_mode = source.select_variable("SQL_MODE")
 
-    # Handle qualified table name (with backtick quotes).
-    db_name = table[0]
-    tbl_name = "{0}.{1}".format(db_name, table[1])
-    q_db_name = quote_with_backticks(db_name, sql_mode)
-    q_tbl_name = "{0}.{1}".format(q_db_name, quote_with_backticks(table[1],
-                                                                  sql_mode))
-
-    # Determine output file to store exported table data.
-    if file_per_table:
-        # Store result of table export to a separated file.
-        file_name = _generate_tbl_filename(tbl_name, frmt)
-        outfile = open(file_name, "w+")
-        tempfile_used = False
-    else:
-        if output_file:
-            # Output file to store result is defined.
-            outfile = output_file
+        # Handle qualified table name (with backtick quotes).
+        db_name = table[0]
+        tbl_name = "{0}.{1}".format(db_name, table[1])
+        q_db_name = quote_with_backticks(db_name, sql_mode)
+        q_tbl_name = "{0}.{1}".format(q_db_name,
+                                      quote_with_backticks(table[1], sql_mode))
+
+        # Determine the key range to export and if this is the first chunk of
+        # the table data (written with the table header).
+        chunk_num, key_range = chunk if chunk else (None, None)
+        first_chunk = not chunk_num or file_per_table
+
+        # Determine output file to store exported table data.
+        if file_per_table:
+            # Store result of table export to a separated file.
+            file_name = _generate_tbl_filename(tbl_name, frmt, chunk_num)
+            outfile = open(file_name, "w+")
             tempfile_used = False
         else:
-            # Store result in a temporary file (merged later).
-            # Used by multiprocess export.
-            tempfile_used = True
-            outfile = tempfile.NamedTemporaryFile(delete=False)
-
-    message = "# Data for table {0}:".format(q_tbl_name)
-    outfile.write("{0}\n".format(message))
-
-    tbl_options = {
-        'verbose': False,
-        'get_cols': True,
-        'quiet': quiet
-    }
-    cur_table = Table(source, q_tbl_name, tbl_options)
-    if single and frmt not in ("sql", "grid", "vertical"):
-        retrieval_mode = -1
-        first = True
-    else:
-        retrieval_mode = 1
-        first = False
-
-    # Find if we have some UNIQUE NOT NULL column indexes.
-    unique_indexes = len(cur_table.get_not_null_unique_indexes())
-
-    # If all columns are BLOBS or there aren't any UNIQUE NOT NULL indexes
-    # then rows won't be correctly copied using the update statement,
-    # so we must warn the user.
-    if (not skip_blobs and frmt == "sql" and
-            (cur_table.blob_columns == len(cur_table.column_names) or
-             (not unique_indexes and cur_table.blob_columns))):
-        print("# WARNING: Table {0}.{1} contains only BLOB and TEXT "
-              "fields. Rows will be generated with separate INSERT "
-              "statements.".format(cur_table.q_db_name, cur_table.q_tbl_name))
-
-    for data_rows in cur_table.retrieve_rows(retrieval_mode):
-        _export_row(data_rows, cur_table, frmt, single,
-                    skip_blobs, first, no_headers, outfile)
-        if first:
+            if output_file:
+                # Output file to store result is defined.
+                outfile = output_file
+                tempfile_used = False
+            else:
+                # Store result in a temporary file (merged later).
+                # Used by multiprocess export.
+                tempfile_used = True
+                outfile = tempfile.NamedTemporaryFile(delete=False)
+
+        if first_chunk:
+            message = "# Data for table {0}:".format(q_tbl_name)
+            outfile.write("{0}\n".format(message))
+
+        tbl_options = {
+            'verbose': False,
+            'get_cols': True,
+            'quiet': quiet
+        }
+        cur_table = Table(source, q_tbl_name, tbl_options)
+        if single and frmt not in ("sql", "grid", "vertical"):
+            retrieval_mode = -1
+            first = first_chunk
+        else:
+            retrieval_mode = 1
             first = False
 
-    if file_per_table:
-        outfile.close()
+        # Find if we have some UNIQUE NOT NULL column indexes.
+        unique_indexes = len(cur_table.get_not_null_unique_indexes())
+
+        # If all columns are BLOBS or there aren't any UNIQUE NOT NULL indexes
+        # then rows won't be correctly copied using the update statement,
+        # so we must warn the user.
+        if (first_chunk and not skip_blobs and frmt == "sql" and
+                (cur_table.blob_columns == len(cur_table.column_names) or
+                 (not unique_indexes and cur_table.blob_columns))):
+            print("# WARNING: Table {0}.{1} contains only BLOB and TEXT "
+                  "fields. Rows will be generated with separate INSERT "
+                  "statements.".format(cur_table.q_db_name,
+                                       cur_table.q_tbl_name))
+
+        if stream:
+            # Write rows in batches as they are read (bounded memory usage).
+            _export_rows_stream(cur_table, frmt, single, skip_blobs, first,
+                                no_headers, outfile, key_range)
+        else:
+            for data_rows in cur_table.retrieve_rows(retrieval_mode,
+                                                     key_range):
+                _export_row(data_rows, cur_table, frmt, single,
+                            skip_blobs, first, no_headers, outfile)
+                if first:
+                    first = False
+
+        if file_per_table:
+            outfile.close()
+    finally:
+        if pool is not None:
+            # Return the connection to the pool (also on errors).
+            pool.release(source)
 
     return outfile.name if tempfile_used else None
 
 
-def _generate_tbl_filename(table_name, output_format):
+def _generate_tbl_filename(table_name, output_format, chunk_num=None):
     """Generate the filename fot the given table.
 
     Generate the filename based on the specified table name and format to
@@ -633,9 +750,14 @@ def _generate_tbl_filename(table_name, output_format):
 
     table_name[in]      Qualified table name (i.e., <db name>.<table name>).
     output_format[in]   Output format to export data.
+    chunk_num[in]       Number of the chunk of table data stored in the file
+                        (i.e., <db name>.<table name>.<chunk_num>). By
+                        default None, the file holds all table data.
 
     return a string with the generated file name.
     """
+    if chunk_num is not None:
+        table_name = "{0}.{1:05d}".format(table_name, chunk_num)
     # Store result of table export to a separated file.
     if output_format == 'sql':
         return "{0}.sql".format(table_name)
@@ -644,7 +766,7 @@ def _generate_tbl_filename(table_name, output_format):
 
 
 def get_copy_lock(server, db_list, options, include_mysql=False,
-                  cloning=False):
+                  cloning=False, server_values=None):
     """Get an instance of the Lock class with a standard copy (read) lock
 
     This method creates an instance of the Lock class using the lock type
@@ -658,6 +780,10 @@ def get_copy_lock(server, db_list, options, include_mysql=False,
     include_mysql[in]      if True, include the mysql tables for copy operation
     cloning[in]            if True, create lock tables with WRITE on dest db
                            Default = False
+    server_values[in]      server connection values, used to create the
+                           pool of processes that share the snapshot for
+                           locking = 'shared-snapshot' with multiprocessing
+                           Default = None (no shared snapshot)
 
     Returns Lock - Lock class instance
     """
@@ -733,6 +859,12 @@ def get_copy_lock(server, db_list, options, include_mysql=False,
                 table_lock_list.append(("mysql.event", 'READ'))
         lock = Lock(server, table_lock_list, options)
 
+    # Use a snapshot shared by the pool of processes (only on POSIX systems).
+    elif (locking == 'shared-snapshot' and server_values and not cloning and
+          options.get('multiprocess', 1) > 1 and os.name == 'posix'):
+        lock = SharedSnapshotLock(server, server_values,
+                                  options['multiprocess'], options)
+
     # Use default or no locking option
     else:
         lock = Lock(server, [], options)
@@ -928,17 +1060,21 @@ def multiprocess_tbl_export_task(export_tbl_task):
                             {'srv_con': <dict with server connections values>,
                              'table': <table to export>,
                              'options': <dict of options>,
+                             'chunk': <chunk number and key range or None>,
                             }
     """
     # Get input to execute task.
-    source_srv = export_tbl_task.get('srv_con')
     table = export_tbl_task.get('table')
     options = export_tbl_task.get('options')
+    chunk = export_tbl_task.get('chunk', None)
     # Execute export table task.
     # NOTE: Must handle any exception here, because worker processes will not
     # propagate them to the main process.
     try:
-        return _export_table_data(source_srv, table, None, options)
+        # Use the server of the shared snapshot, if available.
+        source_srv = (get_snapshot_server() or
+                      export_tbl_task.get('srv_con'))
+        return _export_table_data(source_srv, table, None, options, chunk)
     except UtilError:
         _, err, _ = sys.exc_info()
         print("ERROR exporting data for table '{0}': {1}".format(table,
@@ -1048,8 +1184,11 @@ def export_databases(server_values, db_list, output_file, options):
             write_commands(output_file, [_FKEYS_SWITCH.format("0")], options,
                            True)
 
-    # Lock tables first
-    my_lock = get_copy_lock(source, db_list, options, True)
+    # Lock tables first (the snapshot can only be shared to export data).
+    my_lock = get_copy_lock(source, db_list, options, True,
+                            server_values=(server_values
+                                           if export in ("data", "both")
+                                           else None))
 
     # Determine comment prefix for rpl commands.
     rpl_cmt_prefix = ""
@@ -1083,6 +1222,13 @@ def export_databases(server_values, db_list, output_file, options):
         write_commands(output_file, gtid_info[0], options, True, rpl_cmt,
                        rpl_cmt_prefix)
 
+    # Release the global read lock used to share the snapshot, after reading
+    # the replication information and GTIDs.
+    workers_pool = None
+    if isinstance(my_lock, SharedSnapshotLock):
+        my_lock.release_global_lock()
+        workers_pool = my_lock.pool
+
     # Checking auto increment. See if any tables have 0 in their auto
     # increment column.
     _check_auto_increment(source, db_list, options)
@@ -1097,7 +1243,8 @@ def export_databases(server_values, db_list, output_file, options):
             output_file.write(
                 "# NOTE : --display is ignored for data export.\n"
             )
-        _export_data(source, server_values, db_list, output_file, options)
+        _export_data(source, server_values, db_list, output_file, options,
+                     workers_pool)
 
     # if GTIDs enabled, write the GTID-related commands
     if gtid_info:
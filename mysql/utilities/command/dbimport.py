@@ -21,18 +21,24 @@ table data.
 """
 
 import csv
+import multiprocessing
+import os
 import re
+import shutil
 import sys
+import tempfile
 
 from collections import defaultdict
 
+from mysql.connector.conversion import MySQLConverter
 from mysql.utilities.exception import UtilError, UtilDBError
 from mysql.utilities.common.database import Database
 from mysql.utilities.common.options import check_engine_options
 from mysql.utilities.common.pattern_matching import parse_object_name
 from mysql.utilities.common.table import Table
 from mysql.utilities.common.server import connect_servers
-from mysql.utilities.common.sql_transform import (quote_with_backticks,
+from mysql.utilities.common.sql_transform import (convert_special_characters,
+                                                  quote_with_backticks,
                                                   is_quoted_with_backticks,
                                                   to_sql)
 
@@ -53,6 +59,14 @@ _SQL_LOG_BIN_CMD = "SET @@SESSION.SQL_LOG_"
 _GTID_COMMANDS = ["SET @MYSQLUTILS_TEMP_L", _SQL_LOG_BIN_CMD,
                   "SET @@GLOBAL.GTID_PURG"]
 _GTID_PREFIX = 22
+# Maximum number of data rows kept in memory before building the statements
+# to insert (or load) them, i.e. rows per LOAD DATA block (--bulk-load)
+_MAX_DATA_ROWS = 100000
+# Maximum size (bytes) of the statements kept in memory before executing them
+_MAX_STATEMENTS_SIZE = 16 * 1024 * 1024
+# Characters escaped in the LOAD DATA files (ESCAPED BY '\\').
+_LOAD_DATA_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n'}
+_LOAD_DATA_ESCAPE_RE = re.compile(r'[\\\t\n]')
 _GTID_SKIP_WARNING = ("# WARNING: GTID commands are present in the import "
                       "file but the server does not support GTIDs. Commands "
                       "are ignored.")
@@ -76,7 +90,7 @@ def _read_row(file_h, fmt, skip_comments=False):
     warnings_found = []
     if fmt == "sql":
         # Easiest - just read a row and return it.
-        for row in file_h.readlines():
+        for row in file_h:
             if row.startswith("# WARNING"):
                 warnings_found.append(row)
                 continue
@@ -102,7 +116,7 @@ def _read_row(file_h, fmt, skip_comments=False):
         read_header = False
         header = []
         data_row = []
-        for row in file_h.readlines():
+        for row in file_h:
             # Show warnings from file
             if row.startswith("# WARNING"):
                 warnings_found.append(row)
@@ -939,6 +953,91 @@ def _build_insert_data(col_names, tbl_name, data):
            ") VALUES (" + ','.join(quoted_data) + ");"
 
 
+def _escape_load_data_char(match):
+    """Return the escape sequence for the special character matched.
+    """
+    return _LOAD_DATA_ESCAPES[match.group(0)]
+
+
+def _build_load_data(tbl, columns, rows, skip_blobs, charset=None):
+    """Build a LOAD DATA LOCAL INFILE statement for the given rows.
+
+    The rows are written to a temporary file (tab separated, with the
+    special characters escaped and NULL values written as \\N) that is
+    sent to the server through the connection by the LOAD DATA LOCAL INFILE
+    statement. The values are handled as for the INSERT statements: None
+    values are loaded as NULL, BIT values are converted to INTEGER and blob
+    values are loaded as NULL if skip_blobs is True.
+
+    Note: The caller is responsible for removing the temporary file.
+
+    tbl[in]           Table instance (with the column metadata)
+    columns[in]       list of column names (in the same order of the values)
+    rows[in]          list of rows to load
+    skip_blobs[in]    if True, blob data is not loaded
+    charset[in]       character set of the data. Default = None (use the
+                      server default)
+
+    Returns tuple - (LOAD DATA statement, name of the temporary file)
+    """
+    blob_cols = set(tbl.blob_columns) if skip_blobs else set()
+    bit_cols = set(tbl.bit_columns)
+    converter = MySQLConverter()
+    fd, file_name = tempfile.mkstemp(prefix="mysqldbimport_", suffix=".txt")
+    with os.fdopen(fd, 'wb') as load_file:
+        for row in rows:
+            values = []
+            for col, value in enumerate(row):
+                if value is None or col in blob_cols:
+                    values.append('\\N')
+                elif col in bit_cols:
+                    # pylint: disable=W0212
+                    values.append(str(converter._BIT_to_python(value)))
+                else:
+                    values.append(_LOAD_DATA_ESCAPE_RE.sub(
+                        _escape_load_data_char, value))
+            load_file.write("\t".join(values))
+            load_file.write("\n")
+
+    # Load BIT values through a user variable to convert them from INTEGER.
+    col_list = []
+    set_list = []
+    for col, col_name in enumerate(columns):
+        if not is_quoted_with_backticks(col_name, tbl.sql_mode):
+            col_name = quote_with_backticks(col_name, tbl.sql_mode)
+        if col in bit_cols:
+            col_list.append("@bit_{0}".format(col))
+            set_list.append("{0} = CAST(@bit_{1} AS UNSIGNED)"
+                            "".format(col_name, col))
+        else:
+            col_list.append(col_name)
+    load_data = ["LOAD DATA LOCAL INFILE '{0}' INTO TABLE {1}".format(
+        convert_special_characters(file_name), tbl.q_table)]
+    if charset:
+        load_data.append("CHARACTER SET {0}".format(charset))
+    load_data.append("FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                     "LINES TERMINATED BY '\\n'")
+    load_data.append("({0})".format(", ".join(col_list)))
+    if set_list:
+        load_data.append("SET {0}".format(", ".join(set_list)))
+    return " ".join(load_data), file_name
+
+
+def _remove_load_files(load_files):
+    """Remove the temporary files used to bulk load data.
+
+    The removed files are taken out of the list, which is empty on return.
+
+    load_files[in]    list with the names of the temporary files
+    """
+    while load_files:
+        load_file = load_files.pop()
+        try:
+            os.remove(load_file)
+        except OSError:
+            pass
+
+
 def _skip_sql(sql, options):
     """Check to see if we skip this SQL statement
 
@@ -1021,7 +1120,8 @@ def _skip_object(obj_type, options):
         return False
 
 
-def _exec_statements(statements, destination, fmt, options, dryrun=False):
+def _exec_statements(statements, destination, fmt, options, dryrun=False,
+                     commit=True):
     """Execute a list of SQL statements.
 
     Execute SQL statements from the provided list in the destination server,
@@ -1034,6 +1134,9 @@ def _exec_statements(statements, destination, fmt, options, dryrun=False):
     fmt[in]           Format of import file
     options[in]       Option dictionary containing the --skip_* options
     dryrun[in]        If True, print the SQL statements and do not execute
+    commit[in]        If True, commit at the end (if autocommit is disabled).
+                      Use False to execute a batch of statements of a bigger
+                      transaction. Default = True
 
     Returns (bool) - True if all execute, raises error if one fails
     """
@@ -1190,7 +1293,7 @@ def _exec_statements(statements, destination, fmt, options, dryrun=False):
             raise UtilError("Unexpected error:\n{0}".format(err))
 
     # Commit at the end (if autocommit is disabled).
-    if not autocommit:
+    if commit and not autocommit:
         destination.commit()
     return True
 
@@ -1292,6 +1395,217 @@ def multiprocess_file_import_task(import_file_task):
         print("ERROR: {0}".format(err.errmsg))
 
 
+def _table_data_import_task(import_file_task):
+    """Multiprocess import table data method.
+
+    This method wraps the import_file method to import the data of a table
+    (see import_file_by_table) in a pool of processes, returning the error
+    to the main process instead of printing it.
+
+    import_file_task[in]    dictionary of values required by a process to
+                            perform the file import task (see
+                            multiprocess_file_import_task)
+
+    Returns string - error message or None if the data was imported
+    """
+    try:
+        import_file(import_file_task.get('srv_con'),
+                    import_file_task.get('file_name'),
+                    import_file_task.get('options'))
+    except UtilError:
+        _, err, _ = sys.exc_info()
+        return err.errmsg
+    return None
+
+
+def _is_gtid_command(line):
+    """Check if the line (of an import file) is a GTID command.
+
+    line[in]          line read from the file
+
+    Returns bool - True if the line is a GTID command
+    """
+    return (line[0:_GTID_PREFIX] in _GTID_COMMANDS or
+            (line[0:_RPL] == _RPL_PREFIX and
+             line[_RPL:_GTID_PREFIX + _RPL] in _GTID_COMMANDS))
+
+
+def _ends_table_data(line):
+    """Check if the line (of an import file) ends the data of a table.
+
+    The data of a table ends with the first statement (or command) that is
+    not a data row: a basic command (e.g. SET or USE), a replication command
+    or a comment starting the data of another database.
+
+    line[in]          line read from the file
+
+    Returns bool - True if the line does not belong to the table data
+    """
+    if line.startswith("# Exporting"):
+        return True
+    if line[0:_RPL] == _RPL_PREFIX:
+        line = line[_RPL:]
+    words = line.split(None, 1)
+    if not words:
+        return False
+    first_word = words[0].upper()
+    return first_word in _BASIC_COMMANDS or first_word in _RPL_COMMANDS
+
+
+def _split_file_by_table(file_name, dir_name):
+    """Split an import file at the table boundaries.
+
+    The file is split in (smaller) import files, written in the given
+    directory: one with all the statements found before the data of the
+    first table (definitions), one for the data of each table and one with
+    the statements found after the data of the tables. Each table data file
+    starts with the last SET FOREIGN_KEY_CHECKS command found before its
+    data, in order to be imported on its own connection. The data of a table
+    begins with the "# Data for table" comment (written by mysqldbexport for
+    all formats).
+
+    file_name[in]     name (and path) of the file to split
+    dir_name[in]      directory to write the new files
+
+    Returns tuple - (definitions file, list of table data files, last file)
+                    or None if the file cannot be split (GTID commands found,
+                    that must be executed in the same session of the data)
+    """
+    def _new_part(part_name):
+        """Open a new file for a split part."""
+        return open(os.path.join(dir_name, part_name), 'w')
+
+    data_files = []
+    fkeys_cmd = None
+    file_h = open(file_name)
+    first_h = _new_part("definitions")
+    last_h = None
+    data_h = None
+    try:
+        for line in file_h:
+            if _is_gtid_command(line):
+                return None
+            if _check_for_object_list(line, _DATA_DECORATE):
+                # New table data.
+                if data_h is not None:
+                    data_h.close()
+                data_h = _new_part("data_{0:05d}".format(len(data_files)))
+                data_files.append(data_h.name)
+                if fkeys_cmd:
+                    data_h.write(fkeys_cmd)
+                data_h.write(line)
+                continue
+            if data_h is not None:
+                if not _ends_table_data(line):
+                    data_h.write(line)
+                    continue
+                data_h.close()
+                data_h = None
+            if line[0:4].upper() == "SET " and \
+                    "FOREIGN_KEY_CHECKS" in line.upper():
+                fkeys_cmd = line
+            if not data_files:
+                first_h.write(line)
+            else:
+                # Statements after the data of the tables.
+                if last_h is None:
+                    last_h = _new_part("last")
+                last_h.write(line)
+    finally:
+        file_h.close()
+        for part_h in (first_h, data_h, last_h):
+            if part_h is not None:
+                part_h.close()
+
+    return first_h.name, data_files, last_h.name if last_h else None
+
+
+def import_file_by_table(dest_val, file_name, options):
+    """Import a file, loading the data of its tables concurrently
+
+    This method splits the file at the table boundaries (see
+    _split_file_by_table) to import the data of each table in a pool of
+    worker processes (each one using its own connection to the destination
+    server). All the definitions (statements found before the data) are
+    imported first and the statements found after the data of all the tables
+    last (e.g., replication commands). Files that cannot be split, with GTID
+    commands or only with definitions, are imported by import_file().
+
+    dest_val[in]       a dictionary containing connection information for the
+                       destination (see import_file)
+    file_name[in]      name (and path) of the file to import
+    options[in]        a dictionary containing the options for the import
+                       (see import_file), including multiprocess (number of
+                       worker processes)
+
+    Returns bool True = success, raises an UtilError if the data of any table
+    cannot be imported (the statements after the data are not imported)
+    """
+    fmt = options.get("format", "sql")
+    quiet = options.get("quiet", False)
+    import_type = options.get("import_type", "definitions")
+    if (fmt not in ("sql", "csv", "tab") or import_type == "definitions" or
+            options.get("dryrun", False)):
+        return import_file(dest_val, file_name, options)
+
+    dir_name = tempfile.mkdtemp(prefix="mysqldbimport_")
+    try:
+        parts = _split_file_by_table(file_name, dir_name)
+        if not parts or not parts[1]:
+            return import_file(dest_val, file_name, options)
+        first_file, data_files, last_file = parts
+
+        if not quiet:
+            if import_type == "both":
+                text = "definitions and data"
+            else:
+                text = import_type
+            print("# Importing {0} from {1} ({2} tables concurrently)."
+                  "".format(text, file_name, len(data_files)))
+
+        # Import the definitions (and previous statements) first.
+        part_options = options.copy()
+        part_options['quiet'] = True
+        part_options['split_part'] = True
+        import_file(dest_val, first_file, part_options)
+
+        # Import the data of the tables concurrently, only the data must be
+        # imported (i.e. no database is created or dropped).
+        data_options = part_options.copy()
+        data_options['import_type'] = "data"
+        data_options['do_drop'] = False
+        import_file_tasks = [
+            {'srv_con': dest_val, 'file_name': data_file,
+             'options': data_options} for data_file in data_files
+        ]
+        workers_pool = multiprocessing.Pool(
+            processes=options.get('multiprocess', 1)
+        )
+        try:
+            errors = workers_pool.map_async(_table_data_import_task,
+                                            import_file_tasks).get()
+            # Let the workers exit normally (closing their connections).
+            workers_pool.close()
+            workers_pool.join()
+        finally:
+            workers_pool.terminate()
+            workers_pool.join()
+        errors = [errmsg for errmsg in errors if errmsg is not None]
+        if errors:
+            raise UtilError("Failed to import the data of {0} table(s): "
+                            "{1}".format(len(errors), "; ".join(errors)))
+
+        # Import the remaining statements.
+        if last_file:
+            import_file(dest_val, last_file, part_options)
+    finally:
+        shutil.rmtree(dir_name, True)
+
+    if not quiet:
+        print("#...done.")
+    return True
+
+
 def import_file(dest_val, file_name, options):
     """Import a file
 
@@ -1358,6 +1672,14 @@ def import_file(dest_val, file_name, options):
         if not col_meta:
             raise UtilError("Cannot build bulk insert statements without "
                             "the table definition.")
+        if bulk_load:
+            # Load the rows with a LOAD DATA LOCAL INFILE statement.
+            load_data, load_file = _build_load_data(tbl, columns, table_rows,
+                                                    skip_blobs,
+                                                    destination.charset)
+            load_files.append(load_file)
+            statements.append(load_data)
+            return
         columns_names = columns[:] if use_columns_names else None
         ins_strs = tbl.make_bulk_insert(table_rows, tbl.q_db_name,
                                         columns_names, skip_blobs=skip_blobs)
@@ -1379,16 +1701,28 @@ def import_file(dest_val, file_name, options):
     do_drop = options.get("do_drop", False)
     skip_blobs = options.get("skip_blobs", False)
     skip_gtid = options.get("skip_gtid", False)
+    bulk_load = options.get("bulk_load", False)
+    split_part = options.get("split_part", False)
 
-    # Attempt to connect to the destination server
+    # Attempt to connect to the destination server (allowing the data files
+    # to be sent for LOAD DATA LOCAL INFILE if bulk loading).
     conn_options = {
         'quiet': quiet,
         'version': "5.1.30",
+        'local_infile': bulk_load,
     }
     servers = connect_servers(dest_val, None, conn_options)
 
     destination = servers[0]
 
+    # LOAD DATA LOCAL INFILE must also be enabled on the server.
+    if bulk_load and not dryrun:
+        res = destination.show_server_variable("local_infile")
+        if not res or res[0][1].upper() != "ON":
+            raise UtilError("The --bulk-load option requires the "
+                            "local_infile variable to be enabled on the "
+                            "destination server.")
+
     # Check storage engines
     check_engine_options(destination,
                          options.get("new_engine", None),
@@ -1415,9 +1749,13 @@ def import_file(dest_val, file_name, options):
     has_data = False
     use_columns_names = False
     table_rows = []
+    load_files = []
     obj_type = ""
     definitions = []
     statements = []
+    num_buffered = 0
+    num_loaded = 0
+    buffered_size = 0
     table_col_list = []
     tbl_name = ""
     skip_rpl = options.get("skip_rpl", False)
@@ -1464,186 +1802,243 @@ def import_file(dest_val, file_name, options):
 
     # Read the file one object/definition group at a time
     databases = []
-    # pylint: disable=R0101
-    for row in read_next(file_h, fmt):
-        # Check if --format=raw_csv
-        if fmt == "raw_csv":
-            if read_columns:
-                # Use the first row as columns names
-                columns = row[:]
-                read_columns = False
-                continue
-            if single:
-                statements.append(_build_insert_data(columns, tbl_name, row))
-            else:
-                table_rows.append(row)
-            has_data = True
-            continue
-        # Check for replication command
-        if row[0] == "RPL_COMMAND":
-            if not skip_rpl:
-                statements.append(row[1])
-            continue
-        if row[0] == "GTID_COMMAND":
-            gtid_command_found = True
-            if not supports_gtid:
-                # only display warning once
-                if not skip_gtid_warning_printed:
-                    print _GTID_SKIP_WARNING
-                    skip_gtid_warning_printed = True
-            elif not skip_gtid:
-                if not gtid_version_checked:
-                    gtid_version_checked = True
-                    # Check GTID version for complete feature support
-                    servers[0].check_gtid_version()
-                    # Check the gtid_purged value too
-                    servers[0].check_gtid_executed("import")
-                statements.append(row[1])
-            continue
-        # Check for basic command
-        if row[0] == "BASIC_COMMAND":
-            if import_type != "data" or "FOREIGN_KEY_CHECKS" in row[1].upper():
-                # Process existing data rows to keep execution order.
-                if len(table_rows) > 0:
+    try:
+        # pylint: disable=R0101
+        for row in read_next(file_h, fmt):
+            # Execute the statements read so far when they reach the maximum
+            # size, instead of keeping all of them in memory until the end of
+            # the file (they are still committed at the end, in a single
+            # transaction, unless --autocommit is used).
+            for statement in statements[num_buffered:]:
+                if isinstance(statement, list):  # BLOB statements
+                    buffered_size += sum(len(blob_st) for blob_st in statement)
+                else:
+                    buffered_size += len(statement)
+            num_buffered = len(statements)
+            # The LOAD DATA statements (--bulk-load) are short, their data is
+            # in the temporary files, so count the size of these files.
+            for load_file in load_files[num_loaded:]:
+                buffered_size += os.path.getsize(load_file)
+            num_loaded = len(load_files)
+            if buffered_size >= _MAX_STATEMENTS_SIZE:
+                _exec_statements(statements, destination, fmt, options, dryrun,
+                                 commit=False)
+                statements = []
+                num_buffered = 0
+                buffered_size = 0
+                # The data of the executed statements was already loaded.
+                _remove_load_files(load_files)
+                num_loaded = 0
+            # Check if --format=raw_csv
+            if fmt == "raw_csv":
+                if read_columns:
+                    # Use the first row as columns names
+                    columns = row[:]
+                    read_columns = False
+                    continue
+                if bulk_load:
+                    table_rows.append([None if val == 'NULL' else val
+                                       for val in row])
+                elif single:
+                    statements.append(_build_insert_data(columns, tbl_name,
+                                                         row))
+                else:
+                    table_rows.append(row)
+                # Process big tables in blocks of rows.
+                if len(table_rows) >= _MAX_DATA_ROWS:
                     _process_data(tbl_name, statements, columns,
                                   table_col_list, table_rows, skip_blobs,
                                   use_columns_names)
                     table_rows = []
-                # Now, add command to to the statements list.
-                statements.append(row[1])
-            continue
-        # In the first pass, try to get the database name from the file
-        if row[0] == "TABLE":
-            db = _get_db(row)
-            if db not in ["TABLE_SCHEMA", "TABLE_CATALOG"] and \
-                    db not in databases:
-                databases.append(db)
-                get_db = True
-        if get_db:
-            if skip_header:
-                skip_header = False
-            else:
-                db_name = _get_db(row)
-                # quote db_name with backticks if needed
-                if db_name and not is_quoted_with_backticks(db_name, sql_mode):
-                    db_name = quote_with_backticks(db_name, sql_mode)
-                # No need to get the db_name when found.
-                get_db = False if db_name else get_db
-                if do_drop and import_type != "data":
-                    statements.append("DROP DATABASE IF EXISTS %s;" % db_name)
-                if import_type != "data":
-                    # If has a CREATE DATABASE statement and the database
-                    # exists and the --drop-first option is not provided,
-                    # issue an error message
-                    if db_name and not do_drop and row[0] == "sql":
-                        dest_db = Database(destination, db_name)
-                        if dest_db.exists() and \
-                                row[1].upper().startswith("CREATE DATABASE"):
-                            raise UtilDBError("The database {0} exists. "
-                                              "Use --drop-first to drop the "
-                                              "database before importing."
-                                              "".format(db_name))
-                    if not _skip_object("CREATE_DB", options) and \
-                       fmt != 'sql':
-                        statements.append("CREATE DATABASE %s;" % db_name)
-
-        # This is the first time through the loop so we must
-        # check user permissions on source for all databases
-        if check_privileges and db_name:
-            dest_db = Database(destination, db_name)
-
-            # Make a dictionary of the options
-            access_options = options.copy()
-
-            dest_db.check_write_access(dest_val['user'], dest_val['host'],
-                                       access_options)
-            check_privileges = False  # No need to check privileges again.
-
-        # Now check to see if we want definitions, data, or both:
-        if row[0] == "sql" or row[0] in _DEFINITION_LIST:
-            if fmt != "sql" and len(row[1]) == 1:
-                raise UtilError("Cannot read an import file generated with "
-                                "--display=NAMES")
-
-            if import_type in ("definitions", "both"):
-                if fmt == "sql":
+                has_data = True
+                continue
+            # Check for replication command
+            if row[0] == "RPL_COMMAND":
+                if not skip_rpl:
                     statements.append(row[1])
-                else:
-                    if obj_type == "":
-                        obj_type = row[0]
-                    if obj_type != row[0]:
-                        if len(definitions) > 0:
-                            _process_definitions(statements, table_col_list,
-                                                 db_name, sql_mode)
-                        obj_type = row[0]
-                        definitions = []
-                    if not _skip_object(row[0], options):
-                        definitions.append(row[1])
-        else:
-            # see if there are any definitions to process
-            if len(definitions) > 0:
-                _process_definitions(statements, table_col_list, db_name,
-                                     sql_mode)
-                definitions = []
-
-            if import_type in ("data", "both"):
-                if _skip_object("DATA", options):
-                    continue  # skip data
-                elif fmt == "sql":
+                continue
+            if row[0] == "GTID_COMMAND":
+                gtid_command_found = True
+                if not supports_gtid:
+                    # only display warning once
+                    if not skip_gtid_warning_printed:
+                        print _GTID_SKIP_WARNING
+                        skip_gtid_warning_printed = True
+                elif not skip_gtid:
+                    if not gtid_version_checked:
+                        gtid_version_checked = True
+                        # Check GTID version for complete feature support
+                        servers[0].check_gtid_version()
+                        # Check the gtid_purged value too
+                        servers[0].check_gtid_executed("import")
                     statements.append(row[1])
-                    has_data = True
+                continue
+            # Check for basic command
+            if row[0] == "BASIC_COMMAND":
+                if (import_type != "data" or
+                        "FOREIGN_KEY_CHECKS" in row[1].upper()):
+                    # Process existing data rows to keep execution order.
+                    if len(table_rows) > 0:
+                        _process_data(tbl_name, statements, columns,
+                                      table_col_list, table_rows, skip_blobs,
+                                      use_columns_names)
+                        table_rows = []
+                    # Now, add command to to the statements list.
+                    statements.append(row[1])
+                continue
+            # In the first pass, try to get the database name from the file
+            if row[0] == "TABLE":
+                db = _get_db(row)
+                if db not in ["TABLE_SCHEMA", "TABLE_CATALOG"] and \
+                        db not in databases:
+                    databases.append(db)
+                    get_db = True
+            if get_db:
+                if skip_header:
+                    skip_header = False
                 else:
-                    if row[0] == "BEGIN_DATA":
-                        # Start of table so first row is columns.
-                        if len(table_rows) > 0:
-                            _process_data(tbl_name, statements, columns,
-                                          table_col_list, table_rows,
-                                          skip_blobs)
-                            table_rows = []
-                        read_columns = True
-                        tbl_name = row[1]
-                        if not is_quoted_with_backticks(tbl_name, sql_mode):
-                            db, _, tbl = tbl_name.partition('.')
-                            q_db = quote_with_backticks(db, sql_mode)
-                            q_tbl = quote_with_backticks(tbl, sql_mode)
-                            tbl_name = ".".join([q_db, q_tbl])
+                    db_name = _get_db(row)
+                    # quote db_name with backticks if needed
+                    if db_name and not is_quoted_with_backticks(db_name,
+                                                                sql_mode):
+                        db_name = quote_with_backticks(db_name, sql_mode)
+                    # No need to get the db_name when found.
+                    get_db = False if db_name else get_db
+                    if do_drop and import_type != "data":
+                        statements.append("DROP DATABASE IF EXISTS %s;" %
+                                          db_name)
+                    if import_type != "data":
+                        # If has a CREATE DATABASE statement and the database
+                        # exists and the --drop-first option is not provided,
+                        # issue an error message
+                        if db_name and not do_drop and row[0] == "sql":
+                            dest_db = Database(destination, db_name)
+                            create_db = row[1].upper().startswith(
+                                "CREATE DATABASE")
+                            if dest_db.exists() and create_db:
+                                raise UtilDBError("The database {0} exists. "
+                                                  "Use --drop-first to drop "
+                                                  "the database before "
+                                                  "importing."
+                                                  "".format(db_name))
+                        if not _skip_object("CREATE_DB", options) and \
+                           fmt != 'sql':
+                            statements.append("CREATE DATABASE %s;" % db_name)
+
+            # This is the first time through the loop so we must
+            # check user permissions on source for all databases
+            if check_privileges and db_name:
+                dest_db = Database(destination, db_name)
+
+                # Make a dictionary of the options
+                access_options = options.copy()
+
+                dest_db.check_write_access(dest_val['user'], dest_val['host'],
+                                           access_options)
+                check_privileges = False  # No need to check privileges again.
+
+            # Now check to see if we want definitions, data, or both:
+            if row[0] == "sql" or row[0] in _DEFINITION_LIST:
+                if fmt != "sql" and len(row[1]) == 1:
+                    raise UtilError("Cannot read an import file generated "
+                                    "with --display=NAMES")
+
+                if import_type in ("definitions", "both"):
+                    if fmt == "sql":
+                        statements.append(row[1])
+                    else:
+                        if obj_type == "":
+                            obj_type = row[0]
+                        if obj_type != row[0]:
+                            if len(definitions) > 0:
+                                _process_definitions(statements,
+                                                     table_col_list,
+                                                     db_name, sql_mode)
+                            obj_type = row[0]
+                            definitions = []
+                        if not _skip_object(row[0], options):
+                            definitions.append(row[1])
+                elif (split_part and fmt == "sql" and
+                      "FOREIGN_KEY_CHECKS" in row[1].upper()):
+                    # Disable (or enable) foreign keys for the data of a
+                    # table imported on its own connection (see
+                    # import_file_by_table).
+                    statements.append(row[1])
+            else:
+                # see if there are any definitions to process
+                if len(definitions) > 0:
+                    _process_definitions(statements, table_col_list, db_name,
+                                         sql_mode)
+                    definitions = []
+
+                if import_type in ("data", "both"):
+                    if _skip_object("DATA", options):
+                        continue  # skip data
+                    elif fmt == "sql":
+                        statements.append(row[1])
+                        has_data = True
                     else:
-                        if read_columns:
-                            columns = row[1]
-                            read_columns = False
+                        if row[0] == "BEGIN_DATA":
+                            # Start of table so first row is columns.
+                            if len(table_rows) > 0:
+                                _process_data(tbl_name, statements, columns,
+                                              table_col_list, table_rows,
+                                              skip_blobs)
+                                table_rows = []
+                            read_columns = True
+                            tbl_name = row[1]
+                            if not is_quoted_with_backticks(tbl_name,
+                                                            sql_mode):
+                                db, _, tbl = tbl_name.partition('.')
+                                q_db = quote_with_backticks(db, sql_mode)
+                                q_tbl = quote_with_backticks(tbl, sql_mode)
+                                tbl_name = ".".join([q_db, q_tbl])
                         else:
-                            if not single:
-                                # Convert 'NULL' to None to be correctly
-                                # handled internally
-                                data = [None if val == 'NULL' else val
-                                        for val in row[1]]
-                                table_rows.append(data)
-                                has_data = True
+                            if read_columns:
+                                columns = row[1]
+                                read_columns = False
                             else:
-                                text = _build_insert_data(columns, tbl_name,
-                                                          row[1])
-                                statements.append(text)
-
-                                has_data = True
-    # Process remaining definitions
-    if len(definitions) > 0:
-        _process_definitions(statements, table_col_list, db_name, sql_mode)
-        definitions = []
-
-    # Process remaining data rows
-    if len(table_rows) > 0:
-        _process_data(tbl_name, statements, columns, table_col_list,
-                      table_rows, skip_blobs, use_columns_names)
-    elif import_type == "data" and not has_data:
-        print("# WARNING: No data was found.")
-
-    # Now process the statements
-    _exec_statements(statements, destination, fmt, options, dryrun)
-
-    file_h.close()
+                                if not single or bulk_load:
+                                    # Convert 'NULL' to None to be correctly
+                                    # handled internally
+                                    data = [None if val == 'NULL' else val
+                                            for val in row[1]]
+                                    table_rows.append(data)
+                                    has_data = True
+                                    # Process big tables in blocks of rows.
+                                    if len(table_rows) >= _MAX_DATA_ROWS:
+                                        _process_data(tbl_name, statements,
+                                                      columns, table_col_list,
+                                                      table_rows, skip_blobs)
+                                        table_rows = []
+                                else:
+                                    text = _build_insert_data(columns,
+                                                              tbl_name,
+                                                              row[1])
+                                    statements.append(text)
+
+                                    has_data = True
+        # Process remaining definitions
+        if len(definitions) > 0:
+            _process_definitions(statements, table_col_list, db_name, sql_mode)
+            definitions = []
+
+        # Process remaining data rows
+        if len(table_rows) > 0:
+            _process_data(tbl_name, statements, columns, table_col_list,
+                          table_rows, skip_blobs, use_columns_names)
+        elif import_type == "data" and not has_data and not split_part:
+            print("# WARNING: No data was found.")
+
+        # Now process the statements
+        _exec_statements(statements, destination, fmt, options, dryrun)
+    finally:
+        # Remove the temporary files used to bulk load data.
+        _remove_load_files(load_files)
+        file_h.close()
 
     # Check gtid process
-    if supports_gtid and not gtid_command_found:
+    if supports_gtid and not gtid_command_found and not split_part:
         print(_GTID_MISSING_WARNING)
 
     if not quiet:
@@ -22,6 +22,12 @@ all tables in each database), a list of tables in the for db.table,
 or all tables in all databases except internal databases.
 """
 
+import itertools
+import multiprocessing
+import os
+import StringIO
+import sys
+
 from mysql.utilities.exception import UtilError
 from mysql.utilities.common.server import connect_servers
 from mysql.utilities.common.database import Database
@@ -33,6 +39,287 @@ from mysql.utilities.common.sql_transform import (is_quoted_with_backticks,
                                                   remove_backtick_quoting)
 
 
+# Queries to load the metadata of the tables and of their indexes at once
+# (bulk mode), the conditions select the databases and tables to check.
+_TABLES_QUERY = """
+    SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE, ENGINE
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE {conditions}
+    ORDER BY TABLE_SCHEMA, TABLE_NAME
+"""
+_INDEXES_QUERY = """
+    SELECT TABLE_SCHEMA, TABLE_NAME, NON_UNIQUE, INDEX_NAME, SEQ_IN_INDEX,
+           COLUMN_NAME, COLLATION, SUB_PART, PACKED, NULLABLE, INDEX_TYPE,
+           COMMENT
+    FROM INFORMATION_SCHEMA.STATISTICS
+    WHERE {conditions}
+    ORDER BY TABLE_SCHEMA, TABLE_NAME, INDEX_NAME <> 'PRIMARY', NON_UNIQUE,
+             INDEX_TYPE = 'FULLTEXT', INDEX_NAME, SEQ_IN_INDEX
+"""
+
+# Number of tables sent at once to each process of the pool.
+_TABLES_PER_TASK = 100
+
+# Options used by the processes of the pool (see _init_index_worker).
+_WORKER_OPTIONS = {}
+
+
+def _get_table_names(table_name, sql_mode):
+    """Get the database and table names (without backticks) of a table.
+
+    table_name[in]  table name in the form db.table (like Table)
+    sql_mode[in]    SQL_MODE of the server
+
+    Returns tuple - (database name, table name)
+    """
+    if is_quoted_with_backticks(table_name, sql_mode):
+        q_db_name, q_tbl_name = parse_object_name(table_name, sql_mode)
+        return (remove_backtick_quoting(q_db_name, sql_mode),
+                remove_backtick_quoting(q_tbl_name, sql_mode))
+    return parse_object_name(table_name, sql_mode)
+
+
+def load_index_metadata(server, db_list, tables):
+    """Load the metadata of the indexes of the given databases and tables.
+
+    The metadata of all the tables is read at once from the
+    INFORMATION_SCHEMA (one query for the tables and one for their indexes)
+    and grouped by table.
+
+    server[in]      Server instance
+    db_list[in]     list of database names (all tables are loaded)
+    tables[in]      list of (database name, table name) tuples
+
+    Returns dictionary - for each (database name, table name) a dictionary
+                         with the keys: type (table type), engine (storage
+                         engine) and indexes (list of index rows in the
+                         format of Table.get_tbl_indexes())
+    """
+    conditions = []
+    params = []
+    for db_name in db_list:
+        conditions.append("TABLE_SCHEMA = %s")
+        params.append(db_name)
+    for db_name, tbl_name in tables:
+        conditions.append("(TABLE_SCHEMA = %s AND TABLE_NAME = %s)")
+        params.extend([db_name, tbl_name])
+    if not conditions:
+        return {}
+    query_options = {'params': tuple(params)}
+    conditions = " OR ".join(conditions)
+
+    metadata = {}
+    for db_name, tbl_name, tbl_type, engine in server.exec_query(
+            _TABLES_QUERY.format(conditions=conditions), query_options):
+        metadata[(db_name, tbl_name)] = {'type': tbl_type, 'engine': engine,
+                                         'indexes': []}
+    # Note: The rows of each table are sorted like the indexes of SHOW
+    # INDEXES (PRIMARY, UNIQUE, non-unique and FULLTEXT indexes), by index
+    # name within each kind, and the columns of each index are sorted.
+    for row in server.exec_query(
+            _INDEXES_QUERY.format(conditions=conditions), query_options):
+        table = metadata.get((row[0], row[1]))
+        if table is None:
+            continue
+        # Cardinality is cleared (see Table.get_tbl_indexes).
+        table['indexes'].append((row[1], row[2], row[3], row[4], row[5],
+                                 row[6], "0", row[7], row[8], row[9],
+                                 row[10], row[11]))
+    return metadata
+
+
+def _check_table_indexes(tbl, table_name, options):
+    """Check the indexes of a table (that exists) and print the results.
+
+    tbl[in]         Table instance
+    table_name[in]  table name (as specified to the utility)
+    options[in]     options dictionary (see check_index)
+    """
+    verbosity = options.get("verbosity", False)
+    report_indexes = options.get("report-indexes", False)
+    if not tbl.get_indexes():
+        if verbosity > 1 or report_indexes:
+            print "# Table %s is not indexed." % (table_name)
+    else:
+        if options.get("show-indexes", False):
+            tbl.print_indexes(options.get("index-format", False), verbosity)
+            # Show if table has primary key
+        if verbosity > 1 or report_indexes:
+            if not tbl.has_primary_key():
+                if not tbl.has_unique_key():
+                    print("# Table {0} does not contain neither a "
+                          "PRIMARY nor UNIQUE key.".format(table_name))
+                else:
+                    print("# Table {0} does not contain a PRIMARY key."
+                          "".format(table_name))
+        tbl.check_indexes(options.get("show-drops", False))
+
+
+def _get_table_options(options, sql_mode=None):
+    """Get the options of the Table instances.
+    """
+    verbosity = options.get("verbosity", False)
+    return {
+        'verbose': verbosity >= 1,
+        'get_cols': False,
+        'quiet': verbosity is None or verbosity < 1,
+        'sql_mode': sql_mode,
+    }
+
+
+def _init_index_worker(options, sql_mode):
+    """Initialize a process used to check the indexes of tables.
+
+    options[in]     options dictionary (see check_index)
+    sql_mode[in]    SQL_MODE of the server
+    """
+    _WORKER_OPTIONS.clear()
+    _WORKER_OPTIONS.update(options)
+    _WORKER_OPTIONS['sql_mode'] = sql_mode
+
+
+def check_table_indexes_task(task):
+    """Check the indexes of a table using its loaded metadata.
+
+    The table is checked without a connection to the server (the process
+    is initialized by _init_index_worker) and the output is captured to be
+    printed by the main process in the original order of the tables.
+
+    task[in]        tuple - (table name, table metadata or None if the
+                    table does not exist, see load_index_metadata)
+
+    Returns tuple - (output, softspace flag of the output, error message or
+                     None)
+    """
+    table_name, table = task
+    if table is None:
+        return '', 0, None
+    output = StringIO.StringIO()
+    stdout = sys.stdout
+    sys.stdout = output
+    errmsg = None
+    # NOTE: Must handle the errors here, because the output captured before
+    # the error must be returned to the main process.
+    try:
+        tbl = Table(None, table_name,
+                    _get_table_options(_WORKER_OPTIONS,
+                                       _WORKER_OPTIONS['sql_mode']))
+        tbl.set_index_metadata(table['indexes'], table['engine'])
+        _check_table_indexes(tbl, table_name, _WORKER_OPTIONS)
+    except UtilError:
+        _, err, _ = sys.exc_info()
+        errmsg = err.errmsg
+    finally:
+        sys.stdout = stdout
+    return output.getvalue(), getattr(output, 'softspace', 0), errmsg
+
+
+def _show_index_stats(tbl, options):
+    """Show the best and/or worst indexes of a table (--stats).
+    """
+    index_format = options.get("index-format", False)
+    if options.get("best", None) is not None:
+        tbl.show_special_indexes(index_format, options["best"], True)
+    if options.get("worst", None) is not None:
+        tbl.show_special_indexes(index_format, options["worst"])
+
+
+def _check_indexes_bulk(source, sql_mode, db_list, table_args, options):
+    """Check the indexes of the tables using the metadata loaded at once.
+
+    The metadata of the indexes of all the tables is loaded at once (see
+    load_index_metadata) and the indexes of each table are checked locally,
+    concurrently by a pool of processes if the multiprocess option is
+    greater than 1 (only on POSIX systems). The results are printed in the
+    order of the tables.
+
+    source[in]      Server instance
+    sql_mode[in]    SQL_MODE of the server
+    db_list[in]     list of database names (without backticks)
+    table_args[in]  list of table names (db.table) specified to the utility
+    options[in]     options dictionary (see check_index)
+    """
+    skip = options.get("skip", False)
+    verbosity = options.get("verbosity", False)
+    tables = [_get_table_names(table_name, sql_mode)
+              for table_name in table_args]
+    metadata = load_index_metadata(source, db_list, tables)
+    # Tables may be specified with different letter cases (depending on
+    # lower_case_table_names).
+    metadata_lower = dict(((db_name.lower(), tbl_name.lower()), table)
+                          for (db_name, tbl_name), table
+                          in metadata.iteritems())
+
+    # Build the list of tables in the same order of the default mode.
+    tasks = []
+    for table_name, names in zip(table_args, tables):
+        table = metadata.get(names)
+        if table is None:
+            table = metadata_lower.get((names[0].lower(), names[1].lower()))
+        tasks.append((table_name, table))
+    for db in db_list:
+        # Note: The database names are compared ignoring the letter case,
+        # like the tables.
+        db_objects = [(db_name, tbl_name) for db_name, tbl_name in metadata
+                      if db_name.lower() == db.lower()]
+        # A database without tables (e.g., only with views) exists if it is
+        # found in the server.
+        if (not db_objects and verbosity >= 1 and
+                not Database(source, db).exists()):
+            print "# Warning: database %s does not exist. Skipping." % (db)
+        for db_name, tbl_name in sorted(db_objects):
+            if metadata[(db_name, tbl_name)]['type'] != 'BASE TABLE':
+                continue
+            tasks.append(("{0}.{1}".format(quote_with_backticks(db, sql_mode),
+                                           quote_with_backticks(tbl_name,
+                                                                sql_mode)),
+                          metadata[(db_name, tbl_name)]))
+
+    # Fail if no tables to check
+    if not tasks:
+        raise UtilError("No tables to check.")
+
+    if verbosity > 1:
+        print "# Checking indexes..."
+    multiprocess = options.get("multiprocess", 1)
+    if multiprocess > 1 and os.name == 'posix' and len(tasks) > 1:
+        workers_pool = multiprocessing.Pool(
+            processes=min(multiprocess, len(tasks)),
+            initializer=_init_index_worker, initargs=(options, sql_mode))
+        results = workers_pool.imap(check_table_indexes_task, tasks,
+                                    _TABLES_PER_TASK)
+    else:
+        workers_pool = None
+        _init_index_worker(options, sql_mode)
+        results = itertools.imap(check_table_indexes_task, tasks)
+    try:
+        for (table_name, table), (output, softspace, errmsg) in \
+                itertools.izip(tasks, results):
+            if table is None and not skip:
+                raise UtilError("Table %s does not exist. Use --skip "
+                                "to skip missing tables." % table_name)
+            if output:
+                # Keep the same spacing of the print statements used to
+                # report the results.
+                print output,
+                sys.stdout.softspace = softspace
+            if errmsg is not None:
+                raise UtilError(errmsg)
+            if table is not None and options.get("stats", False):
+                _show_index_stats(Table(source, table_name,
+                                        _get_table_options(options,
+                                                           sql_mode)),
+                                  options)
+            if verbosity > 1:
+                print "#"
+        if workers_pool is not None:
+            workers_pool.close()
+    finally:
+        if workers_pool is not None:
+            workers_pool.terminate()
+            workers_pool.join()
+
+
 def check_index(src_val, table_args, options):
     """Check for duplicate or redundant indexes for one or more tables
 
@@ -53,20 +340,18 @@ def check_index(src_val, table_args, options):
                          worst        : show worst performing indexes
                          best         : show best performing indexes
                          report-indexes : reports tables without PK or UK
+                         bulk         : load the index metadata of all the
+                                        tables at once
+                         multiprocess : number of processes used to check
+                                        the tables concurrently (bulk mode)
 
     Returns bool True = success, raises UtilError if error
     """
 
     # Get options
-    show_drops = options.get("show-drops", False)
     skip = options.get("skip", False)
     verbosity = options.get("verbosity", False)
-    show_indexes = options.get("show-indexes", False)
-    index_format = options.get("index-format", False)
     stats = options.get("stats", False)
-    first_indexes = options.get("best", None)
-    last_indexes = options.get("worst", None)
-    report_indexes = options.get("report-indexes", False)
 
     # Try to connect to the MySQL database server.
     conn_options = {
@@ -108,12 +393,18 @@ def check_index(src_val, table_args, options):
                     if is_quoted_with_backticks(db_name, sql_mode) else db_name
                 db_list.append(db_name)
 
+    if options.get("bulk", False):
+        _check_indexes_bulk(source, sql_mode, db_list, table_list, options)
+        if verbosity > 1:
+            print "# ...done."
+        return
+
     # Loop through database list adding tables
     for db in db_list:
         db_source = Database(source, db)
         db_source.init()
         tables = db_source.get_db_objects("TABLE")
-        if not tables and verbosity >= 1:
+        if not tables and verbosity >= 1 and not db_source.exists():
             print "# Warning: database %s does not exist. Skipping." % (db)
         for table in tables:
             table_list.append("{0}.{1}".format(quote_with_backticks(db,
@@ -130,40 +421,17 @@ def check_index(src_val, table_args, options):
     # Check indexes for each table in the list
     # pylint: disable=R0101
     for table_name in table_list:
-        tbl_options = {
-            'verbose': verbosity >= 1,
-            'get_cols': False,
-            'quiet': verbosity is None or verbosity < 1
-        }
-        tbl = Table(source, table_name, tbl_options)
+        tbl = Table(source, table_name, _get_table_options(options))
         exists = tbl.exists()
         if not exists and not skip:
             raise UtilError("Table %s does not exist. Use --skip "
                             "to skip missing tables." % table_name)
         if exists:
-            if not tbl.get_indexes():
-                if verbosity > 1 or report_indexes:
-                    print "# Table %s is not indexed." % (table_name)
-            else:
-                if show_indexes:
-                    tbl.print_indexes(index_format, verbosity)
-                    # Show if table has primary key
-                if verbosity > 1 or report_indexes:
-                    if not tbl.has_primary_key():
-                        if not tbl.has_unique_key():
-                            print("# Table {0} does not contain neither a "
-                                  "PRIMARY nor UNIQUE key.".format(table_name))
-                        else:
-                            print("# Table {0} does not contain a PRIMARY key."
-                                  "".format(table_name))
-                tbl.check_indexes(show_drops)
+            _check_table_indexes(tbl, table_name, options)
 
             # Show best and/or worst indexes
             if stats:
-                if first_indexes is not None:
-                    tbl.show_special_indexes(index_format, first_indexes, True)
-                if last_indexes is not None:
-                    tbl.show_special_indexes(index_format, last_indexes)
+                _show_index_stats(tbl, options)
 
         if verbosity > 1:
             print "#"
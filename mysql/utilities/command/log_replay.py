@@ -0,0 +1,370 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains the general query log replay command. It rebuilds the
+sessions (connections) of a general query log and replays their statements
+against a server, using concurrent connections, and reports the latency of
+the statements.
+"""
+
+import multiprocessing
+import Queue
+import sys
+import time
+
+from mysql.utilities.command.slow_log import get_fingerprint
+from mysql.utilities.common.format import print_list
+from mysql.utilities.common.histogram import Histogram
+from mysql.utilities.common.parser import GeneralQueryLog
+from mysql.utilities.common.server import connect_servers
+from mysql.utilities.common.sql_transform import quote_with_backticks
+from mysql.utilities.exception import LogParserError, UtilError
+
+
+# Commands of the general query log whose argument is a statement replayed
+# as is. 'Init DB' commands are replayed as USE statements.
+_STATEMENT_COMMANDS = frozenset(['Query', 'Execute'])
+
+# Types of the events generated by read_session_events.
+_SESSION_START, _SESSION_STATEMENT, _SESSION_END = 'start', 'statement', 'end'
+
+# Minimum latency (in seconds) of the histogram buckets (see Histogram).
+_LATENCY_MIN = 0.000001
+
+_COLUMNS = ['count', 'errors', 'total_time', 'avg_time', 'p50_time',
+            'p95_time', 'p99_time', 'max_time', 'statement']
+
+# Values used by the replay workers (set by _init_replay_worker).
+_WORKER_OPTIONS = {}
+
+
+def read_session_events(stream):
+    """Read the session events of a general query log.
+
+    This generator returns the events of the sessions in the order of the
+    log, as soon as they are read: the start of a session (Connect command
+    or first entry of a session started before the beginning of the log),
+    each statement of a session and the end of a session (Quit command).
+    The sessions still open at the end of the log are ended then (ordered
+    by the offset of their start). Nothing is kept in memory but the IDs of
+    the open sessions.
+
+    stream[in]      file object of the general query log
+
+    Returns generator of (event type, session ID, offset, statement) tuples,
+                    where event type is _SESSION_START, _SESSION_STATEMENT
+                    or _SESSION_END, offset is the number of seconds since
+                    the first entry of the log and statement is None for
+                    the start and end events
+    """
+    sessions = {}
+    first_datetime = None
+    offset = 0.0
+    try:
+        for entry in GeneralQueryLog(stream, fast=True):
+            # Note: The parser uses the last timestamp of the session for
+            # the entries without timestamp, but the timestamps of the log
+            # are in order (the last one applies to all the sessions).
+            if entry.datetime is not None:
+                if first_datetime is None:
+                    first_datetime = entry.datetime
+                offset = max(offset, (entry.datetime -
+                                      first_datetime).total_seconds())
+            command = entry.command
+            session_id = entry.session_id
+            if command == 'Connect':
+                # Session IDs are reused after a restart of the server.
+                if sessions.pop(session_id, None) is not None:
+                    yield _SESSION_END, session_id, offset, None
+                sessions[session_id] = offset
+                yield _SESSION_START, session_id, offset, None
+                if entry.database:
+                    yield (_SESSION_STATEMENT, session_id, offset,
+                           "USE {0}".format(
+                               quote_with_backticks(entry.database)))
+                continue
+            if session_id not in sessions:
+                if command == 'Quit':
+                    continue
+                # Session started before the beginning of the log.
+                sessions[session_id] = offset
+                yield _SESSION_START, session_id, offset, None
+            if command in _STATEMENT_COMMANDS:
+                if entry.argument and entry.argument.strip():
+                    yield (_SESSION_STATEMENT, session_id, offset,
+                           entry.argument)
+            elif command == 'Init DB':
+                yield (_SESSION_STATEMENT, session_id, offset,
+                       "USE {0}".format(quote_with_backticks(entry.argument)))
+            elif command == 'Quit':
+                del sessions[session_id]
+                yield _SESSION_END, session_id, offset, None
+    except LogParserError as err:
+        raise UtilError("Error parsing the general query log: "
+                        "{0}".format(err.errmsg))
+    for session_id in sorted(sessions, key=sessions.get):
+        yield _SESSION_END, session_id, offset, None
+
+
+def _init_replay_worker(server_values, start_time, options):
+    """Initialize a process of the pool used to replay the sessions.
+
+    server_values[in]  connection values of the server
+    start_time[in]     time (as returned by time.time()) of the start of
+                       the replay, corresponding to the first entry of the
+                       log when the original timing is kept
+    options[in]        options dictionary (see replay_general_log)
+    """
+    _WORKER_OPTIONS.update({
+        'server_values': server_values,
+        'start_time': start_time,
+        'timing': options.get('timing', False),
+        'speed': options.get('speed', 1.0),
+    })
+
+
+def replay_session_task(session_task):
+    """Replay the statements of a session.
+
+    The statements are read from the queue of the session as they are
+    found in the log, and executed in their original order using a new
+    connection to the server (with autocommit enabled, like new client
+    connections), opened for the first statement. If the original timing is
+    kept, the execution of each statement is delayed until its offset
+    (divided by the speed factor) since the start of the replay.
+
+    session_task[in]    tuple - (session ID, queue of the session), the
+                        queue returns (offset, statement) tuples and None
+                        at the end of the session
+
+    Returns tuple - (session ID, list of (fingerprint, latency in seconds,
+                     error message or None) tuples, connection error message
+                     or None)
+    """
+    session_id, events = session_task
+    start_time = _WORKER_OPTIONS['start_time']
+    timing = _WORKER_OPTIONS['timing']
+    speed = _WORKER_OPTIONS['speed']
+    results = []
+    server = None
+    try:
+        for offset, statement in iter(events.get, None):
+            if server is None:
+                try:
+                    server = connect_servers(
+                        _WORKER_OPTIONS['server_values'], None,
+                        {'quiet': True})[0]
+                    server.toggle_autocommit(enable=True)
+                except UtilError as err:
+                    return session_id, results, err.errmsg
+            if timing:
+                delay = start_time + offset / speed - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            errmsg = None
+            start = time.time()
+            try:
+                server.exec_query(statement, {'fetch': True, 'commit': False})
+            except UtilError as err:
+                errmsg = err.errmsg
+            results.append((get_fingerprint(statement), time.time() - start,
+                            errmsg))
+    finally:
+        if server is not None:
+            server.disconnect()
+    return session_id, results, None
+
+
+class _StatementStats(object):
+    """Latency statistics of the statements with the same fingerprint.
+    """
+
+    def __init__(self, fingerprint):
+        """Constructor
+
+        fingerprint[in]  fingerprint of the statements
+        """
+        self.fingerprint = fingerprint
+        self.errors = 0
+        self.total = 0.0
+        self.latencies = Histogram(_LATENCY_MIN)
+
+    def add(self, latency, error=False):
+        """Add the latency of a statement.
+
+        latency[in]     latency in seconds
+        error[in]       True if the statement failed
+        """
+        self.latencies.add(latency)
+        self.total += latency
+        if error:
+            self.errors += 1
+
+
+def replay_general_log(server_values, log_file, options):
+    """Replay the sessions of a general query log and report the latencies.
+
+    The sessions are replayed concurrently (one connection each), keeping
+    the original order of the statements of each session, and optionally
+    their original timing.
+
+    server_values[in]  connection values of the server
+    log_file[in]       general query log file name ('-' for the standard
+                       input)
+    options[in]        dictionary of options:
+                       connections: number of sessions replayed concurrently
+                       timing: if True, keep the original timing of the
+                               statements
+                       speed: speed factor applied to the original timing
+                       top: number of statement fingerprints to report (0
+                            for all)
+                       format: output format
+                       verbosity: if > 0, print the errors
+    """
+    connections = options.get('connections', 1)
+    verbosity = options.get('verbosity', 0) or 0
+    top = options.get('top', 10)
+
+    if log_file == '-':
+        stream = sys.stdin
+    else:
+        try:
+            stream = open(log_file, 'r')
+        except IOError as err:
+            raise UtilError("Unable to open the general query log file "
+                            "'{0}': {1}".format(log_file, err.strerror))
+
+    stats = {}
+    counters = {'sessions': 0, 'failed_sessions': 0, 'statements': 0,
+                'errors': 0}
+
+    def _add_results(session_id, results, errmsg):
+        """Add the results of a replayed session to the statistics.
+        """
+        if errmsg is not None:
+            counters['sessions'] += 1
+            counters['failed_sessions'] += 1
+            if verbosity > 0:
+                print("# Session {0}: unable to connect: "
+                      "{1}".format(session_id, errmsg))
+            return
+        if not results:
+            return  # Session without statements.
+        counters['sessions'] += 1
+        for fingerprint, latency, stmt_errmsg in results:
+            statement_stats = stats.get(fingerprint)
+            if statement_stats is None:
+                statement_stats = stats[fingerprint] = \
+                    _StatementStats(fingerprint)
+            statement_stats.add(latency, stmt_errmsg is not None)
+            counters['statements'] += 1
+            if stmt_errmsg is not None:
+                counters['errors'] += 1
+                if verbosity > 0:
+                    print("# Session {0}: {1}".format(session_id,
+                                                      stmt_errmsg))
+
+    start_time = time.time()
+    # Each session is sent to a worker as soon as it starts, and its
+    # statements are sent through the queue of the session as they are read,
+    # so the sessions are replayed concurrently (with their original timing,
+    # if requested) while the log is read. Sessions started while all the
+    # workers are busy wait for a free worker.
+    # Note: Server connection values are passed to the workers instead of
+    # server instances, otherwise a multiprocessing error is issued. The
+    # queues of the sessions are managed by a server process to be passed
+    # to the workers.
+    manager = None
+    workers_pool = None
+    queues = {}
+    pending = []
+    try:
+        if connections > 1:
+            manager = multiprocessing.Manager()
+            workers_pool = multiprocessing.Pool(
+                processes=connections, initializer=_init_replay_worker,
+                initargs=(server_values, start_time, options))
+        else:
+            _init_replay_worker(server_values, start_time, options)
+        for event, session_id, offset, statement in \
+                read_session_events(stream):
+            if event == _SESSION_STATEMENT:
+                queues[session_id].put((offset, statement))
+            elif event == _SESSION_START:
+                if workers_pool is None:
+                    # Replay the session when it ends (one at a time).
+                    queues[session_id] = Queue.Queue()
+                else:
+                    # Note: The queue (proxy) is kept with the result until
+                    # the session is replayed, the object is removed from
+                    # the manager when no proxy references it.
+                    queue = queues[session_id] = manager.Queue()
+                    result = workers_pool.apply_async(
+                        replay_session_task, ((session_id, queue),))
+                    pending.append((result, queue))
+            else:
+                queue = queues.pop(session_id)
+                queue.put(None)
+                if workers_pool is None:
+                    _add_results(*replay_session_task((session_id, queue)))
+                else:
+                    # Add the results of the sessions already replayed.
+                    running = []
+                    for result, queue in pending:
+                        if result.ready():
+                            _add_results(*result.get())
+                        else:
+                            running.append((result, queue))
+                    pending = running
+        for result, _ in pending:
+            _add_results(*result.get())
+        if workers_pool is not None:
+            workers_pool.close()
+    finally:
+        if workers_pool is not None:
+            workers_pool.terminate()
+            workers_pool.join()
+        if manager is not None:
+            manager.shutdown()
+        if stream is not sys.stdin:
+            stream.close()
+    elapsed = time.time() - start_time
+
+    print("#\n# Replayed {0} sessions ({1} failed to connect) and {2} "
+          "statements ({3} errors) in {4:.3f} seconds ({5:.1f} "
+          "statements/sec).\n#".format(
+              counters['sessions'], counters['failed_sessions'],
+              counters['statements'], counters['errors'], elapsed,
+              counters['statements'] / elapsed if elapsed else 0.0))
+    top_stats = sorted(stats.itervalues(),
+                       key=lambda statement_stats: statement_stats.total,
+                       reverse=True)
+    if top:
+        top_stats = top_stats[:top]
+    rows = []
+    for statement_stats in top_stats:
+        latencies = statement_stats.latencies
+        rows.append([latencies.count, statement_stats.errors,
+                     "{0:.6f}".format(statement_stats.total),
+                     "{0:.6f}".format(statement_stats.total / latencies.count),
+                     "{0:.6f}".format(latencies.percentile(0.5)),
+                     "{0:.6f}".format(latencies.percentile(0.95)),
+                     "{0:.6f}".format(latencies.percentile(0.99)),
+                     "{0:.6f}".format(latencies.maximum),
+                     statement_stats.fingerprint])
+    if rows:
+        print_list(sys.stdout, options.get('format', 'grid'), _COLUMNS, rows)
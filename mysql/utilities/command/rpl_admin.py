@@ -23,12 +23,15 @@ simple master-to-slaves topology.
 import logging
 import os
 import sys
+import threading
 import time
 
 from datetime import datetime, timedelta
+from itertools import islice
+from multiprocessing.pool import ThreadPool
 
 from mysql.utilities.exception import UtilRplError
-from mysql.utilities.common.gtid import gtid_set_itemize
+from mysql.utilities.common.gtid import GtidSet
 from mysql.utilities.common.ip_parser import hostname_is_ip
 from mysql.utilities.common.messages import (ERROR_SAME_MASTER,
                                              ERROR_USER_WITHOUT_PRIVILEGES,
@@ -86,6 +89,19 @@ _ERRANT_TNX_ERROR = "Errant transaction(s) found on slave(s)."
 
 _GTID_ON_REQ = "{action} requires GTID_MODE=ON for all servers."
 
+# Minimum time (in seconds) between two progress reports of the empty
+# transactions injected on each slave (batch mode).
+_INJECT_PROGRESS_INTERVAL = 5
+
+# Maximum size (in bytes) of the statements injecting one empty transaction
+# (see Server.inject_empty_trx_batch), i.e. for a GTID with the longest
+# transaction number, and size reserved in the packet of a batch for the
+# protocol overhead. Used to limit the number of transactions per batch to
+# the max_allowed_packet of the slave.
+_EMPTY_TRX_STMT_SIZE = len("SET GTID_NEXT='{0}:{1}';BEGIN;COMMIT;".format(
+    '0' * 36, 2 ** 63 - 1))
+_INJECT_PACKET_RESERVED = 1024
+
 WARNING_SLEEP_TIME = 10
 
 
@@ -145,6 +161,71 @@ def purge_log(filename, age):
     return True
 
 
+def _inject_slave_trx_batches(slave_srv, gtids_to_skip, batch_size,
+                              print_lock, verbosity=0):
+    """Inject empty transactions on a slave in batches.
+
+    This method injects an empty transaction on the given slave for each
+    GTID in the given set. The GTIDs are generated lazily from the GTID set
+    (without expanding the whole set) and sent to the slave in groups of
+    batch_size transactions per round trip (see
+    Server.inject_empty_trx_batch), reduced if needed so that the query of
+    each batch does not exceed the max_allowed_packet of the slave. The
+    progress and throughput of the injection are reported periodically.
+    GTID_NEXT is set to AUTOMATIC at the end, even if the injection fails.
+
+    slave_srv[in]       Server instance of the target slave.
+    gtids_to_skip[in]   String representing the set of GTIDs to skip.
+    batch_size[in]      Number of empty transactions injected per round trip.
+    print_lock[in]      Lock used to serialize the output of the concurrent
+                        executions for each slave.
+    verbosity[in]       Verbosity level, if greater than zero the progress
+                        is reported after each batch. By default 0.
+
+    Returns a tuple with the number of injected transactions and the elapsed
+    time in seconds.
+    """
+    max_packet = int(slave_srv.select_variable("max_allowed_packet",
+                                               "global"))
+    max_batch_size = max(1, (max_packet - _INJECT_PACKET_RESERVED) //
+                         _EMPTY_TRX_STMT_SIZE)
+    if batch_size > max_batch_size:
+        with print_lock:
+            print("# - {0}@{1}: batch size reduced to {2} transactions "
+                  "(max_allowed_packet={3}).".format(slave_srv.host,
+                                                     slave_srv.port,
+                                                     max_batch_size,
+                                                     max_packet))
+        batch_size = max_batch_size
+    gtid_set = GtidSet(gtids_to_skip)
+    total = gtid_set.cardinality()
+    trx_iter = ('{0}:{1}'.format(uuid, trx_num) for uuid, trx_num in gtid_set)
+    injected = 0
+    start_time = time.time()
+    last_report = start_time
+    try:
+        while True:
+            batch = list(islice(trx_iter, batch_size))
+            if not batch:
+                break
+            injected += slave_srv.inject_empty_trx_batch(
+                batch, gtid_next_automatic=False)
+            now = time.time()
+            if verbosity or now - last_report >= _INJECT_PROGRESS_INTERVAL:
+                last_report = now
+                elapsed = now - start_time
+                with print_lock:
+                    print("# - {0}@{1}: {2} of {3} transactions injected "
+                          "({4:.0f} trx/s).".format(slave_srv.host,
+                                                    slave_srv.port,
+                                                    injected, total,
+                                                    injected / elapsed
+                                                    if elapsed else 0))
+    finally:
+        slave_srv.set_gtid_next_automatic()
+    return injected, time.time() - start_time
+
+
 def skip_slaves_trx(gtid_set, slaves_cnx_val, options):
     """Skip transactions on slaves.
 
@@ -154,15 +235,22 @@ def skip_slaves_trx(gtid_set, slaves_cnx_val, options):
     executed transaction for a given GTID then that GTID is ignored for this
     slave.
 
+    If a batch size greater than 1 is specified, the empty transactions are
+    sent to each slave in batches (multiple transactions per round trip) and
+    all the slaves are processed concurrently, reporting the progress and
+    throughput for each one of them.
+
     gtid_set[in]            String representing the set of GTIDs to skip.
     slaves_cnx_val[in]      List of the dictionaries with the connection
                             values for each target slave.
-    options[in]             Dictionary of options (dry_run, verbosity).
+    options[in]             Dictionary of options (dry_run, verbosity,
+                            batch_size).
 
     Throws an UtilError exception if an error occurs during the execution.
     """
     verbosity = options.get('verbosity')
     dryrun = options.get('dry_run')
+    batch_size = options.get('batch_size', 1)
 
     # Connect to slaves.
     rpl_topology = Topology(None, slaves_cnx_val, options)
@@ -215,25 +303,53 @@ def skip_slaves_trx(gtid_set, slaves_cnx_val, options):
     # Skip transactions for the given list of slaves.
     print("#")
     # pylint: disable=R0101
-    if has_gtid_to_skip:
+    if has_gtid_to_skip and batch_size > 1 and not dryrun:
+        # Inject the empty transactions in batches, concurrently on all
+        # slaves.
+        print_lock = threading.Lock()
+        pool = ThreadPool(processes=len(gtids_by_slave))
+        thread_res_lst = []
+        for host, port, gtids_to_skip in gtids_by_slave:
+            if gtids_to_skip:
+                print("# Injecting empty transactions for '{0}:{1}'"
+                      "...".format(host, port))
+                slave_key = '{0}@{1}'.format(host, port)
+                slave_srv = slaves_dict[slave_key]['instance']
+                thread_res = pool.apply_async(
+                    _inject_slave_trx_batches,
+                    (slave_srv, gtids_to_skip, batch_size, print_lock,
+                     verbosity))
+                thread_res_lst.append((host, port, thread_res))
+        pool.close()
+        # Wait for all threads to finish here to avoid RuntimeErrors when
+        # waiting for the result of a thread that is already dead.
+        pool.join()
+        # Report the results for each slave (errors are raised here).
+        print("#")
+        for host, port, thread_res in thread_res_lst:
+            injected, elapsed = thread_res.get()
+            print("# - {0}@{1}: {2} transactions injected in {3:.2f} "
+                  "seconds ({4:.0f} trx/s).".format(
+                      host, port, injected, elapsed,
+                      injected / elapsed if elapsed else 0))
+    elif has_gtid_to_skip:
         for host, port, gtids_to_skip in gtids_by_slave:
             if gtids_to_skip:
-                # Decompose GTID set into a list of single transactions.
-                gtid_items = gtid_set_itemize(gtids_to_skip)
                 dryrun_mark = '(dry run) ' if dryrun else ''
                 print("# {0}Injecting empty transactions for '{1}:{2}'"
                       "...".format(dryrun_mark, host, port))
                 slave_key = '{0}@{1}'.format(host, port)
                 slave_srv = slaves_dict[slave_key]['instance']
-                for uuid, trx_list in gtid_items:
-                    for trx_num in trx_list:
-                        trx_to_skip = '{0}:{1}'.format(uuid, trx_num)
-                        if verbosity:
-                            print("# - {0}".format(trx_to_skip))
-                        if not dryrun:
-                            # Inject empty transaction.
-                            slave_srv.inject_empty_trx(
-                                trx_to_skip, gtid_next_automatic=False)
+                # Decompose GTID set into single transactions (generated
+                # lazily, without expanding the whole set).
+                for uuid, trx_num in GtidSet(gtids_to_skip):
+                    trx_to_skip = '{0}:{1}'.format(uuid, trx_num)
+                    if verbosity:
+                        print("# - {0}".format(trx_to_skip))
+                    if not dryrun:
+                        # Inject empty transaction.
+                        slave_srv.inject_empty_trx(
+                            trx_to_skip, gtid_next_automatic=False)
                 if not dryrun:
                     slave_srv.set_gtid_next_automatic()
     else:
@@ -0,0 +1,293 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains the slow query log digest command. It groups the queries
+of a slow query log by fingerprint (the query with the literals stripped) and
+reports the aggregated statistics of the top fingerprints.
+"""
+
+import re
+import sys
+
+from mysql.utilities.common.format import print_list
+from mysql.utilities.common.histogram import Histogram
+from mysql.utilities.common.parser import SlowQueryLog
+from mysql.utilities.exception import LogParserError, UtilError
+
+
+SORT_TYPES = ['count', 'query_time', 'lock_time', 'rows_examined']
+
+# Statistics aggregated for each fingerprint (fields of the slow log entry).
+_STATS = ['query_time', 'lock_time', 'rows_examined']
+
+# The percentiles are computed from a histogram with logarithmic buckets
+# (see Histogram), so memory is bounded by the number of fingerprints.
+_BUCKET_MIN = {'query_time': 0.000001, 'lock_time': 0.000001,
+               'rows_examined': 1}
+_PERCENTILE = 0.95
+
+_COLUMNS = ['count', 'total_time', 'avg_time', 'p95_time', 'total_lock',
+            'avg_lock', 'p95_lock', 'total_rows_examined',
+            'avg_rows_examined', 'p95_rows_examined', 'fingerprint']
+
+# Lines added by the server before the query.
+_QUERY_PREFIX_CRE = re.compile(r"\A(?:(?:use \S+|SET timestamp=\d+);\n)+")
+
+# Quoted strings (escaped quotes included) and comments, matched with a
+# single expression so that quotes inside comments and comment markers inside
+# strings are handled correctly.
+_STRING_COMMENT_CRE = re.compile(
+    r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\")"
+    r"|/\*.*?\*/|(?:--\s|#)[^\n]*", re.S)
+
+# Regular expressions used to build the query fingerprint (in order).
+_FINGERPRINT_SUBS = [
+    # Hexadecimal and numeric literals (not part of identifiers).
+    (re.compile(r"\b0x[0-9a-f]+\b|(?<![\w.`])\d+(?:\.\d*)?(?:e[-+]?\d+)?"
+                r"(?![\w`])", re.I), "?"),
+    # NULL values.
+    (re.compile(r"\bnull\b", re.I), "?"),
+    # Whitespace.
+    (re.compile(r"\s+"), " "),
+    # Lists of values, e.g. IN (?, ?, ?) or VALUES (?, ?), (?, ?).
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*"
+                r"\s*\))*"), "(?+)"),
+]
+
+
+def strip_query_prefix(query):
+    """Strip the lines added by the server before the query.
+
+    The slow query log entries can include a 'use <db>;' and a
+    'SET timestamp=<ts>;' line before the query text.
+
+    query[in]       query text (as found in the slow query log)
+
+    Returns string - query text without the prefix lines
+    """
+    return _QUERY_PREFIX_CRE.sub("", query)
+
+
+def get_fingerprint(query):
+    """Get the fingerprint of a query.
+
+    The fingerprint is the normalized form of the query, used to group the
+    queries that only differ in the literal values, spacing, comments or
+    letter case. Literals are replaced by '?' and lists of values by '(?+)'.
+
+    query[in]       query text (as found in the slow query log)
+
+    Returns string - fingerprint of the query
+    """
+    query = _STRING_COMMENT_CRE.sub(
+        lambda match: "?" if match.group(1) else " ",
+        strip_query_prefix(query))
+    for regex, repl in _FINGERPRINT_SUBS:
+        query = regex.sub(repl, query)
+    return query.strip().rstrip(";").strip().lower()
+
+
+class QueryStats(object):
+    """Aggregated statistics of the queries with the same fingerprint.
+
+    For each statistic (see _STATS) the total and a histogram (to compute
+    the percentile) are kept.
+    """
+
+    def __init__(self, fingerprint):
+        """Constructor
+
+        fingerprint[in]  fingerprint of the queries
+        """
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.example = None
+        self.totals = dict((stat, 0) for stat in _STATS)
+        self.histograms = dict((stat, Histogram(_BUCKET_MIN[stat]))
+                               for stat in _STATS)
+
+    def add(self, values, query=None):
+        """Add the values of a query to the statistics.
+
+        values[in]      dictionary with the value of each statistic
+        query[in]       query text, kept as example of the fingerprint
+                        (only the first one)
+        """
+        self.count += 1
+        if self.example is None:
+            self.example = query
+        for stat in _STATS:
+            value = values[stat]
+            self.totals[stat] += value
+            self.histograms[stat].add(value)
+
+    def average(self, stat):
+        """Get the average value of a statistic.
+
+        stat[in]        statistic name
+
+        Returns float - average value
+        """
+        return float(self.totals[stat]) / self.count if self.count else 0.0
+
+    def percentile(self, stat, percentile=_PERCENTILE):
+        """Get an (approximate) percentile of a statistic.
+
+        stat[in]        statistic name
+        percentile[in]  percentile to compute, between 0 and 1
+                        Default = 0.95
+
+        Returns float - value of the percentile
+        """
+        return self.histograms[stat].percentile(percentile)
+
+
+class SlowLogDigest(object):
+    """Digest of slow query logs.
+
+    The entries of the logs are processed one at a time (streaming), only the
+    statistics of each fingerprint are kept in memory.
+    """
+
+    def __init__(self, options=None):
+        """Constructor
+
+        options[in]     dictionary of options:
+                        top: number of fingerprints to report
+                        sort: statistic used to sort the fingerprints (see
+                              SORT_TYPES)
+                        format: output format
+                        verbosity: if > 0, also report an example query
+        """
+        if options is None:
+            options = {}
+        self.top = options.get('top', 10)
+        self.sort = options.get('sort', 'query_time')
+        self.format = options.get('format', 'grid')
+        self.verbosity = options.get('verbosity', 0) or 0
+        self.stats = {}
+        self.num_queries = 0
+
+    def add_entry(self, entry):
+        """Add a slow query log entry to the digest.
+
+        entry[in]       SlowQueryLogEntry or CompactSlowQueryLogEntry instance
+
+        Returns bool - True if the entry was added, False if it does not
+                       have a query or statistics.
+        """
+        query = entry['query']
+        if not query or entry['query_time'] is None:
+            return False
+        fingerprint = get_fingerprint(query)
+        if not fingerprint:
+            return False
+        query_stats = self.stats.get(fingerprint)
+        if query_stats is None:
+            query_stats = self.stats[fingerprint] = QueryStats(fingerprint)
+        query_stats.add({'query_time': float(entry['query_time']),
+                         'lock_time': float(entry['lock_time']),
+                         'rows_examined': entry['rows_examined']},
+                        strip_query_prefix(query).strip()
+                        if self.verbosity > 0 else None)
+        self.num_queries += 1
+        return True
+
+    def read_log(self, stream):
+        """Add all the entries of a slow query log to the digest.
+
+        stream[in]      file object of the slow query log
+
+        Returns int - number of queries added
+        """
+        num_queries = 0
+        try:
+            for entry in SlowQueryLog(stream, fast=True):
+                if self.add_entry(entry):
+                    num_queries += 1
+        except LogParserError as err:
+            raise UtilError("Error parsing the slow query log: "
+                            "{0}".format(err.errmsg))
+        return num_queries
+
+    def get_top(self):
+        """Get the top fingerprints.
+
+        Returns list - QueryStats instances, sorted in descending order by
+                       the sort statistic (total) or count
+        """
+        if self.sort == 'count':
+            sort_key = lambda query_stats: query_stats.count
+        else:
+            sort_key = lambda query_stats: query_stats.totals[self.sort]
+        top = sorted(self.stats.itervalues(), key=sort_key, reverse=True)
+        return top[:self.top] if self.top else top
+
+    def get_rows(self):
+        """Get the report rows for the top fingerprints.
+
+        Returns tuple - (list of column names, list of rows)
+        """
+        columns = list(_COLUMNS)
+        if self.verbosity > 0:
+            columns.append('example')
+        rows = []
+        for query_stats in self.get_top():
+            row = [query_stats.count]
+            for stat in _STATS:
+                fmt = "{0:.0f}" if stat == 'rows_examined' else "{0:.6f}"
+                row.extend([fmt.format(query_stats.totals[stat]),
+                            fmt.format(query_stats.average(stat)),
+                            fmt.format(query_stats.percentile(stat))])
+            row.append(query_stats.fingerprint)
+            if self.verbosity > 0:
+                row.append(query_stats.example)
+            rows.append(row)
+        return columns, rows
+
+    def print_report(self):
+        """Print the report of the top fingerprints.
+        """
+        print("#\n# Slow query log digest: {0} queries, {1} distinct "
+              "fingerprints.\n#".format(self.num_queries, len(self.stats)))
+        columns, rows = self.get_rows()
+        if rows:
+            print_list(sys.stdout, self.format, columns, rows)
+
+
+def digest_slow_logs(log_files, options):
+    """Print the digest of the given slow query log files.
+
+    log_files[in]   list of slow query log file names ('-' for the standard
+                    input)
+    options[in]     dictionary of options (see SlowLogDigest)
+    """
+    digest = SlowLogDigest(options)
+    for log_file in log_files:
+        if log_file == '-':
+            digest.read_log(sys.stdin)
+            continue
+        try:
+            stream = open(log_file, 'r')
+        except IOError as err:
+            raise UtilError("Unable to open the slow query log file "
+                            "'{0}': {1}".format(log_file, err.strerror))
+        try:
+            digest.read_log(stream)
+        finally:
+            stream.close()
+    digest.print_report()
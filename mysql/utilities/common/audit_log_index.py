@@ -0,0 +1,357 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+
+"""
+This file contains the sidecar index of the audit log. The index splits the
+log into blocks of records (byte ranges) and keeps, for each block, the range
+of the record timestamps, the connection IDs and the connections of users, so
+that date and user searches only read and parse the relevant blocks.
+"""
+
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as xml
+
+from mysql.utilities.common.audit_log_reader import (AuditLogReader,
+                                                      get_raw_fields)
+from mysql.utilities.exception import UtilError
+
+try:
+    # pylint: disable=E0611,C0411
+    from xml.etree.ElementTree import ParseError
+except ImportError:
+    # pylint: disable=C0411
+    from xml.parsers.expat import ExpatError as ParseError
+
+
+# Version of the index file format (indexes with another version are
+# rebuilt).
+_INDEX_VERSION = 1
+
+# Suffix of the index file name (appended to the audit log file name).
+INDEX_SUFFIX = '.idx'
+
+# Minimum size of the blocks in bytes. The last block of the index is
+# extended when the log grows until it reaches this size.
+_BLOCK_SIZE = 1024 * 1024
+
+# Size of the data read from the log when building the index.
+_READ_SIZE = 4 * 1024 * 1024
+
+# Number of bytes at the start of the log used to detect its rotation (the
+# first record of a log holds its startup timestamp).
+_SIGNATURE_SIZE = 1024
+
+_RECORD_START = '<AUDIT_RECORD'
+_NEW_RECORD_END = '</AUDIT_RECORD>'
+_OLD_RECORD_END = '/>'
+
+
+def get_index_name(log_name):
+    """Get the name of the index file of the given audit log.
+
+    log_name[in]    audit log file name
+
+    Returns string - index file name
+    """
+    return "{0}{1}".format(log_name, INDEX_SUFFIX)
+
+
+def _get_signature(log_file, size):
+    """Get the signature of the first bytes of the log.
+
+    log_file[in]    log file object (opened in binary mode)
+    size[in]        number of bytes
+
+    Returns string - MD5 hex digest
+    """
+    log_file.seek(0)
+    return hashlib.md5(log_file.read(size)).hexdigest()
+
+
+def scan_records(log_file, offset=0):
+    """Scan the complete records of the audit log from the given offset.
+
+    The records are found by their start and end tags, without parsing
+    them. A record at the end of the log that is not complete yet (without
+    its end tag and newline) is not returned.
+
+    log_file[in]    log file object (opened in binary mode)
+    offset[in]      offset of the first byte to scan (start of a line)
+
+    Returns generator of (start, end, record) tuples - start is the offset
+            of the first line of the record and end the offset after the
+            newline of its last line
+    """
+    log_file.seek(offset)
+    buf = ''
+    buf_offset = offset
+    while True:
+        data = log_file.read(_READ_SIZE)
+        if not data:
+            return
+        buf += data
+        pos = 0
+        while True:
+            start = buf.find(_RECORD_START, pos)
+            if start == -1:
+                # Keep the end of the buffer, it can hold part of a tag.
+                pos = max(pos, len(buf) - len(_RECORD_START))
+                break
+            tag_end = start + len(_RECORD_START)
+            if tag_end >= len(buf):
+                pos = start
+                break
+            if buf[tag_end] == '>':
+                end_tag = _NEW_RECORD_END
+            else:
+                end_tag = _OLD_RECORD_END
+            end = buf.find(end_tag, tag_end)
+            newline = buf.find('\n', end) if end != -1 else -1
+            if newline == -1:
+                pos = start
+                break
+            line_start = buf.rfind('\n', pos, start) + 1 or pos
+            yield (buf_offset + line_start, buf_offset + newline + 1,
+                   buf[start:end + len(end_tag)])
+            pos = newline + 1
+        buf = buf[pos:]
+        buf_offset += pos
+
+
+class AuditLogIndex(object):
+    """The AuditLogIndex class manages the sidecar index of an audit log.
+
+    The index is a list of blocks (dictionaries) with the keys:
+        start, end: byte range of the block (record and line aligned)
+        min_ts, max_ts: minimum and maximum TIMESTAMP of the records
+        audit: True if the block holds an 'Audit' (server startup) record
+        ids: sorted list of the connection IDs of the records
+        connects: list of [USER, PRIV_USER, CONNECTION_ID] of the 'Connect'
+                  records and of the records with a PRIV_USER
+
+    The index is stored in a JSON file next to the log. It is extended when
+    the log grows and rebuilt when the log is rotated (i.e., replaced by a
+    new file) or truncated.
+    """
+
+    def __init__(self, log_name, index_name=None):
+        """Constructor
+
+        log_name[in]    audit log file name
+        index_name[in]  index file name. By default, the log file name with
+                        the '.idx' suffix.
+        """
+        self.log_name = log_name
+        self.index_name = index_name or get_index_name(log_name)
+        self.blocks = []
+        self.size = 0
+        self.changed = False
+        self._identity = None
+
+    def _read_index(self):
+        """Read the index file.
+
+        Returns dictionary - index data or None if the file does not exist
+                             or is not valid
+        """
+        try:
+            with open(self.index_name, 'r') as index_file:
+                data = json.load(index_file)
+        except (IOError, OSError, ValueError):
+            return None
+        if (not isinstance(data, dict) or
+                data.get('version') != _INDEX_VERSION):
+            return None
+        return data
+
+    def update(self):
+        """Load the index and index the records added to the log.
+
+        The stored index is discarded if it does not belong to the current
+        log file (rotated or truncated log).
+
+        Returns list - blocks of the index
+        """
+        try:
+            log_file = open(self.log_name, 'rb')
+        except IOError as err:
+            raise UtilError("Cannot read log file '{0}': "
+                            "{1}".format(self.log_name, err.strerror))
+        try:
+            stat = os.fstat(log_file.fileno())
+            data = self._read_index()
+            if (data and data.get('inode') == stat.st_ino and
+                    data.get('size', 0) <= stat.st_size and
+                    data.get('signature') == _get_signature(
+                        log_file, data.get('signature_size', 0))):
+                self.blocks = data['blocks']
+                self.size = data['size']
+            else:
+                self.blocks = []
+                self.size = 0
+                self.changed = True
+            signature_size = min(_SIGNATURE_SIZE, stat.st_size)
+            self._identity = {
+                'inode': stat.st_ino,
+                'signature': _get_signature(log_file, signature_size),
+                'signature_size': signature_size,
+            }
+            if stat.st_size > self.size:
+                self._index_records(log_file)
+        finally:
+            log_file.close()
+        return self.blocks
+
+    def _index_records(self, log_file):
+        """Index the records after the indexed part of the log.
+
+        The last block is indexed again if it is smaller than the block
+        size, so that the log growth does not produce small blocks. The
+        index only changes if new (complete) records are found.
+
+        log_file[in]    log file object (opened in binary mode)
+        """
+        offset = self.size
+        if self.blocks and (self.blocks[-1]['end'] -
+                            self.blocks[-1]['start']) < _BLOCK_SIZE:
+            offset = self.blocks.pop()['start']
+        block = None
+        ids = None
+        for start, end, record in scan_records(log_file, offset):
+            if block is None:
+                block = {'start': start, 'end': end, 'min_ts': None,
+                         'max_ts': None, 'audit': False, 'connects': []}
+                ids = set()
+            block['end'] = end
+            fields = get_raw_fields(record)
+            timestamp = fields.get('TIMESTAMP')
+            if timestamp:
+                if block['min_ts'] is None or timestamp < block['min_ts']:
+                    block['min_ts'] = timestamp
+                if block['max_ts'] is None or timestamp > block['max_ts']:
+                    block['max_ts'] = timestamp
+            name = (fields.get('NAME') or '').upper()
+            if name == 'AUDIT':
+                block['audit'] = True
+            connection_id = fields.get('CONNECTION_ID')
+            if connection_id:
+                ids.add(connection_id)
+            if name == 'CONNECT' or 'PRIV_USER' in record:
+                connect = self._get_connect(record)
+                if connect:
+                    block['connects'].append(connect)
+            if end - block['start'] >= _BLOCK_SIZE:
+                block['ids'] = sorted(ids)
+                self.blocks.append(block)
+                block = None
+        if block is not None:
+            block['ids'] = sorted(ids)
+            self.blocks.append(block)
+        if self.blocks and self.blocks[-1]['end'] != self.size:
+            self.size = self.blocks[-1]['end']
+            self.changed = True
+
+    def _get_connect(self, record):
+        """Get the connection values of a record.
+
+        The record is parsed (like the audit log reader does) to get the
+        same USER and PRIV_USER values used by the user search.
+
+        record[in]      record text
+
+        Returns list - [USER, PRIV_USER, CONNECTION_ID] or None if the record
+                       has no user
+        """
+        try:
+            node = xml.fromstring(record)
+        except (ParseError, SyntaxError):
+            raise UtilError("Malformed XML - Cannot parse log file: "
+                            "'{0}'\nInvalid XML element: "
+                            "{1!r}".format(self.log_name, record))
+        new_format = node.find('TIMESTAMP') is not None
+        # pylint: disable=W0212
+        values = AuditLogReader()._make_record(node, new_format)
+        user = values.get('USER')
+        priv_user = values.get('PRIV_USER')
+        if not user and not priv_user:
+            return None
+        return [user, priv_user, values.get('CONNECTION_ID')]
+
+    def save(self):
+        """Write the index file, if it changed.
+
+        The index is written to a temporary file that replaces the previous
+        one, so that a concurrent reader never finds a partial index.
+        """
+        if not self.changed:
+            return
+        data = {'version': _INDEX_VERSION, 'size': self.size,
+                'blocks': self.blocks}
+        data.update(self._identity)
+        tmp_name = "{0}.tmp".format(self.index_name)
+        try:
+            with open(tmp_name, 'w') as index_file:
+                json.dump(data, index_file, separators=(',', ':'))
+            if os.name == 'nt' and os.path.exists(self.index_name):
+                os.remove(self.index_name)
+            os.rename(tmp_name, self.index_name)
+        except (IOError, OSError) as err:
+            raise UtilError("Cannot write the audit log index file "
+                            "'{0}': {1}".format(self.index_name,
+                                                err.strerror))
+        self.changed = False
+
+    def get_ranges(self, start_date=None, end_date=None, users=None):
+        """Get the byte ranges of the log that can hold matching records.
+
+        The blocks are selected with the same criteria applied to the
+        records by the audit log parser (see AuditLogParser):
+          - the range of timestamps intersects the date range;
+          - for user searches, the block holds a connection of the users or
+            a record of their connections. Blocks with connections of the
+            users are always read, the parser tracks them.
+        The blocks with 'Audit' records are always read (the parser keeps
+        them as header rows). Adjacent blocks are merged.
+
+        start_date[in]  start date/time (inclusive) or None
+        end_date[in]    end date/time (inclusive) or None
+        users[in]       list of user names or None
+
+        Returns list of (start, end) tuples - byte ranges in order
+        """
+        ranges = []
+        tracked_ids = set()
+        for block in self.blocks:
+            relevant = (block['min_ts'] is None or
+                        not (start_date and block['max_ts'] < start_date) and
+                        not (end_date and end_date < block['min_ts']))
+            if users:
+                user_ids = [connect[2] for connect in block['connects']
+                            if connect[0] in users or connect[1] in users]
+                if user_ids:
+                    relevant = True
+                elif relevant:
+                    relevant = not tracked_ids.isdisjoint(block['ids'])
+                tracked_ids.update(user_ids)
+            if relevant or block['audit']:
+                if ranges and ranges[-1][1] == block['start']:
+                    ranges[-1] = (ranges[-1][0], block['end'])
+                else:
+                    ranges.append((block['start'], block['end']))
+        return ranges
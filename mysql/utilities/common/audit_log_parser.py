@@ -20,12 +20,218 @@ This file contains features to parse an audit log file, including
 searching and displaying the results.
 """
 
+import multiprocessing
+import os
 import re
 
-from mysql.utilities.common.audit_log_reader import AuditLogReader
+from mysql.utilities.common.audit_log_index import AuditLogIndex
+from mysql.utilities.common.audit_log_reader import (AuditLogReader,
+                                                     get_raw_fields)
 from mysql.utilities.exception import UtilError
 
 
+# Size in bytes of the chunks of the logs processed by each task when the
+# logs are processed concurrently (see AuditLogParser.search_logs).
+_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Size of the data read to find the start of a record, and of the data kept
+# from the previous read (to find matches between reads).
+_READ_SIZE = 64 * 1024
+_KEEP_SIZE = 1024
+
+# Match the start of the line of a record.
+_RECORD_LINE_CRE = re.compile(r'\n[ \t]*<AUDIT_RECORD')
+
+# Match the suffix added to the name of the rotated audit logs (the
+# rotation timestamp and the '.xml' extension in recent versions).
+_ROTATED_SUFFIX_CRE = re.compile(r'^\.(\d+)(?:\.xml)?$')
+
+# Options and tracked connections of the users used by the processes of
+# the pool (see _init_search_worker).
+_WORKER_OPTIONS = {}
+_WORKER_TRACKED_IDS = {}
+
+
+def get_log_files(log_name, rotated=False):
+    """Get the audit log files to process.
+
+    The rotated audit logs are the files of the same directory whose name
+    is the audit log file name followed by the rotation timestamp (and the
+    '.xml' extension in recent versions), e.g. audit.log.13951424704434196.
+
+    log_name[in]    audit log file name
+    rotated[in]     if True, include the rotated audit logs
+
+    Returns list - file names of the rotated logs (sorted by rotation time)
+                   followed by the audit log file name
+    """
+    if not rotated:
+        return [log_name]
+    path, base_name = os.path.split(log_name)
+    rotated_logs = []
+    for file_name in os.listdir(path or os.curdir):
+        if not file_name.startswith(base_name):
+            continue
+        match = _ROTATED_SUFFIX_CRE.match(file_name[len(base_name):])
+        if match:
+            rotated_logs.append((int(match.group(1)),
+                                 os.path.join(path, file_name)))
+    return [name for _, name in sorted(rotated_logs)] + [log_name]
+
+
+def _find_record_line(log_file, offset, end):
+    """Find the start of the first record line after the given offset.
+
+    log_file[in]    log file object (opened in binary mode)
+    offset[in]      offset to start the search
+    end[in]         offset to end the search
+
+    Returns integer - offset of the start of the line or None if not found
+    """
+    log_file.seek(offset)
+    buf = ''
+    buf_offset = offset
+    while buf_offset + len(buf) < end:
+        data = log_file.read(_READ_SIZE)
+        if not data:
+            break
+        buf += data
+        match = _RECORD_LINE_CRE.search(buf)
+        if match:
+            line_start = buf_offset + match.start() + 1
+            return line_start if line_start < end else None
+        # Keep the end of the buffer, it can hold part of the match.
+        buf_offset += max(len(buf) - _KEEP_SIZE, 0)
+        buf = buf[-_KEEP_SIZE:]
+    return None
+
+
+def split_log(log_name, ranges=None, chunk_size=None):
+    """Split the audit log in chunks aligned with the records.
+
+    log_name[in]    audit log file name
+    ranges[in]      list of (start, end) byte ranges of the log to split,
+                    aligned with the records (see AuditLogIndex). By default
+                    (None), the whole log.
+    chunk_size[in]  approximated size of the chunks in bytes (default
+                    _CHUNK_SIZE)
+
+    Returns list of lists of (start, end) tuples - byte ranges of each chunk
+    """
+    if chunk_size is None:
+        chunk_size = _CHUNK_SIZE
+    with open(log_name, 'rb') as log_file:
+        if ranges is None:
+            ranges = [(0, os.fstat(log_file.fileno()).st_size)]
+        chunks = []
+        chunk = []
+        size = 0
+        for start, end in ranges:
+            while start < end:
+                piece_end = end
+                if end - start > chunk_size - size:
+                    piece_end = _find_record_line(
+                        log_file, start + chunk_size - size, end) or end
+                chunk.append((start, piece_end))
+                size += piece_end - start
+                start = piece_end
+                if size >= chunk_size:
+                    chunks.append(chunk)
+                    chunk = []
+                    size = 0
+        if chunk:
+            chunks.append(chunk)
+    return chunks
+
+
+def _is_tracking_record(raw_record):
+    """Check if a record is needed to track the connections of the users.
+
+    The 'Audit' records (header rows) are also returned.
+    """
+    if 'PRIV_USER' in raw_record:
+        return True
+    name = (get_raw_fields(raw_record).get('NAME') or '').upper()
+    return name == 'CONNECT' or name == 'AUDIT'
+
+
+def _init_search_worker(options, tracked_ids=None):
+    """Initialize a process of the pool used to process the log chunks.
+
+    options[in]     options of the parser (see AuditLogParser)
+    tracked_ids[in] dictionary with the number of the chunk where each
+                    connection ID of the users was first tracked and the
+                    users of the connection, i.e. {connection ID: (chunk
+                    number, (user, priv_user))}. By default (None), no
+                    connections are tracked.
+    """
+    _WORKER_OPTIONS.update(options)
+    # Each chunk is processed by a single process.
+    _WORKER_OPTIONS.update({'use_index': False, 'rotated': False,
+                            'multiprocess': 1})
+    _WORKER_TRACKED_IDS.clear()
+    if tracked_ids:
+        _WORKER_TRACKED_IDS.update(tracked_ids)
+
+
+def _open_chunk_log(log_name):
+    """Create a parser for a chunk of the given log and open the log.
+    """
+    options = dict(_WORKER_OPTIONS)
+    options['log_name'] = log_name
+    parser = AuditLogParser(options)
+    parser.open_log()
+    return parser
+
+
+def track_chunk_task(chunk):
+    """Get the records of a chunk needed to track the users connections.
+
+    chunk[in]       tuple - (log file name, list of byte ranges)
+
+    Returns list - 'Audit' records and records with connections of users
+    """
+    log_name, ranges = chunk
+    parser = _open_chunk_log(log_name)
+    try:
+        return [record for record, _ in
+                parser.get_next_record(ranges, _is_tracking_record)]
+    finally:
+        parser.close_log()
+
+
+def search_chunk_task(task):
+    """Search the records of a chunk of the log matching the criteria.
+
+    The connections of the users tracked before the chunk are the ones
+    first tracked in the previous chunks (see _init_search_worker).
+
+    task[in]        tuple - (chunk number, log file name, list of byte
+                    ranges, header rows before the chunk, flag to only read
+                    the header rows)
+
+    Returns tuple - (list of matching records, list of the header rows of
+                     the chunk)
+    """
+    chunk_num, log_name, ranges, header_rows, header_only = task
+    parser = _open_chunk_log(log_name)
+    parser.header_rows = list(header_rows)
+    # pylint: disable=W0212
+    parser._tracked_ids = dict(
+        (conn_id, users) for conn_id, (num, users) in
+        _WORKER_TRACKED_IDS.iteritems() if num < chunk_num
+    )
+    try:
+        if header_only:
+            parser.read_header_rows(ranges)
+            rows = []
+        else:
+            rows = list(parser.get_matching_records(ranges))
+    finally:
+        parser.close_log()
+    return rows, parser.header_rows[len(header_rows):]
+
+
 class AuditLogParser(AuditLogReader):
     """The AuditLogParser class is used to parse the audit log file, applying
     search criterion and filtering the logged data.
@@ -42,6 +248,8 @@ class AuditLogParser(AuditLogReader):
         self.connects = []
         self.rows = []
         self.connection_ids = []
+        # Users of the tracked connection IDs (first connection found).
+        self._tracked_ids = {}
 
         # Compile regexp pattern
         self.regexp_pattern = None
@@ -74,11 +282,102 @@ class AuditLogParser(AuditLogReader):
             # Compile regexp to match text between backticks (`) to be ignored.
             self.regexp_backtick = re.compile(r'`.*?`', re.DOTALL)
 
-    def parse_log(self):
-        """Parse audit log records, apply search criteria and store results.
+    def get_index_ranges(self, log_name=None):
+        """Get the byte ranges of the log to read using the sidecar index.
+
+        The index is updated with the records added to the log since its
+        last use (or rebuilt if the log was rotated) and written back. If the
+        index file cannot be written, the updated index is only used by this
+        search.
+
+        log_name[in]    audit log file name. By default, the log of the
+                        parser.
+
+        Returns list of (start, end) tuples - byte ranges of the log that can
+        hold records matching the date and user search criteria
         """
-        # Find and store records matching search criteria
-        for record, line in self.get_next_record():
+        index = AuditLogIndex(log_name or self.log_name)
+        index.update()
+        try:
+            index.save()
+        except UtilError as err:
+            if self.verbosity:
+                print("# WARNING: {0}".format(err.errmsg))
+        return index.get_ranges(self.options['start_date'],
+                                self.options['end_date'],
+                                self.options['users'])
+
+    def _prefilter(self, raw_record):
+        """Check if a record can match the search criteria, before parsing.
+
+        The user, event type, status and date/time criteria are checked on
+        the values found in the text of the record (see get_raw_fields),
+        and the query type criteria by looking for the query type keywords
+        in its text. Records needed to track the connections of the users
+        and 'Audit' records (header rows) are always parsed.
+
+        raw_record[in]  text of an audit log record
+
+        Returns bool - False if the record does not match the criteria
+        """
+        fields = get_raw_fields(raw_record)
+        name = (fields.get('NAME') or '').upper()
+        if name == 'AUDIT':
+            return True
+        if self.options['users']:
+            if name == 'CONNECT' or 'PRIV_USER' in raw_record:
+                return True
+            if fields.get('CONNECTION_ID') not in self._tracked_ids:
+                return False
+        if (self.options['event_type'] and
+                name.lower() not in self.options['event_type']):
+            return False
+        if (self.options['status'] and
+                not self.match_status(fields, self.options['status'])):
+            return False
+        if ((self.options['start_date'] or self.options['end_date']) and
+                not self.match_datetime_range(fields,
+                                              self.options['start_date'],
+                                              self.options['end_date'])):
+            return False
+        if self.match_qtypes:
+            if 'SQLTEXT' not in raw_record:
+                return False
+            raw_lower = raw_record.lower()
+            for qtype in self.match_qtypes:
+                # Note: The keyword can be followed by a newline (converted
+                # to a space by the XML parser).
+                if qtype.rstrip() in raw_lower:
+                    break
+            else:
+                return False
+        return True
+
+    def get_matching_records(self, ranges=None):
+        """Get the audit log records matching the search criteria.
+
+        Generator function that returns the records (in the order of the
+        log) as they are found, without storing them. The records are
+        returned as dictionaries or, for the 'raw' format, as their original
+        text. The text of each record is prefiltered (see _prefilter) to
+        only parse the records that can match the criteria.
+
+        If the 'use_index' option is set, only the regions of the log that
+        can hold records within the date range and of the users are read
+        (see get_index_ranges).
+
+        ranges[in]      list of (start, end) byte ranges of the log to read.
+                        By default (None), the whole log or the ranges from
+                        the index.
+        """
+        if ranges is None and self.options.get('use_index', False):
+            ranges = self.get_index_ranges()
+        prefilter = None
+        if (self.options['users'] or self.options['event_type'] or
+                self.options['status'] or self.options['start_date'] or
+                self.options['end_date'] or self.match_qtypes):
+            prefilter = self._prefilter
+        for record, line in self.get_next_record(ranges, prefilter):
             name = record.get("NAME")
             name_case = name.upper()
             # The variable matching_record is used to avoid unnecessary
@@ -128,12 +427,174 @@ class AuditLogParser(AuditLogReader):
                     not self.match_pattern(record)):
                 matching_record = False
 
-            # Store record into resulting rows (i.e., survived defined filters)
+            # Return record (i.e., survived defined filters)
             if matching_record:
                 if self.options['format'] == 'raw':
-                    self.rows.append(line)
+                    yield line
                 else:
-                    self.rows.append(record)
+                    yield record
+
+    def read_header_rows(self, ranges=None):
+        """Read the 'Audit' records (header rows) of the log.
+
+        All the records are parsed, to report malformed logs, but only the
+        'Audit' records are kept.
+
+        ranges[in]      list of (start, end) byte ranges of the log to read.
+                        By default (None), the whole log.
+        """
+        for record, _ in self.get_next_record(ranges):
+            if (record.get('NAME') or '').upper() == 'AUDIT':
+                self.header_rows.append(record)
+
+    def get_log_files(self):
+        """Get the audit log files to process.
+
+        Returns list - file names of the rotated logs if the 'rotated' option
+                       is set (see get_log_files) and the audit log
+        """
+        return get_log_files(self.log_name, self.options.get('rotated',
+                                                              False))
+
+    def search_logs(self):
+        """Get the records of the audit logs matching the search criteria.
+
+        Generator function that returns the matching records (see
+        get_matching_records) of the rotated audit logs, if the 'rotated'
+        option is set, and of the audit log (previously opened), in order.
+        If the 'multiprocess' option is greater than 1, the logs are split in
+        chunks processed concurrently (see _process_logs_concurrently).
+        """
+        return self._process_logs(header_only=False)
+
+    def read_logs_header_rows(self):
+        """Read the header rows of the audit logs.
+
+        Like search_logs but only reading the header rows.
+        """
+        for _ in self._process_logs(header_only=True):
+            pass
+
+    def _process_logs(self, header_only):
+        """Process the audit logs, in order.
+
+        header_only[in] if True, only read the header rows (see
+                        read_header_rows), otherwise search the matching
+                        records
+
+        Returns generator - matching records
+        """
+        log_names = self.get_log_files()
+        if self.options.get('multiprocess', 1) > 1:
+            for row in self._process_logs_concurrently(log_names,
+                                                       header_only):
+                yield row
+            return
+        main_log_name = self.log_name
+        for log_name in log_names:
+            if log_name != self.log_name or self.log is None:
+                # Note: The audit log is the last one, it is left open.
+                if self.log is not None:
+                    self.close_log()
+                self.log_name = log_name
+                self.open_log()
+            if header_only:
+                self.read_header_rows()
+            else:
+                for row in self.get_matching_records():
+                    yield row
+        self.log_name = main_log_name
+
+    def _process_logs_concurrently(self, log_names, header_only):
+        """Process the audit logs concurrently, using a pool of processes.
+
+        The logs are split in chunks aligned with the records (only the
+        ranges from the index are used if the 'use_index' option is set)
+        that are processed by the processes of the pool. The results of the
+        chunks are returned in the order of the logs (i.e., timestamp order)
+        as they are available.
+
+        The connections of the users tracked in a chunk are needed by the
+        following ones, so for user searches the records with connections
+        are first read concurrently (without parsing the others) and tracked
+        in order. The chunk where each connection was first tracked is
+        passed once to the processes of the pool that search the chunks.
+
+        log_names[in]   list of audit log file names, in order
+        header_only[in] if True, only read the header rows
+
+        Returns generator - matching records
+        """
+        chunks = []
+        for log_name in log_names:
+            ranges = None
+            if self.options.get('use_index', False) and not header_only:
+                ranges = self.get_index_ranges(log_name)
+            chunks.extend((log_name, chunk_ranges) for chunk_ranges in
+                          split_log(log_name, ranges))
+        if not chunks:
+            return
+        processes = min(self.options['multiprocess'], len(chunks))
+        tracked_ids = {}
+        if self.options['users'] and not header_only:
+            header_rows = []
+            tasks = []
+            for num, records in enumerate(
+                    self._map_chunks(processes, track_chunk_task, chunks)):
+                log_name, ranges = chunks[num]
+                tasks.append((num, log_name, ranges, header_rows[:1],
+                              header_only))
+                for record in records:
+                    name = record.get('NAME').upper()
+                    if name == 'AUDIT':
+                        header_rows.append(record)
+                    self._track_new_users_connection_id(record, name)
+                    conn_id = record.get('CONNECTION_ID')
+                    if (conn_id in self._tracked_ids and
+                            conn_id not in tracked_ids):
+                        tracked_ids[conn_id] = (num,
+                                                self._tracked_ids[conn_id])
+        else:
+            tasks = [(num, log_name, ranges, [], header_only)
+                     for num, (log_name, ranges) in enumerate(chunks)]
+        for rows, header_rows in self._map_chunks(
+                processes, search_chunk_task, tasks, tracked_ids):
+            self.header_rows.extend(header_rows)
+            for row in rows:
+                yield row
+
+    def _map_chunks(self, processes, func, tasks, tracked_ids=None):
+        """Apply a function to the given tasks using a pool of processes.
+
+        The tracked connections of the users are passed once to each
+        process of the pool (see _init_search_worker).
+
+        processes[in]   number of processes of the pool
+        func[in]        function applied to each task (see track_chunk_task
+                        and search_chunk_task)
+        tasks[in]       list of tasks
+        tracked_ids[in] tracked connections of the users, by default None
+
+        Returns generator - results of the tasks, in order
+        """
+        # Note: The options are passed to the workers instead of the parser,
+        # to avoid pickling the opened log.
+        workers_pool = multiprocessing.Pool(
+            processes=processes, initializer=_init_search_worker,
+            initargs=(self.options, tracked_ids))
+        try:
+            for result in workers_pool.imap(func, tasks):
+                yield result
+            workers_pool.close()
+        finally:
+            workers_pool.terminate()
+            workers_pool.join()
+
+    def parse_log(self):
+        """Parse audit log records, apply search criteria and store results.
+        """
+        # Find and store records matching search criteria
+        self.rows.extend(self.search_logs())
 
     def retrieve_rows(self):
         """Retrieve the resulting entries from the log parsing process
@@ -153,6 +614,8 @@ class AuditLogParser(AuditLogReader):
                 (priv_user and (priv_user in self.options['users']))):
             self.connection_ids.append((user, priv_user,
                                         record.get("CONNECTION_ID")))
+            self._tracked_ids.setdefault(record.get("CONNECTION_ID"),
+                                         (user, priv_user))
 
     def match_users(self, record):
         """Match users.
@@ -162,16 +625,16 @@ class AuditLogParser(AuditLogReader):
 
         record[in] audit log record to check
         """
-        for con_id in self.connection_ids:
-            if record.get('CONNECTION_ID', None) == con_id[2]:
-                # Add user columns
-                record['USER'] = con_id[0]
-                record['PRIV_USER'] = con_id[1]
-                # Add server_id column
-                if self.header_rows:
-                    record['SERVER_ID'] = self.header_rows[0]['SERVER_ID']
-                return True
-        return False
+        users = self._tracked_ids.get(record.get('CONNECTION_ID', None))
+        if users is None:
+            return False
+        # Add user columns
+        record['USER'] = users[0]
+        record['PRIV_USER'] = users[1]
+        # Add server_id column
+        if self.header_rows:
+            record['SERVER_ID'] = self.header_rows[0]['SERVER_ID']
+        return True
 
     @staticmethod
     def match_datetime_range(record, start_date, end_date):
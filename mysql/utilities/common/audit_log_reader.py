@@ -20,6 +20,7 @@ This file contains the methods for reading the audit log.
 """
 
 import os
+import re
 import xml.etree.ElementTree as xml
 
 from mysql.utilities.exception import UtilError
@@ -46,6 +47,24 @@ _OPTIONAL_FIELDS = ['CONNECTION_ID', 'DB', 'HOST', 'IP', 'MYSQL_VERSION',
 _NEW_MANDATORY_FIELDS = _MANDATORY_FIELDS + ['RECORD_ID']
 _NEW_OPTIONAL_FIELDS = _OPTIONAL_FIELDS + ['COMMAND_CLASS', 'STATUS_CODE']
 
+# Match the fields with simple values in the text of a record, for both
+# formats (attributes in the old format and elements in the new one).
+# Note: Values cannot hold '"' or '<' characters (they are escaped).
+_RAW_FIELD_CRE = re.compile(r'[\s<](TIMESTAMP|NAME|CONNECTION_ID|STATUS)'
+                            r'(?:="([^"]*)"|>([^<]*)<)')
+
+
+def get_raw_fields(raw_record):
+    """Get the simple fields of a record from its text, without parsing it.
+
+    raw_record[in]  text of an audit log record
+
+    Returns dictionary - values of the TIMESTAMP, NAME, CONNECTION_ID and
+                         STATUS fields found in the record
+    """
+    return dict((match.group(1), match.group(2) or match.group(3))
+                for match in _RAW_FIELD_CRE.finditer(raw_record))
+
 
 class AuditLogReader(object):
     """The AuditLogReader class is used to read the data stored in the audit
@@ -96,17 +115,43 @@ class AuditLogReader(object):
         return (('<?xml ' in line) or
                 ('<AUDIT>' in line) or ('</AUDIT>' in line))
 
-    def get_next_record(self):
+    def _read_lines(self, ranges):
+        """Read the lines of the given byte ranges of the audit log.
+
+        Generator function that returns the lines starting in the given
+        ranges, which must be line aligned.
+
+        ranges[in]      list of (start, end) byte offsets tuples
+        """
+        for start, end in ranges:
+            self.log.seek(start)
+            while self.log.tell() < end:
+                line = self.log.readline()
+                if not line:
+                    break
+                yield line
+
+    def get_next_record(self, ranges=None, prefilter=None):
         """Get the next audit log record.
 
         Generator function that return the next audit log record.
         More precisely, it returns a tuple with a formatted record dict and
         the original record.
+
+        ranges[in]      list of (start, end) byte offsets tuples of the log
+                        to read, aligned with the records (see
+                        AuditLogIndex.get_ranges). By default (None), the
+                        whole log is read.
+        prefilter[in]   function called with the text of each record before
+                        parsing it. The record is skipped (not parsed) if it
+                        returns False. By default (None), all the records
+                        are parsed.
         """
         next_line = ""
         new_format = False
         multiline = False
-        for line in self.log:
+        lines = self.log if ranges is None else self._read_lines(ranges)
+        for line in lines:
             if line.lstrip().startswith('<AUDIT_RECORD>'):
                 # Found first record line in the new format.
                 new_format = True
@@ -140,6 +185,8 @@ class AuditLogReader(object):
                 next_line += line
             log_entry = next_line
             next_line = ""
+            if prefilter is not None and not prefilter(log_entry):
+                continue
             try:
                 yield (
                     self._make_record(xml.fromstring(log_entry), new_format),
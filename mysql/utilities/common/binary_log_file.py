@@ -20,11 +20,18 @@ This file contains common features to manage and handle binary log files.
 """
 import io
 import errno
+import gzip
+import hashlib
+import json
+import multiprocessing
 import os
 import shutil
+import struct
 import time
+import zlib
 
 from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 from mysql.utilities.exception import UtilError
 
@@ -34,6 +41,22 @@ LOG_TYPE_RELAY = LOG_TYPES[1]
 LOG_TYPE_ALL = LOG_TYPES[2]
 
 _DAY_IN_SECONDS = 86400
+_ERR_MSG_MOVE_FILE = "Unable to move binary file: {filename}\n{error}"
+_ERR_MSG_ARCHIVE_FILE = "Unable to archive binary file: {filename}\n{error}"
+# Maximum number of files copied concurrently (see move_binary_logs).
+_MOVE_WORKERS = 4
+# Size of the data blocks read from the binary log files to archive.
+_ARCHIVE_BLOCK_SIZE = 1048576
+_ARCHIVE_SUFFIX = '.gz'
+# Manifest of the archived files (one JSON object per line).
+ARCHIVE_MANIFEST = 'binlog_archive.manifest'
+# Binary log file magic number and header (timestamp, type_code, server_id,
+# event_length) of the events.
+_BINLOG_MAGIC = '\xfebin'
+_EVENT_HEADER_LEN = 19
+_EVENT_HEADER_FORMAT = '<IxII'
+_EVENT_HEADER_FORMAT_LEN = struct.calcsize(_EVENT_HEADER_FORMAT)
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 
 def is_binary_log_filename(filename, log_type=LOG_TYPE_ALL, basename=None):
@@ -327,8 +350,520 @@ def move_binary_log(source, destination, filename, log_index,
         raise UtilError('Failed to update index file: '
                         '{0}{1}'.format(err, warning))
     # Replace the original index file with the new one.
-    if os.name == 'posix':
-        os.rename(tmp_file, log_index)
+    try:
+        if os.name == 'posix':
+            os.rename(tmp_file, log_index)
+        else:
+            # On windows, rename does not work if the target file already
+            # exists.
+            shutil.move(tmp_file, log_index)
+    except (OSError, IOError, shutil.Error) as err:
+        # The original index file is kept, discard the temporary one.
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise UtilError('Unable to replace index file: {0}'.format(err))
+
+
+def _fsync_file(filename):
+    """Flush the content of the given file to disk.
+
+    filename[in]    Path of the file to flush.
+    """
+    with open(filename, 'rb+') as f_obj:
+        os.fsync(f_obj.fileno())
+
+
+def _copy_binary_log(source_file, destination_file):
+    """Copy a binary log file to its destination.
+
+    The file is copied to a temporary file in the destination directory,
+    flushed to disk and verified (same size as the source file) before being
+    renamed to the destination file. The source file is not removed.
+
+    source_file[in]         Path of the binary log file to copy.
+    destination_file[in]    Path of the destination file.
+
+    Returns None if the file was copied successfully, otherwise the raised
+    exception.
+    """
+    tmp_file = '{0}.tmp'.format(destination_file)
+    try:
+        shutil.copy2(source_file, tmp_file)
+        _fsync_file(tmp_file)
+        if os.path.getsize(tmp_file) != os.path.getsize(source_file):
+            raise IOError(errno.EIO, "Size of the copied file does not match "
+                                     "the source file", tmp_file)
+        os.rename(tmp_file, destination_file)
+    except (IOError, OSError, shutil.Error) as err:
+        if os.path.exists(tmp_file):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        return err
+    return None
+
+
+def _rewrite_index_file(log_index, destination, filenames, remove=False):
+    """Update the entries of the given binary log files in the index file.
+
+    The index file is read and rewritten only once. The new content is
+    written to a temporary file (flushed to disk) that atomically replaces
+    the original index file.
+
+    log_index[in]       Location (full path) of the binary log index file.
+    destination[in]     Destination directory of the binary log files.
+    filenames[in]       Names of the moved binary log files.
+    remove[in]          If True, the entries are removed from the index file
+                        instead of updated. By default False.
+
+    Raises an UtilError if an entry is not found or the index file cannot be
+    updated (i.e., written or replaced), keeping the original index file.
+    """
+    try:
+        with io.open(log_index, 'r') as index_file:
+            data = index_file.readlines()
+    except IOError as err:
+        raise UtilError('Failed to update index file: {0}'.format(err))
+    # Map each binary log file name to the position of its entry.
+    entries = {}
+    for pos, line in enumerate(data):
+        entries.setdefault(os.path.basename(line.strip()), pos)
+    for filename in filenames:
+        found_pos = entries.get(filename, None)
+        if found_pos is None:
+            raise UtilError("Entry for file '{0}' not found in index "
+                            "file: {1}".format(filename, log_index))
+        if remove:
+            data[found_pos] = None
+        else:
+            # Replace binary file entry with absolute destination path.
+            data[found_pos] = u'{0}\n'.format(os.path.join(destination,
+                                                           filename))
+    if remove:
+        data = [line for line in data if line is not None]
+    # Create a new temporary index_file with the updated entries.
+    # Note: original file is safe is something goes wrong during write.
+    tmp_file = '{0}.tmp'.format(log_index)
+    try:
+        with io.open(tmp_file, 'w', newline='\n') as tmp_index_file:
+            tmp_index_file.writelines(data)
+        _fsync_file(tmp_file)
+    except IOError as err:
+        raise UtilError('Unable to write temporary index file: '
+                        '{0}'.format(err))
+    # Replace the original index file with the new one.
+    try:
+        if os.name == 'posix':
+            os.rename(tmp_file, log_index)
+        else:
+            # On windows, rename does not work if the target file already
+            # exists.
+            shutil.move(tmp_file, log_index)
+    except (OSError, IOError, shutil.Error) as err:
+        # The original index file is kept, discard the temporary one.
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise UtilError('Unable to replace index file: {0}'.format(err))
+
+
+def move_binary_logs(source, destination, filenames, log_index,
+                     workers=_MOVE_WORKERS):
+    """Move a list of binary log files to a specific destination.
+
+    This method moves the given binary log files, located in the source
+    directory, to the specified destination directory and updates the
+    respective index file only once for all of them (see move_binary_log to
+    move a single file).
+
+    If the source and destination directories are on the same file system
+    the files are simply renamed. Otherwise, the files are copied
+    concurrently by a pool of workers, each copy being flushed to disk and
+    verified, and the source files are only removed after the index file is
+    updated. If any file cannot be moved or the index file cannot be
+    updated, the operation is reverted (files moved back or copies removed)
+    keeping the index file unchanged, and an error is raised.
+
+    source[in]          Source directory where the binary log files are
+                        located.
+    destination[in]     Destination directory to move the binary logs.
+    filenames[in]       List with the names of the binary log files to move.
+    log_index[in]       Location (full path) of the binary log index file.
+    workers[in]         Maximum number of files copied concurrently. By
+                        default _MOVE_WORKERS.
+    """
+    if not os.path.isdir(destination):
+        raise UtilError(_ERR_MSG_MOVE_FILE.format(
+            filename=filenames[0] if filenames else '',
+            error=IOError(errno.ENOENT, "No such destination directory",
+                          destination)))
+    # Check files before moving them.
+    for filename in filenames:
+        source_file = os.path.join(source, filename)
+        error = None
+        if not os.path.isfile(source_file):
+            error = IOError(errno.ENOENT, "No such file", source_file)
+        elif os.path.exists(os.path.join(destination, filename)):
+            error = shutil.Error("Destination path '{0}' already "
+                                 "exists".format(os.path.join(destination,
+                                                              filename)))
+        if error:
+            raise UtilError(_ERR_MSG_MOVE_FILE.format(filename=filename,
+                                                      error=error))
+
+    same_device = os.stat(source).st_dev == os.stat(destination).st_dev
+    moved = []
+    errors = []
+    if same_device:
+        # Rename files (no data copy required).
+        for filename in filenames:
+            try:
+                os.rename(os.path.join(source, filename),
+                          os.path.join(destination, filename))
+            except OSError as err:
+                errors.append((filename, err))
+                break
+            moved.append(filename)
     else:
-        # On windows, rename does not work if the target file already exists.
-        shutil.move(tmp_file, log_index)
+        # Copy files concurrently (source files are kept until the index
+        # file is updated).
+        pool = ThreadPool(processes=max(1, min(workers, len(filenames))))
+        try:
+            results = pool.map(
+                lambda f_name: _copy_binary_log(
+                    os.path.join(source, f_name),
+                    os.path.join(destination, f_name)),
+                filenames)
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+        for filename, err in zip(filenames, results):
+            if err is None:
+                moved.append(filename)
+            else:
+                errors.append((filename, err))
+
+    def _undo_move():
+        """Revert the moved (renamed or copied) files.
+        Returns a warning message indicating if the files were moved back
+        successfully or not.
+        """
+        failed = []
+        for f_name in moved:
+            destination_file = os.path.join(destination, f_name)
+            try:
+                if same_device:
+                    os.rename(destination_file, os.path.join(source, f_name))
+                else:
+                    os.remove(destination_file)
+            except OSError as undo_err:
+                failed.append("{0} ({1})".format(f_name, undo_err))
+        if failed:
+            return ("\nWARNING: Failed to move files back to source "
+                    "directory: {0}").format(", ".join(failed))
+        return "\nWARNING: File move aborted."
+
+    if errors:
+        warning = _undo_move()
+        filename, err = errors[0]
+        raise UtilError("{0}{1}".format(
+            _ERR_MSG_MOVE_FILE.format(filename=filename, error=err), warning))
+
+    # Update index file (once for all files).
+    try:
+        _rewrite_index_file(log_index, destination, filenames)
+    except UtilError as err:
+        raise UtilError("{0}{1}".format(err.errmsg, _undo_move()))
+
+    if not same_device:
+        # Remove source files (already copied and referenced by the index).
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(source, filename))
+            except OSError as err:
+                raise UtilError("Unable to remove moved binary file from "
+                                "source directory: {0}".format(err))
+
+
+class _BinlogEventScanner(object):
+    """Scanner of the event headers of a binary log file.
+
+    The data of the binary log file is provided sequentially in blocks of
+    any size (see update), keeping track of the position of the next event
+    to get the timestamp of the first and last events without storing the
+    file data.
+    """
+
+    def __init__(self):
+        """Constructor
+        """
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self._pos = 0
+        self._next_event = len(_BINLOG_MAGIC)
+        self._magic = ''
+        self._header = ''
+
+    def update(self, data):
+        """Process the next block of data of the binary log file.
+
+        data[in]        Block of data (string).
+        """
+        start = self._pos
+        self._pos += len(data)
+        if len(self._magic) < len(_BINLOG_MAGIC):
+            self._magic += data[:len(_BINLOG_MAGIC) - len(self._magic)]
+            if not _BINLOG_MAGIC.startswith(self._magic):
+                # Not a (readable) binary log file, skip events.
+                self._next_event = float('inf')
+        while self._next_event < self._pos:
+            idx = max(int(self._next_event) - start, 0)
+            self._header += data[idx:idx + _EVENT_HEADER_LEN -
+                                 len(self._header)]
+            if len(self._header) < _EVENT_HEADER_LEN:
+                # Header continues in the next block.
+                break
+            timestamp, _, event_len = struct.unpack(
+                _EVENT_HEADER_FORMAT,
+                self._header[:_EVENT_HEADER_FORMAT_LEN])
+            self._header = ''
+            if event_len < _EVENT_HEADER_LEN:
+                # Invalid event, skip remaining events.
+                self._next_event = float('inf')
+                break
+            # Ignore events without timestamp (e.g., artificial events).
+            if timestamp:
+                if self.first_timestamp is None:
+                    self.first_timestamp = timestamp
+                self.last_timestamp = timestamp
+            self._next_event += event_len
+
+
+def _format_timestamp(timestamp):
+    """Format an event timestamp (UTC).
+
+    timestamp[in]   Timestamp (seconds since the epoch) or None.
+
+    Returns string with the formatted date and time or None.
+    """
+    if timestamp is None:
+        return None
+    return datetime.utcfromtimestamp(timestamp).strftime(_TIMESTAMP_FORMAT)
+
+
+def archive_binary_log_task(task):
+    """Compress a binary log file to the archive directory.
+
+    This method is designed to be used by a pool of processes (see
+    archive_binary_logs). The file is read in blocks of _ARCHIVE_BLOCK_SIZE
+    bytes and compressed (gzip) to a temporary file, which is flushed to
+    disk and verified (decompressed and compared with the size and checksum
+    of the original file) before being renamed to its final name. The
+    original file is not removed.
+
+    task[in]    Tuple with the path of the binary log file to archive and
+                the path of the compressed file to create.
+
+    Returns a tuple with the manifest entry for the archived file (None if
+    an error occurred) and the error message (None if no error).
+    """
+    source_file, archive_file = task
+    tmp_file = '{0}.tmp'.format(archive_file)
+    try:
+        checksum = hashlib.sha256()
+        scanner = _BinlogEventScanner()
+        size = 0
+        with open(source_file, 'rb') as f_in:
+            gz_file = gzip.open(tmp_file, 'wb')
+            try:
+                while True:
+                    data = f_in.read(_ARCHIVE_BLOCK_SIZE)
+                    if not data:
+                        break
+                    size += len(data)
+                    checksum.update(data)
+                    scanner.update(data)
+                    gz_file.write(data)
+            finally:
+                gz_file.close()
+        _fsync_file(tmp_file)
+
+        # Verify the compressed file.
+        verify_checksum = hashlib.sha256()
+        verify_size = 0
+        gz_file = gzip.open(tmp_file, 'rb')
+        try:
+            while True:
+                data = gz_file.read(_ARCHIVE_BLOCK_SIZE)
+                if not data:
+                    break
+                verify_size += len(data)
+                verify_checksum.update(data)
+        finally:
+            gz_file.close()
+        if (verify_size != size or
+                verify_checksum.hexdigest() != checksum.hexdigest()):
+            raise IOError(errno.EIO, "Verification of the compressed file "
+                                     "failed", tmp_file)
+        os.rename(tmp_file, archive_file)
+    except (IOError, OSError, zlib.error) as err:
+        if os.path.exists(tmp_file):
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        return None, _ERR_MSG_ARCHIVE_FILE.format(
+            filename=os.path.basename(source_file), error=err)
+
+    entry = {
+        'file': os.path.basename(source_file),
+        'archive': os.path.basename(archive_file),
+        'size': size,
+        'compressed_size': os.path.getsize(archive_file),
+        'sha256': checksum.hexdigest(),
+        'first_event': _format_timestamp(scanner.first_timestamp),
+        'last_event': _format_timestamp(scanner.last_timestamp),
+    }
+    return entry, None
+
+
+def archive_binary_logs(source, destination, filenames, log_index,
+                        processes=1):
+    """Archive a list of binary log files to a specific destination.
+
+    This method compresses the given binary log files, located in the source
+    directory, to the specified destination directory using a pool of
+    processes (see archive_binary_log_task). Once all compressed files are
+    verified, the manifest file in the destination directory
+    (ARCHIVE_MANIFEST) is appended with the size, checksum and first/last
+    event timestamps of each file, their entries are removed from the index
+    file (the server cannot read compressed files), and the original files
+    are removed. If any file cannot be archived or the index file cannot be
+    updated, the compressed files and the appended manifest entries are
+    removed keeping the index file unchanged, and an error is raised.
+
+    source[in]          Source directory where the binary log files are
+                        located.
+    destination[in]     Destination directory to archive the binary logs.
+    filenames[in]       List with the names of the binary log files to
+                        archive.
+    log_index[in]       Location (full path) of the binary log index file.
+    processes[in]       Number of processes used to compress the files.
+                        Special values: 0 (number of processes equal to the
+                        CPUs detected) and 1 (default - no concurrency).
+                        Concurrency is only used on POSIX systems.
+
+    Returns a list with the manifest entries of the archived files.
+    """
+    if not os.path.isdir(destination):
+        raise UtilError(_ERR_MSG_ARCHIVE_FILE.format(
+            filename=filenames[0] if filenames else '',
+            error=IOError(errno.ENOENT, "No such destination directory",
+                          destination)))
+    # Check files before archiving them.
+    tasks = []
+    for filename in filenames:
+        source_file = os.path.join(source, filename)
+        archive_file = os.path.join(destination,
+                                    filename + _ARCHIVE_SUFFIX)
+        error = None
+        if not os.path.isfile(source_file):
+            error = IOError(errno.ENOENT, "No such file", source_file)
+        elif os.path.exists(archive_file):
+            error = shutil.Error("Destination path '{0}' already "
+                                 "exists".format(archive_file))
+        if error:
+            raise UtilError(_ERR_MSG_ARCHIVE_FILE.format(filename=filename,
+                                                      error=error))
+        tasks.append((source_file, archive_file))
+
+    # Compress files.
+    if processes == 0:
+        processes = multiprocessing.cpu_count()
+    processes = min(processes, len(tasks))
+    if processes > 1 and os.name == 'posix':
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            results = list(pool.imap(archive_binary_log_task, tasks))
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+    else:
+        results = [archive_binary_log_task(task) for task in tasks]
+
+    entries = [entry for entry, _ in results if entry is not None]
+
+    def _remove_archives():
+        """Remove the created compressed files.
+        Returns a warning message indicating if the files were removed
+        successfully or not.
+        """
+        failed = []
+        for entry in entries:
+            try:
+                os.remove(os.path.join(destination, entry['archive']))
+            except OSError as undo_err:
+                failed.append("{0} ({1})".format(entry['archive'], undo_err))
+        if failed:
+            return ("\nWARNING: Failed to remove compressed files: "
+                    "{0}").format(", ".join(failed))
+        return "\nWARNING: File archive aborted."
+
+    errors = [errmsg for _, errmsg in results if errmsg is not None]
+    if errors:
+        raise UtilError("{0}{1}".format(errors[0], _remove_archives()))
+
+    # Append entries to the manifest before updating the index file, so
+    # that the archived files are always recorded.
+    manifest = os.path.join(destination, ARCHIVE_MANIFEST)
+    manifest_size = (os.path.getsize(manifest) if os.path.isfile(manifest)
+                     else 0)
+
+    def _restore_manifest():
+        """Discard the entries appended to the manifest file.
+        Returns a warning message if the manifest file could not be
+        restored, otherwise an empty string.
+        """
+        if not os.path.isfile(manifest):
+            return ""
+        try:
+            with open(manifest, 'r+') as f_manifest:
+                f_manifest.truncate(manifest_size)
+        except IOError as undo_err:
+            return ("\nWARNING: Failed to restore archive manifest file: "
+                    "{0}").format(undo_err)
+        return ""
+
+    try:
+        with open(manifest, 'a') as f_manifest:
+            for entry in entries:
+                f_manifest.write("{0}\n".format(json.dumps(entry,
+                                                           sort_keys=True)))
+            f_manifest.flush()
+            os.fsync(f_manifest.fileno())
+    except IOError as err:
+        raise UtilError("Unable to write archive manifest file: "
+                        "{0}{1}{2}".format(err, _restore_manifest(),
+                                           _remove_archives()))
+
+    # Remove archived files from the index file (once for all files).
+    try:
+        _rewrite_index_file(log_index, destination, filenames, remove=True)
+    except UtilError as err:
+        raise UtilError("{0}{1}{2}".format(err.errmsg, _restore_manifest(),
+                                           _remove_archives()))
+
+    # Remove source files (already archived and removed from the index).
+    for filename in filenames:
+        try:
+            os.remove(os.path.join(source, filename))
+        except OSError as err:
+            raise UtilError("Unable to remove archived binary file from "
+                            "source directory: {0}".format(err))
+    return entries
@@ -28,9 +28,10 @@ import sys
 from collections import deque
 
 from mysql.utilities.exception import UtilError, UtilDBError
+from mysql.utilities.common.lock import get_snapshot_server
 from mysql.utilities.common.pattern_matching import parse_object_name
 from mysql.utilities.common.options import obj2sql
-from mysql.utilities.common.server import connect_servers, Server
+from mysql.utilities.common.server import get_connection_pool, Server
 from mysql.utilities.common.user import User
 from mysql.utilities.common.sql_transform import (quote_with_backticks,
                                                   remove_backtick_quoting,
@@ -127,7 +128,6 @@ def _multiprocess_tbl_copy_task(copy_tbl_task):
                         'q_source_db': <quoted source database name>.
     """
     # Get input to execute task.
-    source_srv = copy_tbl_task.get('source_srv')
     dest_srv = copy_tbl_task.get('dest_srv')
     source_db = copy_tbl_task.get('source_db')
     target_db = copy_tbl_task.get('target_db')
@@ -138,6 +138,9 @@ def _multiprocess_tbl_copy_task(copy_tbl_task):
     # NOTE: Must handle any exception here, because worker processes will not
     # propagate them to the main process.
     try:
+        # Use the source server of the shared snapshot, if available.
+        source_srv = (get_snapshot_server() or
+                      copy_tbl_task.get('source_srv'))
         _copy_table_data(source_srv, dest_srv, source_db, target_db, table,
                          options, cloning)
     except UtilError:
@@ -171,42 +174,45 @@ def _copy_table_data(source_srv, destination_srv, db_name, new_db_name,
     from mysql.utilities.common.table import Table
     # Handle source and destination server instances or connection values.
     # Note: For multiprocessing the use of connection values instead of a
-    # server instance is required to avoid internal errors.
-    if isinstance(source_srv, Server):
-        source = source_srv
-    else:
-        # Get source server instance from connection values.
-        conn_options = {
-            'quiet': True,  # Avoid repeating output for multiprocessing.
-            'version': "5.1.30",
-        }
-        servers = connect_servers(source_srv, None, conn_options)
-        source = servers[0]
-    if isinstance(destination_srv, Server):
-        destination = destination_srv
-    else:
-        # Get source server instance from connection values.
-        conn_options = {
-            'quiet': True,  # Avoid repeating output for multiprocessing.
-            'version': "5.1.30",
-        }
-        servers = connect_servers(destination_srv, None, conn_options)
-        destination = servers[0]
-
-    # Copy table data.
-    if not tbl_options.get("quiet", False):
-        print("# Copying data for TABLE {0}.{1}".format(db_name,
-                                                        tbl_name))
-    source_sql_mode = source.select_variable("SQL_MODE")
-    q_tbl_name = "{0}.{1}".format(quote_with_backticks(db_name,
-                                                       source_sql_mode),
-                                  quote_with_backticks(tbl_name,
-                                                       source_sql_mode))
-    tbl = Table(source, q_tbl_name, tbl_options)
-    if tbl is None:
-        raise UtilDBError("Cannot create table object before copy.", -1,
-                          db_name)
-    tbl.copy_data(destination, cloning, new_db_name, connections)
+    # server instance is required to avoid internal errors. The connections
+    # are taken from the connection pools of the process, to be reused by
+    # the next tasks of worker processes.
+    pools = []
+    try:
+        if isinstance(source_srv, Server):
+            source = source_srv
+        else:
+            # Get source server instance from connection values.
+            src_pool = get_connection_pool(source_srv, {'version': "5.1.30"})
+            source = src_pool.get()
+            pools.append((src_pool, source))
+        if isinstance(destination_srv, Server):
+            destination = destination_srv
+        else:
+            # Get destination server instance from connection values.
+            dest_pool = get_connection_pool(destination_srv,
+                                            {'version': "5.1.30"})
+            destination = dest_pool.get()
+            pools.append((dest_pool, destination))
+
+        # Copy table data.
+        if not tbl_options.get("quiet", False):
+            print("# Copying data for TABLE {0}.{1}".format(db_name,
+                                                            tbl_name))
+        source_sql_mode = source.select_variable("SQL_MODE")
+        q_tbl_name = "{0}.{1}".format(quote_with_backticks(db_name,
+                                                           source_sql_mode),
+                                      quote_with_backticks(tbl_name,
+                                                           source_sql_mode))
+        tbl = Table(source, q_tbl_name, tbl_options)
+        if tbl is None:
+            raise UtilDBError("Cannot create table object before copy.", -1,
+                              db_name)
+        tbl.copy_data(destination, cloning, new_db_name, connections)
+    finally:
+        # Return the connections to the pools (also on errors).
+        for pool, server in pools:
+            pool.release(server)
 
 
 class Database(object):
@@ -957,7 +963,7 @@ class Database(object):
             self.__apply_constraints()
 
     def copy_data(self, new_db, options, new_server=None, connections=1,
-                  src_con_val=None, dest_con_val=None):
+                  src_con_val=None, dest_con_val=None, workers_pool=None):
         """Copy the data for the tables.
 
         This method will copy the data for all of the tables to another, new
@@ -969,10 +975,17 @@ class Database(object):
         new_server[in]      Connection to another server for copying the db
                             Default is None (copy to same server - clone)
         connections[in]     Number of threads(connections) to use for insert
+                            Note: Ignored for tables copied concurrently
+                            (multiprocess), since pool workers cannot create
+                            writer processes.
         src_con_val[in]     Dict. with the connection values of the source
                             server (required for multiprocessing).
         dest_con_val[in]    Dict. with the connection values of the
                             destination server (required for multiprocessing).
+        workers_pool[in]    Pool of processes sharing the snapshot of the
+                            source server (see SharedSnapshotLock) used to
+                            copy the tables concurrently. By default None,
+                            a new pool is created.
         """
 
         # Must call init() first!
@@ -1018,10 +1031,15 @@ class Database(object):
             else:
                 # Copy data from a table (no multiprocessing).
                 _copy_table_data(self.source, self.destination, self.db_name,
-                                 new_db, tblname, tbl_options, self.cloning)
+                                 new_db, tblname, tbl_options, self.cloning,
+                                 connections)
 
         # Copy tables concurrently.
-        if copy_tbl_tasks:
+        if copy_tbl_tasks and workers_pool:
+            # Use the pool of processes that share the snapshot (closed when
+            # the lock is released) and wait for all tasks to be completed.
+            workers_pool.map(_multiprocess_tbl_copy_task, copy_tbl_tasks)
+        elif copy_tbl_tasks:
             # Create process pool.
             workers_pool = multiprocessing.Pool(
                 processes=options['multiprocess']
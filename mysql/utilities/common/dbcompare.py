@@ -19,6 +19,7 @@
 This file contains the methods for checking consistency among two databases.
 """
 
+import binascii
 import re
 import tempfile
 import difflib
@@ -34,9 +35,11 @@ from mysql.utilities.common.lock import Lock
 from mysql.utilities.common.options import PARSE_ERR_OBJ_NAME_FORMAT
 from mysql.utilities.common.server import connect_servers
 from mysql.utilities.common.table import Table
-from mysql.utilities.common.sql_transform import (is_quoted_with_backticks,
+from mysql.utilities.common.sql_transform import (convert_special_characters,
+                                                  is_quoted_with_backticks,
                                                   quote_with_backticks,
                                                   remove_backtick_quoting,
+                                                  to_sql,
                                                   transform_data,
                                                   SQLTransformer)
 
@@ -97,13 +100,41 @@ _COMPARE_SUM = """
 # incorrect SQL diff statements (UPDATES).
 _COMPARE_DIFF = """
     SELECT * FROM {db}.{compare_tbl}
-    WHERE span = UNHEX('{span}') ORDER BY pk_hash
+    WHERE span IN ({span}) ORDER BY span, pk_hash
 """
 
 _COMPARE_SPAN_QUERY = """
     SELECT * FROM {db}.{table} WHERE {where}
 """
 
+# The following are the queries used by the chunk algorithm, which walks the
+# used index in ranges of rows (chunks) instead of using a compare table.
+DEFAULT_CHUNK_SIZE = 10000
+
+# Chunks with a different checksum are split in _CHUNK_SPLIT sub-chunks until
+# they have at most _CHUNK_LEAF_ROWS rows, whose checksums are then compared
+# row by row.
+_CHUNK_SPLIT = 10
+_CHUNK_LEAF_ROWS = 1000
+
+_COMPARE_CHUNK_BOUND = """
+    SELECT {pkstr} FROM {db}.{table}{where} ORDER BY {pkstr} LIMIT {offset}, 1
+"""
+
+_COMPARE_CHUNK_SUM = """
+    SELECT COUNT(*) as cnt,
+        CONCAT(SUM(CONV(SUBSTRING(MD5(CONCAT_WS('/', {colstr})),1,8),16,10)),
+        SUM(CONV(SUBSTRING(MD5(CONCAT_WS('/', {colstr})),9,8),16,10)),
+        SUM(CONV(SUBSTRING(MD5(CONCAT_WS('/', {colstr})),17,8),16,10)),
+        SUM(CONV(SUBSTRING(MD5(CONCAT_WS('/', {colstr})),25,8),16,10))) as sig
+    FROM {db}.{table}{where}
+"""
+
+_COMPARE_CHUNK_ROWS = """
+    SELECT {pkstr}, MD5(CONCAT_WS('/', {colstr}))
+    FROM {db}.{table}{where} ORDER BY {pkstr}
+"""
+
 _ERROR_NO_PRI_KEY = ("The table {tb} does not have an usable Index or "
                      "primary key.")
 
@@ -819,28 +850,23 @@ def _get_compare_objects(index_cols, table1,
     return (table, index_str)
 
 
-def _setup_compare(table1, table2, span_key_size, use_indexes=None):
-    """Create and populate the compare summary tables
+def _get_compare_indexes(table1, table2, use_indexes=None):
+    """Get the index (unique key) used to identify the rows of each table
 
-    This method creates the condensed hash table used to compare groups
-    (span) of records. It also creates the Table instance for each table
-    and populates values in the table information dictionary for use
-    in other methods.
-
-    The method also checks to ensure the tables have primary keys and that
-    the keys are the same (have the same columns). An error is raised if
-    neither of these are met.
+    This method checks to ensure the tables have a unique key without null
+    columns (or uses the ones specified by the user) and that the keys have
+    the same number of columns. An error is raised if neither of these are
+    met.
 
     table1[in]            table1 Table instance
     table2[in]            table2 Table instance
-    span_key_size[in]     the size of key used for the hash.
     use_indexes[in]       a tuple of the indexes names that can be used as
                           an unique key, (for_table_1, for_table_2), they will
                           be tested for columns that not accept null.
-    diag_msgs[out]       a list of debug and warning messages.
 
-    Returns four-tuple - string representations of the primary index columns,
-    the index_columns, the index name used and diagnostic messages.
+    Returns four-tuple - the index columns for table1 and table2 in the form
+    (column_name, type), the index name used for table1 and diagnostic
+    messages.
     """
 
     def get_column_names_types_for_index(index, table):
@@ -872,8 +898,6 @@ def _setup_compare(table1, table2, span_key_size, use_indexes=None):
         return indexs_found
 
     diag_msgs = []
-    server1 = table1.server
-    server2 = table2.server
 
     # get not nullable indexes for tables
     table1.get_indexes()
@@ -932,6 +956,39 @@ def _setup_compare(table1, table2, span_key_size, use_indexes=None):
     if len(table1_idx) != len(table2_idx):
         raise UtilError("Indexes are not the same.")
 
+    return (table1_idx, table2_idx, table1_idx_name, diag_msgs)
+
+
+def _setup_compare(table1, table2, span_key_size, use_indexes=None):
+    """Create and populate the compare summary tables
+
+    This method creates the condensed hash table used to compare groups
+    (span) of records. It also creates the Table instance for each table
+    and populates values in the table information dictionary for use
+    in other methods.
+
+    The method also checks to ensure the tables have primary keys and that
+    the keys are the same (have the same columns). An error is raised if
+    neither of these are met.
+
+    table1[in]            table1 Table instance
+    table2[in]            table2 Table instance
+    span_key_size[in]     the size of key used for the hash.
+    use_indexes[in]       a tuple of the indexes names that can be used as
+                          an unique key, (for_table_1, for_table_2), they will
+                          be tested for columns that not accept null.
+    diag_msgs[out]       a list of debug and warning messages.
+
+    Returns four-tuple - string representations of the primary index columns,
+    the index_columns, the index name used and diagnostic messages.
+    """
+    server1 = table1.server
+    server2 = table2.server
+
+    table1_idx, table2_idx, table1_idx_name, diag_msgs = (
+        _get_compare_indexes(table1, table2, use_indexes)
+    )
+
     # drop the temporary tables
     _drop_compare_object(server1, table1.db_name, table1.tbl_name)
     _drop_compare_object(server2, table2.db_name, table2.tbl_name)
@@ -1015,50 +1072,157 @@ def _make_sum_rows(table, idx_str, span_key_size=8):
     return res
 
 
-def _get_rows_span(table, span, index):
-    """Get the rows corresponding to a list of span values
+def _split_in_batches(values, max_size):
+    """Split a list of SQL values in batches of a maximum size.
 
-    This method returns the rows from the original table that match the
-    span value presented.
+    values[in]        list of strings (SQL values) to split
+    max_size[in]      maximum size of the values in each batch, including
+                      the separator (", ") used to join them
 
-    TODO: This may need refactoring to make it more efficient.
-          For example, use a WHERE clause such as:
-          WHERE some_col IN ('a','b')
+    Returns generator - lists of values
+    """
+    batch = []
+    batch_size = 0
+    for value in values:
+        value_size = len(value) + 2
+        if batch and batch_size + value_size > max_size:
+            yield batch
+            batch = []
+            batch_size = 0
+        batch.append(value)
+        batch_size += value_size
+    if batch:
+        yield batch
+
+
+def _get_span_rows(table, span):
+    """Get the rows of the compare table corresponding to a list of spans.
+
+    The rows are retrieved with a single query per batch of span values
+    (WHERE span IN (...)), the size of each batch is limited by the
+    max_allowed_packet.
 
     table[in]         Table instance
-    span[in]          span value
+    span[in]          list of span values
 
-    Returns rows from original table
+    Returns list - list of rows (ordered by pk_hash) of the compare table for
+                   each span value (in the same order of span)
+    """
+    # Quote compare table appropriately with backticks
+    q_tbl_name = quote_with_backticks(
+        _COMPARE_TABLE_NAME.format(tbl=table.tbl_name),
+        table.sql_mode
+    )
+    max_size = int(table.max_packet_size) - 1024
+    span_rows = {}
+    for batch in _split_in_batches(["UNHEX('{0}')".format(span_key)
+                                    for span_key in span], max_size):
+        res = table.server.exec_query(
+            _COMPARE_DIFF.format(db=table.q_db_name, compare_tbl=q_tbl_name,
+                                 span=", ".join(batch)))
+        for row in res:
+            span_key = binascii.hexlify(row[-1]).upper()
+            span_rows.setdefault(span_key, []).append(row)
+    return [span_rows.get(span_key.upper(), []) for span_key in span]
+
+
+def _get_original_rows(table, index, pks):
+    """Get the rows of the original table for a list of key values.
+
+    The rows are retrieved with a single query per batch of key values,
+    using WHERE (key cols) IN ((...), (...)) or, for servers where the
+    optimizer does not use the index for row constructors (before 5.7.3),
+    WHERE (...) OR (...). The size of each batch is limited by the
+    max_allowed_packet.
+
+    table[in]         Table instance
+    index[in]         used table index (unique key), list of columns in the
+                      form (column_name, type)
+    pks[in]           list of key values (tuples) to retrieve
+
+    Returns list - original rows for each key value (in the same order of
+                   pks)
     """
+    if not pks:
+        return []
     server = table.server
-    rows = []
     ukeys = [col[0] for col in index]
-    # build WHERE clause
-    for row in span:
-        # Quote compare table appropriately with backticks
-        q_tbl_name = quote_with_backticks(
-            _COMPARE_TABLE_NAME.format(tbl=table.tbl_name),
-            table.sql_mode
-        )
+    q_ukeys = [key if is_quoted_with_backticks(key, table.sql_mode)
+               else quote_with_backticks(key, table.sql_mode)
+               for key in ukeys]
+    col_names = table.get_col_names()
+    key_pos = [col_names.index(key) for key in ukeys]
+    use_row_constructor = server.check_version_compat(5, 7, 3)
+
+    # Build the SQL condition for each key value
+    conditions = []
+    for pk in pks:
+        values = ["'{0}'".format(convert_special_characters(col))
+                  for col in pk]
+        if len(values) == 1:
+            conditions.append(values[0])
+        elif use_row_constructor:
+            conditions.append("({0})".format(", ".join(values)))
+        else:
+            conditions.append("({0})".format(
+                " AND ".join("{0} = {1}".format(key, value)
+                             for key, value in zip(q_ukeys, values))))
+    if len(q_ukeys) == 1:
+        where_fmt = "{0} IN ({{0}})".format(q_ukeys[0])
+        join_str = ", "
+    elif use_row_constructor:
+        where_fmt = "({0}) IN ({{0}})".format(", ".join(q_ukeys))
+        join_str = ", "
+    else:
+        where_fmt = "{0}"
+        join_str = " OR "
+
+    max_size = int(table.max_packet_size) - 1024
+    orig_rows = {}
+    for batch in _split_in_batches(conditions, max_size):
+        res = server.exec_query(
+            _COMPARE_SPAN_QUERY.format(db=table.q_db_name,
+                                       table=table.q_tbl_name,
+                                       where=where_fmt.format(
+                                           join_str.join(batch))))
+        for row in res:
+            orig_rows[tuple(row[pos] for pos in key_pos)] = row
 
-        span_rows = server.exec_query(
-            _COMPARE_DIFF.format(db=table.q_db_name, compare_tbl=q_tbl_name,
-                                 span=row))
-        # Loop through multiple rows with the same span value.
-        for res_row in span_rows:
-            pk = res_row[2:-1]
-            where_clause = ' AND '.join("{0} = '{1}'".
-                                        format(key, col)
-                                        for key, col in zip(ukeys, pk))
-            orig_rows = server.exec_query(
+    rows = []
+    for pk in pks:
+        row = orig_rows.get(tuple(pk))
+        if row is None:
+            # Key value returned in a different form (e.g., case or trailing
+            # spaces for some collations), get the row on its own.
+            where_clause = ' AND '.join(
+                "{0} = '{1}'".format(key, convert_special_characters(col))
+                for key, col in zip(q_ukeys, pk))
+            row = server.exec_query(
                 _COMPARE_SPAN_QUERY.format(db=table.q_db_name,
                                            table=table.q_tbl_name,
-                                           where=where_clause))
-            rows.append(orig_rows[0])
-
+                                           where=where_clause))[0]
+        rows.append(row)
     return rows
 
 
+def _get_rows_span(table, span, index):
+    """Get the rows corresponding to a list of span values
+
+    This method returns the rows from the original table that match the
+    span value presented. The rows are retrieved in batches (see
+    _get_span_rows and _get_original_rows).
+
+    table[in]         Table instance
+    span[in]          span value
+    index[in]         used table index (unique key).
+
+    Returns rows from original table
+    """
+    pks = [res_row[2:-1] for span_rows in _get_span_rows(table, span)
+           for res_row in span_rows]
+    return _get_original_rows(table, index, pks)
+
+
 def _get_changed_rows_span(table1, table2, span, index):
     """Get the original changed rows corresponding to a list of span values.
 
@@ -1070,6 +1234,9 @@ def _get_changed_rows_span(table1, table2, span, index):
     original data. This separation is required in order to generate the
     appropriate SQL diff statement (UPDATE, INSERT, DELETE) later.
 
+    The span rows and the original rows are retrieved in batches (see
+    _get_span_rows and _get_original_rows).
+
     table1[in]      First table instance.
     table2[in]      Second table instance.
     span[in]        List of span keys.
@@ -1081,50 +1248,21 @@ def _get_changed_rows_span(table1, table2, span, index):
     of changed rows and the second the list of extra rows (compared to the
     other table).
     """
-    # Get all span rows for table 1.
-    server1 = table1.server
-    full_span_data_1 = []
-    for row in span:
-        # Quote compare table appropriately with backticks
-        q_tbl_name = quote_with_backticks(
-            _COMPARE_TABLE_NAME.format(tbl=table1.tbl_name),
-            table1.sql_mode
-        )
-
-        span_rows = server1.exec_query(
-            _COMPARE_DIFF.format(db=table1.q_db_name, compare_tbl=q_tbl_name,
-                                 span=row))
-        # Auxiliary set with (compare_sign, pk_hash) tuples for table.
-        cmp_signs = set([(row[0], row[1]) for row in span_rows])
-        # Keep span rows and auxiliary data for table 1.
-        full_span_data_1.append((span_rows, cmp_signs))
-
-    # Get all span rows for table 2.
-    server2 = table2.server
-    full_span_data_2 = []
-    for row in span:
-        # Quote compare table appropriately with backticks
-        q_tbl_name = quote_with_backticks(
-            _COMPARE_TABLE_NAME.format(tbl=table2.tbl_name),
-            table2.sql_mode
-        )
-
-        span_rows = server2.exec_query(
-            _COMPARE_DIFF.format(db=table2.q_db_name, compare_tbl=q_tbl_name,
-                                 span=row))
-        # Auxiliary set with (compare_sign, pk_hash) tuples for table.
-        cmp_signs = set([(row[0], row[1]) for row in span_rows])
-        # Keep span rows and auxiliary data for table 1.
-        full_span_data_2.append((span_rows, cmp_signs))
-
-    # List of key columns
-    ukeys = [col[0] for col in index]
+    # Get all span rows for table 1 and 2, with an auxiliary set with
+    # (compare_sign, pk_hash) tuples for each span.
+    full_span_data_1 = [
+        (span_rows, set([(row[0], row[1]) for row in span_rows]))
+        for span_rows in _get_span_rows(table1, span)
+    ]
+    full_span_data_2 = [
+        (span_rows, set([(row[0], row[1]) for row in span_rows]))
+        for span_rows in _get_span_rows(table2, span)
+    ]
 
-    # Get the original diff rows for tables 1 and 2.
-    changed_in1 = []
-    extra_in1 = []
-    changed_in2 = []
-    extra_in2 = []
+    # Identify the diff rows for tables 1 and 2, keeping the key value and
+    # if it is a changed row (True) or an extra row (False).
+    diff_keys1 = []
+    diff_keys2 = []
     for pos, span_data1 in enumerate(full_span_data_1):
         # Also get span data for table 2.
         # Note: specific span data is at the same position for both tables.
@@ -1136,57 +1274,228 @@ def _get_changed_rows_span(table1, table2, span, index):
         diff_pk_hash1 = set(cmp_sign[1] for cmp_sign in diff_rows_sign1)
         diff_pk_hash2 = set(cmp_sign[1] for cmp_sign in diff_rows_sign2)
 
-        # Get the original diff rows for tables 1.
-        for res_row in span_data1[0]:
-            # Skip row if not in previously identified changed rows set.
-            if (res_row[0], res_row[1]) in diff_rows_sign1:
-                # Execute query to get the original row.
-                pk = res_row[2:-1]
-                where_clause = ' AND '.join("{0} = '{1}'".
-                                            format(key, col)
-                                            for key, col in zip(ukeys, pk))
-                res = server1.exec_query(
-                    _COMPARE_SPAN_QUERY.format(db=table1.q_db_name,
-                                               table=table1.q_tbl_name,
-                                               where=where_clause))
-
-                # Determine if it is a changed or extra row.
-                # Check if the same pk_hash is found in table 2.
-                if res_row[1] in diff_pk_hash2:
-                    # Store original changed row (to UPDATE).
-                    changed_in1.append(res[0])
-                else:
-                    # Store original extra row (to DELETE).
-                    extra_in1.append(res[0])
-
-        # Get the original diff rows for table 2.
-        for res_row in span_data2[0]:
-            # Skip row if not in previously identified changed rows set.
-            if (res_row[0], res_row[1]) in diff_rows_sign2:
-                # Execute query to get the original row.
-                pk = res_row[2:-1]
-                where_clause = ' AND '.join("{0} = '{1}'".
-                                            format(key, col)
-                                            for key, col in zip(ukeys, pk))
-                res = server2.exec_query(
-                    _COMPARE_SPAN_QUERY.format(db=table2.q_db_name,
-                                               table=table2.q_tbl_name,
-                                               where=where_clause))
-
-                # Determine if it is a changed or extra row.
-                # Check if the same pk_hash is found in table 1.
-                if res_row[1] in diff_pk_hash1:
-                    # Store original changed row (to UPDATE).
-                    changed_in2.append(res[0])
-                else:
-                    # Store original extra row (to ADD).
-                    extra_in2.append(res[0])
+        # Skip rows not in previously identified changed rows set, and check
+        # if the same pk_hash is found in the other table (changed row).
+        diff_keys1.extend((res_row[2:-1], res_row[1] in diff_pk_hash2)
+                          for res_row in span_data1[0]
+                          if (res_row[0], res_row[1]) in diff_rows_sign1)
+        diff_keys2.extend((res_row[2:-1], res_row[1] in diff_pk_hash1)
+                          for res_row in span_data2[0]
+                          if (res_row[0], res_row[1]) in diff_rows_sign2)
+
+    # Get the original diff rows for tables 1 and 2, and determine if they
+    # are changed rows (to UPDATE) or extra rows (to DELETE or ADD).
+    changed_in1 = []
+    extra_in1 = []
+    changed_in2 = []
+    extra_in2 = []
+    orig_rows1 = _get_original_rows(table1, index,
+                                    [diff_key[0] for diff_key in diff_keys1])
+    for diff_key, orig_row in zip(diff_keys1, orig_rows1):
+        if diff_key[1]:
+            changed_in1.append(orig_row)
+        else:
+            extra_in1.append(orig_row)
+    orig_rows2 = _get_original_rows(table2, index,
+                                    [diff_key[0] for diff_key in diff_keys2])
+    for diff_key, orig_row in zip(diff_keys2, orig_rows2):
+        if diff_key[1]:
+            changed_in2.append(orig_row)
+        else:
+            extra_in2.append(orig_row)
 
     # Return a tuple with a tuple for each table, containing the changed and
     # extra original row for each table.
     return (changed_in1, extra_in1), (changed_in2, extra_in2)
 
 
+def _get_chunk_where(key_str, low, high):
+    """Get the WHERE clause to retrieve the rows of a chunk.
+
+    key_str[in]       string representation of the index columns, e.g.
+                      `a` or (`a`, `b`)
+    low[in]           lower bound (inclusive) of the chunk, as an SQL value,
+                      or None if the chunk has no lower bound
+    high[in]          upper bound (exclusive) of the chunk, as an SQL value,
+                      or None if the chunk has no upper bound
+
+    Returns string - WHERE clause (empty if the chunk has no bounds)
+    """
+    conditions = []
+    if low is not None:
+        conditions.append("{0} >= {1}".format(key_str, low))
+    if high is not None:
+        conditions.append("{0} < {1}".format(key_str, high))
+    if not conditions:
+        return ""
+    return " WHERE {0}".format(" AND ".join(conditions))
+
+
+def _get_chunk_key(table, index):
+    """Get the string representations of the index columns of a table.
+
+    table[in]         Table instance
+    index[in]         used table index (unique key), list of columns in the
+                      form (column_name, type)
+
+    Returns tuple - (list of columns, to be used in a SELECT, value to be
+                     compared with the chunk bounds)
+    """
+    q_cols = [quote_with_backticks(col[0], table.sql_mode) for col in index]
+    pk_str = ", ".join(q_cols)
+    key_str = q_cols[0] if len(q_cols) == 1 else "({0})".format(pk_str)
+    return pk_str, key_str
+
+
+def _get_chunk_bounds(table, index, chunk_size, low=None, high=None):
+    """Get the bounds that split a range of the index in chunks.
+
+    The index is walked reading only chunk_size index entries to find each
+    bound, i.e., the key value at the start of each chunk.
+
+    table[in]         Table instance
+    index[in]         used table index (unique key)
+    chunk_size[in]    number of rows for each chunk
+    low[in]           lower bound (inclusive) of the range to split
+    high[in]          upper bound (exclusive) of the range to split
+
+    Returns list - bounds (SQL values) in key order, excluding low and high
+    """
+    pk_str, key_str = _get_chunk_key(table, index)
+    bounds = []
+    where = _get_chunk_where(key_str, low, high)
+    while True:
+        res = table.server.exec_query(
+            _COMPARE_CHUNK_BOUND.format(pkstr=pk_str, db=table.q_db_name,
+                                        table=table.q_tbl_name, where=where,
+                                        offset=chunk_size))
+        if not res:
+            break
+        values = [to_sql(val) for val in res[0]]
+        bound = values[0] if len(values) == 1 else \
+            "({0})".format(", ".join(values))
+        bounds.append(bound)
+        where = _get_chunk_where(key_str, bound, high)
+    return bounds
+
+
+def _get_chunk_checksum(table, index, low, high):
+    """Get the number of rows and the checksum of a chunk.
+
+    The checksum is the sum of the MD5 hash of each row (broken into four
+    parts), computed by the server with a single query for the chunk.
+
+    table[in]         Table instance
+    index[in]         used table index (unique key)
+    low[in]           lower bound (inclusive) of the chunk
+    high[in]          upper bound (exclusive) of the chunk
+
+    Returns tuple - (number of rows, checksum)
+    """
+    _, key_str = _get_chunk_key(table, index)
+    col_str = ", ".join(table.get_col_names(True))
+    res = table.server.exec_query(
+        _COMPARE_CHUNK_SUM.format(colstr=col_str, db=table.q_db_name,
+                                  table=table.q_tbl_name,
+                                  where=_get_chunk_where(key_str, low, high)))
+    return int(res[0][0]), res[0][1]
+
+
+def _get_chunk_row_diffs(table1, table2, index1, index2, low, high,
+                         diff_keys):
+    """Find the different rows of a chunk.
+
+    The key values and the MD5 hash of each row of the chunk are retrieved
+    from both tables and compared to identify the changed rows (same key
+    but different hash) and the extra rows of each table.
+
+    table1[in]        First table instance.
+    table2[in]        Second table instance.
+    index1[in]        Used index (unique key) of table1.
+    index2[in]        Used index (unique key) of table2.
+    low[in]           lower bound (inclusive) of the chunk
+    high[in]          upper bound (exclusive) of the chunk
+    diff_keys[out]    tuple with the lists of key values of the changed rows,
+                      the extra rows in table1 and the extra rows in table2
+                      (each found key value is appended to the right list).
+    """
+    chunk_rows = []
+    for table, index in ((table1, index1), (table2, index2)):
+        pk_str, key_str = _get_chunk_key(table, index)
+        col_str = ", ".join(table.get_col_names(True))
+        chunk_rows.append(table.server.exec_query(
+            _COMPARE_CHUNK_ROWS.format(pkstr=pk_str, colstr=col_str,
+                                       db=table.q_db_name,
+                                       table=table.q_tbl_name,
+                                       where=_get_chunk_where(key_str, low,
+                                                              high))))
+    rows1, rows2 = chunk_rows
+    changed_keys, extra1_keys, extra2_keys = diff_keys
+    hashes1 = dict((tuple(row[:-1]), row[-1]) for row in rows1)
+    hashes2 = dict((tuple(row[:-1]), row[-1]) for row in rows2)
+    for row in rows1:
+        key = tuple(row[:-1])
+        row_hash = hashes2.get(key)
+        if row_hash is None:
+            extra1_keys.append(key)
+        elif row_hash != row[-1]:
+            changed_keys.append(key)
+    extra2_keys.extend(tuple(row[:-1]) for row in rows2
+                       if tuple(row[:-1]) not in hashes1)
+
+
+def _find_chunk_diffs(table1, table2, index1, index2, chunk_size,
+                      low=None, high=None, diff_keys=None):
+    """Find the different rows of two tables comparing chunk checksums.
+
+    This method splits the given range of the index in chunks (using the
+    table with more rows in the range) and compares the checksum of each
+    chunk between both tables. Only the chunks with a different checksum are
+    split again (recursively), until they are small enough to be compared
+    row by row (see _get_chunk_row_diffs).
+
+    table1[in]        First table instance.
+    table2[in]        Second table instance.
+    index1[in]        Used index (unique key) of table1.
+    index2[in]        Used index (unique key) of table2.
+    chunk_size[in]    number of rows for each chunk
+    low[in]           lower bound (inclusive) of the range to compare
+                      Default = None (no lower bound)
+    high[in]          upper bound (exclusive) of the range to compare
+                      Default = None (no upper bound)
+    diff_keys[out]    tuple with the lists of key values of the changed rows,
+                      the extra rows in table1 and the extra rows in table2
+
+    Returns tuple - diff_keys
+    """
+    if diff_keys is None:
+        diff_keys = ([], [], [])
+    bounds = _get_chunk_bounds(table1, index1, chunk_size, low, high)
+    for chunk_low, chunk_high in zip([low] + bounds, bounds + [high]):
+        cnt1, sig1 = _get_chunk_checksum(table1, index1, chunk_low,
+                                         chunk_high)
+        cnt2, sig2 = _get_chunk_checksum(table2, index2, chunk_low,
+                                         chunk_high)
+        if cnt1 == cnt2 and sig1 == sig2:
+            continue
+        rows = max(cnt1, cnt2)
+        if rows <= _CHUNK_LEAF_ROWS:
+            _get_chunk_row_diffs(table1, table2, index1, index2, chunk_low,
+                                 chunk_high, diff_keys)
+        elif cnt1 >= cnt2:
+            _find_chunk_diffs(table1, table2, index1, index2,
+                              max(rows // _CHUNK_SPLIT, _CHUNK_LEAF_ROWS),
+                              chunk_low, chunk_high, diff_keys)
+        else:
+            # Split the chunk using the table with more rows, swapping the
+            # tables (and the found extra rows).
+            swapped_keys = (diff_keys[0], diff_keys[2], diff_keys[1])
+            _find_chunk_diffs(table2, table1, index2, index1,
+                              max(rows // _CHUNK_SPLIT, _CHUNK_LEAF_ROWS),
+                              chunk_low, chunk_high, swapped_keys)
+    return diff_keys
+
+
 def _get_formatted_rows(rows, table, fmt='GRID', col_widths=None):
     """Get a printable representation of the data rows
 
@@ -1220,22 +1529,22 @@ def _get_formatted_rows(rows, table, fmt='GRID', col_widths=None):
     return result_rows
 
 
-def _generate_data_diff_output(diff_data, table1, table2, used_index, options):
-    """Generates the data difference output.
+def _get_data_diff_output(changed_rows, extra1_rows, extra2_rows, table1,
+                          table2, options):
+    """Get the data difference output for the given rows.
 
-    This function generates the output data for the found data differences
-    between two tables, according to the provided options (difftype and
-    format).
+    This function formats the original rows found to be different between
+    two tables, according to the provided options (difftype and format).
 
-    diff_data[in]   Tuple with three elements containing the data differences
-                    between two tables. The first element contains the rows on
-                    both tables but with different values, the second contains
-                    the rows found in table1 but not in table2, and the third
-                    contains the rows found in table2 but not in table1.
-    table1[in]      First compared table (source).
-    table2[in]      Second compared table (target).
-    used_index[in]  Index (key) used to identify rows.
-    options[in]     Dictionary of option (format, difftype, compact, etc.).
+    changed_rows[in] None or a tuple with an element for each table,
+                     containing at its turn a tuple with the list of changed
+                     rows and the list of extra rows for that table (see
+                     _get_changed_rows_span).
+    extra1_rows[in]  List of rows found in table1 but not in table2.
+    extra2_rows[in]  List of rows found in table2 but not in table1.
+    table1[in]       First compared table (source).
+    table2[in]       Second compared table (target).
+    options[in]      Dictionary of option (format, difftype, compact, etc.).
 
     Return a list of difference (strings) generated according to the
     specified options.
@@ -1245,7 +1554,6 @@ def _generate_data_diff_output(diff_data, table1, table2, used_index, options):
     compact_diff = options.get("compact", False)
     table1_name = table1.q_table
     table2_name = table2.q_table
-    changed_rows, extra1, extra2 = diff_data
     data_diffs = []
 
     def get_max_cols(tbl1_rows, tbl2_rows):
@@ -1279,14 +1587,9 @@ def _generate_data_diff_output(diff_data, table1, table2, used_index, options):
                 max_cols.append(t2_cols[i])
         return max_cols
 
-    if len(changed_rows) > 0:
+    if changed_rows:
         data_diffs.append("# Data differences found among rows:")
-        # Get original changed/extra rows for each table within the given
-        # span set 'changed_rows' (excluding unchanged rows).
-        # Note: each span can refer to multiple rows.
-        tbl1_rows, tbl2_rows = _get_changed_rows_span(table1, table2,
-                                                      changed_rows,
-                                                      used_index)
+        tbl1_rows, tbl2_rows = changed_rows
 
         if difftype == 'sql':
             # Compute SQL diff for changed rows.
@@ -1318,33 +1621,150 @@ def _generate_data_diff_output(diff_data, table1, table2, used_index, options):
             if len(diff_str) > 0:
                 data_diffs.extend(diff_str)
 
-    if len(extra1) > 0:
+    if extra1_rows:
         # Compute diff for extra rows in table 1.
-        rows = _get_rows_span(table1, extra1, used_index)
         if difftype == 'sql':
             data_diffs.extend(transform_data(table1, table2,
-                                             "DELETE", rows))
+                                             "DELETE", extra1_rows))
         else:
             data_diffs.append("\n# Rows in {0} not in {1}"
                               "".format(table1_name, table2_name))
-            res = _get_formatted_rows(rows, table1, fmt)
+            res = _get_formatted_rows(extra1_rows, table1, fmt)
             data_diffs.extend(res)
 
-    if len(extra2) > 0:
+    if extra2_rows:
         # Compute diff for extra rows in table 2.
-        rows = _get_rows_span(table2, extra2, used_index)
         if difftype == 'sql':
             data_diffs.extend(transform_data(table1, table2,
-                                             "INSERT", rows))
+                                             "INSERT", extra2_rows))
         else:
             data_diffs.append("\n# Rows in {0} not in {1}"
                               "".format(table2_name, table1_name))
-            res = _get_formatted_rows(rows, table2, fmt)
+            res = _get_formatted_rows(extra2_rows, table2, fmt)
             data_diffs.extend(res)
 
     return data_diffs
 
 
+def _generate_data_diff_output(diff_data, table1, table2, used_index, options):
+    """Generates the data difference output.
+
+    This function generates the output data for the found data differences
+    between two tables, according to the provided options (difftype and
+    format).
+
+    diff_data[in]   Tuple with three elements containing the data differences
+                    between two tables. The first element contains the rows on
+                    both tables but with different values, the second contains
+                    the rows found in table1 but not in table2, and the third
+                    contains the rows found in table2 but not in table1.
+    table1[in]      First compared table (source).
+    table2[in]      Second compared table (target).
+    used_index[in]  Index (key) used to identify rows.
+    options[in]     Dictionary of option (format, difftype, compact, etc.).
+
+    Return a list of difference (strings) generated according to the
+    specified options.
+    """
+    changed_rows, extra1, extra2 = diff_data
+
+    # Get original changed/extra rows for each table within the given
+    # span set 'changed_rows' (excluding unchanged rows).
+    # Note: each span can refer to multiple rows.
+    changed_orig_rows = None
+    if len(changed_rows) > 0:
+        changed_orig_rows = _get_changed_rows_span(table1, table2,
+                                                   changed_rows, used_index)
+    extra1_rows = None
+    if len(extra1) > 0:
+        extra1_rows = _get_rows_span(table1, extra1, used_index)
+    extra2_rows = None
+    if len(extra2) > 0:
+        extra2_rows = _get_rows_span(table2, extra2, used_index)
+
+    return _get_data_diff_output(changed_orig_rows, extra1_rows, extra2_rows,
+                                 table1, table2, options)
+
+
+def _check_consistency_chunks(table1, table2, use_indexes, options,
+                              diag_msgs=None, reporter=None):
+    """Check the data consistency of two tables comparing chunk checksums
+
+    This method implements the chunk algorithm of check_consistency. Instead
+    of populating a compare table for each table (holding a lock on the
+    original table), the used index is walked in ranges of rows (chunks) and
+    the checksum of each chunk is computed by the server with a single query.
+    The chunk checksums are compared between both tables and only the chunks
+    that differ are split again, until they are small enough to compare the
+    hash of each row (see _find_chunk_diffs). No temporary tables are created
+    and no data is written, thus the binary log does not need to be turned
+    off.
+
+    table1[in]        First table instance.
+    table2[in]        Second table instance.
+    use_indexes[in]   a tuple of the indexes names that can be used as an
+                      unique key, (for_table_1, for_table_2).
+    options[in]       dictionary of options for the operation (see
+                      check_consistency) including:
+                        'chunk_size': number of rows for each chunk
+    diag_msgs[out]    a list of diagnostic and warning messages.
+    reporter[in]      Instance of the database compare reporter class.
+
+    Returns a tuple with the list of differences for server1 and/or server2
+            according to the specified direction. If the data is consistent
+            then the tuple (None, None) is returned.
+    """
+    chunk_size = options.get('chunk_size', DEFAULT_CHUNK_SIZE)
+    direction = options.get('changes-for', 'server1')
+    reverse = options.get('reverse', False)
+
+    if reporter:
+        reporter.report_object("", "- Find row differences")
+        reporter.report_state("")
+        reporter.report_state("")
+
+    table1_idx, table2_idx, table1_idx_name, msgs = (
+        _get_compare_indexes(table1, table2, use_indexes)
+    )
+
+    # Add warnings to print them later.
+    if diag_msgs is not None and isinstance(diag_msgs, list):
+        diag_msgs.extend(msgs)
+        diag_msgs.append("# INFO: for table {0} the index {1} is used to "
+                         "compare.".format(table1.tbl_name, table1_idx_name))
+
+    changed_keys, extra1_keys, extra2_keys = _find_chunk_diffs(
+        table1, table2, table1_idx, table2_idx, chunk_size)
+
+    data_diffs1 = None
+    data_diffs2 = None
+    if changed_keys or extra1_keys or extra2_keys:
+        # Get the original rows for each table.
+        changed1 = _get_original_rows(table1, table1_idx, changed_keys)
+        changed2 = _get_original_rows(table2, table2_idx, changed_keys)
+        extra1 = _get_original_rows(table1, table1_idx, extra1_keys)
+        extra2 = _get_original_rows(table2, table2_idx, extra2_keys)
+
+        # Generate data differences output according to direction.
+        changed_rows = ((changed1, []), (changed2, [])) if changed_keys \
+            else None
+        if direction == 'server1' or reverse:
+            data_diffs1 = _get_data_diff_output(changed_rows, extra1, extra2,
+                                                table1, table2, options)
+        if direction == 'server2' or reverse:
+            if changed_rows:
+                changed_rows = (changed_rows[1], changed_rows[0])
+            data_diffs2 = _get_data_diff_output(changed_rows, extra2, extra1,
+                                                table2, table1, options)
+
+    if reporter:
+        if data_diffs1 or data_diffs2:
+            reporter.report_state('FAIL')
+        else:
+            reporter.report_state('pass')
+    return data_diffs1, data_diffs2
+
+
 def check_consistency(server1, server2, table1_name, table2_name,
                       options=None, diag_msgs=None, reporter=None):
     """Check the data consistency of two tables
@@ -1428,6 +1848,10 @@ def check_consistency(server1, server2, table1_name, table2_name,
                         'format'    : format for output of missing rows
                         'difftype'  : type of difference to show
                         'unique_key': column name for pseudo-key
+                        'algorithm' : algorithm used to find the row
+                                      differences, 'span' (described
+                                      above) or 'chunk' (see
+                                      _check_consistency_chunks)
     diag_msgs[out]    a list of diagnostic and warning messages.
     reporter[in]      Instance of the database compare reporter class.
 
@@ -1499,6 +1923,11 @@ def check_consistency(server1, server2, table1_name, table2_name,
              in unq_use_indexes if table2.tbl_name == tb_name]
         )
 
+    if options.get('algorithm', 'span') == 'chunk':
+        return _check_consistency_chunks(
+            table1, table2, (table1_use_indexes, table2_use_indexes),
+            options, diag_msgs, reporter)
+
     if options.get('toggle_binlog', 'False'):
         binlog_server1 = server1.binlog_enabled()
         if binlog_server1:
@@ -243,10 +243,15 @@ def format_vertical_list(f_out, columns, rows, options=None):
     rows[in]           list of rows to print
     options[in]        options controlling list:
         none_to_null   if True converts None values to NULL
+        start_row      number of rows already written, used to continue
+                       the row numbering (default is 0)
+        print_footer   if False, do not print the number of rows
     """
     if options is None:
         options = {}
     none_to_null = options.get("none_to_null", False)
+    start_row = options.get("start_row", 0)
+    print_footer = options.get("print_footer", True)
 
     # do nothing if no rows.
     if len(rows) == 0:
@@ -259,7 +264,7 @@ def format_vertical_list(f_out, columns, rows, options=None):
             max_colwidth = len(col) + 1
 
     stop = len(columns)
-    row_num = 0
+    row_num = start_row
     for row in rows:
         row_num += 1
         f_out.write('{0:{0}<{1}}{2:{3}>{4}}. row {0:{0}<{1}}\n'.format("*", 25,
@@ -276,7 +281,7 @@ def format_vertical_list(f_out, columns, rows, options=None):
             out = u"{0:>{1}}: {2}\n".format(col, max_colwidth, val)
             f_out.write(out.encode("utf-8"))
 
-    if row_num > 0:
+    if print_footer and row_num > 0:
         row_str = 'rows' if row_num > 1 else 'row'
         f_out.write("{0} {1}.\n".format(row_num, row_str))
 
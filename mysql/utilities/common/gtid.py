@@ -19,6 +19,282 @@
 This module contains function to manipulate GTIDs.
 """
 
+from mysql.utilities.exception import UtilError
+
+
+def _parse_intervals(uuid_set):
+    """Parse the intervals of the GTID set of a single UUID.
+
+    uuid_set[in]    GTID set of a UUID, e.g. 'uuid:1-5:7'
+
+    Returns tuple - (UUID in lower case, list of (start, end) tuples)
+    """
+    elements = uuid_set.split(':')
+    intervals = []
+    try:
+        for interval in elements[1:]:
+            values = interval.split('-')
+            if len(values) > 2:
+                raise ValueError
+            start, end = int(values[0]), int(values[-1])
+            if start > end:
+                raise ValueError
+            intervals.append((start, end))
+    except ValueError:
+        raise UtilError("Invalid GTID set: '{0}'".format(uuid_set))
+    return elements[0].strip().lower(), intervals
+
+
+def _merge_intervals(intervals):
+    """Merge the intersecting and consecutive intervals.
+
+    intervals[in]   list of (start, end) tuples sorted by start
+
+    Returns list of (start, end) tuples - disjoint and not consecutive
+    intervals, in ascending order
+    """
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1] + 1:
+            # Interval intersects or is consecutive to the last one.
+            if merged[-1][1] < end:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _intersect_intervals(intervals_a, intervals_b):
+    """Compute the intersection of two lists of normalized intervals.
+
+    Returns list of (start, end) tuples
+    """
+    result = []
+    i = j = 0
+    while i < len(intervals_a) and j < len(intervals_b):
+        start = max(intervals_a[i][0], intervals_b[j][0])
+        end = min(intervals_a[i][1], intervals_b[j][1])
+        if start <= end:
+            result.append((start, end))
+        # Advance the interval that ends first.
+        if intervals_a[i][1] < intervals_b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+def _subtract_intervals(intervals_a, intervals_b):
+    """Compute the difference of two lists of normalized intervals.
+
+    Returns list of (start, end) tuples - intervals of A not in B
+    """
+    result = []
+    j = 0
+    for start, end in intervals_a:
+        # Skip the intervals of B before the current interval.
+        while j < len(intervals_b) and intervals_b[j][1] < start:
+            j += 1
+        k = j
+        while k < len(intervals_b) and intervals_b[k][0] <= end:
+            if start < intervals_b[k][0]:
+                result.append((start, intervals_b[k][0] - 1))
+            start = max(start, intervals_b[k][1] + 1)
+            k += 1
+        if start <= end:
+            result.append((start, end))
+    return result
+
+
+class GtidSet(object):
+    """GTID set stored as a list of intervals for each UUID.
+
+    The intervals of each UUID are kept normalized (sorted, disjoint and not
+    consecutive), so that the set operations are computed merging the
+    intervals in linear time on the number of intervals, regardless of the
+    number of transactions in the set. UUIDs are kept in lower case (they
+    are case insensitive).
+
+    Sets support the operators | (union), & (intersection), - (difference),
+    <= (subset), == and in (for GTIDs in the 'uuid:number' format), and are
+    converted to the normalized GTID set format by str().
+    """
+
+    def __init__(self, gtid_set=None):
+        """Constructor
+
+        gtid_set[in]    GTID set string (not necessarily normalized, i.e.,
+                        with unordered and repeated UUIDs and intervals),
+                        GtidSet instance to copy or None for an empty set.
+        """
+        self._intervals = {}
+        if isinstance(gtid_set, GtidSet):
+            self._intervals = dict(gtid_set._intervals)
+        elif gtid_set:
+            unmerged = {}
+            for uuid_set in gtid_set.split(','):
+                uuid_set = uuid_set.strip()
+                if not uuid_set:
+                    continue
+                uuid, intervals = _parse_intervals(uuid_set)
+                unmerged.setdefault(uuid, []).extend(intervals)
+            for uuid, intervals in unmerged.iteritems():
+                if intervals:
+                    self._intervals[uuid] = _merge_intervals(
+                        sorted(intervals))
+
+    @classmethod
+    def _from_intervals(cls, intervals_dict):
+        """Create a set from a dictionary of normalized intervals.
+        """
+        gtid_set = cls()
+        gtid_set._intervals = dict((uuid, intervals) for uuid, intervals
+                                   in intervals_dict.iteritems() if intervals)
+        return gtid_set
+
+    def uuids(self):
+        """Get the UUIDs of the set.
+
+        Returns list - UUIDs (lower case) sorted alphabetically
+        """
+        return sorted(self._intervals)
+
+    def intervals(self, uuid):
+        """Get the intervals of the given UUID.
+
+        uuid[in]        server UUID
+
+        Returns list of (start, end) tuples - normalized intervals (empty if
+        the UUID is not in the set)
+        """
+        return list(self._intervals.get(uuid.lower(), []))
+
+    def cardinality(self):
+        """Get the number of transactions of the set.
+        """
+        return sum(end - start + 1
+                   for intervals in self._intervals.itervalues()
+                   for start, end in intervals)
+
+    def union(self, other):
+        """Compute the union with another set.
+
+        other[in]       GtidSet or GTID set string
+
+        Returns GtidSet - new set
+        """
+        other = _as_gtid_set(other)
+        result = dict(self._intervals)
+        for uuid, intervals in other._intervals.iteritems():
+            if uuid in result:
+                result[uuid] = _merge_intervals(
+                    sorted(result[uuid] + intervals))
+            else:
+                result[uuid] = intervals
+        return GtidSet._from_intervals(result)
+
+    def intersection(self, other):
+        """Compute the intersection with another set.
+
+        other[in]       GtidSet or GTID set string
+
+        Returns GtidSet - new set
+        """
+        other = _as_gtid_set(other)
+        return GtidSet._from_intervals(dict(
+            (uuid, _intersect_intervals(intervals, other._intervals[uuid]))
+            for uuid, intervals in self._intervals.iteritems()
+            if uuid in other._intervals))
+
+    def difference(self, other):
+        """Compute the difference with another set (transactions not in it).
+
+        other[in]       GtidSet or GTID set string
+
+        Returns GtidSet - new set
+        """
+        other = _as_gtid_set(other)
+        return GtidSet._from_intervals(dict(
+            (uuid, _subtract_intervals(intervals,
+                                       other._intervals.get(uuid, [])))
+            for uuid, intervals in self._intervals.iteritems()))
+
+    def issubset(self, other):
+        """Check if all the transactions of the set are in another set.
+
+        other[in]       GtidSet or GTID set string
+
+        Returns bool
+        """
+        return not self.difference(other)
+
+    def __contains__(self, gtid):
+        """Check if a GTID ('uuid:number') or a GTID set is in the set.
+        """
+        if isinstance(gtid, GtidSet):
+            return gtid.issubset(self)
+        uuid, _, trx_num = gtid.rpartition(':')
+        try:
+            trx_num = int(trx_num)
+        except ValueError:
+            raise UtilError("Invalid GTID: '{0}'".format(gtid))
+        for start, end in self._intervals.get(uuid.strip().lower(), []):
+            if trx_num < start:
+                break
+            if trx_num <= end:
+                return True
+        return False
+
+    def __iter__(self):
+        """Iterate over the transactions of the set.
+
+        The transactions are generated lazily, in order, as (UUID,
+        transaction number) tuples.
+        """
+        for uuid in self.uuids():
+            for start, end in self._intervals[uuid]:
+                for trx_num in xrange(start, end + 1):
+                    yield uuid, trx_num
+
+    def __len__(self):
+        return self.cardinality()
+
+    def __nonzero__(self):
+        return bool(self._intervals)
+
+    def __eq__(self, other):
+        if not isinstance(other, GtidSet):
+            return NotImplemented
+        return self._intervals == other._intervals
+
+    def __ne__(self, other):
+        if not isinstance(other, GtidSet):
+            return NotImplemented
+        return self._intervals != other._intervals
+
+    def __str__(self):
+        return ','.join(
+            "{0}:{1}".format(uuid, ':'.join(
+                str(start) if start == end else "{0}-{1}".format(start, end)
+                for start, end in self._intervals[uuid]))
+            for uuid in self.uuids())
+
+    def __repr__(self):
+        return "GtidSet({0!r})".format(str(self))
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __le__ = issubset
+
+
+def _as_gtid_set(gtid_set):
+    """Get the given GTID set (string or GtidSet) as a GtidSet.
+    """
+    if isinstance(gtid_set, GtidSet):
+        return gtid_set
+    return GtidSet(gtid_set)
+
 
 def get_last_server_gtid(gtid_set, server_uuid):
     """Get the last GTID of the specified GTID set for the given server UUID.
@@ -65,18 +341,7 @@ def gtid_set_cardinality(gtid_set):
 
     Returns the number of elements of the specified GTID set.
     """
-    count = 0
-    uuid_sets = gtid_set.split(',')
-    for uuid_set in uuid_sets:
-        intervals = uuid_set.strip().split(':')[1:]
-        for interval in intervals:
-            try:
-                start_val, end_val = interval.split('-')
-                count = count + int(end_val) - int(start_val) + 1
-            except ValueError:
-                # Error raised for single values (not an interval).
-                count += 1
-    return count
+    return GtidSet(gtid_set).cardinality()
 
 
 def gtid_set_union(gtid_set_a, gtid_set_b):
@@ -95,72 +360,7 @@ def gtid_set_union(gtid_set_a, gtid_set_b):
     Returns a string with the result of the set union operation between the
     two given GTID sets.
     """
-    def get_gtid_dict(gtid_a, gtid_b):
-        """Get a dict representation of the specified GTID sets.
-
-        Combine the given GTID sets into a single dict structure, removing
-        duplicated UUIDs and string intervals.
-
-        Return a dictionary (not normalized) with the GTIDs contained in both
-        input GTID sets. For example, for the given (not normalized) GTID sets
-        'uuid_a:2:5-7,uuid_b:4' and 'uuid_a:2:4-6:2,uuid_b:1-3' the follow dict
-        will be returned:
-        {'uuid_a': set(['2', '5-7', '4-6']), 'uuid_b': set(['4','1-3'])}
-        """
-        res_dict = {}
-        uuid_sets_a = gtid_a.split(',')
-        uuid_sets_b = gtid_b.split(',')
-        uuid_sets = uuid_sets_a + uuid_sets_b
-        for uuid_set in uuid_sets:
-            uuid_set_values = uuid_set.split(':')
-            uuid_key = uuid_set_values[0]
-            if uuid_key in res_dict:
-                res_dict[uuid_key] = \
-                    res_dict[uuid_key].union(uuid_set_values[1:])
-            else:
-                res_dict[uuid_key] = set(uuid_set_values[1:])
-        return res_dict
-
-    # Create auxiliary dict representation of both input GTID sets.
-    gtid_dict = get_gtid_dict(gtid_set_a, gtid_set_b)
-
-    # Perform the union between the GTID sets.
-    union_gtid_list = []
-    for uuid in gtid_dict:
-        intervals = gtid_dict[uuid]
-        # Convert the set of string intervals into a single list of tuples
-        # with integers, in order to be handled easily.
-        intervals_list = []
-        for values in intervals:
-            interval = values.split('-')
-            intervals_list.append((int(interval[0]), int(interval[-1])))
-        # Compute the union of the tuples (intervals).
-        union_set = []
-        for start, end in sorted(intervals_list):
-            # Note: no interval start before the next one (ordered list).
-            if union_set and start <= union_set[-1][1] + 1:
-                # Current interval intersects or is consecutive to the last
-                # one in the results.
-                if union_set[-1][1] < end:
-                    # If the end of the interval is greater than the last one
-                    # then augment it (set the new end), otherwise do nothing
-                    # (meaning the interval is fully included in the last one).
-                    union_set[-1] = (union_set[-1][0], end)
-            else:
-                # No interval in the results or the interval does not intersect
-                # nor is consecutive to the last one, then add it to the end of
-                # the results list.
-                union_set.append((start, end))
-        # Convert resulting union set to a valid string format.
-        union_str = ":".join(
-            ["{0}-{1}".format(vals[0], vals[1])
-             if vals[0] != vals[1] else str(vals[0]) for vals in union_set]
-        )
-        # Concatenate UUID and add the to the result list.
-        union_gtid_list.append("{0}:{1}".format(uuid, union_str))
-
-    # GTID sets are sorted alphabetically, return the result accordingly.
-    return ','.join(sorted(union_gtid_list))
+    return str(GtidSet(gtid_set_a).union(gtid_set_b))
 
 
 def gtid_set_itemize(gtid_set):
@@ -169,23 +369,20 @@ def gtid_set_itemize(gtid_set):
     Decompose the given GTID set into a list of individual GTID items grouped
     by UUID.
 
+    Note: The list holds all the transactions of the set, use the iteration
+    of GtidSet instead for large sets.
+
     gtid_set[in]    GTID set to itemize.
 
     Return a list of tuples with the UUIDs and transactions number for all
     individual items in the GTID set. For example: 'uuid_a:1-3:5,uuid_b:4' is
     converted into [('uuid_a', [1, 2, 3, 5]), ('uuid_b', [4])].
     """
+    gtid_set = GtidSet(gtid_set)
     gtid_list = []
-    uuid_sets = gtid_set.split(',')
-    for uuid_set in uuid_sets:
-        uuid_set_elements = uuid_set.split(':')
+    for uuid in gtid_set.uuids():
         trx_num_list = []
-        for interval in uuid_set_elements[1:]:
-            try:
-                start_val, end_val = interval.split('-')
-                trx_num_list.extend(range(int(start_val), int(end_val) + 1))
-            except ValueError:
-                # Error raised for single values (not an interval).
-                trx_num_list.append(int(interval))
-        gtid_list.append((uuid_set_elements[0], trx_num_list))
+        for start, end in gtid_set.intervals(uuid):
+            trx_num_list.extend(xrange(start, end + 1))
+        gtid_list.append((uuid, trx_num_list))
     return gtid_list
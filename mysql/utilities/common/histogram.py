@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+
+"""
+This module contains a histogram with logarithmic buckets, used to compute
+approximate percentiles of latencies (or other non-negative values) with
+bounded memory.
+"""
+
+import math
+
+
+_BUCKET_BASE = 1.05
+_PERCENTILE = 0.95
+
+
+class Histogram(object):
+    """Histogram of non-negative values with logarithmic buckets.
+
+    Each bucket is _BUCKET_BASE times wider than the previous one, so the
+    relative error of the percentiles is at most 5% and the number of buckets
+    is bounded (a few hundreds for the range of values found in a log).
+    Values lower than min_value are stored in bucket 0.
+    """
+
+    def __init__(self, min_value):
+        """Constructor
+
+        min_value[in]   minimum value of bucket 1
+        """
+        self.min_value = min_value
+        self.count = 0
+        self.maximum = 0
+        self.buckets = {}
+
+    def add(self, value):
+        """Add a value to the histogram.
+
+        value[in]       value (non-negative)
+        """
+        self.count += 1
+        if value > self.maximum:
+            self.maximum = value
+        if value < self.min_value:
+            bucket = 0
+        else:
+            bucket = int(math.log(value / self.min_value, _BUCKET_BASE)) + 1
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percentile=_PERCENTILE):
+        """Get an (approximate) percentile of the values.
+
+        percentile[in]  percentile to compute, between 0 and 1
+                        Default = 0.95
+
+        Returns float - value of the percentile (the upper bound of its
+                        bucket, but never greater than the maximum value)
+        """
+        rank = max(int(math.ceil(self.count * percentile)), 1)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == 0:
+                    return 0.0
+                return min(self.min_value * _BUCKET_BASE ** bucket,
+                           float(self.maximum))
+        return float(self.maximum)
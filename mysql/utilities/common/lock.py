@@ -20,7 +20,12 @@
 This file contains the methods for checking consistency among two databases.
 """
 
+import multiprocessing
+import Queue
+import sys
+
 from mysql.utilities.exception import UtilError, UtilDBError
+from mysql.utilities.common.server import connect_servers
 
 
 # The following are the queries needed to perform table locking.
@@ -37,6 +42,16 @@ _LOCK_WARNING = "WARNING: Lock in progress. You must call unlock() " + \
 
 _FLUSH_TABLES_READ_LOCK = "FLUSH TABLES WITH READ LOCK"
 
+# Maximum time (in seconds) to wait for the worker processes to start the
+# shared snapshot while the global read lock is held.
+_SNAPSHOT_WORKERS_TIMEOUT = 60
+
+# Server instance of a worker process that uses a shared snapshot.
+_SNAPSHOT_WORKER_SERVER = []
+
+# Error message of a worker process that failed to start the shared snapshot.
+_SNAPSHOT_WORKER_ERROR = []
+
 
 class Lock(object):
     """Lock
@@ -101,7 +116,7 @@ class Lock(object):
 
             self.locked = True
 
-        elif self.locking == 'snapshot':
+        elif self.locking in ('snapshot', 'shared-snapshot'):
             self.server.exec_query(_SESSION_ISOLATION_LEVEL, self.query_opts)
             self.server.exec_query(_START_TRANSACTION, self.query_opts)
 
@@ -141,7 +156,7 @@ class Lock(object):
             self.locked = False
 
         # Stop transaction if locking == 0
-        elif self.locking == 'snapshot':
+        elif self.locking in ('snapshot', 'shared-snapshot'):
             if not abort:
                 if self.verbosity >= 3 and not self.silent:
                     print "COMMIT"
@@ -150,3 +165,158 @@ class Lock(object):
                 self.server.exec_queery("ROLLBACK", self.query_opts)
                 if self.verbosity >= 3 and not self.silent:
                     print "ROLLBACK"
+
+
+def _start_snapshot_worker(server_values, ready_queue, locked_event):
+    """Start the shared snapshot in a worker process.
+
+    This method is used to initialize each worker process of the pool
+    created by SharedSnapshotLock. The worker connects to the server and
+    starts a transaction with a consistent snapshot (while the global read
+    lock is held by the main process), reporting the result in ready_queue.
+
+    The snapshot is only valid if the global read lock is still held after
+    it is started, which is checked with locked_event. This is not the case
+    for a worker process started by the pool to replace another one that
+    terminated after the global read lock is released; the tasks executed
+    by such a process fail (see get_snapshot_server).
+
+    server_values[in]  dictionary with the server connection values
+    ready_queue[in]    multiprocessing queue to report that the snapshot is
+                       started (None) or the error message
+    locked_event[in]   multiprocessing event, set while the global read lock
+                       is held by the main process
+    """
+    # NOTE: Must handle any exception here, otherwise the pool will keep
+    # creating new worker processes.
+    try:
+        conn_options = {
+            'quiet': True,  # Avoid repeating output for multiprocessing.
+            'version': "5.1.30",
+        }
+        servers = connect_servers(server_values, None, conn_options)
+        Lock(servers[0], [], {'locking': 'snapshot', 'silent': True})
+        if not locked_event.is_set():
+            servers[0].disconnect()
+            raise UtilError("The global read lock was released before the "
+                            "snapshot of the worker process was started.")
+        _SNAPSHOT_WORKER_SERVER[:] = [servers[0]]
+        ready_queue.put(None)
+    except UtilError:
+        _, err, _ = sys.exc_info()
+        _SNAPSHOT_WORKER_ERROR[:] = [err.errmsg]
+        ready_queue.put(err.errmsg)
+    except Exception:  # pylint: disable=W0703
+        _, err, _ = sys.exc_info()
+        _SNAPSHOT_WORKER_ERROR[:] = [str(err)]
+        ready_queue.put(str(err))
+
+
+def get_snapshot_server():
+    """Get the server used by the current worker process.
+
+    Returns Server instance with the shared snapshot started, or None if the
+    current process is not a worker of a SharedSnapshotLock pool.
+    Raises UtilError if the worker process failed to start the snapshot.
+    """
+    if _SNAPSHOT_WORKER_ERROR:
+        raise UtilError("The shared snapshot is not available: "
+                        "{0}".format(_SNAPSHOT_WORKER_ERROR[0]))
+    return _SNAPSHOT_WORKER_SERVER[0] if _SNAPSHOT_WORKER_SERVER else None
+
+
+class SharedSnapshotLock(Lock):
+    """Consistent read shared by a pool of worker processes.
+
+    The snapshot is shared following these steps: a global read lock is
+    acquired (FLUSH TABLES WITH READ LOCK), then the main connection and
+    each worker process of the pool start a transaction with a consistent
+    snapshot, and the global read lock is released (see
+    release_global_lock). All the connections read the data at the same
+    point in time, that also matches the binary log position and GTIDs
+    executed read while the global read lock is held.
+    """
+    def __init__(self, server, server_values, processes, options=None):
+        """Constructor
+
+        server[in]         Server instance of the main connection
+        server_values[in]  dictionary with the server connection values,
+                           used by the worker processes to connect
+        processes[in]      number of worker processes of the pool
+        options[in]        dictionary of options
+                           verbosity int
+                           silent bool
+        """
+        if options is None:
+            options = {}
+        new_opts = options.copy()
+        new_opts['locking'] = 'shared-snapshot'
+        self.server = server
+        self.verbosity = int(options.get('verbosity', 0) or 0)
+        self.silent = options.get('silent', False)
+        self.query_opts = {'fetch': False, 'commit': False}
+
+        if self.verbosity >= 3 and not self.silent:
+            print "# LOCK STRING: %s" % _FLUSH_TABLES_READ_LOCK
+        server.exec_query(_FLUSH_TABLES_READ_LOCK, self.query_opts)
+        self.global_locked = True
+        # Set while the global read lock is held, checked by the workers.
+        self.locked_event = multiprocessing.Event()
+        self.locked_event.set()
+        self.pool = None
+        try:
+            # Start the snapshot of the main connection.
+            super(SharedSnapshotLock, self).__init__(server, [], new_opts)
+            # Start the snapshot of each worker.
+            # Note: The worker processes must not be recycled
+            # (maxtasksperchild), a new process cannot join the snapshot
+            # once the global read lock is released.
+            ready_queue = multiprocessing.Queue()
+            self.pool = multiprocessing.Pool(
+                processes=processes,
+                initializer=_start_snapshot_worker,
+                initargs=(server_values, ready_queue, self.locked_event),
+                maxtasksperchild=None
+            )
+            for _ in range(processes):
+                try:
+                    errmsg = ready_queue.get(
+                        timeout=_SNAPSHOT_WORKERS_TIMEOUT)
+                except Queue.Empty:
+                    errmsg = "Timeout waiting for the worker processes."
+                if errmsg:
+                    raise UtilError("Unable to start the shared snapshot: "
+                                    "{0}".format(errmsg))
+        except:
+            if self.pool:
+                self.pool.terminate()
+                self.pool.join()
+            self.release_global_lock()
+            raise
+
+    def release_global_lock(self):
+        """Release the global read lock.
+
+        The global read lock must be released as soon as the snapshot is
+        started and the replication information (if needed) is read.
+        """
+        if not self.global_locked:
+            return
+        # Must be cleared before the lock is released, for the workers to
+        # detect a snapshot started too late.
+        self.locked_event.clear()
+        if self.verbosity >= 3 and not self.silent:
+            print "# UNLOCK STRING: UNLOCK TABLES"
+        self.server.exec_query("UNLOCK TABLES", self.query_opts)
+        self.global_locked = False
+
+    def unlock(self, abort=False):
+        """Release the global read lock (if not released yet), wait for the
+        tasks of the pool and end the snapshot of all the processes.
+        """
+        self.release_global_lock()
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        super(SharedSnapshotLock, self).unlock(abort)
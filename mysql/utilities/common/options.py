@@ -548,12 +548,16 @@ def add_locking(parser):
     """
     parser.add_option("--locking", action="store", dest="locking",
                       type="choice", default="snapshot",
-                      choices=['no-locks', 'lock-all', 'snapshot'],
+                      choices=['no-locks', 'lock-all', 'snapshot',
+                               'shared-snapshot'],
                       help="choose the lock type for the operation: no-locks "
                       "= do not use any table locks, lock-all = use table "
                       "locks but no transaction and no consistent read, "
                       "snaphot (default): consistent read using a single "
-                      "transaction.")
+                      "transaction, shared-snapshot = consistent read shared "
+                      "by all the processes used with --multiprocess, "
+                      "requires a brief global read lock (FLUSH TABLES WITH "
+                      "READ LOCK).")
 
 
 def add_exclude(parser, object_type="objects",
@@ -20,6 +20,8 @@
 import re
 import decimal
 import datetime
+import itertools
+import string
 
 from mysql.utilities.exception import LogParserError
 
@@ -47,6 +49,27 @@ _GENERAL_ENTRY_CRE = re.compile(
     r'(?:(' + _DATE_PAT + r'))?\s*'
     r'(\d+)\s([\w ]+)\t*(?:(.+))?$')
 
+# First characters of the lines matching _GENERAL_ENTRY_CRE, lines starting
+# with any other character can be skipped without using the regex.
+_GENERAL_ENTRY_START = frozenset(string.digits + string.whitespace)
+
+# First characters of the Slow Query Log lines which are not part of the
+# query text (or can end it, except for headers).
+_SLOW_QUERY_SPECIAL_START = frozenset('uS#')
+
+_DATETIME_FORMAT = "%y%m%d %H:%M:%S"
+
+# Commands of the General Query Log whose argument can span multiple lines.
+_GENERAL_MULTI_LINE_COMMANDS = frozenset(['Query', 'Prepare', 'Execute',
+                                          'Fetch'])
+
+# Maximum number of decimal values cached by SlowQueryLog (fast parsing
+# mode), lock times in particular usually repeat.
+_DECIMAL_CACHE_SIZE = 4096
+
+# Size of the blocks read from the log file (fast parsing mode).
+_READ_BLOCK_SIZE = 4 * 1024 * 1024
+
 
 class LogParserBase(object):
     """Base class for parsing MySQL log files
@@ -58,14 +81,23 @@ class LogParserBase(object):
     - Retrieve next line from stream
     - Parse header information from a log file (for General or Slow Query Log)
     - Implements the iterator protocol
+    - Fast parsing mode, reading the stream in large blocks and returning
+      compact log entries (see CompactLogEntryBase)
 
     This class should not be used directly, but inhereted and extended to
     match the log file which needs to be parsed.
     """
-    def __init__(self, stream):
+    def __init__(self, stream, fast=False):
         """Constructor
 
         stream[in]          A file type
+        fast[in]            If True, use the fast parsing mode: the stream
+                            is read in large blocks (only the read()-method
+                            is used, it does not need to support seek())
+                            and the entries, parsed by a single generator
+                            (see _iter_fast_entries), are
+                            CompactLogEntryBase-objects instead of
+                            dictionaries. Default = False.
 
         The stream argument must be a valid file type supporting for
         example the readline()-method. For example, the return of the buildin
@@ -81,11 +113,21 @@ class LogParserBase(object):
         self._socket = None
         self._start_datetime = None
         self._last_seen_datetime = None
+        self._last_datetime = (None, None)
+        self._fast = fast
+        # Line returned again by _get_next_line() (see _push_back_line).
+        self._pending_line = None
+        # Lines of the stream read in blocks (fast parsing mode).
+        self._lines = None
+        # Generator of the parsed entries (fast parsing mode).
+        self._entries = None
 
         # Check if we got a file type
         line = None
         try:
             self._stream = stream
+            if fast:
+                self._lines = self._read_lines()
             line = self._get_next_line()
         except AttributeError:
             raise LogParserError("Need a file type")
@@ -93,8 +135,89 @@ class LogParserBase(object):
         # Not every log file starts with a header
         if line is not None and line.endswith('started with:'):
             self._parse_header(line)
+        elif fast:
+            # Blocks are read ahead, the stream cannot be rewound.
+            if line is not None:
+                self._push_back_line(line)
         else:
-            self._stream.seek(0)
+            try:
+                self._stream.seek(0)
+            except IOError:
+                # Not seekable (e.g., a pipe), return the line again.
+                if line is not None:
+                    self._push_back_line(line)
+
+    def _push_back_line(self, line):
+        """Return the given line on the next call to _get_next_line()
+
+        line[in]        A string, the line to return again
+
+        Used instead of rewinding the stream if it does not support seek().
+        """
+        self._pending_line = line
+
+    def _read_lines(self):
+        """Read the lines of the log file in large blocks
+
+        This generator is used by the fast parsing mode. It reads the stream
+        in blocks of _READ_BLOCK_SIZE bytes and yields the lines without the
+        trailing newline (\n) and carriage return (\r) characters, like
+        _get_next_line().
+        """
+        read = self._stream.read
+        tail = ''
+        while True:
+            block = read(_READ_BLOCK_SIZE)
+            if not block:
+                break
+            block = tail + block
+            lines = block.split('\n')
+            tail = lines.pop()
+            if '\r' in block:
+                lines = [line.rstrip('\r') for line in lines]
+            for line in lines:
+                yield line
+        if tail:
+            yield tail.rstrip('\r')
+
+    def _get_fast_lines(self):
+        """Get the iterator of the lines to parse (fast parsing mode)
+
+        Returns an iterator starting with the pushed back line (if any).
+        """
+        line = self._pending_line
+        if line is None:
+            return self._lines
+        self._pending_line = None
+        return itertools.chain([line], self._lines)
+
+    def _parse_datetime(self, value):
+        """Parse a timestamp of the log file
+
+        value[in]       a string, for example '111206 11:55:54'
+
+        Consecutive log entries usually have the same timestamp, the last
+        parsed one is cached. The fields are converted directly (with the
+        same rules as time.strptime() for the two-digit year), strptime() is
+        only used if the timestamp does not have the expected format.
+
+        Returns datetime.datetime-object.
+        """
+        last_value, last_datetime = self._last_datetime
+        if value == last_value:
+            return last_datetime
+        try:
+            date, time = value.split()
+            hour, minute, second = time.split(':')
+            year = int(date[0:2])
+            last_datetime = datetime.datetime(
+                year + 2000 if year < 69 else year + 1900, int(date[2:4]),
+                int(date[4:6]), int(hour), int(minute), int(second))
+        except ValueError:
+            last_datetime = datetime.datetime.strptime(value,
+                                                       _DATETIME_FORMAT)
+        self._last_datetime = (value, last_datetime)
+        return last_datetime
 
     def _get_next_line(self):
         """Get next line from the log file
@@ -104,6 +227,12 @@ class LogParserBase(object):
 
         Returns next line as string or None
         """
+        line = self._pending_line
+        if line is not None:
+            self._pending_line = None
+            return line
+        if self._lines is not None:
+            return next(self._lines, None)
         line = self._stream.readline()
         if not line:
             return None
@@ -237,8 +366,13 @@ class LogParserBase(object):
     def __iter__(self):
         """Class is iterable
 
-        Returns a LogParserBase-object.
+        In fast parsing mode, the generator of the entries is returned to
+        avoid a method call for each entry.
+
+        Returns a LogParserBase-object or a generator.
         """
+        if self._entries is not None:
+            return self._entries
         return self
 
     def next(self):
@@ -246,8 +380,11 @@ class LogParserBase(object):
 
         Raises StopIteration when no more entries are available.
 
-        Returns a LogEntryBase-object.
+        Returns a LogEntryBase-object (or a CompactLogEntryBase-object in
+        fast parsing mode).
         """
+        if self._entries is not None:
+            return self._entries.next()
         entry = self._parse_entry()
         if entry is None:
             raise StopIteration
@@ -258,6 +395,11 @@ class LogParserBase(object):
         """
         pass
 
+    def _iter_fast_entries(self):
+        """Generator of the parsed log entries (fast parsing mode)
+        """
+        pass
+
     def __str__(self):
         """String representation of LogParserBase
         """
@@ -278,16 +420,20 @@ class GeneralQueryLog(LogParserBase):
     - Keep track of MySQL sessions and remove them
     - Process log headers found later in the log file
     """
-    def __init__(self, stream):
+    def __init__(self, stream, fast=False):
         """Constructor
 
         stream[in]      file type
+        fast[in]        If True, use the fast parsing mode (see
+                        LogParserBase). Default = False.
 
         Raises LogParserError on errors.
         """
-        super(GeneralQueryLog, self).__init__(stream)
+        super(GeneralQueryLog, self).__init__(stream, fast)
         self._sessions = {}
         self._cached_logentry = None
+        if fast:
+            self._entries = self._iter_fast_entries()
 
         self._commands = {
             # 'Sleep': None,
@@ -339,6 +485,25 @@ class GeneralQueryLog(LogParserBase):
         )
         return self._sessions[session_id]
 
+    @staticmethod
+    def _parse_connect_argument(argument):
+        """Parse the argument of a 'Connect'-command
+
+        argument[in]    a string, last part of a log entry
+
+        Returns a tuple (user, host, database).
+        """
+        # Argument can be as follows:
+        # root@localhost on test
+        # root@localhost on
+        try:
+            connection, _, database = argument.split(' ')
+        except ValueError:
+            connection = argument.replace(' on', '')
+            database = None
+        user, host = connection.split('@')
+        return user, host, database
+
     @staticmethod
     def _handle_connect(entry, session, argument):
         """Handle a 'Connect'-command
@@ -353,16 +518,9 @@ class GeneralQueryLog(LogParserBase):
         current session and also sets the argument for the entry.
 
         """
-        # Argument can be as follows:
-        # root@localhost on test
-        # root@localhost on
-        try:
-            connection, _, database = argument.split(' ')
-        except ValueError:
-            connection = argument.replace(' on', '')
-            database = None
-        session['user'], session['host'] = connection.split('@')
-        session['database'] = database
+        (session['user'], session['host'],
+         session['database']) = GeneralQueryLog._parse_connect_argument(
+             argument)
         entry['argument'] = argument
 
     @staticmethod
@@ -409,11 +567,13 @@ class GeneralQueryLog(LogParserBase):
             if line.endswith('started with:'):
                 self._cached_logentry = line
                 break
-            # Stop if a new log entry is found.
-            info = _GENERAL_ENTRY_CRE.match(line)
-            if info is not None:
-                self._cached_logentry = info.groups()
-                break
+            # Stop if a new log entry is found (only lines starting with a
+            # date or with the session ID can be a new log entry).
+            if line[:1] in _GENERAL_ENTRY_START:
+                info = _GENERAL_ENTRY_CRE.match(line)
+                if info is not None:
+                    self._cached_logentry = info.groups()
+                    break
             # Otherwise, append line and read next.
             argument_parts.append(line)
             line = self._get_next_line()
@@ -480,8 +640,7 @@ class GeneralQueryLog(LogParserBase):
 
         entry['command'] = command
         if dt is not None:
-            entry['datetime'] = datetime.datetime.strptime(dt,
-                                                           "%y%m%d %H:%M:%S")
+            entry['datetime'] = self._parse_datetime(dt)
             session['time_last_action'] = entry['datetime']
         else:
             entry['datetime'] = session['time_last_action']
@@ -492,9 +651,9 @@ class GeneralQueryLog(LogParserBase):
             # Generic command
             entry['argument'] = argument
 
-        for key in entry.keys():
-            if key in session:
-                entry[key] = session[key]
+        entry['database'] = session['database']
+        entry['user'] = session['user']
+        entry['host'] = session['host']
 
         if session['to_delete'] is True:
             del self._sessions[session_id]
@@ -522,6 +681,80 @@ class GeneralQueryLog(LogParserBase):
         self._parse_command(line, entry)
         return entry
 
+    def _iter_fast_entries(self):
+        """Generator of the parsed log entries (fast parsing mode)
+
+        The lines are parsed in a single loop, with the same rules of
+        _parse_command() and the command handlers, keeping the state in local
+        variables. The sessions are lists [database, user, host,
+        time_last_action] and the entries of multi-line commands are only
+        created when the next entry (or header) is found.
+
+        Raises LogParserError on errors.
+
+        Returns a generator of CompactGeneralQueryLogEntry-instances.
+        """
+        new_entry = tuple.__new__
+        entry_class = CompactGeneralQueryLogEntry
+        entry_match = _GENERAL_ENTRY_CRE.match
+        entry_start = _GENERAL_ENTRY_START
+        multi_line_commands = _GENERAL_MULTI_LINE_COMMANDS
+        parse_connect = self._parse_connect_argument
+        sessions = self._sessions
+        last_dt, last_datetime = None, None
+        # Fields and argument lines of the pending multi-line entry.
+        pending = None
+        argument_parts = None
+        for line in self._get_fast_lines():
+            if line.endswith('started with:'):
+                info = None
+            else:
+                info = entry_match(line) if line[:1] in entry_start else None
+                if info is None:
+                    if argument_parts is None:
+                        raise LogParserError("Failed parsing command line: "
+                                             "%s" % line)
+                    argument_parts.append(line)
+                    continue
+            if argument_parts is not None:
+                yield new_entry(entry_class, pending + (
+                    '\n'.join(argument_parts) if len(argument_parts) > 1
+                    else argument_parts[0],))
+                pending = argument_parts = None
+            if info is None:
+                # We got a header
+                self._parse_header(line)
+                continue
+
+            dt, session_id, command, argument = info.groups()
+            session_id = int(session_id)
+            session = sessions.get(session_id)
+            if session is None:
+                session = sessions[session_id] = [None, None, None, None]
+            if dt is not None:
+                if dt != last_dt:
+                    last_dt, last_datetime = dt, self._parse_datetime(dt)
+                session[3] = last_datetime
+            if command in multi_line_commands:
+                pending = (session[3], session[0], session[1], session[2],
+                           session_id, command)
+                argument_parts = [argument]
+                continue
+            if command == 'Connect':
+                session[1], session[2], session[0] = parse_connect(argument)
+            elif command == 'Init DB':
+                session[0] = argument
+            elif command == 'Quit':
+                argument = None
+                del sessions[session_id]
+            yield new_entry(entry_class, (session[3], session[0], session[1],
+                                          session[2], session_id, command,
+                                          argument))
+        if argument_parts is not None:
+            yield new_entry(entry_class, pending + (
+                '\n'.join(argument_parts) if len(argument_parts) > 1
+                else argument_parts[0],))
+
 
 class SlowQueryLog(LogParserBase):
     """Class implementing a parser for the MySQL Slow Query Log
@@ -533,10 +766,12 @@ class SlowQueryLog(LogParserBase):
     - Parse connection and temporal information
     - Get statistics of the slow query
     """
-    def __init__(self, stream):
+    def __init__(self, stream, fast=False):
         """Constructor
 
         stream[in]      A file type
+        fast[in]        If True, use the fast parsing mode (see
+                        LogParserBase). Default = False.
 
         The stream argument must be a valid file type supporting for
         example the readline()-method. For example, the return of the build-in
@@ -545,9 +780,13 @@ class SlowQueryLog(LogParserBase):
 
         Raises LogParserError on errors.
         """
-        super(SlowQueryLog, self).__init__(stream)
+        super(SlowQueryLog, self).__init__(stream, fast)
         self._cached_line = None
         self._current_database = None
+        self._last_timestamp = (None, None)
+        self._decimals = {}
+        if fast:
+            self._entries = self._iter_fast_entries()
 
     @staticmethod
     def _parse_line(regex, line):
@@ -608,12 +847,55 @@ class SlowQueryLog(LogParserBase):
         # # Time: 111206 11:55:54
         info = self._parse_line(_SLOW_TIMESTAMP_CRE, line)
 
-        entry['datetime'] = datetime.datetime.strptime(info[0],
-                                                       "%y%m%d %H:%M:%S")
+        entry['datetime'] = self._parse_datetime(info[0])
         if self._start_datetime is None:
             self._start_datetime = entry['datetime']
             self._last_seen_datetime = entry['datetime']
 
+    def _get_decimal(self, value):
+        """Get the decimal.Decimal-object for the given string
+
+        value[in]   a string, for example '0.000331'
+
+        The decimal values are cached (decimal.Decimal-objects are immutable
+        and slow to create).
+
+        Returns a decimal.Decimal-object.
+        """
+        try:
+            return self._decimals[value]
+        except KeyError:
+            if len(self._decimals) >= _DECIMAL_CACHE_SIZE:
+                self._decimals.clear()
+            result = self._decimals[value] = decimal.Decimal(value)
+            return result
+
+    def _split_statistics(self, line):
+        """Parses statistics information splitting the line
+
+        line[in]    a string
+
+        The fields are split instead of matching the regular expression,
+        which is only used if the line does not have the expected fields.
+
+        Raises LogParserError on errors.
+
+        Returns a tuple (query_time, lock_time, rows_examined, rows_sent).
+        """
+        parts = line.split(None, 9)
+        if (len(parts) >= 9 and parts[1] == 'Query_time:' and
+                parts[3] == 'Lock_time:' and parts[5] == 'Rows_sent:' and
+                parts[7] == 'Rows_examined:'):
+            try:
+                return (self._get_decimal(parts[2]),
+                        self._get_decimal(parts[4]), int(parts[8]),
+                        int(parts[6]))
+            except (ValueError, decimal.InvalidOperation):
+                pass
+        result = self._parse_line(_SLOW_STATS_CRE, line)
+        return (decimal.Decimal(result[0]), decimal.Decimal(result[1]),
+                int(result[3]), int(result[2]))
+
     def _parse_statistics(self, line, entry):
         """Parses statistics information
 
@@ -657,11 +939,19 @@ class SlowQueryLog(LogParserBase):
         while True:
             if line is None:
                 break
-            if line.startswith('use'):
+            if line[:1] not in _SLOW_QUERY_SPECIAL_START:
+                # Most lines of the query, only check for a header.
+                if line.endswith('started with:'):
+                    break
+            elif line.startswith('use'):
                 entry['database'] = self._current_database = line.split(' ')[1]
             elif line.startswith('SET timestamp='):
-                entry['datetime'] = datetime.datetime.fromtimestamp(
-                    int(line[14:].strip(';')))
+                timestamp = line[14:]
+                if timestamp != self._last_timestamp[0]:
+                    self._last_timestamp = (
+                        timestamp, datetime.datetime.fromtimestamp(
+                            int(timestamp.strip(';'))))
+                entry['datetime'] = self._last_timestamp[1]
             elif (line.startswith('# Time:') or
                   line.startswith("# User@Host") or
                   line.endswith('started with:')):
@@ -728,6 +1018,104 @@ class SlowQueryLog(LogParserBase):
 
         return entry
 
+    def _iter_fast_entries(self):
+        """Generator of the parsed log entries (fast parsing mode)
+
+        The lines are parsed in a single loop, with the same rules of
+        _parse_entry() and _parse_query(), keeping the state of the current
+        entry in local variables. The stage of the entry indicates the next
+        expected line: 0 (no entry, a time line or any other line starts a
+        new entry), 1 (connection information), 2 (statistics) and 3 (query).
+        Repeated connection information lines are only parsed once.
+
+        Raises LogParserError on errors.
+
+        Returns a generator of CompactSlowQueryLogEntry-instances.
+        """
+        new_entry = tuple.__new__
+        entry_class = CompactSlowQueryLogEntry
+        special_start = _SLOW_QUERY_SPECIAL_START
+        split_statistics = self._split_statistics
+        timestamp_match = _SLOW_TIMESTAMP_CRE.match
+        stage = 0
+        current_database = self._current_database
+        last_userhost = (None, (None, None, None))
+        last_timestamp = (None, None)
+        entry_datetime = connection = statistics = query = None
+        for line in self._get_fast_lines():
+            while True:
+                if stage == 3:
+                    if line[:1] not in special_start:
+                        # Most lines of the query, only check for a header.
+                        if not line.endswith('started with:'):
+                            query.append(line)
+                            break
+                    elif line.startswith('use'):
+                        current_database = line.split(' ')[1]
+                        query.append(line)
+                        break
+                    elif line.startswith('SET timestamp='):
+                        timestamp = line[14:]
+                        if timestamp != last_timestamp[0]:
+                            last_timestamp = (
+                                timestamp, datetime.datetime.fromtimestamp(
+                                    int(timestamp.strip(';'))))
+                        entry_datetime = last_timestamp[1]
+                        query.append(line)
+                        break
+                    elif not (line.startswith('# Time:') or
+                              line.startswith("# User@Host") or
+                              line.endswith('started with:')):
+                        query.append(line)
+                        break
+                    # End of the entry, the line is parsed again.
+                    yield new_entry(entry_class, (
+                        entry_datetime, current_database) + connection +
+                        ('\n'.join(query),) + statistics)
+                    stage = 0
+                elif stage == 0:
+                    if line.endswith('started with:'):
+                        # We got a header
+                        self._parse_header(line)
+                        break
+                    entry_datetime = None
+                    connection = (None, None, None)
+                    statistics = (None, None, None, None)
+                    query = []
+                    stage = 1
+                    if line.startswith('# Time:'):
+                        timestamp = timestamp_match(line)
+                        if timestamp is None:
+                            raise LogParserError(
+                                'Failed parsing Slow Query line: %s' %
+                                line[:30])
+                        entry_datetime = self._parse_datetime(
+                            timestamp.group(1))
+                        if self._start_datetime is None:
+                            self._start_datetime = entry_datetime
+                            self._last_seen_datetime = entry_datetime
+                        break
+                elif stage == 1:
+                    stage = 2
+                    if line.startswith('# User@Host:'):
+                        if line != last_userhost[0]:
+                            (priv_user, unpriv_user, host, ip,
+                             sid) = self._parse_line(_SLOW_USERHOST_CRE, line)
+                            last_userhost = (line, (
+                                priv_user if priv_user else unpriv_user,
+                                host if host else ip, sid))
+                        connection = last_userhost[1]
+                        break
+                else:
+                    stage = 3
+                    if line.startswith('# Query_time:'):
+                        statistics = split_statistics(line)
+                        break
+        if stage:
+            yield new_entry(entry_class, (
+                entry_datetime, current_database) + connection +
+                ('\n'.join(query),) + statistics)
+
 
 class LogEntryBase(dict):
     """Class inherited by GeneralQueryEntryLog and SlowQueryEntryLog
@@ -818,3 +1206,115 @@ class SlowQueryLogEntry(LogEntryBase):
             "<%(clsname)s %(datetime)s [%(user)s@%(host)s] "
             "%(query_time)s/%(lock_time)s/%(rows_examined)s/%(rows_sent)s>"
         ) % param
+
+
+class CompactLogEntryBase(tuple):
+    """Class inherited by CompactGeneralQueryLogEntry and
+    CompactSlowQueryLogEntry
+
+    Compact log entries are returned by the parsers in fast parsing mode.
+    They are tuples (no __dict__, created without calling Python code) with
+    the values of the fields in _fields, but provide the same interface as
+    LogEntryBase: fields can be accessed using items (logentry['database'])
+    or attributes (logentry.database) and the usual read methods of
+    dictionaries are available. Compact log entries are read-only.
+
+    Should not be used directly.
+    """
+    __slots__ = ()
+    # Names of the fields, in the order of the values.
+    _fields = ()
+    # Position of each field.
+    _index = {}
+    # Class of the equivalent dictionary based log entry.
+    _entry_class = LogEntryBase
+    # Dictionaries are not hashable.
+    __hash__ = None
+
+    def __getitem__(self, key):
+        return tuple.__getitem__(self, self._index[key])
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError("%s has no attribute '%s'" %
+                                 (self.__class__.__name__, name))
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __eq__(self, other):
+        try:
+            return self.copy() == dict(other.items())
+        except AttributeError:
+            return False
+
+    def __ne__(self, other):
+        return not self == other
+
+    def get(self, key, default=None):
+        """Returns the value of the given field or default
+        """
+        try:
+            return tuple.__getitem__(self, self._index[key])
+        except KeyError:
+            return default
+
+    def has_key(self, key):
+        """Returns True if the log entry has the given field
+        """
+        return key in self._index
+
+    def keys(self):
+        """Returns a list with the field names
+        """
+        return list(self._fields)
+
+    def values(self):
+        """Returns a list with the field values
+        """
+        return list(tuple.__iter__(self))
+
+    def items(self):
+        """Returns a list of (field name, value) tuples
+        """
+        return zip(self._fields, tuple.__iter__(self))
+
+    def copy(self):
+        """Returns a dictionary with the fields of the log entry
+        """
+        return dict(zip(self._fields, tuple.__iter__(self)))
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def __str__(self):
+        entry = self._entry_class()
+        entry.update(self.items())
+        return str(entry)
+
+
+class CompactGeneralQueryLogEntry(CompactLogEntryBase):
+    """Class representing an entry of the General Query Log (fast parsing
+    mode)
+    """
+    __slots__ = ()
+    _fields = ('datetime', 'database', 'user', 'host', 'session_id',
+               'command', 'argument')
+    _index = dict((name, pos) for pos, name in enumerate(_fields))
+    _entry_class = GeneralQueryLogEntry
+
+
+class CompactSlowQueryLogEntry(CompactLogEntryBase):
+    """Class representing an entry of the Slow Query Log (fast parsing mode)
+    """
+    __slots__ = ()
+    _fields = ('datetime', 'database', 'user', 'host', 'session_id',
+               'query', 'query_time', 'lock_time', 'rows_examined',
+               'rows_sent')
+    _index = dict((name, pos) for pos, name in enumerate(_fields))
+    _entry_class = SlowQueryLogEntry
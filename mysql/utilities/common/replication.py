@@ -26,6 +26,7 @@ import socket
 
 from mysql.utilities.exception import UtilError, UtilRplWarn, UtilRplError
 from mysql.utilities.exception import FormatError
+from mysql.utilities.common.gtid import GtidSet
 from mysql.utilities.common.options import parse_user_password
 from mysql.utilities.common.server import Server
 from mysql.utilities.common.user import User
@@ -1785,11 +1786,20 @@ class Slave(Server):
     def num_gtid_behind(self, master_gtids):
         """Get the number of transactions the slave is behind the master.
 
+        The GTIDs of the master not in the slave are computed locally (see
+        GtidSet), the GTID_SUBTRACT function is only invoked on the slave if
+        the GTID sets cannot be parsed.
+
         master_gtids[in]  the master's GTID_EXECUTED list
 
         Returns int - number of trans behind master
         """
         slave_gtids = self.exec_query(_GTID_EXECUTED)[0][0]
+        try:
+            return GtidSet(master_gtids[0][0]).difference(
+                slave_gtids).cardinality()
+        except UtilError:
+            pass
         gtids = self.exec_query("SELECT GTID_SUBTRACT('%s','%s')" %
                                 (master_gtids[0][0], slave_gtids))[0]
         # Init gtid_behind count (if no GTIDs behind then 0 is returned)
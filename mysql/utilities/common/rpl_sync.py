@@ -29,8 +29,7 @@ from multiprocessing.pool import ThreadPool
 from mysql.utilities.command.dbcompare import diff_objects, get_common_objects
 from mysql.utilities.common.database import Database
 from mysql.utilities.common.gtid import (get_last_server_gtid,
-                                         gtid_set_cardinality,
-                                         gtid_set_union)
+                                         gtid_set_cardinality, GtidSet)
 from mysql.utilities.common.messages import (ERROR_USER_WITHOUT_PRIVILEGES,
                                              ERROR_ANSI_QUOTES_MIX_SQL_MODE)
 from mysql.utilities.common.pattern_matching import convertSQL_LIKE2REGEXP
@@ -665,22 +664,13 @@ class RPLSynchronizer(object):
                 active_slaves, 'get_gtid_executed', multithreading=True
             )
 
-            # Compute the union of all GTID sets for each UUID among slaves.
-            gtid_sets_by_uuid = {}
+            # Compute the union of all GTID sets among slaves.
+            all_gtids = GtidSet()
             for _, gtid_executed in all_gtid_executed:
-                gtids_list = gtid_executed.split("\n")
-                for gtid in gtids_list:
-                    gtid_set = gtid.rstrip(', ')
-                    uuid = gtid_set.split(':')[0]
-                    if uuid not in gtid_sets_by_uuid:
-                        gtid_sets_by_uuid[uuid] = gtid_set
-                    else:
-                        union_set = gtid_set_union(gtid_sets_by_uuid[uuid],
-                                                   gtid_set)
-                        gtid_sets_by_uuid[uuid] = union_set
+                all_gtids = all_gtids.union(gtid_executed)
 
             # Return union of all know executed GTID.
-            return ",".join(gtid_sets_by_uuid.itervalues())
+            return str(all_gtids)
 
     def _sync_slaves(self, slaves, gtid):
         """Set synchronization point (specified GTID set) for the given slaves.
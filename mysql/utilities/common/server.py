@@ -30,24 +30,50 @@ import tempfile
 import threading
 import logging
 
+from multiprocessing.util import Finalize
+
 import mysql.connector
 from mysql.connector.constants import ClientFlag
 
 from mysql.connector.errorcode import CR_SERVER_LOST
 from mysql.utilities.exception import (ConnectionValuesError, UtilError,
                                        UtilDBError, UtilRplError)
+from mysql.utilities.common.gtid import GtidSet
 from mysql.utilities.common.user import User
 from mysql.utilities.common.tools import (delete_directory, execute_script,
                                           ping_host)
 from mysql.utilities.common.ip_parser import (parse_connection, hostname_is_ip,
                                               clean_IPv6, format_IPv6)
 from mysql.utilities.common.messages import MSG_MYSQL_VERSION
+from mysql.utilities.common.sql_transform import quote_with_backticks
 
 
 _FOREIGN_KEY_SET = "SET foreign_key_checks = {0}"
 _AUTOCOMMIT_SET = "SET AUTOCOMMIT = {0}"
 _GTID_ERROR = ("The server %s:%s does not comply to the latest GTID "
                "feature support. Errors:")
+# Statements changing server variables (SET or conditional SET comment), used
+# to invalidate the cached variable values of the connection.
+_SET_STMT_REGEX = re.compile(r"^\s*(?:/\*!\d*\s*)?SET\b", re.IGNORECASE)
+# Session variables whose value only changes with SET statements of the
+# connection, the only ones cached (GLOBAL values can be changed by other
+# connections).
+_CACHED_SESSION_VARIABLES = frozenset([
+    "autocommit", "character_set_client", "character_set_connection",
+    "character_set_results", "collation_connection", "foreign_key_checks",
+    "sql_log_bin", "sql_mode", "time_zone", "unique_checks",
+])
+# Maximum number of idle connections kept by a ConnectionPool.
+_POOL_MAX_IDLE = 8
+# Session variables restored to their initial value when a connection is
+# returned to a ConnectionPool (the current database is also restored).
+_POOL_SESSION_VARS = ("SQL_MODE", "FOREIGN_KEY_CHECKS", "UNIQUE_CHECKS",
+                      "AUTOCOMMIT", "SQL_LOG_BIN")
+_POOL_SESSION_QUERY = "SELECT {0}, DATABASE()".format(
+    ", ".join("@@SESSION.{0}".format(var) for var in _POOL_SESSION_VARS))
+# Connection pools of the current process (see get_connection_pool).
+_CONNECTION_POOLS = {}
+_CONNECTION_POOLS_PID = [None]
 
 
 def tostr(value):
@@ -424,6 +450,9 @@ def connect_servers(src_val, dest_val, options=None):
                        not None (default is False)
         verbose        Verbose value used by the returned server instances
                        (default is False).
+        local_infile   if True, the connections allow the client to send
+                       local files with LOAD DATA LOCAL INFILE
+                       (default is False)
 
     Returns tuple (source, destination) where
             source = connection to source server
@@ -439,6 +468,7 @@ def connect_servers(src_val, dest_val, options=None):
     version = options.get("version", None)
     charset = options.get("charset", None)
     verbose = options.get('verbose', False)
+    local_infile = options.get("local_infile", False)
 
     ssl_dict = {}
     if options.get("ssl_cert", None) is not None:
@@ -467,6 +497,12 @@ def connect_servers(src_val, dest_val, options=None):
     if dest_dict and charset:
         dest_dict["charset"] = charset
 
+    # Allow LOAD DATA LOCAL INFILE (disabled by default by C/py).
+    if src_dict and local_infile:
+        src_dict = dict(src_dict, local_infile=True)
+    if dest_dict and local_infile:
+        dest_dict = dict(dest_dict, local_infile=True)
+
     # Check for uniqueness - dictionary
     if options.get("unique", False) and dest_dict is not None:
         dupes = False
@@ -791,6 +827,7 @@ class Server(object):
             self.ssl = conn_values.get('ssl', False)
             if self.ssl_cert or self.ssl_ca or self.ssl_key or self.ssl:
                 self.has_ssl = True
+            self.local_infile = conn_values.get('local_infile', False)
         except KeyError:
             raise UtilError("Dictionary format not recognized.")
         self.connect_error = None
@@ -802,6 +839,11 @@ class Server(object):
         self.aliases = set()
         self.grants_enabled = None
         self._version = None
+        # Cache of server variables values for the current connection (see
+        # show_server_variable and select_variable).
+        self._var_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     @classmethod
     def fromServer(cls, server, conn_info=None):
@@ -1079,6 +1121,8 @@ class Server(object):
             conn_vals["ssl_key"] = self.ssl_key
         if self.ssl:
             conn_vals["ssl"] = self.ssl
+        if self.local_infile:
+            conn_vals["local_infile"] = self.local_infile
 
         return conn_vals
 
@@ -1096,6 +1140,8 @@ class Server(object):
         """
         try:
             self.db_conn = self.get_connection()
+            # New session, discard any cached variable values.
+            self.invalidate_cache()
             if log_version:
                 log_server_version(self)
             # If no charset provided, get it from the "character_set_client"
@@ -1104,6 +1150,8 @@ class Server(object):
                 res = self.show_server_variable('character_set_client')
                 self.db_conn.set_charset_collation(charset=res[0][1])
                 self.charset = res[0][1]
+                # Character set variables changed (not using SET).
+                self.invalidate_cache()
             if self.ssl:
                 res = self.exec_query("SHOW STATUS LIKE 'Ssl_cipher'")
                 if res[0][1] == '':
@@ -1175,6 +1223,11 @@ class Server(object):
                 cpy_flags = [ClientFlag.SSL, ClientFlag.SSL_VERIFY_SERVER_CERT]
                 parameters['client_flags'] = cpy_flags
 
+            # Allow the client to send local files (LOAD DATA LOCAL INFILE),
+            # disabled by default since C/py 8.0.18.
+            if self.local_infile:
+                parameters['allow_local_infile'] = True
+
             db_conn = mysql.connector.connect(**parameters)
             # Return MySQL connection object.
             return db_conn
@@ -1262,6 +1315,10 @@ class Server(object):
                            (default is True)
             commit         Perform a commit (if needed) automatically at the
                            end (default: True).
+            multi          If True, execute a multi-statement query, the
+                           results of all the statements are consumed and
+                           the ones of the last statement are returned
+                           (default: False).
         exec_timeout[in]   Timeout value in seconds to kill the query execution
                            if exceeded. Value must be greater than zero for
                            this feature to be enabled. By default 0, meaning
@@ -1276,10 +1333,15 @@ class Server(object):
         fetch = options.get('fetch', True)
         raw = options.get('raw', True)
         do_commit = options.get('commit', True)
+        multi = options.get('multi', False)
 
         # Guard for connect() prerequisite
         assert self.db_conn, "You must call connect before executing a query."
 
+        # Cached variable values might be changed by the statement.
+        if self._var_cache and _SET_STMT_REGEX.match(query_str):
+            self.invalidate_cache()
+
         # If we are fetching all, we need to use a buffered
         if fetch:
             if raw:
@@ -1306,7 +1368,16 @@ class Server(object):
                 q_killer.daemon = True
                 q_killer.start()
             # Execute query.
-            if params == ():
+            if multi:
+                # The results of each statement must be consumed to execute
+                # the whole multi-statement query.
+                if params == ():
+                    results = cur.execute(query_str, multi=True)
+                else:
+                    results = cur.execute(query_str, params, multi=True)
+                for _ in results:
+                    pass
+            elif params == ():
                 cur.execute(query_str)
             else:
                 cur.execute(query_str, params)
@@ -1320,6 +1391,7 @@ class Server(object):
                 # CR_SERVER_LOST = Errno 2013 Lost connection to MySQL server
                 # during query.
                 self.db_conn.reconnect()
+                self.invalidate_cache()
                 raise UtilError("Timeout executing query", err.errno)
             else:
                 raise UtilDBError("Query failed. {0}".format(err))
@@ -1380,17 +1452,75 @@ class Server(object):
 
         self.db_conn.rollback()
 
-    def show_server_variable(self, variable):
+    def invalidate_cache(self):
+        """Discard the cached server variables values.
+
+        This method must be called when the value of server variables is
+        changed without using exec_query() (i.e., not detected as a SET
+        statement), to get the new values from the server.
+        """
+        self._var_cache = {}
+
+    def get_cache_stats(self):
+        """Get the usage statistics of the server variables cache.
+
+        Returns a dictionary with the number of cache hits, misses and
+        cached entries (keys: 'hits', 'misses', 'entries').
+        """
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'entries': len(self._var_cache),
+        }
+
+    def _get_cached_variable(self, key, var_name, query_func, force=False):
+        """Get a server variable value using the connection cache.
+
+        Only the session values of the variables that can only be changed
+        by the connection are cached (see _CACHED_SESSION_VARIABLES), other
+        values (GLOBAL variables or wildcard strings) are always retrieved
+        from the server.
+
+        key[in]         Key of the value in the cache.
+        var_name[in]    Name of the variable (or wildcard string).
+        query_func[in]  Function without arguments that returns the value
+                        from the server.
+        force[in]       If True, get the value directly from the server
+                        (updating the cache). By default False.
+
+        Returns the variable value (from the cache or the server).
+        """
+        if var_name.lower() not in _CACHED_SESSION_VARIABLES:
+            return query_func()
+        if not force and key in self._var_cache:
+            self.cache_hits += 1
+            return self._var_cache[key]
+        self.cache_misses += 1
+        value = query_func()
+        self._var_cache[key] = value
+        return value
+
+    def show_server_variable(self, variable, force=False):
         """Returns one or more rows from the SHOW VARIABLES command.
 
+        The result of the session variables is cached for the connection
+        until a SET statement is executed (see _get_cached_variable and
+        invalidate_cache).
+
         variable[in]       The variable or wildcard string
+        force[in]          If True, returns the value directly from the
+                           server instead of the cached value.
 
         Returns result set
         """
-
-        return self.exec_query("SHOW VARIABLES LIKE '%s'" % variable)
-
-    def select_variable(self, var_name, var_type=None):
+        res = self._get_cached_variable(
+            ('SHOW', variable.lower()), variable,
+            lambda: self.exec_query("SHOW VARIABLES LIKE '%s'" % variable),
+            force)
+        # Return a copy to prevent changes to the cached result set.
+        return list(res)
+
+    def select_variable(self, var_name, var_type=None, force=False):
         """Get server system variable value using SELECT statement.
 
         This function displays the value of system variables using the SELECT
@@ -1406,6 +1536,10 @@ class Server(object):
                         default no type is used, meaning that the session
                         value is returned if it exists and the global value
                         otherwise.
+        force[in]       If True, returns the value directly from the server
+                        instead of the cached value (the session values are
+                        cached for the connection until a SET statement is
+                        executed, see _get_cached_variable).
 
         Return the value for the given server system variable.
         """
@@ -1418,8 +1552,13 @@ class Server(object):
                               "'global' and 'session'.".format(var_type))
         # Execute SELECT @@[var_type.]var_name.
         # Note: An error is issued if the given variable is not known.
-        res = self.exec_query("SELECT @@{0}{1}".format(var_type, var_name))
-        return res[0][0]
+        query_str = "SELECT @@{0}{1}".format(var_type, var_name)
+        if var_type.lower() == 'global.':
+            # Global values are not cached.
+            return self.exec_query(query_str)[0][0]
+        return self._get_cached_variable(
+            ('SELECT', var_type.lower(), var_name.lower()), var_name,
+            lambda: self.exec_query(query_str)[0][0], force)
 
     def flush_logs(self, log_type=None):
         """Execute the FLUSH [log_type] LOGS statement.
@@ -1459,12 +1598,10 @@ class Server(object):
         if not version_ok:
             return "NO"
         try:
-            res = self.exec_query("SELECT @@GLOBAL.GTID_MODE")
+            return self.select_variable("GTID_MODE", "global")
         except:
             return "NO"
 
-        return res[0][0]
-
     def check_gtid_version(self):
         """Determine if server supports latest GTID changes
 
@@ -1541,9 +1678,10 @@ class Server(object):
     def gtid_subtract(self, gtid_set, gtid_subset):
         """Subtract given GTID sets.
 
-        This function invokes GTID_SUBTRACT function on the server to retrieve
-        the GTIDs from the given gtid_set that are not in the specified
-        gtid_subset.
+        This function computes the GTIDs from the given gtid_set that are not
+        in the specified gtid_subset. The subtraction is computed locally
+        (see GtidSet), the GTID_SUBTRACT function is only invoked on the
+        server if the GTID sets cannot be parsed.
 
         gtid_set[in]        Base GTID set to subtract the subset from.
         gtid_subset[in]     GTID subset to be subtracted from the base set.
@@ -1551,6 +1689,10 @@ class Server(object):
         Return a string with the GTID set resulting from the subtraction of the
         specified gtid_subset from the gtid_set.
         """
+        try:
+            return str(GtidSet(gtid_set).difference(gtid_subset))
+        except UtilError:
+            pass
         try:
             return self.exec_query(
                 "SELECT GTID_SUBTRACT('{0}', '{1}')".format(gtid_set,
@@ -1560,18 +1702,30 @@ class Server(object):
             # If no rows are returned by query then return an empty string.
             return ''
 
-    def gtid_subtract_executed(self, gtid_set):
+    def gtid_subtract_executed(self, gtid_set, gtid_executed=None):
         """Subtract GTID_EXECUTED to the given GTID set.
 
-        This function invokes GTID_SUBTRACT function on the server to retrieve
-        the GTIDs from the given gtid_set that are not in the GTID_EXECUTED
-        set.
+        This function computes the GTIDs from the given gtid_set that are not
+        in the GTID_EXECUTED set. The GTID_EXECUTED set is retrieved once and
+        the subtraction is computed locally (see GtidSet), the GTID_SUBTRACT
+        function is only invoked on the server if the GTID sets cannot be
+        parsed.
 
-        gtid_set[in]        Base GTID set to subtract the GTID_EXECUTED.
+        gtid_set[in]        Base GTID set (string or GtidSet) to subtract the
+                            GTID_EXECUTED.
+        gtid_executed[in]   GTID_EXECUTED set of the server previously
+                            retrieved (see get_gtid_executed). By default
+                            None, meaning that it is retrieved.
 
         Return a string with the GTID set resulting from the subtraction of the
         GTID_EXECUTED set from the specified gtid_set.
         """
+        if gtid_executed is None:
+            gtid_executed = self.get_gtid_executed()
+        try:
+            return str(GtidSet(gtid_set).difference(gtid_executed))
+        except UtilError:
+            pass
         from mysql.utilities.common.topology import _GTID_SUBTRACT_TO_EXECUTED
         try:
             result = self.exec_query(
@@ -1604,6 +1758,43 @@ class Server(object):
         if gtid_next_automatic:
             self.exec_query("SET GTID_NEXT='AUTOMATIC'")
 
+    def inject_empty_trx_batch(self, gtids, gtid_next_automatic=True):
+        """ Inject a batch of empty transactions.
+
+        This method injects an empty transaction on the server for each of
+        the given GTIDs. The SET GTID_NEXT, BEGIN and COMMIT statements of
+        all the transactions are sent together as a single multi-statement
+        query, i.e., in one round trip to the server instead of three per
+        transaction (see inject_empty_trx). The GTID_NEXT is set to
+        AUTOMATIC afterwards if requested, and always if the batch fails.
+
+        Note: SUPER privilege is required for this operation, more precisely
+        to set the GTID_NEXT variable. The size of the generated query grows
+        with the number of GTIDs and must not exceed max_allowed_packet.
+
+        gtids[in]                   List of GTIDs (strings) for the empty
+                                    transactions to inject.
+        gtid_next_automatic[in]     Indicate if the GTID_NEXT is set to
+                                    AUTOMATIC after successfully injecting
+                                    the empty transactions. By default True.
+
+        Returns the number of injected transactions.
+        """
+        stmts = ["SET GTID_NEXT='{0}';BEGIN;COMMIT".format(gtid)
+                 for gtid in gtids]
+        if not stmts:
+            return 0
+        failed = True
+        try:
+            self.exec_query(";".join(stmts), {'multi': True})
+            failed = False
+        finally:
+            # Always reset if the batch fails, GTID_NEXT might be left set
+            # to one of the GTIDs.
+            if failed or gtid_next_automatic:
+                self.set_gtid_next_automatic()
+        return len(gtids)
+
     def set_gtid_next_automatic(self):
         """ Set GTID_NEXT to AUTOMATIC.
         """
@@ -2237,6 +2428,220 @@ class Server(object):
         return None
 
 
+class ConnectionPool(object):
+    """Pool of reusable connections to a server.
+
+    The pool hands out connected Server instances for the given connection
+    values. The connections returned to the pool are kept (up to a maximum
+    number of idle connections) and reused by the next requests, avoiding
+    the cost of establishing and initializing a new connection each time.
+    The session state of a returned connection is reset: the current
+    transaction is rolled back, table locks are released, temporary tables
+    are dropped and the current database and the session variables in
+    _POOL_SESSION_VARS are restored to their initial value.
+
+    Note: Connections cannot be shared between processes, each process must
+    use its own pool (see get_connection_pool).
+    """
+
+    def __init__(self, conn_values, options=None):
+        """Constructor
+
+        conn_values[in]    Connection values for the server (dictionary,
+                           connection string or Server instance).
+        options[in]        Options to control behavior:
+            name           Name or role of the created servers
+                           (default is "Server")
+            version        If specified (default is None), fail if the
+                           server version is < version specified
+            charset        Default character set for the connections
+                           (default is None)
+            verbose        Verbose value used by the created servers
+                           (default is False)
+            max_idle       Maximum number of idle connections kept by the
+                           pool (default is _POOL_MAX_IDLE)
+        """
+        if options is None:
+            options = {}
+        self.conn_dict = dict(get_connection_dictionary(conn_values))
+        charset = options.get("charset", None)
+        if charset:
+            self.conn_dict["charset"] = charset
+        self.name = options.get("name", "Server")
+        self.version = options.get("version", None)
+        self.verbose = options.get("verbose", False)
+        self.max_idle = options.get("max_idle", _POOL_MAX_IDLE)
+        self.created = 0
+        self.reused = 0
+        self._idle = []
+        self._session_state = {}
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get a connected server from the pool.
+
+        An idle connection is returned if available, otherwise a new
+        connection to the server is established.
+
+        Returns Server instance
+        """
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop()
+        server = self._connect()
+        # Store initial session state, restored when returned to the pool.
+        res = server.exec_query(_POOL_SESSION_QUERY)
+        with self._lock:
+            self._session_state[id(server)] = res[0]
+            self.created += 1
+        return server
+
+    def _connect(self):
+        """Establish a new connection to the server of the pool.
+
+        Returns Server instance (connected)
+        """
+        server = get_server(self.name, self.conn_dict, True,
+                            verbose=self.verbose)
+        if not _require_version(server, self.version):
+            server.disconnect()
+            raise UtilError("The %s version is incompatible. Utility "
+                            "requires version %s or higher." %
+                            (self.name, self.version))
+        return server
+
+    def _reset_session(self, server):
+        """Reset the session state of a connection from the pool.
+
+        The session is reset by the server with COM_RESET_CONNECTION, or
+        COM_CHANGE_USER if not supported (before MySQL 5.7.3), i.e. the
+        current transaction is rolled back, table locks are released and
+        temporary tables are dropped. The current database and the session
+        variables in _POOL_SESSION_VARS are then restored.
+
+        server[in]         Server instance to reset.
+
+        Raises an UtilError if the session state cannot be reset.
+        """
+        initial_state = self._session_state[id(server)]
+        initial_db = initial_state[-1]
+        try:
+            try:
+                server.db_conn.cmd_reset_connection()
+            except (AttributeError, mysql.connector.NotSupportedError):
+                # Not supported by the server or by Connector/Python.
+                server.db_conn.cmd_change_user(server.user,
+                                               server.passwd or '',
+                                               initial_db or '')
+                if server.charset:
+                    server.db_conn.set_charset_collation(
+                        charset=server.charset)
+        except mysql.connector.Error as err:
+            raise UtilDBError("Cannot reset session. {0}".format(err))
+        # Values changed without SET statements, they must be read again.
+        server.invalidate_cache()
+        server.fkeys = None
+        server.autocommit = None
+        res = server.exec_query(_POOL_SESSION_QUERY)
+        if res[0][-1] != initial_db:
+            if initial_db is None:
+                raise UtilError("Cannot reset the current database of the "
+                                "session.")
+            # Note: The first value is the SQL_MODE.
+            server.exec_query("USE {0}".format(
+                quote_with_backticks(initial_db, res[0][0])))
+        set_values = []
+        for var, value, initial in zip(_POOL_SESSION_VARS, res[0],
+                                       initial_state):
+            if value != initial:
+                if var == "SQL_MODE":
+                    initial = "'{0}'".format(initial)
+                set_values.append("@@SESSION.{0} = {1}".format(var, initial))
+        if set_values:
+            server.exec_query("SET {0}".format(", ".join(set_values)))
+
+    def release(self, server):
+        """Return a server obtained with get() to the pool.
+
+        The session state of the connection is reset before it is made
+        available to other requests. The connection is closed if it cannot
+        be reset or the maximum number of idle connections is reached.
+
+        server[in]         Server instance to return to the pool.
+        """
+        try:
+            self._reset_session(server)
+        except UtilError:
+            self._discard(server)
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(server)
+                return
+        self._discard(server)
+
+    def _discard(self, server):
+        """Close a connection from the pool.
+
+        server[in]         Server instance to close.
+        """
+        with self._lock:
+            self._session_state.pop(id(server), None)
+        server.disconnect()
+
+    def close(self):
+        """Close all the idle connections of the pool.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for server in idle:
+            self._discard(server)
+
+
+def get_connection_pool(conn_values, options=None):
+    """Get the connection pool of the current process for a server.
+
+    The pools are kept for the lifetime of the process and shared by all
+    the calls with the same connection values and options, this way
+    the worker processes of a multiprocessing pool keep their connections
+    alive across tasks. Pools inherited from a parent process (fork) are
+    discarded without closing their connections, which still belong to the
+    parent. The idle connections are closed when the process exits normally
+    (e.g., the worker processes of a closed multiprocessing pool), or before
+    by close_connection_pools.
+
+    conn_values[in]    Connection values for the server (dictionary,
+                       connection string or Server instance).
+    options[in]        Options for the pool if created (see ConnectionPool).
+
+    Returns ConnectionPool instance
+    """
+    if options is None:
+        options = {}
+    if _CONNECTION_POOLS_PID[0] != os.getpid():
+        _CONNECTION_POOLS.clear()
+        _CONNECTION_POOLS_PID[0] = os.getpid()
+        Finalize(None, close_connection_pools, exitpriority=0)
+    conn_dict = get_connection_dictionary(conn_values)
+    key = (tuple(sorted(conn_dict.items())), tuple(sorted(options.items())))
+    pool = _CONNECTION_POOLS.get(key, None)
+    if pool is None:
+        pool = ConnectionPool(conn_values, options)
+        _CONNECTION_POOLS[key] = pool
+    return pool
+
+
+def close_connection_pools():
+    """Close the idle connections of all the pools of the current process.
+    """
+    if _CONNECTION_POOLS_PID[0] == os.getpid():
+        for pool in _CONNECTION_POOLS.values():
+            pool.close()
+    _CONNECTION_POOLS.clear()
+
+
 class QueryKillerThread(threading.Thread):
     """Class to run a thread to kill an executing query.
 
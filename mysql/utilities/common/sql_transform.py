@@ -43,6 +43,14 @@ _DB_NAME, _DB_CHARSET, _DB_COLLATION, _DB_SQL_PATH = range(0, 4)
 _COLUMN_ORDINAL_POSITION, _COLUMN_NAME, _COLUMN_TYPE, _COLUMN_IS_NULLABLE, \
     _COLUMN_DEFAULT, _COLUMN_EXTRA, _COLUMN_COMMENT, _COLUMN_KEY = range(0, 8)
 
+# Special characters in string literals and their escape sequence. The
+# backslash is not escaped when followed by % or _ (\% and \_ are kept).
+_ESCAPE_SEQUENCES = {
+    '\\': '\\\\', '\x00': '\\0', "'": "\\'", '"': '\\"', '\b': '\\b',
+    '\n': '\\n', '\r': '\\r', '\t': '\\t', chr(26): '\\Z',
+}
+_SPECIAL_CHARS_RE = re.compile(r'\\(?=[^%_])|\\\Z|[\x00\'"\b\n\r\t\x1a]')
+
 _TABLE_DEF, _COLUMN_DEF, _PART_DEF = range(0, 3)
 _TABLE_DB, _TABLE_NAME, _TABLE_ENGINE, _TABLE_AUTO_INCREMENT, \
     _TABLE_AVG_ROW_LENGTH, _TABLE_CHECKSUM, _TABLE_COLLATION, _TABLE_COMMENT, \
@@ -154,6 +162,12 @@ def is_quoted_with_backticks(identifier, sql_mode=''):
         return identifier[0] == "`" and identifier[-1] == "`"
 
 
+def _escape_char(match):
+    """Return the escape sequence for the special character matched.
+    """
+    return _ESCAPE_SEQUENCES[match.group(0)]
+
+
 def convert_special_characters(str_val):
     """Convert especial characters in the string to respective escape sequence.
 
@@ -168,24 +182,8 @@ def convert_special_characters(str_val):
     """
     # Check if the input value is a string before performing replacement.
     if str_val and isinstance(str_val, basestring):
-        # First replace backslash '\' character, to avoid replacing '\' in
-        # further escape sequences. backslash_re matches '|' not followed by %
-        # as \% and \_ do not need to be replaced, and when '|' appear at the
-        # end of the string to be replaced correctly.
-        backslash_re = r'\\(?=[^%_])|\\\Z'
-        res = re.sub(backslash_re, r'\\\\', str_val)
-
-        # Replace remaining especial characters
-        res = res.replace('\x00', '\\0')  # \0
-        res = res.replace("'", "\\'")  # \'
-        res = res.replace('"', '\\"')  # \"
-        res = res.replace('\b', '\\b')  # \b
-        res = res.replace('\n', '\\n')  # \n
-        res = res.replace('\r', '\\r')  # \r
-        res = res.replace('\t', '\\t')  # \t
-        res = res.replace(chr(26), '\\Z')  # \Z
-
-        return res
+        # Replace all the special characters in a single pass.
+        return _SPECIAL_CHARS_RE.sub(_escape_char, str_val)
     else:
         # Not a string, return the input value
         return str_val
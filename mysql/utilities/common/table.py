@@ -22,17 +22,19 @@ This module contains abstractions of a MySQL table and an index.
 import multiprocessing
 import sys
 from itertools import izip
+from Queue import Full
 
 from mysql.utilities.exception import UtilError, UtilDBError
 from mysql.connector.conversion import MySQLConverter
 from mysql.utilities.common.format import print_list
 from mysql.utilities.common.lock import Lock
 from mysql.utilities.common.pattern_matching import parse_object_name
-from mysql.utilities.common.server import Server
+from mysql.utilities.common.server import get_connection_pool
 from mysql.utilities.common.sql_transform import (convert_special_characters,
                                                   quote_with_backticks,
                                                   remove_backtick_quoting,
-                                                  is_quoted_with_backticks)
+                                                  is_quoted_with_backticks,
+                                                  to_sql)
 
 # Constants
 _MAXPACKET_SIZE = 1024 * 1024
@@ -40,6 +42,14 @@ _MAXBULK_VALUES = 25000
 _MAXTHREADS_INSERT = 6
 _MAXROWS_PER_THREAD = 100000
 _MAXAVERAGE_CALC = 100
+_STREAM_BATCH_SIZE = 10000
+_MAXQUEUE_BATCHES_PER_WRITER = 2
+# Timeout (in seconds) of each attempt to put a batch of rows in the queue of
+# the writers (see _put_rows).
+_QUEUE_PUT_TIMEOUT = 1
+# Options of the pool of connections to the destination server used for the
+# bulk inserts (see get_connection_pool).
+_DEST_POOL_OPTIONS = {'name': "thread"}
 
 _FOREIGN_KEY_QUERY = """
   SELECT CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_SCHEMA,
@@ -313,14 +323,19 @@ class Table(object):
     def __init__(self, server1, name, options=None):
         """Constructor
 
-        server[in]         A Server object
+        server[in]         A Server object or None to check the indexes of
+                           the table without a connection to the server
+                           (see set_index_metadata)
         name[in]           Name of table in the form (db.table)
         options[in]        options for class: verbose, quiet, get_cols,
+                           sql_mode
             quiet     If True, do not print information messages
             verbose   print extra data during operations (optional)
                       (default is False)
             get_cols  If True, get the column metadata on construction
                       (default is False)
+            sql_mode  SQL_MODE of the server (default is None, meaning
+                      that it is read from the server)
         """
         if options is None:
             options = {}
@@ -329,7 +344,9 @@ class Table(object):
         self.server = server1
 
         # Get sql_mode set on server
-        self.sql_mode = self.server.select_variable("SQL_MODE")
+        self.sql_mode = options.get('sql_mode', None)
+        if self.sql_mode is None:
+            self.sql_mode = self.server.select_variable("SQL_MODE")
 
         # Keep table identifier considering backtick quotes
         if is_quoted_with_backticks(name, self.sql_mode):
@@ -363,6 +380,8 @@ class Table(object):
         self.blob_columns = []
         self.bit_columns = []
         self.column_format = None
+        self._values_format = None
+        self._quoted_columns = []
         self.column_names = []
         self.column_name_type = []
         self.q_column_names = []
@@ -371,9 +390,14 @@ class Table(object):
             self.get_column_metadata()
         self.dest_vals = None
         self.storage_engine = None
+        # Index rows set by set_index_metadata (None: read from the server).
+        self._index_rows = None
 
         # Get max allowed packet
-        res = self.server.exec_query("SELECT @@session.max_allowed_packet")
+        res = None
+        if self.server is not None:
+            res = self.server.exec_query(
+                "SELECT @@session.max_allowed_packet")
         if res:
             self.max_packet_size = res[0][0]
         else:
@@ -458,6 +482,13 @@ class Table(object):
                     col_format_values[col] = "%s"
         self.column_format = "%s%s%s" % \
                              (" (", ', '.join(col_format_values), ")")
+        # Format used to build the VALUES of a row, where each value is
+        # already encoded (see get_column_string).
+        self._values_format = "%s%s%s" % (" (", ', '.join(['%s'] * stop),
+                                          ")")
+        self._quoted_columns = [col for col in range(0, stop)
+                               if col_format_values[col] == "'%s'" and
+                               col not in self.text_columns]
 
     def get_col_names(self, quote_backticks=False):
         """Get column names for the export operation.
@@ -654,7 +685,6 @@ class Table(object):
             self.get_column_metadata()
 
         blob_inserts = []
-        values = list(row)
         is_blob_insert = False
         # find if we have some unique column indexes
         unique_indexes = len(self.get_not_null_unique_indexes())
@@ -674,102 +704,111 @@ class Table(object):
                 blob = self._build_update_blob(row, new_db, self.q_tbl_name)
                 if blob is not None:
                     blob_inserts.append(blob)
-                for col in self.blob_columns:
-                    values[col] = "NULL"
 
         if not is_blob_insert:
-            # Replace single quotes located in the value for a text field with
-            # the correct special character escape sequence. This fixes SQL
-            # errors related to using single quotes in a string value that is
-            # single quoted. For example, 'this' is it' is changed to
-            # 'this\' is it'.
+            # Encode the values of the row in a single pass: None values
+            # are converted to NULL, then only the columns that require it
+            # are changed. Special characters of text fields are replaced by
+            # their escape sequence (e.g., 'this' is it' is changed to
+            # 'this\' is it') and BIT values converted to INTEGER.
+            values = ["NULL" if value is None else value for value in row]
             for col in self.text_columns:
-                # Check if the value is not None before replacing quotes
-                if values[col]:
-                    # Apply escape sequences to special characters
-                    values[col] = convert_special_characters(values[col])
-
+                if row[col] is not None:
+                    values[col] = "'%s'" % convert_special_characters(
+                        row[col])
+            for col in self._quoted_columns:
+                if row[col] is not None:
+                    values[col] = "'%s'" % row[col]
             for col in self.bit_columns:
-                if values[col] is not None:
-                    # Convert BIT to INTEGER for dump.
+                if row[col] is not None:
                     # pylint: disable=W0212
-                    values[col] = MySQLConverter()._BIT_to_python(values[col])
-
-            # Build string (add quotes to "string" like types)
-            val_str = self.column_format % tuple(values)
-
-            # Change 'None' occurrences with "NULL"
-            val_str = val_str.replace(", None", ", NULL")
-            val_str = val_str.replace("(None", "(NULL")
-            val_str = val_str.replace(", 'None'", ", NULL")
-            val_str = val_str.replace("('None'", "(NULL")
-
+                    values[col] = MySQLConverter()._BIT_to_python(row[col])
+            for col in self.blob_columns:
+                values[col] = "NULL"
+            val_str = self._values_format % tuple(values)
         else:
             val_str = None
 
         return val_str, blob_inserts
 
-    def make_bulk_insert(self, rows, new_db, columns_names=None,
-                         skip_blobs=False):
-        """Create bulk insert statements for the data
+    def generate_bulk_insert(self, rows, new_db, columns_names=None,
+                             skip_blobs=False, blob_inserts=None):
+        """Generate bulk insert statements for the data
 
         Reads data from a table (rows) and builds group INSERT statements for
-        bulk inserts.
+        bulk inserts. Each statement is yielded as soon as it is complete,
+        i.e., when it reaches _MAXBULK_VALUES rows or the size limit imposed
+        by max_allowed_packet, thus the rows can be any iterable (including a
+        stream of rows) and only one statement is kept in memory. The VALUES
+        of each statement are accumulated in a list and joined only once.
 
         Note: This method does not print any information to stdout.
 
-        rows[in]           a list of rows to process
+        rows[in]           an iterable of rows to process
         new_db[in]         new database name
+        columns_names[in]  list of (quoted) column names to use in the
+                           INSERT statements. Default = None (all columns)
         skip_blobs[in]     boolean value, if True, blob columns are skipped
+        blob_inserts[out]  if not None, list to which the blob data inserts
+                           (or updates) are appended
 
-        Returns (tuple) - (bulk insert statements, blob data inserts)
+        Returns generator - bulk insert statements
         """
 
         if self.column_format is None:
             self.get_column_metadata()
 
-        data_inserts = []
-        blob_inserts = []
-        row_count = 0
-        data_size = 0
-        val_str = None
+        if columns_names:
+            insert_str = "INSERT INTO {0}.{1} ({2}) VALUES ".format(
+                new_db, self.q_tbl_name, ", ".join(columns_names)
+            )
+        else:
+            insert_str = self._insert % (new_db, self.q_tbl_name)
+        max_size = int(self.max_packet_size) - 512
+        values = []
+        data_size = len(insert_str)
 
         for row in rows:
-            if row_count == 0:
-                if columns_names:
-                    insert_str = "INSERT INTO {0}.{1} ({2}) VALUES ".format(
-                        new_db, self.q_tbl_name, ", ".join(columns_names)
-                    )
-                else:
-                    insert_str = self._insert % (new_db, self.q_tbl_name)
-                if val_str:
-                    row_count += 1
-                    insert_str += val_str
+            val_str, row_blobs = self.get_column_string(row, new_db,
+                                                        skip_blobs)
+            if row_blobs and blob_inserts is not None:
+                blob_inserts.extend(row_blobs)
+            if not val_str:
+                continue
+            row_size = len(val_str) + 2  # Include ", " separator
+            if values and (len(values) >= _MAXBULK_VALUES or
+                           data_size + row_size > max_size):
+                yield insert_str + ", ".join(values)
+                values = []
                 data_size = len(insert_str)
+            values.append(val_str)
+            data_size += row_size
 
-            col_data = self.get_column_string(row, new_db, skip_blobs)
-            if len(col_data[1]) > 0:
-                blob_inserts.extend(col_data[1])
-            if col_data[0]:
-                val_str = col_data[0]
-
-                row_size = len(val_str)
-                next_size = data_size + row_size + 3
-                if ((row_count >= _MAXBULK_VALUES) or
-                        (next_size > (int(self.max_packet_size) - 512))):
-                    # add to buffer
-                    data_inserts.append(insert_str)
-                    row_count = 0
-                else:
-                    row_count += 1
-                    if row_count > 1:
-                        insert_str += ", "
-                    insert_str += val_str
-                    data_size += row_size + 3
+        if values:
+            yield insert_str + ", ".join(values)
 
-        if row_count > 0:
-            data_inserts.append(insert_str)
+    def make_bulk_insert(self, rows, new_db, columns_names=None,
+                         skip_blobs=False):
+        """Create bulk insert statements for the data
+
+        Reads data from a table (rows) and builds group INSERT statements for
+        bulk inserts. See generate_bulk_insert().
+
+        Note: This method does not print any information to stdout.
+
+        rows[in]           a list of rows to process
+        new_db[in]         new database name
+        columns_names[in]  list of (quoted) column names to use in the
+                           INSERT statements. Default = None (all columns)
+        skip_blobs[in]     boolean value, if True, blob columns are skipped
 
+        Returns (tuple) - (bulk insert statements, blob data inserts)
+        """
+        blob_inserts = []
+        data_inserts = list(self.generate_bulk_insert(rows, new_db,
+                                                      columns_names,
+                                                      skip_blobs,
+                                                      blob_inserts))
         return data_inserts, blob_inserts
 
     def get_storage_engine(self):
@@ -831,6 +870,55 @@ class Table(object):
                   "threads = %d." % max_threads
         return (num_rows / max_threads) + max_threads
 
+    def _connect_bulk_insert(self, destination=None):
+        """Get a connection to the destination server for bulk inserts.
+
+        The connection is taken from the connection pool of the process for
+        the destination server (a new one is opened if none is available).
+        The returned connection has foreign key checks disabled and the
+        NO_BACKSLASH_ESCAPES SQL_MODE removed (if set).
+
+        destination[in]    the destination server
+
+        Returns tuple (Server instance, previous SQL_MODE to restore or None
+        if not changed), see _restore_bulk_insert.
+        """
+        if self.dest_vals is None:
+            self.dest_vals = self.get_dest_values(destination)
+
+        # Get a connection from the pool
+        dest = get_connection_pool(self.dest_vals, _DEST_POOL_OPTIONS).get()
+
+        # Test if SQL_MODE is 'NO_BACKSLASH_ESCAPES' in the destination server
+        prev_sql_mode = None
+        if dest.select_variable("SQL_MODE") == "NO_BACKSLASH_ESCAPES":
+            # Change temporarily the SQL_MODE in the destination server
+            dest.exec_query("SET @@SESSION.SQL_MODE=''")
+            prev_sql_mode = "NO_BACKSLASH_ESCAPES"
+
+        # Turn off foreign keys if turned on
+        dest.disable_foreign_key_checks(True)
+        return dest, prev_sql_mode
+
+    @staticmethod
+    def _restore_bulk_insert(dest, prev_sql_mode):
+        """Restore the session of a connection used for bulk inserts.
+
+        Foreign key checks are turned on again (if they were on at the start)
+        and the SQL_MODE changed by _connect_bulk_insert is restored. Errors
+        are ignored (the connection might be broken).
+
+        dest[in]           Server instance used for the bulk inserts
+        prev_sql_mode[in]  SQL_MODE to restore or None if not changed
+        """
+        try:
+            dest.disable_foreign_key_checks(False)
+            if prev_sql_mode is not None:
+                dest.exec_query("SET @@SESSION.SQL_MODE='{0}'"
+                                "".format(prev_sql_mode))
+        except UtilError:
+            pass
+
     def _bulk_insert(self, rows, new_db, destination=None):
         """Import data using bulk insert
 
@@ -846,37 +934,36 @@ class Table(object):
         new_db[in]         new database name
         destination[in]    the destination server
         """
-        if self.dest_vals is None:
-            self.dest_vals = self.get_dest_values(destination)
+        dest, prev_sql_mode = self._connect_bulk_insert(destination)
+        try:
+            # Issue the write lock
+            lock_list = [("%s.%s" % (new_db, self.q_tbl_name), 'WRITE')]
+            my_lock = Lock(dest, lock_list, {'locking': 'lock-all', })
 
-        # Spawn a new connection
-        server_options = {
-            'conn_info': self.dest_vals,
-            'role': "thread",
-        }
-        dest = Server(server_options)
-        dest.connect()
+            self._exec_bulk_insert(dest, rows, new_db)
 
-        # Test if SQL_MODE is 'NO_BACKSLASH_ESCAPES' in the destination server
-        if dest.select_variable("SQL_MODE") == "NO_BACKSLASH_ESCAPES":
-            # Change temporarily the SQL_MODE in the destination server
-            dest.exec_query("SET @@SESSION.SQL_MODE=''")
+            my_lock.unlock()
+        finally:
+            # Now, turn on foreign keys if they were on at the start
+            self._restore_bulk_insert(dest, prev_sql_mode)
+            # Return the connection to the pool for the next inserts.
+            get_connection_pool(self.dest_vals,
+                                _DEST_POOL_OPTIONS).release(dest)
 
-        # Issue the write lock
-        lock_list = [("%s.%s" % (new_db, self.q_tbl_name), 'WRITE')]
-        my_lock = Lock(dest, lock_list, {'locking': 'lock-all', })
-
-        # First, turn off foreign keys if turned on
-        dest.disable_foreign_key_checks(True)
+    def _exec_bulk_insert(self, dest, rows, new_db):
+        """Insert rows using bulk INSERT statements on the given connection.
 
+        dest[in]           Server instance to insert the rows
+        rows[in]           a list of rows to process
+        new_db[in]         new database name
+        """
         if self.column_format is None:
             self.get_column_metadata()
-        data_lists = self.make_bulk_insert(rows, new_db)
-        insert_data = data_lists[0]
-        blob_data = data_lists[1]
+        blob_data = []
 
         # Insert the data first
-        for data_insert in insert_data:
+        for data_insert in self.generate_bulk_insert(rows, new_db,
+                                                     blob_inserts=blob_data):
             try:
                 dest.exec_query(data_insert, self.query_options)
             except UtilError, e:
@@ -891,10 +978,135 @@ class Table(object):
                 raise UtilError("Problem updating blob field. "
                                 "Error = %s" % e.errmsg)
 
-        # Now, turn on foreign keys if they were on at the start
-        dest.disable_foreign_key_checks(False)
-        my_lock.unlock()
-        del dest
+    def _bulk_insert_worker(self, rows_queue, errors_queue, new_db,
+                            destination=None):
+        """Insert the batches of rows received from a queue.
+
+        This method is designed to run in a long-lived writer process of the
+        copy pipeline (see _pipeline_copy_data). It keeps a single connection
+        to the destination server to insert all the batches of rows it gets
+        from rows_queue until None is received. If an error occurs, the error
+        message is put in errors_queue (whatever the raised exception) and
+        the remaining batches are discarded (but still consumed to avoid
+        blocking the reader).
+
+        Note: This method does not print any information to stdout.
+
+        rows_queue[in]     queue with the batches of rows to insert
+        errors_queue[in]   queue to report errors
+        new_db[in]         new database name
+        destination[in]    the destination server
+        """
+        dest = None
+        prev_sql_mode = None
+        failed = False
+        while True:
+            rows = rows_queue.get()
+            if rows is None:
+                break
+            if failed:
+                continue
+            try:
+                if dest is None:
+                    dest, prev_sql_mode = self._connect_bulk_insert(
+                        destination)
+                self._exec_bulk_insert(dest, rows, new_db)
+            except UtilError as err:
+                errors_queue.put(err.errmsg)
+                failed = True
+            except Exception as err:  # pylint: disable=W0703
+                # Report any other error, the process must not die silently.
+                errors_queue.put("Problem inserting data. Error = "
+                                 "{0}".format(err))
+                failed = True
+        if dest is not None:
+            # Turn on foreign keys if they were on at the start
+            self._restore_bulk_insert(dest, prev_sql_mode)
+            # Return the connection to the pool of the process.
+            get_connection_pool(self.dest_vals,
+                                _DEST_POOL_OPTIONS).release(dest)
+
+    def _pipeline_copy_data(self, new_db, destination, num_writers):
+        """Copy the table data with a pipeline of reader and writers.
+
+        The rows are read from the source in fixed-size batches (using an
+        unbuffered cursor) and put in a bounded queue, from which a fixed
+        pool of writer processes take them to insert on the destination, each
+        one using a single persistent connection. Reads and writes overlap
+        and the memory used is limited by the queue size, not the table size.
+
+        Note: No WRITE lock is taken on the destination table, otherwise the
+        writers would be serialized.
+
+        new_db[in]         new database name
+        destination[in]    the destination server
+        num_writers[in]    number of writer processes (connections)
+        """
+        # Load the metadata required by the writers before they are created,
+        # they must not use the source connection.
+        if self.column_format is None:
+            self.get_column_metadata()
+        self.get_not_null_unique_indexes()
+        if self.dest_vals is None:
+            self.dest_vals = self.get_dest_values(destination)
+
+        rows_queue = multiprocessing.Queue(
+            num_writers * _MAXQUEUE_BATCHES_PER_WRITER)
+        errors_queue = multiprocessing.Queue()
+        writers = []
+        for _ in range(num_writers):
+            writer = multiprocessing.Process(
+                target=self._bulk_insert_worker,
+                args=(rows_queue, errors_queue, new_db, destination))
+            writer.start()
+            writers.append(writer)
+
+        rows_iter = self.stream_rows()
+        try:
+            for rows in rows_iter:
+                # Stop reading if a writer failed.
+                if (not errors_queue.empty() or
+                        not self._put_rows(rows_queue, rows, writers)):
+                    break
+        finally:
+            # Close the reader (unread rows are discarded from the source
+            # connection).
+            rows_iter.close()
+            # Signal the writers to finish and wait for them.
+            for _ in writers:
+                if not self._put_rows(rows_queue, None, writers):
+                    break
+            for writer in writers:
+                writer.join()
+
+        if not errors_queue.empty():
+            raise UtilError(errors_queue.get())
+        if any(writer.exitcode != 0 for writer in writers):
+            raise UtilError("Problem inserting data. A writer process "
+                            "terminated unexpectedly.")
+
+    @staticmethod
+    def _put_rows(rows_queue, rows, writers):
+        """Put an item in the queue of the writers of the copy pipeline.
+
+        The item is put with a timeout, retrying while at least one of the
+        writers is alive, to avoid blocking forever if all the writers
+        terminated (e.g., killed) and no one is consuming the queue.
+
+        rows_queue[in]     queue with the batches of rows to insert
+        rows[in]           batch of rows (or None to signal the end)
+        writers[in]        list of writer processes
+
+        Returns bool - True if the item was put in the queue, False if all
+                       the writers are dead.
+        """
+        while True:
+            try:
+                rows_queue.put(rows, timeout=_QUEUE_PUT_TIMEOUT)
+                return True
+            except Full:
+                if not any(writer.is_alive() for writer in writers):
+                    return False
 
     def insert_rows(self, rows, new_db, destination=None, spawn=False):
         """Insert rows in the table using bulk copy.
@@ -959,6 +1171,10 @@ class Table(object):
         the file provided.
 
         Note: if connections < 1 - retrieve the data one row at-a-time
+              if connections > 1 - the data is copied by a pipeline that
+                                   reads batches of rows from the source while
+                                   the given number of writer processes insert
+                                   them on the destination.
 
         destination[in]    Destination server
         cloning[in]        If True, we are copying on the same server
@@ -980,7 +1196,6 @@ class Table(object):
             self._clone_data(new_db)
         else:
             # Read and copy the data
-            pthreads = []
             # Change the sql_mode if the mode is different on each server
             # and if "ANSI_QUOTES" is set in source, this is for
             # compatibility between the names.
@@ -1005,37 +1220,90 @@ class Table(object):
                     self.q_column_names.append(
                         quote_with_backticks(column, self.sql_mode)
                     )
-            for rows in self.retrieve_rows(num_conn):
-                p = self.insert_rows(rows, new_db, destination, num_conn > 1)
-                if p is not None:
-                    p.start()
-                    pthreads.append(p)
-
-            if num_conn > 1:
-                # Wait for all threads to finish
-                for p in pthreads:
-                    p.join()
-            # restoring the previous sql_mode, changed if the sql_mode in both
-            # servers is different and one is "ANSI_QUOTES"
-            if prev_sql_mode:
-                self.server.exec_query("SET @@SESSION.SQL_MODE={0}"
-                                       "".format(prev_sql_mode))
-                self.sql_mode = prev_sql_mode
-                self.q_tbl_name = quote_with_backticks(
-                    self.tbl_name,
-                    self.sql_mode
-                )
-                self.q_db_name = quote_with_backticks(
-                    self.db_name,
-                    self.sql_mode
-                )
-                self.q_table = ".".join([self.q_db_name, self.q_tbl_name])
-                for column in self.column_names:
-                    self.q_column_names.append(
-                        quote_with_backticks(column, self.sql_mode)
+            try:
+                if num_conn > 1:
+                    self._pipeline_copy_data(new_db, destination, num_conn)
+                else:
+                    for rows in self.retrieve_rows(num_conn):
+                        self.insert_rows(rows, new_db, destination)
+            finally:
+                # restoring the previous sql_mode, changed if the sql_mode in
+                # both servers is different and one is "ANSI_QUOTES" (also
+                # if an error occurred)
+                if prev_sql_mode:
+                    self.server.exec_query("SET @@SESSION.SQL_MODE='{0}'"
+                                           "".format(prev_sql_mode))
+                    self.sql_mode = prev_sql_mode
+                    self.q_tbl_name = quote_with_backticks(
+                        self.tbl_name,
+                        self.sql_mode
+                    )
+                    self.q_db_name = quote_with_backticks(
+                        self.db_name,
+                        self.sql_mode
                     )
+                    self.q_table = ".".join([self.q_db_name,
+                                             self.q_tbl_name])
+                    for column in self.column_names:
+                        self.q_column_names.append(
+                            quote_with_backticks(column, self.sql_mode)
+                        )
+
+    def get_key_ranges(self, chunk_size=_MAXROWS_PER_THREAD):
+        """Split the table data into ranges of a UNIQUE NOT NULL index.
+
+        This method walks the primary key (or the first UNIQUE NOT NULL BTREE
+        index without column prefixes) to find the key values that split the
+        table in ranges with chunk_size rows each. Only chunk_size index
+        entries are read for each boundary found.
+
+        chunk_size[in]     Number of rows for each range.
+                           Default = _MAXROWS_PER_THREAD
+
+        Returns list of clauses (WHERE ... ORDER BY ...) to retrieve each
+        range of rows in key order, or None if the table does not have a
+        suitable index.
+        """
+        key_index = None
+        for index in self.get_not_null_unique_indexes():
+            # Indexes with column prefixes (e.g. a(20)) cannot define ranges.
+            if index.type == "BTREE" and not index.column_subparts:
+                key_index = index
+                break
+        if key_index is None:
+            return None
 
-    def retrieve_rows(self, num_conn=1):
+        q_cols = [quote_with_backticks(col[0], self.sql_mode)
+                  for col in key_index.columns]
+        cols_str = ", ".join(q_cols)
+        key_str = q_cols[0] if len(q_cols) == 1 else "({0})".format(cols_str)
+        query = "SELECT {0} FROM {1}{{0}} ORDER BY {0} LIMIT {{1}}, 1".format(
+            cols_str, self.q_table)
+
+        # Find the key value at the start of each range (except the first).
+        bounds = []
+        res = self.server.exec_query(query.format("", chunk_size))
+        while res:
+            values = [to_sql(val) for val in res[0]]
+            bound = values[0] if len(values) == 1 else \
+                "({0})".format(", ".join(values))
+            bounds.append(bound)
+            res = self.server.exec_query(query.format(
+                " WHERE {0} > {1}".format(key_str, bound), chunk_size - 1))
+
+        # Build the clauses to retrieve each range.
+        order_by = " ORDER BY {0}".format(cols_str)
+        if not bounds:
+            return [order_by.lstrip()]
+        ranges = ["WHERE {0} < {1}{2}".format(key_str, bounds[0], order_by)]
+        for low, high in zip(bounds, bounds[1:]):
+            ranges.append("WHERE {0} >= {1} AND {0} < {2}{3}".format(
+                key_str, low, high, order_by))
+        ranges.append("WHERE {0} >= {1}{2}".format(key_str, bounds[-1],
+                                                   order_by))
+        return ranges
+
+    def retrieve_rows(self, num_conn=1, key_range=None):
         """Retrieve the table data in rows.
 
         This method can be used to retrieve rows from a table as a generator
@@ -1046,6 +1314,9 @@ class Table(object):
 
         num_conn[in]       Number of threads(connections) to use
                            Default = 1 (one large segment)
+        key_range[in]      Clause returned by get_key_ranges() to retrieve
+                           only the rows of that range.
+                           Default = None (retrieve all rows)
 
         Returns (yield) row data
         """
@@ -1055,7 +1326,7 @@ class Table(object):
             segment_size = self.get_segment_size(num_conn)
 
         # Execute query to get all of the data
-        cur = self.server.exec_query("SELECT * FROM {0}".format(self.q_table),
+        cur = self.server.exec_query(self._get_select_rows(key_range),
                                      self.query_options)
 
         while True:
@@ -1080,6 +1351,58 @@ class Table(object):
 
         cur.close()
 
+    def _get_select_rows(self, key_range=None):
+        """Get the SELECT statement to retrieve the table data.
+
+        key_range[in]      Clause returned by get_key_ranges() to retrieve
+                           only the rows of that range (optional).
+
+        Returns string - SELECT statement
+        """
+        if key_range:
+            return "SELECT * FROM {0} {1}".format(self.q_table, key_range)
+        return "SELECT * FROM {0}".format(self.q_table)
+
+    def stream_rows(self, batch_size=_STREAM_BATCH_SIZE, key_range=None):
+        """Retrieve the table data in fixed-size batches of rows.
+
+        Unlike retrieve_rows(), this method reads the rows through an
+        unbuffered (server-side) cursor and only keeps one batch of rows in
+        memory at a time, regardless of the size of the table.
+
+        Note: No other query can be executed using the server connection of
+        the table until all rows are retrieved.
+
+        batch_size[in]     Maximum number of rows to fetch at one time.
+                           Default = _STREAM_BATCH_SIZE
+        key_range[in]      Clause returned by get_key_ranges() to retrieve
+                           only the rows of that range.
+                           Default = None (retrieve all rows)
+
+        Returns (yield) list of rows
+        """
+        cur = self.server.exec_query(self._get_select_rows(key_range),
+                                     self.query_options)
+        done = False
+        try:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    done = True
+                    break
+                yield rows
+        finally:
+            if not done:
+                # Stopped before reading all rows (e.g., error or generator
+                # closed), discard the unread rows to allow the execution of
+                # other queries on the connection.
+                try:
+                    while cur.fetchmany(batch_size):
+                        pass
+                except Exception:  # pylint: disable=W0703
+                    pass
+            cur.close()
+
     def get_dest_values(self, destination=None):
         """Get the destination connection values if not already set.
 
@@ -1228,16 +1551,60 @@ class Table(object):
 
         return redundant_indexes if redundant_indexes else []
 
+    def set_index_metadata(self, index_rows, storage_engine):
+        """Set the indexes and storage engine of the table.
+
+        The index metadata previously retrieved (e.g., for all the tables of
+        a database at once) is used to check the indexes of the table,
+        instead of querying the server.
+
+        index_rows[in]      list of index rows in the format of the result
+                            set of get_tbl_indexes() (in the order of SHOW
+                            INDEXES)
+        storage_engine[in]  storage engine of the table
+        """
+        self._index_rows = index_rows
+        self.storage_engine = (storage_engine or '').upper()
+
     def _get_index_list(self):
         """Get the list of indexes for a table.
         Returns list containing indexes.
         """
+        if self._index_rows is not None:
+            return self._index_rows
         rows = self.get_tbl_indexes()
         return rows
 
+    def _get_primary_index_from_metadata(self):
+        """Get the primary index columns from the index metadata.
+
+        Like EXPLAIN, the columns of the first UNIQUE index without NULL
+        columns nor column prefixes are used if the table has no PRIMARY
+        key (the index used as the primary key by the server).
+
+        Returns list of tuples with the column names
+        """
+        indexes = []
+        for row in self._index_rows:
+            if not indexes or indexes[-1][0] != row[2]:
+                indexes.append((row[2], row[1], []))
+            indexes[-1][2].append(row)
+        for name, _, rows in indexes:
+            if name == "PRIMARY":
+                return [(row[4],) for row in rows]
+        for _, non_unique, rows in indexes:
+            if (not int(non_unique) and
+                    not any(row[9] or row[7] for row in rows)):
+                return [(row[4],) for row in rows]
+        return []
+
     def get_primary_index(self):
         """Retrieve the primary index columns for this table.
         """
+        if self._index_rows is not None:
+            self.pri_idx = self._get_primary_index_from_metadata()
+            return self.pri_idx
+
         pri_idx = []
 
         rows = self.server.exec_query("EXPLAIN {0}".format(self.q_table))
@@ -1343,7 +1710,7 @@ class Table(object):
         # primary key columns. Therefore the use of keys that include the
         # primary key might be redundant.
         redundant_idxs = []
-        if not self.storage_engine:
+        if self.storage_engine is None:
             self.storage_engine = self.get_storage_engine()
         if self.storage_engine == 'INNODB':
             all_indexes = self.btree_indexes
@@ -297,13 +297,16 @@ def get_mysqld_version(mysqld_path):
     return parse_mysqld_version(fixed_str)
 
 
-def show_file_statistics(file_name, wild=False, out_format="GRID"):
+def show_file_statistics(file_name, wild=False, out_format="GRID",
+                         exclude_suffixes=None):
     """Show file statistics for file name specified
 
     file_name[in]    target file name and path
     wild[in]         if True, get file statistics for all files with prefix of
                      file_name. Default is False
     out_format[in]   output format to print file statistics. Default is GRID.
+    exclude_suffixes[in] tuple of suffixes of the files to skip when wild is
+                     True. Default is None (no files skipped).
     """
 
     def _get_file_stats(path, file_name):
@@ -319,7 +322,8 @@ def show_file_statistics(file_name, wild=False, out_format="GRID"):
     if wild:
         for _, _, files in os.walk(path):
             for f in files:
-                if f.startswith(filename):
+                if f.startswith(filename) and not (
+                        exclude_suffixes and f.endswith(exclude_suffixes)):
                     rows.append(_get_file_stats(path, f))
     else:
         rows.append(_get_file_stats(path, filename))
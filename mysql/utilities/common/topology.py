@@ -28,6 +28,7 @@ import os
 from multiprocessing.pool import ThreadPool
 
 from mysql.utilities.exception import FormatError, UtilError, UtilRplError
+from mysql.utilities.common.gtid import GtidSet
 from mysql.utilities.common.lock import Lock
 from mysql.utilities.common.my_print_defaults import MyDefaultsReader
 from mysql.utilities.common.ip_parser import parse_connection
@@ -825,11 +826,14 @@ class Topology(Replication):
                                    ((_GTID_WAIT % (gtids.strip(','),
                                                    self.timeout)), err.errmsg))
 
-    def _has_missing_transactions(self, candidate, slave):
+    def _has_missing_transactions(self, candidate, slave,
+                                  candidate_exec_gtids=None):
         """Determine if there are transactions on the slave not on candidate
 
-        This method uses the function gtid_subset() to determine if there are
-        GTIDs (transactions) on the slave that are not on the candidate.
+        This method checks if the GTIDs (transactions) of the slave are a
+        subset of the GTIDs of the candidate. The check is computed locally
+        (see GtidSet), the function gtid_subset() is only invoked on the
+        slave if the GTID sets cannot be parsed.
 
         Return code fopr query should be 0 when there are missing
         transactions, 1 if not, and -1 if there is a non-numeric result
@@ -837,21 +841,29 @@ class Topology(Replication):
 
         candidate[in]   Server instance of candidate (new master)
         slave[in]       Server instance of slave to check
+        candidate_exec_gtids[in]  executed GTID set of the candidate, if
+                        already retrieved (see _get_executed_gtid_set).
+                        By default (None), it is retrieved.
 
         Returns boolean - True if there are transactions else False
         """
         slave_exec_gtids = slave.get_executed_gtid_set()
         slave_retrieved_gtids = slave.get_retrieved_gtid_set()
-        cand_slave = self._change_role(candidate)
-        candidate_exec_gtids = cand_slave.get_executed_gtid_set()
+        if candidate_exec_gtids is None:
+            candidate_exec_gtids = self._get_executed_gtid_set(candidate)
         slave_gtids = ",".join([slave_exec_gtids.strip(","),
                                 slave_retrieved_gtids.strip(",")])
-        res = slave.exec_query("SELECT gtid_subset('%s', '%s')" %
-                               (slave_gtids, candidate_exec_gtids.strip(",")))
-        if res and res[0][0].isdigit():
-            result_code = int(res[0][0])
-        else:
-            result_code = -1
+        try:
+            result_code = int(GtidSet(slave_gtids).issubset(
+                candidate_exec_gtids))
+        except UtilError:
+            res = slave.exec_query("SELECT gtid_subset('%s', '%s')" %
+                                   (slave_gtids,
+                                    candidate_exec_gtids.strip(",")))
+            if res and res[0][0].isdigit():
+                result_code = int(res[0][0])
+            else:
+                result_code = -1
 
         if self.verbose and not self.quiet:
             if result_code != 1:
@@ -865,6 +877,15 @@ class Topology(Replication):
 
         return result_code != 1
 
+    def _get_executed_gtid_set(self, server):
+        """Get the executed GTID set of a server, acting as a slave.
+
+        server[in]      Server instance
+
+        Returns string - Executed_Gtid_Set of SHOW SLAVE STATUS
+        """
+        return self._change_role(server).get_executed_gtid_set()
+
     def _prepare_candidate_for_failover(self, candidate, user, passwd=""):
         """Prepare candidate slave for slave promotion (in failover)
 
@@ -900,6 +921,9 @@ class Topology(Replication):
         }
 
         hostport = "%s:%s" % (candidate.host, candidate.port)
+        # The executed GTID set of the candidate is only retrieved again after
+        # it catches up with a slave.
+        candidate_exec_gtids = None
         for slave_dict in self.slaves:
             s_host = slave_dict['host']
             s_port = slave_dict['port']
@@ -921,7 +945,10 @@ class Topology(Replication):
 
             # Check for missing transactions. No need to connect to slave if
             # there are no transactions (GTIDs) to retrieve
-            if not self._has_missing_transactions(candidate, temp_master):
+            if candidate_exec_gtids is None:
+                candidate_exec_gtids = self._get_executed_gtid_set(candidate)
+            if not self._has_missing_transactions(candidate, temp_master,
+                                                  candidate_exec_gtids):
                 continue
 
             try:
@@ -980,6 +1007,7 @@ class Topology(Replication):
 
             # Disconnect candidate from slave (temp_master)
             candidate.stop()
+            candidate_exec_gtids = None
 
         return True
 
@@ -1104,6 +1132,11 @@ class Topology(Replication):
         are not found on the other slaves (only on one slave) and not from the
         current master.
 
+        The GTID_EXECUTED set of each slave is retrieved once and the sets are
+        compared locally (see GtidSet), instead of querying each pair of
+        slaves. If a set cannot be parsed, the sets are compared by the
+        slaves (GTID_SUBTRACT() function).
+
         Returns a list of tuples, each tuple containing the slave host, port
         and set of corresponding errant transactions, i.e.:
         [(host1, port1, set1), ..., (hostn, portn, setn)]. If no errant
@@ -1117,53 +1150,121 @@ class Topology(Replication):
             master_uuid = self.master.get_uuid()
             use_master_uuid_from_slave = False
 
-        # Check all slaves for executed transactions not in other slaves
+        # Get the GTID_EXECUTED set of all the slaves (skip not defined or
+        # dead slaves).
+        slaves_gtids = []
         for slave_dict in self.slaves:
             slave = slave_dict['instance']
-            # Skip not defined or dead slaves
             if not slave or not slave.is_alive():
                 continue
-            tnx_set = slave.get_executed_gtid_set()
+            slaves_gtids.append((slave_dict, slave,
+                                 slave.get_gtid_executed()))
+        try:
+            gtid_sets = [GtidSet(tnx_set) for _, _, tnx_set in slaves_gtids]
+        except UtilError:
+            # The sets are compared by the slaves.
+            gtid_sets = None
+        live_slaves = [slave_dict for slave_dict, _, _ in slaves_gtids]
 
+        # Check all slaves for executed transactions not in other slaves
+        for num, (slave_dict, slave, tnx_set) in enumerate(slaves_gtids):
             # Get master UUID from slave if master is not available
             if use_master_uuid_from_slave:
                 master_uuid = slave.get_master_uuid()
-
-            slave_set = set()
-            for others_slave_dic in self.slaves:
-                if (slave_dict['host'] != others_slave_dic['host'] or
-                        slave_dict['port'] != others_slave_dic['port']):
-                    other_slave = others_slave_dic['instance']
-                    # Skip not defined or dead slaves
-                    if not other_slave or not other_slave.is_alive():
-                        continue
-                    errant_res = other_slave.exec_query(
-                        _GTID_SUBTRACT_TO_EXECUTED.format(tnx_set))
-
-                    # Only consider the transaction as errant if not from the
-                    # current master.
-                    # Note: server UUID can appear with mixed cases (e.g. for
-                    # 5.6.9 servers the server_uuid is lower case and appears
-                    # in upper cases in the GTID_EXECUTED set.
-                    errant_set = set()
-                    for tnx in errant_res:
-                        if tnx[0] and not tnx[0].lower().startswith(
-                                master_uuid.lower()):
-                            errant_set.update(tnx[0].split(',\n'))
-
-                    # Errant transactions exist on only one slave, therefore if
-                    # the returned set is empty the loop can be break
-                    # (no need to check the remaining slaves).
-                    if not errant_set:
-                        break
-
-                    slave_set = slave_set.union(errant_set)
+            if gtid_sets is None:
+                slave_set = self._query_errant_transactions(
+                    slave_dict, tnx_set, live_slaves, master_uuid)
+            else:
+                slave_set = self._get_errant_transactions(
+                    num, live_slaves, gtid_sets, master_uuid)
             # Store result
             if slave_set:
-                res.append((slave_dict['host'], slave_dict['port'], slave_set))
+                res.append((slave_dict['host'], slave_dict['port'],
+                            slave_set))
 
         return res
 
+    @staticmethod
+    def _get_errant_transactions(num, slaves, gtid_sets, master_uuid):
+        """Get the errant transactions of a slave from the slaves GTID sets.
+
+        num[in]         position of the slave in the given slaves
+        slaves[in]      list of the dictionaries of the (live) slaves
+        gtid_sets[in]   list of the GTID_EXECUTED sets (GtidSet) of the
+                        slaves
+        master_uuid[in] UUID of the master
+
+        Returns set - GTID sets (one for each UUID) of the errant transactions
+        """
+        slave_dict = slaves[num]
+        tnx_set = gtid_sets[num]
+        # Note: server UUID can appear with mixed cases (e.g. for 5.6.9
+        # servers the server_uuid is lower case and appears in upper cases
+        # in the GTID_EXECUTED set), GtidSet uses lower case UUIDs.
+        master_uuid_lower = master_uuid.lower() if master_uuid else None
+
+        slave_errant = GtidSet()
+        for other_dict, other_set in zip(slaves, gtid_sets):
+            if (slave_dict['host'] == other_dict['host'] and
+                    slave_dict['port'] == other_dict['port']):
+                continue
+            # Only consider the transaction as errant if not from the
+            # current master.
+            errant_set = tnx_set - other_set
+            if not [uuid for uuid in errant_set.uuids()
+                    if uuid != master_uuid_lower]:
+                # Errant transactions exist on only one slave, therefore
+                # if the set is empty the loop can be break (no need to
+                # check the remaining slaves).
+                break
+
+            slave_errant = slave_errant | errant_set
+        return set(uuid_set for uuid_set in str(slave_errant).split(',')
+                   if uuid_set and not uuid_set.startswith(
+                       "{0}:".format(master_uuid_lower)))
+
+    @staticmethod
+    def _query_errant_transactions(slave_dict, tnx_set, slaves, master_uuid):
+        """Get the errant transactions of a slave querying the other slaves.
+
+        The GTID_SUBTRACT() function is executed on each other slave, used if
+        the GTID sets cannot be compared locally.
+
+        slave_dict[in]  dictionary of the slave
+        tnx_set[in]     GTID_EXECUTED set of the slave
+        slaves[in]      list of the dictionaries of the (live) slaves
+        master_uuid[in] UUID of the master
+
+        Returns set - GTID sets (one for each UUID) of the errant transactions
+        """
+        slave_set = set()
+        for other_dict in slaves:
+            if (slave_dict['host'] == other_dict['host'] and
+                    slave_dict['port'] == other_dict['port']):
+                continue
+            errant_res = other_dict['instance'].exec_query(
+                _GTID_SUBTRACT_TO_EXECUTED.format(tnx_set))
+
+            # Only consider the transaction as errant if not from the
+            # current master.
+            # Note: server UUID can appear with mixed cases (e.g. for
+            # 5.6.9 servers the server_uuid is lower case and appears
+            # in upper cases in the GTID_EXECUTED set.
+            errant_set = set()
+            for tnx in errant_res:
+                if tnx[0] and not tnx[0].lower().startswith(
+                        master_uuid.lower()):
+                    errant_set.update(tnx[0].split(',\n'))
+
+            # Errant transactions exist on only one slave, therefore if
+            # the returned set is empty the loop can be break
+            # (no need to check the remaining slaves).
+            if not errant_set:
+                break
+
+            slave_set = slave_set.union(errant_set)
+        return slave_set
+
     def _check_all_slaves(self, new_master):
         """Check all slaves for errors.
 
@@ -1535,6 +1636,13 @@ class Topology(Replication):
         representing the set of GTIDs from the given set not in the
         GTID_EXECUTED set of the corresponding slave.
         """
+        # Parse the GTID set once, the GTID_EXECUTED set of each slave is
+        # subtracted locally (see Server.gtid_subtract_executed).
+        try:
+            gtid_set = GtidSet(gtid_set)
+        except UtilError:
+            # Subtraction computed by the slaves.
+            pass
         if multithreading:
             # Create a pool of threads to execute the method for each slave.
             pool = ThreadPool(processes=len(self.slaves))
@@ -34,6 +34,7 @@ from mysql.utilities.command.audit_log import (AuditLog,
                                                command_requires_value,
                                                command_requires_log_name,
                                                command_requires_server)
+from mysql.utilities.common.audit_log_index import INDEX_SUFFIX
 from mysql.utilities.common.messages import PARSE_ERR_SSL_REQ_SERVER
 from mysql.utilities.common.options import (add_ssl_options, add_verbosity,
                                             UtilitiesParser,
@@ -296,7 +297,10 @@ if __name__ == '__main__':
 
         # Do file stats
         if opt.file_stats:
-            show_file_statistics(opt.log_name, True)
+            # Skip the sidecar index files of the audit logs.
+            show_file_statistics(opt.log_name, True,
+                                 exclude_suffixes=(INDEX_SUFFIX,
+                                                   INDEX_SUFFIX + '.tmp'))
 
     except UtilError:
         _, e, _ = sys.exc_info()
@@ -22,6 +22,7 @@ retrieve log entries according to the specified search criteria (i.e.,
 from specific users, search patterns, date ranges, or query types).
 """
 
+import multiprocessing
 import os.path
 import sys
 
@@ -61,6 +62,10 @@ if not check_connector_python():
     sys.exit(1)
 
 if __name__ == '__main__':
+    # Needed for freeze support to avoid RuntimeError when running as a Windows
+    # executable, otherwise ignored.
+    multiprocessing.freeze_support()
+
     # Setup the command parser
     program = os.path.basename(sys.argv[0]).replace(".py", "")
     parser = MyParser(
@@ -149,6 +154,31 @@ if __name__ == '__main__':
                            "error codes) or intervals marked with a dash. "
                            "For example: 1051,1068-1075,1109,1146.")
 
+    # Use the sidecar index of the audit log
+    parser.add_option("--index", action="store_true", default=False,
+                      dest="use_index",
+                      help="use a sidecar index of the audit log (stored in "
+                           "the file AUDIT_LOG_FILE.idx, created or updated "
+                           "as needed) to only read the regions of the log "
+                           "matching the --start-date, --end-date and "
+                           "--users search criteria.")
+
+    # Search the rotated audit logs
+    parser.add_option("--rotated", action="store_true", default=False,
+                      dest="rotated",
+                      help="also process the rotated audit log files (files "
+                           "named AUDIT_LOG_FILE.<timestamp>[.xml]) found in "
+                           "the directory of the audit log, before it, in "
+                           "timestamp order.")
+
+    # Add multiprocessing option.
+    parser.add_option("--multiprocess", action="store", dest="multiprocess",
+                      type="int", default="1", help="use multiprocessing, "
+                      "number of processes to use for concurrent processing "
+                      "of the audit log files, split in chunks. Special "
+                      "values: 0 (number of processes equal to the CPUs "
+                      "detected) and 1 (default - no concurrency).")
+
     # Add regexp option
     add_regexp(parser)
 
@@ -248,6 +278,21 @@ if __name__ == '__main__':
         status_list = get_value_intervals_list(parser, opt.status, '--status',
                                                'status')
 
+    # Check multiprocessing options.
+    if opt.multiprocess < 0:
+        parser.error("Number of processes '{0}' must be greater or equal than "
+                     "zero.".format(opt.multiprocess))
+    num_cpu = multiprocessing.cpu_count()
+    if opt.multiprocess > num_cpu:
+        sys.stderr.write("# WARNING: Number of processes '{0}' is greater "
+                         "than the number of CPUs '{1}'.\n"
+                         "".format(opt.multiprocess, num_cpu))
+    multiprocess = num_cpu if opt.multiprocess == 0 else opt.multiprocess
+    if multiprocess != 1 and os.name != 'posix':
+        sys.stderr.write("# WARNING: --multiprocess option ignored on "
+                         "non-POSIX systems.\n")
+        multiprocess = 1
+
     # Create dictionary of options
     options = {
         'log_name': args[0],
@@ -261,6 +306,9 @@ if __name__ == '__main__':
         'query_type': query_types,
         'event_type': event_types,
         'status': status_list,
+        'use_index': opt.use_index,
+        'rotated': opt.rotated,
+        'multiprocess': multiprocess,
     }
 
     try:
@@ -273,19 +321,24 @@ if __name__ == '__main__':
             # Open the audit log file
             log.open_log()
 
-            # Parse the audit log file and apply filters
-            log.parse_log()
+            if opt.stats:
+                # Read the header rows of the audit log file
+                log.read_header_rows()
 
-            # Close the audit log
-            log.close_log()
+                # Close the audit log
+                log.close_log()
 
-            if opt.stats:
                 # Show audit log stats
                 log.show_statistics()
             else:
-                # Print the resulting data (to the sdtout) in the specified
-                # format
-                log.output_formatted_log()
+                # Parse the audit log file, apply filters and print the
+                # resulting data (to the sdtout) in the specified format as
+                # it is found
+                try:
+                    log.output_formatted_log()
+                finally:
+                    # Close the audit log
+                    log.close_log()
 
     except UtilError:
         _, e, _ = sys.exc_info()
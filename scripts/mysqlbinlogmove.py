@@ -21,6 +21,7 @@ This file contains the binlog relocate utility. It is used to move binlog
 files to a different location, updating the binlog index files accordingly.
 """
 
+import multiprocessing
 import os
 import sys
 import mysql.utilities.command.binlog_admin as binlog_admin
@@ -105,6 +106,13 @@ will be moved, as shown in the following examples.
   $ mysqlbinlogmove --server=root:pass@host1:3306 \\
                     --modified-before=2004-07-30 /new/location
 
+  # Archive all binlog files not modified in the last seven days, except
+  # the one currently in use, compressing them with 4 processes to
+  # /archive/location.
+
+  $ mysqlbinlogmove --server=root:pass@host1:3306 --modified-before=7 \\
+                    --archive --multiprocess=4 /archive/location
+
 
 Helpful Hints
 -------------
@@ -119,9 +127,18 @@ Helpful Hints
   - When the --server option is used by default binary logs are flushed at the
     end of the relocate operation in order to update the server's info. Use
     --skip-flush-binlogs to skip this step.
+  - With the --archive option the files are compressed (gzip) to the
+    destination directory and removed from the index file, since the server
+    cannot read compressed files. The size, SHA-256 checksum and timestamps
+    of the first and last events of each file are appended to the
+    binlog_archive.manifest file in the destination directory.
 """
 
 if __name__ == '__main__':
+    # Needed for freeze support to avoid RuntimeError when running as a
+    # Windows executable, otherwise ignored.
+    multiprocessing.freeze_support()
+
     # Setup the command parser (with common options including --server).
     parser = setup_common_options(os.path.basename(sys.argv[0]),
                                   DESCRIPTION, USAGE, server=True,
@@ -198,6 +215,24 @@ if __name__ == '__main__':
                       help="Skip the binary/relay flush operation to reload "
                            "server's cache after moving files.")
 
+    # Add option to archive (compress) the files.
+    parser.add_option("--archive", action="store_true", dest="archive",
+                      default=False,
+                      help="archive the files, compressing them to the "
+                           "destination directory and removing them from the "
+                           "index file. A manifest with the size, checksum "
+                           "and first/last event timestamps of each file is "
+                           "written in the destination directory.")
+
+    # Add multiprocessing option.
+    parser.add_option("--multiprocess", action="store", dest="multiprocess",
+                      type="int", default="1",
+                      help="use multiprocessing, number of processes to use "
+                           "for concurrent compression of the files (used "
+                           "with --archive). Special values: 0 (number of "
+                           "processes equal to the CPUs detected) and 1 "
+                           "(default - no concurrency).")
+
     # Parse the options and arguments.
     opt, args = parser.parse_args()
 
@@ -310,6 +345,21 @@ if __name__ == '__main__':
         print(WARN_OPT_ONLY_USED_WITH.format(opt='--skip-flush-binlogs',
                                              used_with='--server'))
 
+    # Check multiprocessing options.
+    if opt.multiprocess < 0:
+        parser.error("Number of processes '{0}' must be greater or equal than "
+                     "zero.".format(opt.multiprocess))
+    if opt.multiprocess != 1 and not opt.archive:
+        print(WARN_OPT_ONLY_USED_WITH.format(opt='--multiprocess',
+                                             used_with='--archive'))
+    num_cpu = multiprocessing.cpu_count()
+    if opt.multiprocess > num_cpu:
+        print("# WARNING: Number of processes '{0}' is greater than the "
+              "number of CPUs '{1}'.".format(opt.multiprocess, num_cpu))
+    if opt.multiprocess != 1 and os.name != 'posix':
+        print("# WARNING: --multiprocess option ignored on non-POSIX "
+              "systems.")
+
     # Create dictionary of options
     options = {
         'verbosity': 0 if opt.verbosity is None else opt.verbosity,
@@ -317,6 +367,8 @@ if __name__ == '__main__':
         'sequence': sequence_list,
         'modified_before': modified_before,
         'skip_flush_binlogs': opt.skip_flush_binlogs,
+        'archive': opt.archive,
+        'multiprocess': opt.multiprocess,
     }
 
     # Relocate binary log files.
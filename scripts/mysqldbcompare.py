@@ -21,6 +21,7 @@ This file contains the operations to perform database consistency checking
 on two databases.
 """
 
+import multiprocessing
 import os
 import re
 import sys
@@ -30,7 +31,8 @@ from mysql.utilities.exception import UtilError, FormatError
 from mysql.utilities.command.dbcompare import (compare_all_databases,
                                                database_compare)
 from mysql.utilities.common.ip_parser import parse_connection
-from mysql.utilities.common.dbcompare import (DEFAULT_SPAN_KEY_SIZE,
+from mysql.utilities.common.dbcompare import (DEFAULT_CHUNK_SIZE,
+                                              DEFAULT_SPAN_KEY_SIZE,
                                               MAX_SPAN_KEY_SIZE)
 from mysql.utilities.common.pattern_matching import (REGEXP_OBJ_NAME,
                                                      REGEXP_OBJ_NAME_AQ)
@@ -39,6 +41,7 @@ from mysql.utilities.common.messages import (PARSE_ERR_DB_PAIR,
                                              PARSE_ERR_DB_PAIR_EXT,
                                              PARSE_ERR_DB_MISSING_CMP,
                                              PARSE_ERR_OPTS_REQ,
+                                             PARSE_ERR_OPT_REQ_GREATER_VALUE,
                                              PARSE_ERR_SPAN_KEY_SIZE_TOO_HIGH,
                                              PARSE_ERR_SPAN_KEY_SIZE_TOO_LOW,
                                              WARN_OPT_ONLY_USED_WITH)
@@ -72,6 +75,10 @@ if not check_connector_python():
     sys.exit(1)
 
 if __name__ == '__main__':
+    # Needed for freeze support to avoid RuntimeError when running as a Windows
+    # executable, otherwise ignored.
+    multiprocessing.freeze_support()
+
     # Setup the command parser
     parser = setup_common_options(os.path.basename(sys.argv[0]),
                                   DESCRIPTION, USAGE, server=False)
@@ -164,6 +171,32 @@ if __name__ == '__main__':
              "{0}.".format(DEFAULT_SPAN_KEY_SIZE)
     )
 
+    # add the algorithm options
+    parser.add_option(
+        "--algorithm", action="store", default="span", type="choice",
+        dest="algorithm", choices=["span", "chunk"],
+        help="algorithm used to find the row differences. 'span' (default) "
+             "fills a compare table with the hash of each row, holding a "
+             "lock on the table. 'chunk' compares the checksum of ranges of "
+             "rows (chunks) of the used index, and only the rows of the "
+             "chunks that differ, without compare tables and table locks."
+    )
+
+    parser.add_option(
+        "--chunk-size", action="store", default=DEFAULT_CHUNK_SIZE,
+        type="int", dest="chunk_size",
+        help="number of rows of each chunk compared by the chunk algorithm. "
+             "Default value is {0}.".format(DEFAULT_CHUNK_SIZE)
+    )
+
+    # Add multiprocessing option.
+    parser.add_option("--multiprocess", action="store", dest="multiprocess",
+                      type="int", default="1", help="use multiprocessing, "
+                      "number of processes to use for concurrent comparison "
+                      "of the objects of each database. Special values: 0 "
+                      "(number of processes equal to the CPUs detected) and "
+                      "1 (default - no concurrency).")
+
     # add the use indexes option
     parser.add_option(
         "--use-indexes", action="store", type="string", default='',
@@ -229,6 +262,18 @@ if __name__ == '__main__':
     # Check for regexp symbols
     check_exclude_pattern(exclude_list, opt.use_regexp)
 
+    # Check multiprocessing options.
+    if opt.multiprocess < 0:
+        parser.error("Number of processes '{0}' must be greater or equal than "
+                     "zero.".format(opt.multiprocess))
+    num_cpu = multiprocessing.cpu_count()
+    if opt.multiprocess > num_cpu and not opt.quiet:
+        print("# WARNING: Number of processes '{0}' is greater than the "
+              "number of CPUs '{1}'.".format(opt.multiprocess, num_cpu))
+    if opt.multiprocess != 1 and os.name != 'posix' and not opt.quiet:
+        print("# WARNING: --multiprocess option ignored on non-POSIX "
+              "systems.")
+
     db_idxes_l = None
 
     # Set options for database operations.
@@ -248,6 +293,9 @@ if __name__ == '__main__':
         "changes-for": opt.changes_for,
         "reverse": opt.reverse,
         "span_key_size": opt.span_key_size,
+        "algorithm": opt.algorithm,
+        "chunk_size": opt.chunk_size,
+        "multiprocess": num_cpu if opt.multiprocess == 0 else opt.multiprocess,
         "skip_table_opts": opt.skip_tbl_opts,
         "charset": opt.charset,
         "use_indexes": db_idxes_l,
@@ -351,6 +399,11 @@ if __name__ == '__main__':
                       " must be an even number. The value {0} will be used "
                       "instead.".format(opt.span_key_size - 1))
 
+    # Check --chunk-size value.
+    if opt.chunk_size < 1:
+        parser.error(PARSE_ERR_OPT_REQ_GREATER_VALUE.format(opt="--chunk-size",
+                                                            val="0"))
+
     # Operations to perform:
     # 1) databases exist
     # 2) check object counts
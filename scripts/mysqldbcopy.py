@@ -44,7 +44,8 @@ from mysql.utilities.common.options import (add_skip_options, add_verbosity,
                                             add_character_set_option,
                                             check_password_security,
                                             add_exclude, check_exclude_pattern)
-from mysql.utilities.common.server import connect_servers
+from mysql.utilities.common.server import (close_connection_pools,
+                                           connect_servers)
 from mysql.utilities.common.sql_transform import (is_quoted_with_backticks,
                                                   remove_backtick_quoting)
 from mysql.utilities.common.tools import (check_connector_python,
@@ -140,6 +141,15 @@ if __name__ == '__main__':
                       "Special values: 0 (number of processes equal to the "
                       "CPUs detected) and 1 (default - no concurrency).")
 
+    # Add number of writer connections option.
+    parser.add_option("--connections", action="store", dest="connections",
+                      type="int", default="1", help="number of destination "
+                      "connections (writer processes) used to insert the data "
+                      "of each table while it is read from the source in "
+                      "batches. Ignored for tables copied concurrently with "
+                      "--multiprocess. Default: 1 (read all rows of the "
+                      "table, then insert them).")
+
     # Add override for blob not null test
     parser.add_option("--not-null-blobs", action="store_true",
                       dest="not_null_blobs", default=False,
@@ -196,6 +206,11 @@ if __name__ == '__main__':
         print("# WARNING: Number of processes '{0}' is greater than the "
               "number of CPUs '{1}'.".format(opt.multiprocess, num_cpu))
 
+    # Check number of writer connections.
+    if opt.connections < 1:
+        parser.error("Number of connections '{0}' must be greater than "
+                     "zero.".format(opt.connections))
+
     # Warning for non-posix (windows) systems if too many process are used.
     num_db = len(args)
     if (os.name != 'posix' and num_db and opt.multiprocess > num_db and
@@ -231,6 +246,7 @@ if __name__ == '__main__':
         "skip_gtid": opt.skip_gtid,
         "charset": opt.charset,
         "multiprocess": num_cpu if opt.multiprocess == 0 else opt.multiprocess,
+        "connections": opt.connections,
         "before_alter": [],
         "after_alter": [],
     }
@@ -404,5 +420,8 @@ if __name__ == '__main__':
         _, err, _ = sys.exc_info()
         print("ERROR: {0}".format(err.errmsg))
         sys.exit(1)
+    finally:
+        # Close the idle connections kept by the connection pools.
+        close_connection_pools()
 
     sys.exit()
@@ -39,7 +39,8 @@ from mysql.utilities.common.options import (
     check_skip_options, check_verbosity, setup_common_options,
     check_password_security, get_ssl_dict, add_exclude, check_exclude_pattern
 )
-from mysql.utilities.common.server import connect_servers
+from mysql.utilities.common.server import (close_connection_pools,
+                                           connect_servers)
 from mysql.utilities.common.sql_transform import (is_quoted_with_backticks,
                                                   remove_backtick_quoting)
 from mysql.utilities.common.tools import (check_connector_python,
@@ -163,6 +164,23 @@ if __name__ == '__main__':
                       "Special values: 0 (number of processes equal to the "
                       "CPUs detected) and 1 (default - no concurrency).")
 
+    # Add table chunking option.
+    parser.add_option("--chunk-size", action="store", dest="chunk_size",
+                      type="int", default="0", help="split the data of each "
+                      "table with a PRIMARY KEY or UNIQUE NOT NULL index into "
+                      "key ranges of the given number of rows, exported "
+                      "concurrently. The ranges are merged in key order or "
+                      "written to numbered files with --file-per-table. "
+                      "Valid only with --multiprocess and for the sql, csv "
+                      "and tab formats. Default: 0 (do not split tables).")
+
+    # Add streaming option.
+    parser.add_option("--stream", action="store_true", dest="stream",
+                      default=False, help="retrieve table data in fixed-size "
+                      "batches using an unbuffered cursor and write each "
+                      "batch as soon as it is read, keeping memory usage "
+                      "bounded regardless of the table size.")
+
     # Add output file option.
     parser.add_option("--output-file", action="store", dest="output_file",
                       help="path and file name to store the generated output, "
@@ -227,6 +245,14 @@ if __name__ == '__main__':
         print("# WARNING: Number of processes '{0}' is greater than the "
               "number of CPUs '{1}'.".format(opt.multiprocess, num_cpu))
 
+    # Check table chunking options.
+    if opt.chunk_size < 0:
+        parser.error("The value for --chunk-size '{0}' must be greater or "
+                     "equal than zero.".format(opt.chunk_size))
+    if opt.chunk_size and opt.multiprocess == 1 and not opt.quiet:
+        print("# WARNING: --chunk-size option ignored without "
+              "--multiprocess.")
+
     # Warning for non-posix (windows) systems if too many process are used.
     num_db = len(args)
     if (os.name != 'posix' and num_db and opt.multiprocess > num_db and
@@ -287,6 +313,8 @@ if __name__ == '__main__':
         "charset": opt.charset,
         "multiprocess": num_cpu if opt.multiprocess == 0 else opt.multiprocess,
         "output_filename": output_filename,
+        "stream": opt.stream,
+        "chunk_size": opt.chunk_size,
     }
 
     # Parse server connection values
@@ -379,5 +407,8 @@ if __name__ == '__main__':
         _, err, _ = sys.exc_info()
         print("ERROR: {0}".format(err.errmsg))
         sys.exit(1)
+    finally:
+        # Close the idle connections kept by the connection pools.
+        close_connection_pools()
 
     sys.exit()
@@ -45,7 +45,8 @@ from mysql.utilities.common.options import (add_character_set_option,
 from mysql.utilities.common.pattern_matching import (
     REGEXP_QUALIFIED_OBJ_NAME,
     REGEXP_QUALIFIED_OBJ_NAME_AQ)
-from mysql.utilities.common.server import connect_servers
+from mysql.utilities.common.server import (close_connection_pools,
+                                           connect_servers)
 from mysql.utilities.common.tools import (check_connector_python,
                                           print_elapsed_time)
 from mysql.utilities.exception import FormatError, UtilError
@@ -102,6 +103,12 @@ if __name__ == '__main__':
                       dest="bulk_insert", default=False, help="use bulk "
                       "insert statements for data (default:False)")
 
+    # Bulk load mode
+    parser.add_option("--bulk-load", action="store_true", dest="bulk_load",
+                      default=False, help="use LOAD DATA LOCAL INFILE to "
+                      "import the table data from CSV or TAB files, instead "
+                      "of INSERT statements (default:False)")
+
     # No header option
     add_no_headers_option(parser, restricted_formats=['tab', 'csv'],
                           help_msg="files do not contain column headers")
@@ -200,7 +207,7 @@ if __name__ == '__main__':
 
     # Warning if too many process are used.
     num_files = len(args)
-    if opt.multiprocess > num_files and not opt.quiet:
+    if opt.multiprocess > num_files > 1 and not opt.quiet:
         print("# WARNING: Number of processes '{0}' is greater than the "
               "number of files to import '{1}'.".format(opt.multiprocess,
                                                         num_files))
@@ -212,6 +219,11 @@ if __name__ == '__main__':
     if opt.max_bulk_insert and not opt.bulk_insert and not opt.quiet:
         print(WARN_OPT_ONLY_USED_WITH.format(opt="--max-bulk-insert",
                                              used_with="--bulk-insert"))
+    # Check bulk load option.
+    if opt.bulk_load and opt.format not in ("csv", "tab", "raw_csv"):
+        parser.error("The --bulk-load option can only be used with "
+                     "--format=csv, tab or raw_csv.")
+
     # Set default value for max bulk insert.
     max_bulk_size = opt.max_bulk_insert if opt.max_bulk_insert else 30000
 
@@ -245,6 +257,7 @@ if __name__ == '__main__':
         "multiprocess": num_cpu if opt.multiprocess == 0 else opt.multiprocess,
         "autocommit": opt.autocommit,
         "max_bulk_insert": max_bulk_size,
+        "bulk_load": opt.bulk_load,
     }
 
     # Parse server connection values
@@ -317,9 +330,14 @@ if __name__ == '__main__':
         import_file_tasks = []
         for file_name in file_list:
             # Check multiprocess file import.
-            # Note: Multiprocessing is only applied at the file level,
-            # independently from the system (posix or not).
-            if options['multiprocess'] > 1:
+            # Note: Multiprocessing is applied at the file level or, for a
+            # single file, at the table level, independently from the system
+            # (posix or not).
+            if options['multiprocess'] > 1 and len(file_list) == 1:
+                # Import the data of the tables concurrently.
+                dbimport.import_file_by_table(server_values, file_name,
+                                              options)
+            elif options['multiprocess'] > 1:
                 # Create import file task.
                 import_task = {
                     'srv_con': server_values,
@@ -351,5 +369,8 @@ if __name__ == '__main__':
         _, err, _ = sys.exc_info()
         print("ERROR: {0}".format(err.errmsg))
         sys.exit(1)
+    finally:
+        # Close the idle connections kept by the connection pools.
+        close_connection_pools()
 
     sys.exit()
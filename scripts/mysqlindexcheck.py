@@ -23,7 +23,8 @@ all tables in each database), a list of tables in the for db.table,
 or all tables in all databases except internal databases.
 """
 
-import os.path
+import multiprocessing
+import os
 import sys
 
 from mysql.utilities.common.tools import check_python_version
@@ -48,6 +49,10 @@ if not check_connector_python():
     sys.exit(1)
 
 if __name__ == '__main__':
+    # Needed for freeze support to avoid RuntimeError when running as a
+    # Windows executable, otherwise ignored.
+    multiprocessing.freeze_support()
+
     # Setup the command parser and setup server, help
     parser = setup_common_options(os.path.basename(sys.argv[0]),
                                   DESCRIPTION, USAGE, False, True, None)
@@ -93,6 +98,22 @@ if __name__ == '__main__':
                       help="reports if a table has neither UNIQUE indexes nor"
                            " a PRIMARY key")
 
+    # Load the index metadata of all tables at once
+    parser.add_option("--bulk", action="store_true", dest="bulk",
+                      default=False,
+                      help="load the indexes of all the tables to check at "
+                           "once from the INFORMATION_SCHEMA, instead of "
+                           "querying each table (recommended to check a large "
+                           "number of tables).")
+
+    # Add multiprocessing option.
+    parser.add_option("--multiprocess", action="store", dest="multiprocess",
+                      type="int", default="1", help="use multiprocessing, "
+                      "number of processes to use for concurrent checking "
+                      "of the indexes of the tables (implies --bulk). "
+                      "Special values: 0 (number of processes equal to the "
+                      "CPUs detected) and 1 (default - no concurrency).")
+
     # Add verbosity mode
     add_verbosity(parser, False)
 
@@ -153,6 +174,19 @@ if __name__ == '__main__':
         parser.error("You must specify --stats for --best or --worst to take "
                      "effect.")
 
+    # Check multiprocessing options.
+    if opt.multiprocess < 0:
+        parser.error("Number of processes '{0}' must be greater or equal than "
+                     "zero.".format(opt.multiprocess))
+    num_cpu = multiprocessing.cpu_count()
+    if opt.multiprocess > num_cpu:
+        print("# WARNING: Number of processes '{0}' is greater than the "
+              "number of CPUs '{1}'.".format(opt.multiprocess, num_cpu))
+    if opt.multiprocess != 1 and os.name != 'posix':
+        print("# WARNING: --multiprocess option ignored on non-POSIX "
+              "systems.")
+    multiprocess = num_cpu if opt.multiprocess == 0 else opt.multiprocess
+
     # Build dictionary of options
     options = {
         "show-drops": opt.show_drops,
@@ -163,7 +197,9 @@ if __name__ == '__main__':
         "stats": opt.stats,
         "best": best,
         "worst": worst,
-        "report-indexes": opt.report_indexes
+        "report-indexes": opt.report_indexes,
+        "bulk": opt.bulk or multiprocess > 1,
+        "multiprocess": multiprocess,
     }
 
     try:
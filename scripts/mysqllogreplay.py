@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+
+"""
+This file contains the general query log replay utility. It replays the
+sessions of a general query log against a server and reports the latency of
+the statements.
+"""
+
+import multiprocessing
+import os
+import sys
+
+from mysql.utilities.common.tools import check_python_version
+from mysql.utilities.command.log_replay import replay_general_log
+from mysql.utilities.common.ip_parser import parse_connection
+from mysql.utilities.common.messages import (
+    PARSE_ERR_OPTS_REQ, PARSE_ERR_OPT_REQ_GREATER_VALUE,
+    PARSE_ERR_OPT_REQ_NON_NEGATIVE_VALUE)
+from mysql.utilities.common.options import (add_format_option, add_verbosity,
+                                            get_ssl_dict,
+                                            setup_common_options)
+from mysql.utilities.common.tools import check_connector_python
+from mysql.utilities.exception import FormatError, UtilError
+
+# Check Python version compatibility
+check_python_version()
+
+# Constants
+NAME = "MySQL Utilities - mysqllogreplay "
+DESCRIPTION = "mysqllogreplay - general query log replay utility"
+USAGE = "%prog --server=user:pass@host:port GENERAL_LOG_FILE"
+EXTENDED_HELP = """
+Introduction
+------------
+The mysqllogreplay utility rebuilds the sessions (connections) found in a
+general query log and replays their statements against a server, for
+example to test a new server with the production workload. The statements
+of each session are executed in their original order using a new
+connection, and several sessions can be replayed concurrently. When the
+replay ends, the latency percentiles of the statements, grouped by
+fingerprint (the statement with the literal values replaced by '?'), are
+reported.
+
+WARNING: All the statements found in the log are executed, including the
+ones that change data. Use a server with a copy of the data.
+
+The following are examples of use:
+  # Replay the sessions of a general query log using 8 connections.
+  $ mysqllogreplay --server=root:pass@host1:3306 --connections=8 \\
+                   /var/lib/mysql/host2.log
+
+  # Replay the sessions keeping the original timing of the statements, but
+  # twice as fast.
+  $ mysqllogreplay --server=root:pass@host1:3306 --connections=50 \\
+                   --timing --speed=2 /var/lib/mysql/host2.log
+"""
+
+# Check for connector/python
+if not check_connector_python():
+    sys.exit(1)
+
+if __name__ == '__main__':
+    # Needed for freeze support to avoid RuntimeError when running as a Windows
+    # executable, otherwise ignored.
+    multiprocessing.freeze_support()
+
+    # Setup the command parser
+    parser = setup_common_options(os.path.basename(sys.argv[0]),
+                                  DESCRIPTION, USAGE, server=True,
+                                  server_default=None,
+                                  extended_help=EXTENDED_HELP)
+
+    # Number of concurrent connections
+    parser.add_option("--connections", action="store", dest="connections",
+                      type="int", default=1,
+                      help="number of sessions replayed concurrently, each "
+                      "one using its own connection (and process). "
+                      "Default = 1.")
+
+    # Keep the original timing
+    parser.add_option("--timing", action="store_true", dest="timing",
+                      default=False,
+                      help="keep the original timing of the statements, "
+                      "delaying their execution until the time elapsed "
+                      "since the first entry of the log. By default, the "
+                      "statements are executed as fast as possible.")
+
+    # Speed factor
+    parser.add_option("--speed", action="store", dest="speed", type="float",
+                      default=1.0,
+                      help="speed factor applied to the original timing of "
+                      "the statements, for example 2 to replay them twice "
+                      "as fast. Only used with --timing. Default = 1.")
+
+    # Number of statements to report
+    parser.add_option("--top", action="store", dest="top", type="int",
+                      default=10,
+                      help="number of statement fingerprints to report "
+                      "(with the highest total time). Use 0 to report all "
+                      "of them. Default = 10.")
+
+    # Output format
+    add_format_option(parser, "display the report in either grid (default), "
+                      "tab, csv, or vertical format", "grid")
+
+    # Add verbosity
+    add_verbosity(parser, quiet=False)
+
+    # Now we process the rest of the arguments.
+    opt, args = parser.parse_args()
+
+    # Check mandatory options: --server
+    if not opt.server:
+        parser.error(PARSE_ERR_OPTS_REQ.format(opt="--server"))
+
+    # Check the general query log file.
+    if len(args) != 1:
+        parser.error("You must specify one general query log file.")
+    if args[0] != '-' and not os.path.isfile(args[0]):
+        parser.error("The specified general query log file does not exist: "
+                     "{0}".format(args[0]))
+
+    # Check --connections, --speed and --top values.
+    if opt.connections < 1:
+        parser.error(PARSE_ERR_OPT_REQ_GREATER_VALUE.format(
+            opt="--connections", val="0"))
+    if opt.speed <= 0:
+        parser.error(PARSE_ERR_OPT_REQ_GREATER_VALUE.format(opt="--speed",
+                                                            val="0"))
+    if opt.top < 0:
+        parser.error(PARSE_ERR_OPT_REQ_NON_NEGATIVE_VALUE.format(opt="--top"))
+
+    # Parse server connection values
+    try:
+        ssl_opts = get_ssl_dict(opt)
+        server_val = parse_connection(opt.server, None, ssl_opts)
+    except FormatError as err:
+        # pylint: disable=E1101
+        parser.error("ERROR: {0}\n".format(err.errmsg))
+    except UtilError as err:
+        parser.error("ERROR: {0}\n".format(err.errmsg))
+
+    # Create dictionary of options
+    options = {
+        'connections': opt.connections,
+        'timing': opt.timing,
+        'speed': opt.speed,
+        'top': opt.top,
+        'format': opt.format,
+        'verbosity': 0 if opt.verbosity is None else opt.verbosity,
+    }
+
+    try:
+        replay_general_log(server_val, args[0], options)
+    except UtilError:
+        _, e, _ = sys.exc_info()
+        sys.stderr.write("ERROR: {0}\n".format(e.errmsg))
+        sys.exit(1)
+
+    sys.exit(0)
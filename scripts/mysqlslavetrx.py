@@ -27,7 +27,8 @@ import sys
 
 from mysql.utilities.common.tools import check_python_version
 from mysql.utilities.command.rpl_admin import skip_slaves_trx
-from mysql.utilities.common.messages import PARSE_ERR_OPTS_REQ
+from mysql.utilities.common.messages import (PARSE_ERR_OPTS_REQ,
+                                             PARSE_ERR_OPT_INVALID_VALUE)
 from mysql.utilities.common.options import (add_slaves_option, add_verbosity,
                                             check_gtid_set_format,
                                             check_password_security,
@@ -113,6 +114,17 @@ if __name__ == '__main__':
                            "them (injecting empty transactions) - useful to "
                            "test the transactions that would be skipped.")
 
+    # Add option for the number of transactions injected per round trip.
+    parser.add_option("--batch-size", action="store", dest="batch_size",
+                      type="int", default=1,
+                      help="number of empty transactions sent to each slave "
+                           "per round trip. If greater than 1, the "
+                           "transactions are injected in batches "
+                           "(multi-statement queries) on all slaves "
+                           "concurrently, reporting the progress and "
+                           "throughput for each slave. By default 1 (one "
+                           "transaction at a time).")
+
     # Add verbose option (no --quiet option).
     add_verbosity(parser, False)
 
@@ -131,6 +143,11 @@ if __name__ == '__main__':
     # Check GTID set format.
     check_gtid_set_format(parser, opt.gtid_set)
 
+    # Check the batch size.
+    if opt.batch_size < 1:
+        parser.error(PARSE_ERR_OPT_INVALID_VALUE.format(
+            option='--batch-size', value=opt.batch_size))
+
     # Parse the connection parameters for the slaves (no candidates).
     try:
         opt.master = None  # No master option available, set value to None.
@@ -146,6 +163,7 @@ if __name__ == '__main__':
     options = {
         'verbosity': 0 if opt.verbosity is None else opt.verbosity,
         'dry_run': opt.dry_run,
+        'batch_size': opt.batch_size,
     }
 
     # Skip transactions for the given list of slaves.
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+
+"""
+This file contains the slow query log digest utility. It groups the queries
+of slow query log files by fingerprint and reports the statistics of the top
+fingerprints.
+"""
+
+import os
+import sys
+
+from mysql.utilities.common.tools import check_python_version
+from mysql.utilities.command.slow_log import digest_slow_logs, SORT_TYPES
+from mysql.utilities.common.messages import \
+    PARSE_ERR_OPT_REQ_NON_NEGATIVE_VALUE
+from mysql.utilities.common.options import (add_format_option, add_verbosity,
+                                            setup_common_options)
+from mysql.utilities.exception import UtilError
+
+# Check Python version compatibility
+check_python_version()
+
+# Constants
+NAME = "MySQL Utilities - mysqlslowlog "
+DESCRIPTION = "mysqlslowlog - slow query log digest utility"
+USAGE = "%prog [options] SLOW_LOG_FILE [SLOW_LOG_FILE ...]"
+EXTENDED_HELP = """
+Introduction
+------------
+The mysqlslowlog utility reads slow query log files and groups the queries
+by fingerprint, i.e. the query with the literal values replaced by '?'. For
+each fingerprint it reports the number of queries and the total, average and
+95th percentile of the query time, lock time and rows examined. The log
+files are read in a single pass and only the statistics of each fingerprint
+are kept in memory, so large log files can be processed.
+
+The following are examples of use:
+  # Show the 10 fingerprints with the highest total query time.
+  $ mysqlslowlog /var/lib/mysql/host1-slow.log
+
+  # Show the 5 most frequent queries, including an example of each one.
+  $ mysqlslowlog --top=5 --sort=count -v /var/lib/mysql/host1-slow.log
+
+  # Read the slow query log from the standard input.
+  $ zcat host1-slow.log.gz | mysqlslowlog -
+"""
+
+if __name__ == '__main__':
+    # Setup the command parser
+    parser = setup_common_options(os.path.basename(sys.argv[0]),
+                                  DESCRIPTION, USAGE, server=False,
+                                  extended_help=EXTENDED_HELP)
+
+    # Number of fingerprints to report
+    parser.add_option("--top", action="store", dest="top", type="int",
+                      default=10,
+                      help="number of fingerprints to report. Use 0 to "
+                      "report all of them. Default = 10.")
+
+    # Sort criteria
+    parser.add_option("--sort", action="store", dest="sort", type="choice",
+                      default="query_time", choices=SORT_TYPES,
+                      help="sort the fingerprints by the total of the "
+                      "specified statistic or by the number of queries. "
+                      "Valid values: count, query_time, lock_time, "
+                      "rows_examined. Default = query_time.")
+
+    # Output format
+    add_format_option(parser, "display the report in either grid (default), "
+                      "tab, csv, or vertical format", "grid")
+
+    # Add verbosity
+    add_verbosity(parser, quiet=False)
+
+    # Now we process the rest of the arguments.
+    opt, args = parser.parse_args()
+
+    # Check the slow query log files.
+    if not args:
+        parser.error("You must specify at least one slow query log file.")
+    for log_file in args:
+        if log_file != '-' and not os.path.isfile(log_file):
+            parser.error("The specified slow query log file does not exist: "
+                         "{0}".format(log_file))
+
+    # Check --top value.
+    if opt.top < 0:
+        parser.error(PARSE_ERR_OPT_REQ_NON_NEGATIVE_VALUE.format(opt="--top"))
+
+    # Create dictionary of options
+    options = {
+        'top': opt.top,
+        'sort': opt.sort,
+        'format': opt.format,
+        'verbosity': 0 if opt.verbosity is None else opt.verbosity,
+    }
+
+    try:
+        digest_slow_logs(args, options)
+    except UtilError:
+        _, e, _ = sys.exc_info()
+        sys.stderr.write("ERROR: {0}\n".format(e.errmsg))
+        sys.exit(1)
+
+    sys.exit(0)
@@ -0,0 +1,198 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the sidecar index of the audit log
+(mysql.utilities.common.audit_log_index module).
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mysql.utilities.common import audit_log_index
+from mysql.utilities.common.audit_log_index import AuditLogIndex
+from mysql.utilities.common.audit_log_parser import AuditLogParser
+
+_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n<AUDIT>\n'
+
+_NEW_AUDIT = """\
+ <AUDIT_RECORD>
+  <TIMESTAMP>2014-03-{day:02d}T00:00:00 UTC</TIMESTAMP>
+  <RECORD_ID>1_2014-03-{day:02d}T00:00:00</RECORD_ID>
+  <NAME>Audit</NAME>
+  <SERVER_ID>1</SERVER_ID>
+ </AUDIT_RECORD>
+"""
+
+_NEW_CONNECT = """\
+ <AUDIT_RECORD>
+  <TIMESTAMP>2014-03-{day:02d}T{hour:02d}:00:00 UTC</TIMESTAMP>
+  <RECORD_ID>{num}_2014-03-{day:02d}T00:00:00</RECORD_ID>
+  <NAME>Connect</NAME>
+  <CONNECTION_ID>{conn}</CONNECTION_ID>
+  <STATUS>0</STATUS>
+  <USER>{user}</USER>
+  <PRIV_USER>{user}</PRIV_USER>
+ </AUDIT_RECORD>
+"""
+
+_NEW_QUERY = """\
+ <AUDIT_RECORD>
+  <TIMESTAMP>2014-03-{day:02d}T{hour:02d}:00:00 UTC</TIMESTAMP>
+  <RECORD_ID>{num}_2014-03-{day:02d}T00:00:00</RECORD_ID>
+  <NAME>Query</NAME>
+  <CONNECTION_ID>{conn}</CONNECTION_ID>
+  <STATUS>0</STATUS>
+  <SQLTEXT>SELECT {num} FROM t1 WHERE a &lt; 'x'</SQLTEXT>
+ </AUDIT_RECORD>
+"""
+
+_OLD_AUDIT = ('  <AUDIT_RECORD TIMESTAMP="2012-09-{day:02d}T00:00:00" '
+              'NAME="Audit" SERVER_ID="1" VERSION="1"/>\n')
+_OLD_CONNECT = ('  <AUDIT_RECORD '
+                'TIMESTAMP="2012-09-{day:02d}T{hour:02d}:00:00" '
+                'NAME="Connect" CONNECTION_ID="{conn}" STATUS="0" '
+                'USER="{user}" PRIV_USER="{user}" HOST="localhost"/>\n')
+_OLD_QUERY = ('  <AUDIT_RECORD '
+              'TIMESTAMP="2012-09-{day:02d}T{hour:02d}:00:00" '
+              'NAME="Query" CONNECTION_ID="{conn}" STATUS="0" '
+              'SQLTEXT="SELECT {num}\n FROM t1"/>\n')
+
+_USERS = ['root', 'joe', 'sally']
+
+
+def _generate_records(templates, days):
+    """Generate the records of an audit log (one server startup per day).
+    """
+    audit, connect, query = templates
+    records = []
+    num = 0
+    for day in days:
+        records.append(audit.format(day=day))
+        for hour in range(24):
+            conn = hour % 5 + 1
+            num += 1
+            records.append(connect.format(day=day, hour=hour, num=num,
+                                          conn=conn,
+                                          user=_USERS[hour % len(_USERS)]))
+            for _ in range(3):
+                num += 1
+                records.append(query.format(day=day, hour=hour, num=num,
+                                            conn=conn))
+    return ''.join(records)
+
+
+class TestAuditLogIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.block_size = audit_log_index._BLOCK_SIZE
+        audit_log_index._BLOCK_SIZE = 4096
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_name = os.path.join(self.tmp_dir, 'audit.log')
+
+    def tearDown(self):
+        audit_log_index._BLOCK_SIZE = self.block_size
+        shutil.rmtree(self.tmp_dir)
+
+    def _write_log(self, data, mode='w'):
+        with open(self.log_name, mode) as log_file:
+            log_file.write(data)
+
+    def _search(self, use_index, **criteria):
+        options = {'log_name': self.log_name, 'format': 'raw',
+                   'users': None, 'start_date': None, 'end_date': None,
+                   'pattern': None, 'query_type': None, 'event_type': None,
+                   'status': None, 'use_index': use_index}
+        options.update(criteria)
+        log = AuditLogParser(options)
+        log.open_log()
+        log.parse_log()
+        log.close_log()
+        return log.rows, log.header_rows
+
+    def _check_searches(self, dates):
+        for criteria in ({}, {'users': ['joe']}, {'users': ['spam']},
+                         {'start_date': dates[0]}, {'end_date': dates[1]},
+                         {'start_date': dates[0], 'end_date': dates[1],
+                          'users': ['sally', 'root']}):
+            rows, header_rows = self._search(False, **criteria)
+            self.assertEqual((rows, header_rows),
+                             self._search(True, **criteria))
+
+    def test_searches(self):
+        for templates, dates in (
+                ((_NEW_AUDIT, _NEW_CONNECT, _NEW_QUERY),
+                 ('2014-03-02T06:00:00', '2014-03-03T12:00:00')),
+                ((_OLD_AUDIT, _OLD_CONNECT, _OLD_QUERY),
+                 ('2012-09-02T06:00:00', '2012-09-03T12:00:00'))):
+            self._write_log(_HEADER + _generate_records(templates,
+                                                        range(1, 5)))
+            self._check_searches(dates)
+
+    def test_ranges(self):
+        self._write_log(_HEADER + _generate_records(
+            (_NEW_AUDIT, _NEW_CONNECT, _NEW_QUERY), range(1, 5)))
+        index = AuditLogIndex(self.log_name)
+        blocks = index.update()
+        self.assertTrue(len(blocks) > 4)
+        self.assertEqual(blocks[0]['start'], len(_HEADER))
+        for block, next_block in zip(blocks, blocks[1:]):
+            self.assertEqual(block['end'], next_block['start'])
+        size = blocks[-1]['end'] - blocks[0]['start']
+        self.assertEqual(index.get_ranges(),
+                         [(blocks[0]['start'], blocks[-1]['end'])])
+        # Only a part of the log is read for the last day, but the blocks
+        # with 'Audit' records are read.
+        ranges = index.get_ranges(start_date='2014-03-04T00:00:00')
+        self.assertTrue(sum(end - start for start, end in ranges) < size / 2)
+        self.assertEqual(ranges[0][0], blocks[0]['start'])
+
+    def test_incremental_and_rotation(self):
+        templates = (_NEW_AUDIT, _NEW_CONNECT, _NEW_QUERY)
+        index_name = audit_log_index.get_index_name(self.log_name)
+        # Last record not complete yet.
+        data = _HEADER + _generate_records(templates, [1])
+        new_data = _generate_records(templates, [2, 3])
+        self._write_log(data + new_data[:50])
+        self._search(True)
+        self.assertTrue(os.path.exists(index_name))
+        index = AuditLogIndex(self.log_name)
+        index.update()
+        self.assertFalse(index.changed)
+        self.assertEqual(index.size, len(data))
+
+        # The log grows, the index is extended.
+        self._write_log(new_data[50:], 'a')
+        self._check_searches(('2014-03-01T12:00:00', '2014-03-02T12:00:00'))
+        index = AuditLogIndex(self.log_name)
+        blocks = index.update()
+        self.assertFalse(index.changed)
+        self.assertEqual(blocks[0]['start'], len(_HEADER))
+        self.assertTrue(blocks[-1]['max_ts'].startswith('2014-03-03'))
+
+        # The log is rotated, the index is rebuilt.
+        self._write_log(_HEADER + _generate_records(templates, [5]))
+        index = AuditLogIndex(self.log_name)
+        blocks = index.update()
+        self.assertTrue(index.changed)
+        self.assertTrue(blocks[0]['min_ts'].startswith('2014-03-05'))
+        self._check_searches(('2014-03-05T06:00:00', '2014-03-05T12:00:00'))
+
+
+if __name__ == '__main__':
+    unittest.main()
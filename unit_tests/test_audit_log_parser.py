@@ -0,0 +1,218 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the prefiltering of the records and the
+split of the logs of the audit log parser
+(mysql.utilities.common.audit_log_parser module).
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mysql.utilities.common import audit_log_parser
+from mysql.utilities.common.audit_log_parser import (AuditLogParser,
+                                                      get_log_files,
+                                                      split_log)
+from mysql.utilities.common.audit_log_reader import get_raw_fields
+from mysql.utilities.exception import UtilError
+
+_AUDIT_LOG = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<AUDIT>
+  <AUDIT_RECORD TIMESTAMP="2012-09-27T13:33:11" NAME="Audit" SERVER_ID="1" \
+VERSION="1" MYSQL_VERSION="5.5.29-log"/>
+  <AUDIT_RECORD TIMESTAMP="2012-09-27T13:33:39" NAME="Connect" \
+CONNECTION_ID="7" STATUS="0" USER="root" PRIV_USER="root" HOST="localhost"/>
+  <AUDIT_RECORD TIMESTAMP="2012-09-27T13:33:39" NAME="Query" \
+CONNECTION_ID="7" STATUS="0" SQLTEXT="SELECT
+ 1 FROM t1 WHERE a = &quot;NAME=&quot;"/>
+  <AUDIT_RECORD TIMESTAMP="2012-09-27T13:34:48" NAME="Query" \
+CONNECTION_ID="8" STATUS="1046" SQLTEXT="drop table t1"/>
+  <AUDIT_RECORD TIMESTAMP="2012-09-28T11:26:50" NAME="Quit" \
+CONNECTION_ID="7" STATUS="0"/>
+ <AUDIT_RECORD>
+  <TIMESTAMP>2014-03-18T11:15:43 UTC</TIMESTAMP>
+  <RECORD_ID>3_2014-03-18T11:15:34</RECORD_ID>
+  <NAME>Query</NAME>
+  <CONNECTION_ID>7</CONNECTION_ID>
+  <STATUS>0</STATUS>
+  <STATUS_CODE>0</STATUS_CODE>
+  <SQLTEXT>commit</SQLTEXT>
+ </AUDIT_RECORD>
+</AUDIT>
+"""
+
+
+class TestAuditLogPrefilter(unittest.TestCase):
+
+    def setUp(self):
+        log_file, self.log_name = tempfile.mkstemp()
+        os.write(log_file, _AUDIT_LOG)
+        os.close(log_file)
+
+    def tearDown(self):
+        os.remove(self.log_name)
+
+    def _search(self, prefilter, **criteria):
+        options = {'log_name': self.log_name, 'format': 'grid',
+                   'users': None, 'start_date': None, 'end_date': None,
+                   'pattern': None, 'query_type': None, 'event_type': None,
+                   'status': None}
+        options.update(criteria)
+        log = AuditLogParser(options)
+        if not prefilter:
+            log._prefilter = lambda raw_record: True
+        parsed = []
+        make_record = log._make_record
+
+        def _make_record(node, new_format=False):
+            parsed.append(node)
+            return make_record(node, new_format)
+        log._make_record = _make_record
+        log.open_log()
+        rows = list(log.get_matching_records())
+        log.close_log()
+        return rows, log.header_rows, len(parsed)
+
+    def test_raw_fields(self):
+        self.assertEqual(
+            get_raw_fields('<AUDIT_RECORD TIMESTAMP="2012-09-27T13:33:39" '
+                           'NAME="Query" CONNECTION_ID="7" STATUS="" '
+                           'SQLTEXT="SELECT &quot;NAME=&quot;"/>'),
+            {'TIMESTAMP': '2012-09-27T13:33:39', 'NAME': 'Query',
+             'CONNECTION_ID': '7', 'STATUS': None})
+        self.assertEqual(
+            get_raw_fields(' <AUDIT_RECORD>\n  <NAME>Quit</NAME>\n'
+                           '  <STATUS>0</STATUS>\n'
+                           '  <STATUS_CODE>1</STATUS_CODE>\n'
+                           ' </AUDIT_RECORD>\n'),
+            {'NAME': 'Quit', 'STATUS': '0'})
+
+    def test_prefilter(self):
+        _, _, num_records = self._search(False)
+        for criteria, num_rows, num_parsed in (
+                ({'users': ['root']}, 4, 5),
+                ({'users': ['root'], 'event_type': ['quit']}, 1, 3),
+                ({'event_type': ['connect', 'quit']}, 2, 3),
+                ({'status': [(1000, 1100)]}, 1, 2),
+                ({'start_date': '2012-09-27T13:34:00',
+                  'end_date': '2012-09-28T00:00:00'}, 1, 2),
+                ({'query_type': ['select', 'commit']}, 2, 3),
+                ({'query_type': ['drop'], 'status': [0]}, 0, 1)):
+            rows, header_rows, parsed = self._search(True, **criteria)
+            self.assertEqual((rows, header_rows),
+                             self._search(False, **criteria)[:2])
+            self.assertEqual(len(rows), num_rows)
+            # Only the records that can match (and the 'Audit' record) are
+            # parsed.
+            self.assertEqual(parsed, num_parsed)
+            self.assertTrue(parsed < num_records)
+
+
+class TestAuditLogSplit(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_name = os.path.join(self.tmp_dir, 'audit.log')
+        with open(self.log_name, 'w') as log_file:
+            log_file.write(_AUDIT_LOG)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_split_log(self):
+        size = len(_AUDIT_LOG)
+        self.assertEqual(split_log(self.log_name), [[(0, size)]])
+        chunks = split_log(self.log_name, chunk_size=100)
+        self.assertTrue(len(chunks) > 2)
+        # Chunks are contiguous and start at the line of a record.
+        ranges = [chunk_range for chunk in chunks for chunk_range in chunk]
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], size)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertTrue(_AUDIT_LOG[start:].lstrip(' ').startswith(
+                '<AUDIT_RECORD'))
+        # Only the given ranges are read, and they are not split within a
+        # record.
+        self.assertEqual(split_log(self.log_name, [(10, 20), (30, 40),
+                                                   (50, 60)], chunk_size=15),
+                         [[(10, 20), (30, 40)], [(50, 60)]])
+
+    def test_get_log_files(self):
+        for name in ('audit.log.20.xml', 'audit.log.3', 'audit.log.idx',
+                     'audit.log.3.idx', 'audit.log.bak'):
+            open(os.path.join(self.tmp_dir, name), 'w').close()
+        self.assertEqual(get_log_files(self.log_name), [self.log_name])
+        self.assertEqual(get_log_files(self.log_name, rotated=True),
+                         [os.path.join(self.tmp_dir, 'audit.log.3'),
+                          os.path.join(self.tmp_dir, 'audit.log.20.xml'),
+                          self.log_name])
+
+    def test_search_chunks(self):
+        # pylint: disable=W0212
+        options = {'log_name': self.log_name, 'format': 'grid',
+                   'users': ['root'], 'start_date': None, 'end_date': None,
+                   'pattern': None, 'query_type': None, 'event_type': None,
+                   'status': None}
+        log = AuditLogParser(options)
+        log.open_log()
+        expected = list(log.get_matching_records())
+        log.close_log()
+        chunks = [(self.log_name, ranges) for ranges in
+                  split_log(self.log_name, chunk_size=100)]
+        tracked_ids = {}
+        header_rows = []
+        rows = []
+        audit_log_parser._init_search_worker(options)
+        for num, chunk in enumerate(chunks):
+            records = audit_log_parser.track_chunk_task(chunk)
+            for record in records:
+                if record['NAME'] == 'Connect':
+                    tracked_ids.setdefault(record['CONNECTION_ID'],
+                                           (num, (record['USER'],
+                                                  record['PRIV_USER'])))
+        audit_log_parser._init_search_worker(options, tracked_ids)
+        try:
+            for num, (log_name, ranges) in enumerate(chunks):
+                chunk_rows, chunk_header_rows = (
+                    audit_log_parser.search_chunk_task(
+                        (num, log_name, ranges, header_rows[:1], False)))
+                rows.extend(chunk_rows)
+                header_rows.extend(chunk_header_rows)
+        finally:
+            audit_log_parser._init_search_worker(options)
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(rows, expected)
+        self.assertEqual(len(header_rows), 1)
+
+    def test_read_header_rows_malformed(self):
+        with open(self.log_name, 'w') as log_file:
+            log_file.write(_AUDIT_LOG.replace('NAME="Quit"', 'NAME="Quit'))
+        log = AuditLogParser({'log_name': self.log_name, 'pattern': None,
+                              'query_type': None})
+        log.open_log()
+        try:
+            self.assertRaises(UtilError, log.read_header_rows)
+        finally:
+            log.close_log()
+
+
+if __name__ == '__main__':
+    unittest.main()
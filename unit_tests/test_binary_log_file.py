@@ -18,16 +18,21 @@
 This files contains unit tests for mysql.utilities.common.binary_log module.
 """
 
+import errno
+import gzip
+import json
 import os
 import shutil
+import struct
 import tempfile
 import time
 import unittest
 
 from mysql.utilities.common.binary_log_file import (
-    filter_binary_logs_by_date, filter_binary_logs_by_sequence, get_index_file,
-    is_binary_log_filename, LOG_TYPE_ALL, LOG_TYPE_BIN, LOG_TYPE_RELAY,
-    LOG_TYPES, move_binary_log
+    archive_binary_logs, ARCHIVE_MANIFEST, filter_binary_logs_by_date,
+    filter_binary_logs_by_sequence, get_index_file, is_binary_log_filename,
+    LOG_TYPE_ALL, LOG_TYPE_BIN, LOG_TYPE_RELAY, LOG_TYPES, move_binary_log,
+    move_binary_logs
 )
 from mysql.utilities.exception import UtilError
 
@@ -200,6 +205,165 @@ class TestBinaryLogFile(unittest.TestCase):
                           self.tmp_destination, 'not_in_index.000007',
                           test_index)
 
+    def test_move_binary_logs(self):
+        source = tempfile.mkdtemp()
+        destination = tempfile.mkdtemp()
+        try:
+            # Create fake binary log files to move and index file.
+            test_files = ['test-bin.{0:06d}'.format(i) for i in range(1, 6)]
+            for filename in test_files:
+                with open(os.path.join(source, filename), 'w') as f_obj:
+                    f_obj.write("test file (fake binary log)\n")
+            test_index = os.path.join(source, 'test-bin.index')
+            with open(test_index, 'w') as f_obj:
+                for filename in test_files:
+                    f_obj.write("{0}\n".format(os.path.join('.', filename)))
+
+            # Move the first files.
+            move_binary_logs(source, destination, test_files[:3], test_index)
+
+            # Confirm if files were successfully moved.
+            self.assertEqual(sorted(os.listdir(destination)), test_files[:3])
+            # Confirm if index file was updated correctly.
+            with open(test_index, 'r') as f_obj:
+                data = f_obj.readlines()
+            expected_data = [
+                '{0}\n'.format(os.path.join(destination, filename))
+                for filename in test_files[:3]
+            ] + [
+                '{0}\n'.format(os.path.join('.', filename))
+                for filename in test_files[3:]
+            ]
+            self.assertEqual(data, expected_data)
+
+            # Check error: no entry for a file in the index file (move of
+            # all files is reverted).
+            test_file = os.path.join(source, 'not_in_index.000007')
+            with open(test_file, 'w') as f_obj:
+                f_obj.write("test file (fake binary log, not in index)\n")
+            self.assertRaises(UtilError, move_binary_logs, source,
+                              destination,
+                              test_files[3:] + ['not_in_index.000007'],
+                              test_index)
+            self.assertEqual(sorted(os.listdir(destination)), test_files[:3])
+            for filename in test_files[3:]:
+                self.assertTrue(os.path.isfile(os.path.join(source,
+                                                            filename)))
+            with open(test_index, 'r') as f_obj:
+                self.assertEqual(f_obj.readlines(), expected_data)
+
+            # Check error: destination file already exists.
+            with open(os.path.join(source, test_files[0]), 'w') as f_obj:
+                f_obj.write("test file (fake binary log)\n")
+            self.assertRaises(UtilError, move_binary_logs, source,
+                              destination, test_files[:1], test_index)
+
+            # Check error: destination directory does not exist.
+            self.assertRaises(UtilError, move_binary_logs, source,
+                              'not_exist', test_files[3:], test_index)
+
+            # Check error: index file cannot be replaced (move of all files
+            # is reverted).
+            os.remove(os.path.join(source, test_files[0]))
+            os_rename = os.rename
+
+            def _fail_index_rename(src, dst):
+                if src.endswith('.tmp'):
+                    raise OSError(errno.EACCES, "Permission denied", dst)
+                os_rename(src, dst)
+            os.rename = _fail_index_rename
+            try:
+                self.assertRaises(UtilError, move_binary_logs, source,
+                                  destination, test_files[3:], test_index)
+            finally:
+                os.rename = os_rename
+            self.assertEqual(sorted(os.listdir(destination)), test_files[:3])
+            for filename in test_files[3:]:
+                self.assertTrue(os.path.isfile(os.path.join(source,
+                                                            filename)))
+            self.assertFalse(os.path.exists('{0}.tmp'.format(test_index)))
+            with open(test_index, 'r') as f_obj:
+                self.assertEqual(f_obj.readlines(), expected_data)
+        finally:
+            shutil.rmtree(source)
+            shutil.rmtree(destination)
+
+    def test_archive_binary_logs(self):
+        source = tempfile.mkdtemp()
+        destination = tempfile.mkdtemp()
+
+        def _event(timestamp, body):
+            # Event header: timestamp, type_code, server_id, event_length,
+            # next_position and flags.
+            return struct.pack('<IBIIIH', timestamp, 15, 1, 19 + len(body),
+                               0, 0) + body
+        try:
+            # Create fake binary log files to archive and index file.
+            test_files = ['test-bin.{0:06d}'.format(i) for i in range(1, 4)]
+            test_data = {}
+            for i, filename in enumerate(test_files):
+                test_data[filename] = '\xfebin{0}{1}{2}'.format(
+                    _event(1400000000 + i, 'x' * 100), _event(0, 'rotate'),
+                    _event(1400000060 + i, 'y' * 100))
+                with open(os.path.join(source, filename), 'wb') as f_obj:
+                    f_obj.write(test_data[filename])
+            test_index = os.path.join(source, 'test-bin.index')
+            with open(test_index, 'w') as f_obj:
+                for filename in test_files:
+                    f_obj.write("{0}\n".format(os.path.join('.', filename)))
+
+            # Archive the first files.
+            entries = archive_binary_logs(source, destination,
+                                          test_files[:2], test_index)
+
+            # Confirm if files were compressed and removed from the source
+            # directory and the index file.
+            self.assertEqual([entry['file'] for entry in entries],
+                             test_files[:2])
+            for filename in test_files[:2]:
+                self.assertFalse(os.path.exists(os.path.join(source,
+                                                             filename)))
+                gz_file = gzip.open(os.path.join(destination,
+                                                 '{0}.gz'.format(filename)))
+                self.assertEqual(gz_file.read(), test_data[filename])
+                gz_file.close()
+            with open(test_index, 'r') as f_obj:
+                self.assertEqual(f_obj.readlines(), [
+                    '{0}\n'.format(os.path.join('.', test_files[2]))])
+            # Confirm manifest entries.
+            with open(os.path.join(destination, ARCHIVE_MANIFEST)) as f_obj:
+                manifest = [json.loads(line) for line in f_obj]
+            self.assertEqual(manifest, json.loads(json.dumps(entries)))
+            self.assertEqual(entries[0]['size'],
+                             len(test_data[test_files[0]]))
+            self.assertEqual(entries[0]['first_event'], '2014-05-13 16:53:20')
+            self.assertEqual(entries[0]['last_event'], '2014-05-13 16:54:20')
+
+            # Check error: no entry for a file in the index file (archive is
+            # reverted).
+            test_file = os.path.join(source, 'not_in_index.000007')
+            with open(test_file, 'w') as f_obj:
+                f_obj.write("test file (fake binary log, not in index)\n")
+            self.assertRaises(UtilError, archive_binary_logs, source,
+                              destination,
+                              [test_files[2], 'not_in_index.000007'],
+                              test_index)
+            self.assertTrue(os.path.isfile(os.path.join(source,
+                                                        test_files[2])))
+            self.assertFalse(os.path.exists(
+                os.path.join(destination, '{0}.gz'.format(test_files[2]))))
+            # The appended manifest entries are discarded.
+            with open(os.path.join(destination, ARCHIVE_MANIFEST)) as f_obj:
+                self.assertEqual([json.loads(line) for line in f_obj],
+                                 manifest)
+
+            # Check error: binary file does not exist.
+            self.assertRaises(UtilError, archive_binary_logs, source,
+                              destination, test_files[:1], test_index)
+        finally:
+            shutil.rmtree(source)
+            shutil.rmtree(destination)
+
     def test_filter_binary_logs_by_sequence(self):
         # Generate test filenames.
         test_files = []
@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2015, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the bulk INSERT statements built by the
+Table class (mysql.utilities.common.table module).
+"""
+
+import multiprocessing
+import unittest
+
+from mysql.utilities.common.table import Table
+
+_COLUMNS = [
+    ('id', 'int(11)'),
+    ('name', 'varchar(64)'),
+    ('created', 'datetime'),
+    ('flags', 'bit(8)'),
+    ('price', 'decimal(10,2)'),
+]
+
+
+class _FakeServer(object):
+    """Minimal server to build INSERT statements without a connection.
+    """
+
+    def __init__(self, columns, max_packet=1024 * 1024):
+        self.columns = columns
+        self.max_packet = max_packet
+
+    def select_variable(self, var_name, var_type=None):
+        """Return an empty SQL_MODE."""
+        return ""
+
+    def exec_query(self, query_str, options=None):
+        """Return the results for the queries issued by the Table class."""
+        if query_str.startswith("SELECT @@session.max_allowed_packet"):
+            return [(self.max_packet,)]
+        if query_str.startswith("explain"):
+            return self.columns
+        return []
+
+
+def _get_table(columns=None, max_packet=1024 * 1024):
+    """Get a Table instance (with column metadata) for the given columns.
+    """
+    if columns is None:
+        columns = _COLUMNS
+    return Table(_FakeServer(columns, max_packet), "`db`.`t1`",
+                 {'get_cols': True})
+
+
+class TestBulkInsert(unittest.TestCase):
+
+    def test_column_string(self):
+        tbl = _get_table()
+        row = ('1', "it's", '2015-01-01 10:00:00', '\x05', '9.99')
+        self.assertEqual(tbl.get_column_string(row, "`db`"),
+                         (" (1, 'it\\'s', '2015-01-01 10:00:00', 5, 9.99)",
+                          []))
+
+    def test_column_string_null(self):
+        tbl = _get_table()
+        # NULL values and strings like 'None' or ', None' must not be mixed.
+        row = (None, 'x, None', None, None, None)
+        self.assertEqual(tbl.get_column_string(row, "`db`")[0],
+                         " (NULL, 'x, None', NULL, NULL, NULL)")
+        row = ('2', 'None', '', None, '0')
+        self.assertEqual(tbl.get_column_string(row, "`db`")[0],
+                         " (2, 'None', '', NULL, 0)")
+
+    def test_make_bulk_insert(self):
+        tbl = _get_table()
+        rows = [('1', 'a', None, None, '1.00'),
+                ('2', 'b', None, None, '2.00')]
+        inserts, blobs = tbl.make_bulk_insert(rows, "`db2`")
+        self.assertEqual(inserts,
+                         ["INSERT INTO `db2`.`t1` VALUES  "
+                          "(1, 'a', NULL, NULL, 1.00),  "
+                          "(2, 'b', NULL, NULL, 2.00)"])
+        self.assertEqual(blobs, [])
+        # Using column names.
+        col_names = ["`id`", "`name`", "`created`", "`flags`", "`price`"]
+        inserts, _ = tbl.make_bulk_insert(rows[:1], "`db2`", col_names)
+        self.assertEqual(inserts,
+                         ["INSERT INTO `db2`.`t1` (`id`, `name`, `created`, "
+                          "`flags`, `price`) VALUES  "
+                          "(1, 'a', NULL, NULL, 1.00)"])
+        # No rows.
+        self.assertEqual(tbl.make_bulk_insert([], "`db2`"), ([], []))
+
+    def test_make_bulk_insert_column_count(self):
+        tbl = _get_table()
+        rows = [('1', 'a', None, None, '1.00'),
+                ('2', 'b', None, None, '2.00')]
+        col_names = ["`id`", "`name`", "`created`", "`flags`", "`price`"]
+        inserts, _ = tbl.make_bulk_insert(rows, "`db2`", col_names)
+        self.assertEqual(len(inserts), 1)
+        cols, values = inserts[0].split(" VALUES  ", 1)
+        num_cols = len(cols.split(" (", 1)[1].rstrip(")").split(", "))
+        self.assertEqual(num_cols, len(col_names))
+        # Each row has as many values as the listed columns.
+        row_values = values.split(",  ")
+        self.assertEqual(len(row_values), len(rows))
+        for value in row_values:
+            self.assertEqual(len(value.strip(" ()").split(", ")), num_cols)
+
+    def test_generate_bulk_insert_max_packet(self):
+        tbl = _get_table(max_packet=1024)
+        rows = [(str(i), 'x' * 50, None, None, None) for i in range(100)]
+        inserts = list(tbl.generate_bulk_insert(iter(rows), "`db`"))
+        self.assertTrue(len(inserts) > 1)
+        values = []
+        for insert in inserts:
+            self.assertTrue(len(insert) <= 1024 - 512)
+            values.extend(insert.split("VALUES ", 1)[1].split(",  ("))
+        # All the rows are included (in order), none is lost.
+        self.assertEqual(len(values), 100)
+        self.assertTrue(values[-1].startswith("99, "))
+
+    def test_generate_bulk_insert_blobs(self):
+        tbl = _get_table([('id', 'int(11)'), ('data', 'blob')])
+        blobs = []
+        inserts = list(tbl.generate_bulk_insert([('1', 'abc'), ('2', None)],
+                                                "`db`", blob_inserts=blobs))
+        # No unique index, the rows are inserted with the blob data.
+        self.assertEqual(inserts, [])
+        self.assertEqual(blobs,
+                         ["INSERT INTO `db`.`t1` VALUES  (1, 'abc');",
+                          "INSERT INTO `db`.`t1` VALUES  (2, NULL);"])
+
+    def test_put_rows_dead_writers(self):
+        rows_queue = multiprocessing.Queue(1)
+        writer = multiprocessing.Process(target=len, args=([],))
+        writer.start()
+        writer.join()
+        # Free slot in the queue, the item is put.
+        self.assertTrue(Table._put_rows(rows_queue, [('1',)], [writer]))
+        # Queue full and no writer alive, do not block forever.
+        self.assertFalse(Table._put_rows(rows_queue, None, [writer]))
+        self.assertEqual(rows_queue.get(), [('1',)])
+
+
+if __name__ == '__main__':
+    unittest.main()
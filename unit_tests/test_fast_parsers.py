@@ -0,0 +1,332 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the fast parsing mode (and the other
+optimizations) of the General and Slow Query Log parsers
+(mysql.utilities.common.parser module), checking that both parsing modes
+return the same entries.
+
+It can also be executed as a script to run a benchmark of both parsers, in
+each parsing mode, on generated log files (MB/s):
+
+    python test_fast_parsers.py --benchmark [size_mb]
+"""
+
+import datetime
+import decimal
+import operator
+import os.path
+import sys
+import tempfile
+import time
+import unittest
+from cStringIO import StringIO
+
+from mysql.utilities.common import parser
+from mysql.utilities.common.parser import (CompactGeneralQueryLogEntry,
+                                           CompactSlowQueryLogEntry,
+                                           GeneralQueryLog, SlowQueryLog)
+from mysql.utilities.exception import LogParserError
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_HEADER = ("/usr/sbin/mysqld, Version: 5.5.17-log (Source distribution). "
+           "started with:\nTcp port: 3306  Unix socket: /tmp/mysql.sock\n"
+           "Time                 Id Command    Argument\n")
+
+
+class _Pipe(object):
+    """Stream that does not support seek(), like a pipe.
+    """
+    def __init__(self, data):
+        stream = StringIO(data)
+        self.readline = stream.readline
+        self.read = stream.read
+
+    @staticmethod
+    def seek(_):
+        """Raise the error of a pipe."""
+        raise IOError(29, "Illegal seek")
+
+
+def _generate_general_log(size):
+    """Generate a General Query Log with (at least) the given size in bytes.
+    """
+    lines = [_HEADER]
+    written = len(_HEADER)
+    num = 0
+    while written < size:
+        sid = num % 50 + 1
+        entry = (
+            "111205 10:{0:02d}:{1:02d}\t{2:>5} Connect\troot@localhost on "
+            "test\n"
+            "\t\t{2:>5} Query\tSELECT a, b, c FROM t1 WHERE id = {3} "
+            "AND name = 'user{3}'\n"
+            "\t\t{2:>5} Query\tUPDATE t1 SET b = b + 1\n"
+            "  WHERE id IN ({3}, {4}, {5})\n"
+            "  AND c IS NOT NULL\n"
+            "\t\t{2:>5} Init DB\tmysql\n"
+            "\t\t{2:>5} Quit\t\n"
+        ).format((num // 60) % 60, num % 60, sid, num, num + 1, num + 2)
+        lines.append(entry)
+        written += len(entry)
+        num += 1
+    return ''.join(lines)
+
+
+def _generate_slow_log(size):
+    """Generate a Slow Query Log with (at least) the given size in bytes.
+    """
+    lines = [_HEADER]
+    written = len(_HEADER)
+    num = 0
+    while written < size:
+        entry = (
+            "# Time: 111206 11:{0:02d}:{1:02d}\n"
+            "# User@Host: root[root] @ localhost [127.0.0.1]\n"
+            "# Query_time: 0.{2:06d}  Lock_time: 0.000{3:03d} Rows_sent: {4}  "
+            "Rows_examined: {5}\n"
+            "use test;\n"
+            "SET timestamp=1323169459;\n"
+            "SELECT a, b, c FROM t1\n"
+            "  WHERE id = {4} AND name = 'user{4}';\n"
+        ).format((num // 60) % 60, num % 60, num % 1000000, num % 1000, num,
+                 num * 10)
+        lines.append(entry)
+        written += len(entry)
+        num += 1
+    return ''.join(lines)
+
+
+def _read_entries(parser_class, data, stream_class=StringIO, fast=False):
+    """Read all the entries of a log (copies of the entries as dictionaries).
+    """
+    return [dict(entry.items())
+            for entry in parser_class(stream_class(data), fast=fast)]
+
+
+class TestFastParsers(unittest.TestCase):
+
+    def assertSameEntries(self, parser_class, data, entries=None):
+        """Check that all the parsing modes return the same entries."""
+        if entries is None:
+            entries = _read_entries(parser_class, data)
+        self.assertTrue(entries)
+        for fast in (False, True):
+            self.assertEqual(entries,
+                             _read_entries(parser_class, data, fast=fast))
+            self.assertEqual(entries, _read_entries(parser_class, data,
+                                                    _Pipe, fast))
+
+    def test_sample_logs(self):
+        for parser_class, log_name in ((GeneralQueryLog, 'sample-general.log'),
+                                       (SlowQueryLog, 'sample-slow.log')):
+            with open(os.path.join(_HERE, log_name)) as log_file:
+                data = log_file.read()
+            self.assertSameEntries(parser_class, data)
+
+    def test_generated_general_log(self):
+        data = _generate_general_log(64 * 1024)
+        entries = _read_entries(GeneralQueryLog, data, fast=True)
+        self.assertSameEntries(GeneralQueryLog, data, entries)
+        self.assertEqual(len(entries) % 5, 0)
+        for num in range(len(entries) // 5):
+            connect, select, update, init_db, quit_ = \
+                entries[num * 5:num * 5 + 5]
+            expected_dt = datetime.datetime(2011, 12, 5, 10,
+                                            (num // 60) % 60, num % 60)
+            for entry in (connect, select, update, init_db, quit_):
+                self.assertEqual(entry['session_id'], num % 50 + 1)
+                self.assertEqual(entry['datetime'], expected_dt)
+                self.assertEqual(entry['user'], 'root')
+                self.assertEqual(entry['host'], 'localhost')
+            self.assertEqual(connect['command'], 'Connect')
+            self.assertEqual(select['argument'],
+                             "SELECT a, b, c FROM t1 WHERE id = {0} "
+                             "AND name = 'user{0}'".format(num))
+            # Lines of a multi-line query are not taken as new entries.
+            self.assertEqual(update['argument'],
+                             "UPDATE t1 SET b = b + 1\n"
+                             "  WHERE id IN ({0}, {1}, {2})\n"
+                             "  AND c IS NOT NULL".format(num, num + 1,
+                                                          num + 2))
+            self.assertEqual(select['database'], 'test')
+            self.assertEqual(quit_['database'], 'mysql')
+
+    def test_generated_slow_log(self):
+        data = _generate_slow_log(64 * 1024)
+        entries = _read_entries(SlowQueryLog, data, fast=True)
+        self.assertSameEntries(SlowQueryLog, data, entries)
+        set_dt = datetime.datetime.fromtimestamp(1323169459)
+        for num, entry in enumerate(entries):
+            self.assertEqual(entry['datetime'], set_dt)
+            self.assertEqual(entry['query_time'],
+                             decimal.Decimal('0.{0:06d}'.format(num)))
+            self.assertEqual(entry['lock_time'],
+                             decimal.Decimal('0.000{0:03d}'.format(num)))
+            self.assertEqual(entry['rows_sent'], num)
+            self.assertEqual(entry['rows_examined'], num * 10)
+            self.assertEqual(entry['query'],
+                             "use test;\nSET timestamp=1323169459;\n"
+                             "SELECT a, b, c FROM t1\n"
+                             "  WHERE id = {0} AND name = 'user{0}';"
+                             "".format(num))
+
+    def test_generated_logs(self):
+        for parser_class, generator in ((GeneralQueryLog,
+                                         _generate_general_log),
+                                        (SlowQueryLog, _generate_slow_log)):
+            data = generator(64 * 1024)
+            entries = _read_entries(parser_class, data)
+            # No header (also not seekable), Windows line endings and
+            # repeated headers (e.g., server restart).
+            no_header = (data[data.index('\n# Time') + 1:]
+                         if parser_class is SlowQueryLog else
+                         data[len(_HEADER):])
+            self.assertSameEntries(parser_class, no_header, entries)
+            self.assertSameEntries(parser_class,
+                                   data.replace('\n', '\r\n'), entries)
+            self.assertSameEntries(parser_class, data + _HEADER + no_header,
+                                   entries + entries)
+
+    def test_block_boundaries(self):
+        # pylint: disable=W0212
+        block_size = parser._READ_BLOCK_SIZE
+        try:
+            for size in (1, 7, 64):
+                parser._READ_BLOCK_SIZE = size
+                for parser_class, generator in ((GeneralQueryLog,
+                                                 _generate_general_log),
+                                                (SlowQueryLog,
+                                                 _generate_slow_log)):
+                    data = generator(4 * 1024)
+                    self.assertEqual(
+                        _read_entries(parser_class, data),
+                        _read_entries(parser_class, data, fast=True))
+                    # Last line without newline.
+                    data = data.rstrip('\n').replace('\n', '\r\n')
+                    self.assertEqual(
+                        _read_entries(parser_class, data),
+                        _read_entries(parser_class, data, fast=True))
+        finally:
+            parser._READ_BLOCK_SIZE = block_size
+
+    def test_compact_entries(self):
+        data = _generate_general_log(1024)
+        entry = GeneralQueryLog(StringIO(data), fast=True).next()
+        self.assertTrue(isinstance(entry, CompactGeneralQueryLogEntry))
+        expected = GeneralQueryLog(StringIO(data)).next()
+        self.assertEqual(entry, expected)
+        self.assertFalse(entry != expected)
+        self.assertEqual(entry.copy(), expected)
+        self.assertEqual(str(entry), str(expected))
+        self.assertEqual(entry['argument'], entry.argument)
+        self.assertEqual(entry.get('command'), 'Connect')
+        self.assertEqual(entry.get('query', 'none'), 'none')
+        self.assertEqual(sorted(entry.keys()), sorted(expected.keys()))
+        self.assertEqual(sorted(entry), sorted(expected))
+        self.assertEqual(dict(zip(entry.keys(), entry.values())), expected)
+        self.assertEqual(len(entry), len(expected))
+        self.assertTrue('database' in entry)
+        self.assertFalse('query' in entry)
+        self.assertRaises(KeyError, entry.__getitem__, 'query')
+        self.assertRaises(AttributeError, getattr, entry, 'query')
+        # Compact entries are read-only.
+        self.assertRaises(TypeError, operator.setitem, entry, 'user', 'joe')
+        self.assertRaises(AttributeError, setattr, entry, 'user', 'joe')
+
+        entry = SlowQueryLog(StringIO(_generate_slow_log(1024)),
+                             fast=True).next()
+        self.assertTrue(isinstance(entry, CompactSlowQueryLogEntry))
+        self.assertEqual(entry.query_time, decimal.Decimal('0.000000'))
+        self.assertEqual(entry['rows_examined'], 0)
+        self.assertTrue(str(entry).startswith("<SlowQueryLogEntry "))
+
+    def test_slow_log_statistics(self):
+        data = _generate_slow_log(1024).replace(
+            "# Query_time: 0.000001  Lock_time: 0.000001 Rows_sent: 1  "
+            "Rows_examined: 10",
+            "# Query_time: 1.5 Lock_time: 0.000001 Rows_sent: 1 "
+            "Rows_examined: 10 Rows_affected: 0")
+        entries = _read_entries(SlowQueryLog, data, fast=True)
+        self.assertEqual(entries[1]['query_time'], decimal.Decimal('1.5'))
+        self.assertEqual(entries[1]['rows_sent'], 1)
+        self.assertEqual(entries[1]['rows_examined'], 10)
+        self.assertEqual(entries, _read_entries(SlowQueryLog, data))
+
+    def test_errors(self):
+        data = _HEADER + "111205 10:01:14\t    1 Connect\troot@localhost\n"
+        for fast in (False, True):
+            self.assertRaises(LogParserError, _read_entries, GeneralQueryLog,
+                              data + "not an entry\n", fast=fast)
+            self.assertRaises(LogParserError, _read_entries, SlowQueryLog,
+                              "# Time: 111206 11:55\n", fast=fast)
+            self.assertRaises(LogParserError, GeneralQueryLog, None,
+                              fast=fast)
+
+    def test_parse_datetime(self):
+        log = GeneralQueryLog(StringIO(_HEADER))
+        for value in ('111206 11:55:54', '111206 11:55:54', '000101  0:00:00',
+                      '681231 23:59:59', '690101 00:00:00', '991231 9:05:07'):
+            self.assertEqual(log._parse_datetime(value),
+                             datetime.datetime.strptime(value,
+                                                        "%y%m%d %H:%M:%S"))
+        self.assertRaises(ValueError, log._parse_datetime, '111306 11:55:54')
+
+    def test_not_seekable(self):
+        data = _generate_general_log(4 * 1024)[len(_HEADER):]
+        for fast in (False, True):
+            log = GeneralQueryLog(_Pipe(data), fast=fast)
+            entry = log.next()
+            self.assertEqual(entry.command, 'Connect')
+            self.assertEqual(entry['session_id'], 1)
+            self.assertEqual(log.next()['command'], 'Query')
+            # The pushed back line is only returned once.
+            self.assertEqual(log.next()['command'], 'Query')
+
+
+def benchmark(size_mb=50):
+    """Print the MB/s of both parsers, in each parsing mode, on generated log
+    files.
+
+    size_mb[in]     size of each generated log file in MB
+    """
+    size = size_mb * 1024 * 1024
+    for parser_class, generator in ((GeneralQueryLog, _generate_general_log),
+                                    (SlowQueryLog, _generate_slow_log)):
+        log_file = tempfile.TemporaryFile()
+        log_file.write(generator(size))
+        size = log_file.tell()
+        for mode, fast in (("default", False), ("fast", True)):
+            log_file.seek(0)
+            start = time.time()
+            num_entries = 0
+            for _ in parser_class(log_file, fast=fast):
+                num_entries += 1
+            elapsed = time.time() - start
+            print("{0:<16} {1:<8} {2:>10} entries {3:>8.1f} MB/s".format(
+                parser_class.__name__, mode, num_entries,
+                size / 1024.0 / 1024.0 / elapsed if elapsed else
+                float('inf')))
+        log_file.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 50)
+    else:
+        unittest.main()
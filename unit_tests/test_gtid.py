@@ -16,14 +16,25 @@
 #
 """
 This files contains unit tests for mysql.utilities.common.gtid module.
+
+It can also be executed as a script to run a benchmark of the GtidSet
+operations against the same operations on the itemized GTID sets:
+
+    python test_gtid.py --benchmark [num_trx]
 """
 
+import sys
+import time
 import unittest
 
 from mysql.utilities.common.gtid import (get_last_server_gtid,
                                          gtid_set_cardinality,
                                          gtid_set_itemize,
-                                         gtid_set_union)
+                                         gtid_set_union, GtidSet)
+from mysql.utilities.exception import UtilError
+
+_UUID_A = 'cfb4dd08-588e-11e4-89aa-606720440b68'
+_UUID_B = 'd4f8eb6e-588e-11e4-89aa-606720440b68'
 
 
 class TestBinaryLogFile(unittest.TestCase):
@@ -109,3 +120,117 @@ class TestBinaryLogFile(unittest.TestCase):
         ]
         # Decompose (itemize) a GTID set with different intervals and UUIDs.
         self.assertEqual(gtid_set_itemize(gtid_set), expected_result)
+
+
+class TestGtidSet(unittest.TestCase):
+
+    def _check_operations(self, gtid_set_a, gtid_set_b):
+        """Check the GtidSet operations against the itemized sets.
+        """
+        items_a = set(GtidSet(gtid_set_a))
+        items_b = set(GtidSet(gtid_set_b))
+        set_a = GtidSet(gtid_set_a)
+        for result, items in ((set_a | gtid_set_b, items_a | items_b),
+                              (set_a & gtid_set_b, items_a & items_b),
+                              (set_a - gtid_set_b, items_a - items_b)):
+            self.assertEqual(sorted(items), list(result))
+            self.assertEqual(len(items), result.cardinality())
+            # The result is normalized.
+            self.assertEqual(result, GtidSet(str(result)))
+        self.assertEqual(set_a <= gtid_set_b, items_a <= items_b)
+
+    def test_normalize(self):
+        gtid_set = GtidSet('{0}:7:1-3,\n{1}:5, {0}:4:10-11:9'.format(
+            _UUID_A.upper(), _UUID_B))
+        self.assertEqual(str(gtid_set),
+                         '{0}:1-4:7:9-11,{1}:5'.format(_UUID_A, _UUID_B))
+        self.assertEqual(gtid_set.uuids(), [_UUID_A, _UUID_B])
+        self.assertEqual(gtid_set.intervals(_UUID_A.upper()),
+                         [(1, 4), (7, 7), (9, 11)])
+        self.assertEqual(gtid_set.intervals('spam'), [])
+        self.assertEqual(len(gtid_set), 9)
+        self.assertEqual(GtidSet(gtid_set), gtid_set)
+        self.assertFalse(GtidSet(''))
+        self.assertFalse(GtidSet('{0}:2-4:10'.format(_UUID_A)) - gtid_set)
+        for invalid in ('{0}:a'.format(_UUID_A), '{0}:1-2-3'.format(_UUID_A),
+                        '{0}:5-3'.format(_UUID_A)):
+            self.assertRaises(UtilError, GtidSet, invalid)
+
+    def test_operations(self):
+        self._check_operations(
+            '{0}:1-10:15:20-30,{1}:1-5'.format(_UUID_A, _UUID_B),
+            '{0}:5-16:18:25-40'.format(_UUID_A))
+        self._check_operations(
+            '{0}:3-4:8'.format(_UUID_A),
+            '{0}:1-20,{1}:1'.format(_UUID_A, _UUID_B))
+        self._check_operations('{0}:1-3'.format(_UUID_A), '')
+        self._check_operations('', '{0}:1-3'.format(_UUID_A))
+
+    def test_contains(self):
+        gtid_set = GtidSet('{0}:1-10:20'.format(_UUID_A))
+        self.assertTrue('{0}:5'.format(_UUID_A.upper()) in gtid_set)
+        self.assertTrue('{0}:20'.format(_UUID_A) in gtid_set)
+        self.assertFalse('{0}:15'.format(_UUID_A) in gtid_set)
+        self.assertFalse('{0}:5'.format(_UUID_B) in gtid_set)
+        self.assertTrue(GtidSet('{0}:2-3'.format(_UUID_A)) in gtid_set)
+        self.assertRaises(UtilError, gtid_set.__contains__, _UUID_A)
+
+    def test_large_sets(self):
+        # Operations do not depend on the number of transactions.
+        gtid_set = GtidSet('{0}:1-5000000000'.format(_UUID_A))
+        result = gtid_set - '{0}:2-4999999999'.format(_UUID_A)
+        self.assertEqual(str(result), '{0}:1:5000000000'.format(_UUID_A))
+        self.assertEqual(gtid_set.cardinality(), 5000000000)
+        self.assertEqual(list(result), [(_UUID_A, 1), (_UUID_A, 5000000000)])
+
+
+def _itemized_union(items_a, items_b):
+    """Union of itemized GTID sets (see gtid_set_itemize).
+    """
+    result = dict((uuid, set(trx_list)) for uuid, trx_list in items_a)
+    for uuid, trx_list in items_b:
+        result.setdefault(uuid, set()).update(trx_list)
+    return result
+
+
+def _itemized_difference(items_a, items_b):
+    """Difference of itemized GTID sets (see gtid_set_itemize).
+    """
+    items_b = dict(items_b)
+    return dict((uuid, set(trx_list).difference(items_b.get(uuid, [])))
+                for uuid, trx_list in items_a)
+
+
+def benchmark(num_trx=1000000):
+    """Print the time of the union and difference of GTID sets using GtidSet
+    and the itemized GTID sets.
+
+    num_trx[in]     number of transactions of each set
+    """
+    # Sets with gaps every 1000 transactions (e.g., errant transactions).
+    gtid_set_a = '{0}:{1},{2}:1-{3}'.format(
+        _UUID_A, ':'.join('{0}-{1}'.format(start, start + 997)
+                          for start in xrange(1, num_trx, 1000)),
+        _UUID_B, num_trx)
+    gtid_set_b = '{0}:1-{1},{2}:{3}'.format(_UUID_A, num_trx, _UUID_B,
+                                            num_trx + 1)
+    for name, operation in (
+            ('itemized', lambda: (
+                _itemized_union(gtid_set_itemize(gtid_set_a),
+                                gtid_set_itemize(gtid_set_b)),
+                _itemized_difference(gtid_set_itemize(gtid_set_b),
+                                     gtid_set_itemize(gtid_set_a)))),
+            ('GtidSet', lambda: (
+                GtidSet(gtid_set_a) | gtid_set_b,
+                GtidSet(gtid_set_b) - gtid_set_a))):
+        start = time.time()
+        operation()
+        print("{0:<10} union and difference of {1} transactions: {2:>9.4f} "
+              "seconds".format(name, num_trx, time.time() - start))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    else:
+        unittest.main()
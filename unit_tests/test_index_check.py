@@ -0,0 +1,180 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the check of the indexes of tables using
+their loaded metadata, without a connection to the server (bulk mode of
+mysql.utilities.command.indexcheck).
+"""
+
+import sys
+import unittest
+from cStringIO import StringIO
+
+from mysql.utilities.command.indexcheck import (_check_indexes_bulk,
+                                                _init_index_worker,
+                                                check_table_indexes_task)
+from mysql.utilities.common.table import Table
+from mysql.utilities.exception import UtilError
+
+
+def _index_rows(table, indexes):
+    """Get index rows (in the format of SHOW INDEXES) of the given indexes.
+
+    indexes[in]     list of (name, unique, type, list of (column, sub_part,
+                    nullable) tuples)
+    """
+    rows = []
+    for name, unique, idx_type, columns in indexes:
+        for seq, (column, sub_part, nullable) in enumerate(columns, 1):
+            rows.append((table, '0' if unique else '1', name, str(seq),
+                         column, 'A', '0', sub_part, None,
+                         'YES' if nullable else '', idx_type, ''))
+    return rows
+
+
+class _FakeServer(object):
+    """Minimal server returning the given metadata of the tables.
+    """
+
+    def __init__(self, tables, indexes, schemas):
+        self.tables = tables
+        self.indexes = indexes
+        self.schemas = schemas
+
+    def exec_query(self, query, options=None):
+        # pylint: disable=W0613
+        if 'INFORMATION_SCHEMA.TABLES' in query:
+            return self.tables
+        if 'INFORMATION_SCHEMA.STATISTICS' in query:
+            return self.indexes
+        return self.schemas
+
+    @staticmethod
+    def select_variable(var_name):
+        # pylint: disable=W0613
+        return ''
+
+
+class TestIndexCheckMetadata(unittest.TestCase):
+
+    def _get_table(self, indexes, engine='InnoDB'):
+        tbl = Table(None, 'db1.t1', {'sql_mode': '', 'quiet': True})
+        tbl.set_index_metadata(_index_rows('t1', indexes), engine)
+        return tbl
+
+    def test_primary_index(self):
+        tbl = self._get_table([
+            ('PRIMARY', True, 'BTREE', [('a', None, False),
+                                        ('b', None, False)]),
+            ('u1', True, 'BTREE', [('c', None, False)])])
+        self.assertEqual(tbl.get_primary_index(), [('a',), ('b',)])
+        self.assertTrue(tbl.has_primary_key())
+        # Without PRIMARY key, the first UNIQUE index without NULL columns
+        # nor column prefixes is used.
+        tbl = self._get_table([
+            ('u1', True, 'BTREE', [('a', None, True)]),
+            ('u2', True, 'BTREE', [('b', '10', False)]),
+            ('u3', True, 'BTREE', [('c', None, False), ('d', None, False)]),
+            ('i1', False, 'BTREE', [('e', None, False)])])
+        self.assertEqual(tbl.get_primary_index(), [('c',), ('d',)])
+        self.assertFalse(tbl.has_primary_key())
+        self.assertTrue(tbl.has_unique_key())
+        tbl = self._get_table([('i1', False, 'BTREE', [('a', None, False)])])
+        self.assertEqual(tbl.get_primary_index(), [])
+
+    def test_check_indexes(self):
+        indexes = [
+            ('PRIMARY', True, 'BTREE', [('a', None, False)]),
+            ('i1', False, 'BTREE', [('b', None, True), ('c', None, True)]),
+            ('i2', False, 'BTREE', [('b', None, True)]),
+            ('i3', False, 'BTREE', [('d', None, True), ('a', None, False)])]
+        _init_index_worker({'show-drops': True, 'verbosity': 0}, '')
+        output, _, errmsg = check_table_indexes_task(
+            ('db1.t1', {'indexes': _index_rows('t1', indexes),
+                        'engine': 'InnoDB'}))
+        self.assertEqual(errmsg, None)
+        self.assertTrue("CREATE INDEX `i2` ON `db1`.`t1` (`b`) USING BTREE"
+                        in output)
+        self.assertTrue("ALTER TABLE `db1`.`t1` DROP INDEX `i2`;" in output)
+        # Index containing the clustered index (InnoDB).
+        self.assertTrue("ALTER TABLE `db1`.`t1` DROP INDEX `i3`, ADD INDEX "
+                        "`i3` (d);" in output)
+
+        # Same output of the check with a Table instance.
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            tbl = self._get_table(indexes)
+            tbl.get_indexes()
+            tbl.check_indexes(True)
+            self.assertEqual(sys.stdout.getvalue(), output)
+        finally:
+            sys.stdout = stdout
+
+        # Tables that do not exist are skipped.
+        self.assertEqual(check_table_indexes_task(('db1.t2', None)),
+                         ('', 0, None))
+
+    def _check_bulk(self, server, db_list):
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            _check_indexes_bulk(server, '', db_list, [],
+                                {'verbosity': 1, 'show-drops': True})
+            return sys.stdout.getvalue()
+        finally:
+            sys.stdout = stdout
+
+    def test_check_databases_bulk(self):
+        indexes = [
+            ('PRIMARY', True, 'BTREE', [('a', None, False)]),
+            ('i1', False, 'BTREE', [('a', None, False)])]
+        server = _FakeServer(
+            [('DB1', 't1', 'BASE TABLE', 'InnoDB'),
+             ('DB1', 'v1', 'VIEW', None)],
+            [('DB1',) + row for row in _index_rows('t1', indexes)], [])
+        # The database names are compared ignoring the letter case.
+        output = self._check_bulk(server, ['db1'])
+        self.assertTrue("DROP INDEX `i1`" in output)
+        self.assertFalse("does not exist" in output)
+        # A database with only views is not reported as missing.
+        server.tables = server.tables[1:]
+        server.indexes = []
+        stdout = sys.stdout
+        sys.stdout = StringIO()
+        try:
+            self.assertRaises(UtilError, _check_indexes_bulk, server, '',
+                              ['db1'], [], {'verbosity': 1})
+            self.assertFalse("does not exist" in sys.stdout.getvalue())
+            # Empty databases are not reported either, only the databases
+            # not found in the server.
+            server.tables = []
+            server.schemas = [('db1',)]
+            self.assertRaises(UtilError, _check_indexes_bulk, server, '',
+                              ['db1'], [], {'verbosity': 1})
+            self.assertFalse("does not exist" in sys.stdout.getvalue())
+            server.schemas = []
+            self.assertRaises(UtilError, _check_indexes_bulk, server, '',
+                              ['db1'], [], {'verbosity': 1})
+            self.assertTrue("database db1 does not exist" in
+                            sys.stdout.getvalue())
+        finally:
+            sys.stdout = stdout
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the session events read from a general
+query log (mysql.utilities.command.log_replay module).
+"""
+
+import os.path
+import unittest
+from cStringIO import StringIO
+
+from mysql.utilities.command.log_replay import read_session_events
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+_GENERAL_LOG = """\
+111205 10:00:00\t    5 Query\tSELECT 1
+111205 10:00:01\t    6 Connect\troot@localhost on db1
+\t\t    6 Query\tSELECT * FROM t1
+  WHERE a = 1
+\t\t    5 Init DB\tdb2
+111205 10:00:03\t    6 Quit\t
+\t\t    5 Query\tSELECT 2
+\t\t    7 Connect\troot@localhost on
+\t\t    7 Quit\t
+"""
+
+
+class TestReadSessionEvents(unittest.TestCase):
+
+    def test_read_session_events(self):
+        events = list(read_session_events(StringIO(_GENERAL_LOG)))
+        # Events are generated in the order of the log, sessions are started
+        # before their first statement (even without Connect) and the open
+        # sessions are ended at the end of the log.
+        self.assertEqual(events, [
+            ('start', 5, 0.0, None),
+            ('statement', 5, 0.0, "SELECT 1"),
+            ('start', 6, 1.0, None),
+            ('statement', 6, 1.0, "USE `db1`"),
+            ('statement', 6, 1.0, "SELECT * FROM t1\n  WHERE a = 1"),
+            ('statement', 5, 1.0, "USE `db2`"),
+            ('end', 6, 3.0, None),
+            ('statement', 5, 3.0, "SELECT 2"),
+            ('start', 7, 3.0, None),
+            ('end', 7, 3.0, None),
+            ('end', 5, 3.0, None),
+        ])
+
+    def test_reused_session_id(self):
+        log = ("111205 10:00:00\t    5 Connect\troot@localhost on db1\n"
+               "\t\t    5 Query\tSELECT 1\n"
+               "111205 10:00:02\t    5 Connect\troot@localhost on\n"
+               "\t\t    5 Quit\t\n"
+               "\t\t    8 Quit\t\n")
+        self.assertEqual(list(read_session_events(StringIO(log))), [
+            ('start', 5, 0.0, None),
+            ('statement', 5, 0.0, "USE `db1`"),
+            ('statement', 5, 0.0, "SELECT 1"),
+            ('end', 5, 2.0, None),
+            ('start', 5, 2.0, None),
+            ('end', 5, 2.0, None),
+        ])
+
+    def test_sample_log(self):
+        with open(os.path.join(_HERE, 'sample-general.log')) as log_file:
+            events = list(read_session_events(log_file))
+        sessions = {}
+        open_sessions = set()
+        for event, session_id, offset, statement in events:
+            if event == 'start':
+                self.assertFalse(session_id in open_sessions)
+                open_sessions.add(session_id)
+                sessions[session_id] = []
+            elif event == 'end':
+                open_sessions.remove(session_id)
+            else:
+                self.assertTrue(session_id in open_sessions)
+                sessions[session_id].append((offset, statement))
+        self.assertEqual(open_sessions, set())
+        statements = [session for session in sessions.values() if session]
+        self.assertEqual(len(statements), 1)
+        session = statements[0]
+        self.assertEqual(session[0], (0.0, "select @@version_comment limit 1"))
+        self.assertTrue((8.0, "USE `test`") in session)
+        # Offsets are in order.
+        self.assertEqual([event[2] for event in events],
+                         sorted(event[2] for event in events))
+
+
+if __name__ == '__main__':
+    unittest.main()
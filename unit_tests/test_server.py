@@ -0,0 +1,370 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the execution of queries by the Server
+class (mysql.utilities.common.server module), using a fake connection that
+records the executed statements.
+"""
+
+import multiprocessing
+import threading
+import unittest
+
+import mysql.connector
+
+from mysql.utilities.command import rpl_admin
+from mysql.utilities.common import server as server_module
+from mysql.utilities.common.server import (close_connection_pools,
+                                           ConnectionPool,
+                                           get_connection_pool, Server)
+from mysql.utilities.exception import UtilDBError
+
+_GTID = 'cfb4dd08-588e-11e4-89aa-606720440b68'
+_CONN_VALUES = {'user': 'root', 'passwd': None, 'host': 'localhost',
+                'port': 3306}
+# pylint: disable=W0212
+_SESSION_QUERY = server_module._POOL_SESSION_QUERY
+_PACKET_QUERY = "SELECT @@global.max_allowed_packet"
+
+
+class _FakeCursor(object):
+    """Cursor executing the statements on a _FakeConnection.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = None
+        self.with_rows = False
+
+    def _execute_stmt(self, stmt):
+        self.conn.statements.append(stmt)
+        if self.conn.fail_on is not None and self.conn.fail_on in stmt:
+            raise mysql.connector.Error("Statement failed")
+        self.rows = self.conn.results.get(stmt)
+        self.with_rows = self.rows is not None
+
+    def execute(self, query_str, params=None, multi=False):
+        # pylint: disable=W0613
+        if not multi:
+            self._execute_stmt(query_str)
+            return None
+
+        def _execute_iter():
+            for stmt in query_str.split(';'):
+                self._execute_stmt(stmt)
+                yield self
+        self.conn.queries += 1
+        return _execute_iter()
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+class _FakeConnection(object):
+    """Connection recording the executed statements.
+    """
+
+    def __init__(self, results=None):
+        self.results = results or {}
+        self.statements = []
+        self.queries = 0
+        self.fail_on = None
+        self.reset_supported = True
+        self.connected = True
+
+    def cursor(self, **kwargs):
+        # pylint: disable=W0613
+        return _FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def cmd_reset_connection(self):
+        if not self.reset_supported:
+            raise mysql.connector.NotSupportedError("Not supported")
+        self.statements.append("RESET CONNECTION")
+
+    def cmd_change_user(self, username, password, database):
+        self.statements.append("CHANGE USER {0} {1} {2!r}".format(
+            username, password, database))
+
+    def set_charset_collation(self, charset):
+        self.statements.append("SET NAMES {0}".format(charset))
+
+    def disconnect(self):
+        self.connected = False
+
+
+def _get_server(results=None):
+    """Get a Server using a _FakeConnection.
+    """
+    server = Server({'conn_info': _CONN_VALUES})
+    server.db_conn = _FakeConnection(results)
+    return server
+
+
+class _FakePool(ConnectionPool):
+    """Connection pool creating servers with a _FakeConnection.
+    """
+
+    def __init__(self, state, options=None):
+        ConnectionPool.__init__(self, _CONN_VALUES, options)
+        self.state = state
+
+    def _connect(self):
+        return _get_server({_SESSION_QUERY: [self.state],
+                            "SELECT @@SQL_MODE": [(self.state[0],)]})
+
+
+def _get_pool_task(conn):
+    """Get a connection pool, reporting through conn when it is closed.
+    """
+    pool = get_connection_pool(_CONN_VALUES)
+    close = pool.close
+
+    def _close():
+        conn.send('closed')
+        close()
+    pool.close = _close
+
+
+class TestServerQueries(unittest.TestCase):
+
+    def test_variables_cache(self):
+        server = _get_server({
+            "SELECT @@SQL_MODE": [('ANSI',)],
+            "SELECT @@global.GTID_MODE": [('ON',)],
+            "SHOW VARIABLES LIKE 'autocommit'": [('autocommit', 'ON')],
+            "SHOW VARIABLES LIKE 'gtid_mode'": [('gtid_mode', 'ON')],
+            "SHOW VARIABLES LIKE 'sql%'": [('sql_mode', 'ANSI')],
+        })
+        self.assertEqual(server.select_variable("SQL_MODE"), 'ANSI')
+        self.assertEqual(server.select_variable("SQL_MODE"), 'ANSI')
+        self.assertEqual(server.show_server_variable('autocommit'),
+                         [('autocommit', 'ON')])
+        self.assertEqual(server.show_server_variable('autocommit'),
+                         [('autocommit', 'ON')])
+        self.assertEqual(server.get_cache_stats(),
+                         {'hits': 2, 'misses': 2, 'entries': 2})
+        self.assertEqual(len(server.db_conn.statements), 2)
+        # Values are retrieved from the server if forced.
+        self.assertEqual(server.select_variable("SQL_MODE", force=True),
+                         'ANSI')
+        self.assertEqual(server.get_cache_stats(),
+                         {'hits': 2, 'misses': 3, 'entries': 2})
+        self.assertEqual(len(server.db_conn.statements), 3)
+
+        # GLOBAL variables and wildcard strings are not cached.
+        for _ in range(2):
+            self.assertEqual(server.select_variable("GTID_MODE", "global"),
+                             'ON')
+            self.assertEqual(server.show_server_variable('gtid_mode'),
+                             [('gtid_mode', 'ON')])
+            self.assertEqual(server.show_server_variable('sql%'),
+                             [('sql_mode', 'ANSI')])
+        self.assertEqual(len(server.db_conn.statements), 9)
+        self.assertEqual(server.get_cache_stats(),
+                         {'hits': 2, 'misses': 3, 'entries': 2})
+
+    def test_variables_cache_invalidation(self):
+        server = _get_server({"SELECT @@SQL_MODE": [('ANSI',)]})
+        self.assertEqual(server.select_variable("SQL_MODE"), 'ANSI')
+        server.db_conn.results["SELECT @@SQL_MODE"] = [('',)]
+        self.assertEqual(server.select_variable("SQL_MODE"), 'ANSI')
+        # The cache is discarded by SET statements.
+        server.exec_query("SET SQL_MODE=''")
+        self.assertEqual(server.get_cache_stats()['entries'], 0)
+        self.assertEqual(server.select_variable("SQL_MODE"), '')
+        server.exec_query("/*!40101 SET @OLD_SQL_MODE=@@SQL_MODE */")
+        self.assertEqual(server.get_cache_stats()['entries'], 0)
+        self.assertEqual(server.select_variable("SQL_MODE"), '')
+        server.exec_query("SELECT 1")
+        self.assertEqual(server.get_cache_stats()['entries'], 1)
+        # Including the batches of empty transactions (SET GTID_NEXT).
+        server.inject_empty_trx_batch(['{0}:1'.format(_GTID)])
+        self.assertEqual(server.get_cache_stats(),
+                         {'hits': 1, 'misses': 3, 'entries': 0})
+
+    def test_inject_empty_trx_batch(self):
+        server = _get_server()
+        gtids = ['{0}:{1}'.format(_GTID, num) for num in (1, 2)]
+        self.assertEqual(server.inject_empty_trx_batch(gtids), 2)
+        self.assertEqual(server.db_conn.statements,
+                         ["SET GTID_NEXT='{0}'".format(gtids[0]), "BEGIN",
+                          "COMMIT", "SET GTID_NEXT='{0}'".format(gtids[1]),
+                          "BEGIN", "COMMIT", "SET GTID_NEXT='AUTOMATIC'"])
+        # All the transactions are injected with a single query.
+        self.assertEqual(server.db_conn.queries, 1)
+        self.assertEqual(server.inject_empty_trx_batch([]), 0)
+        self.assertEqual(server.db_conn.queries, 1)
+
+    def test_inject_empty_trx_batch_error(self):
+        server = _get_server()
+        server.db_conn.fail_on = "{0}:2'".format(_GTID)
+        gtids = ['{0}:{1}'.format(_GTID, num) for num in (1, 2, 3)]
+        self.assertRaises(UtilDBError, server.inject_empty_trx_batch, gtids)
+        # GTID_NEXT is set to AUTOMATIC even if the batch fails.
+        self.assertEqual(server.db_conn.statements[-1],
+                         "SET GTID_NEXT='AUTOMATIC'")
+        self.assertEqual(len(server.db_conn.statements), 5)
+        server.db_conn.statements = []
+        # Even if not requested (GTID_NEXT is only kept on success).
+        self.assertRaises(UtilDBError, server.inject_empty_trx_batch, gtids,
+                          False)
+        self.assertEqual(server.db_conn.statements[-1],
+                         "SET GTID_NEXT='AUTOMATIC'")
+        self.assertEqual(len(server.db_conn.statements), 5)
+        server.db_conn.fail_on = None
+        server.db_conn.statements = []
+        server.inject_empty_trx_batch(gtids, False)
+        self.assertEqual(server.db_conn.statements[-1], "COMMIT")
+
+    def test_inject_slave_trx_batches(self):
+        # The batches are limited by max_allowed_packet (2 transactions).
+        max_packet = (rpl_admin._INJECT_PACKET_RESERVED +
+                      2 * rpl_admin._EMPTY_TRX_STMT_SIZE)
+        server = _get_server({_PACKET_QUERY: [(str(max_packet),)]})
+        injected, _ = rpl_admin._inject_slave_trx_batches(
+            server, '{0}:1-5'.format(_GTID), 10, threading.Lock())
+        self.assertEqual(injected, 5)
+        self.assertEqual(server.db_conn.queries, 3)
+        self.assertEqual(server.db_conn.statements[-1],
+                         "SET GTID_NEXT='AUTOMATIC'")
+        self.assertEqual(
+            server.db_conn.statements.count("SET GTID_NEXT='AUTOMATIC'"), 1)
+        # GTID_NEXT is set to AUTOMATIC if a batch fails.
+        server.db_conn.fail_on = "{0}:4'".format(_GTID)
+        server.db_conn.statements = []
+        self.assertRaises(UtilDBError, rpl_admin._inject_slave_trx_batches,
+                          server, '{0}:1-5'.format(_GTID), 10,
+                          threading.Lock())
+        self.assertEqual(server.db_conn.statements[-1],
+                         "SET GTID_NEXT='AUTOMATIC'")
+
+
+class TestServerConnection(unittest.TestCase):
+
+    def test_local_infile(self):
+        parameters = []
+
+        def _connect(**kwargs):
+            parameters.append(kwargs)
+            return _FakeConnection()
+        connect = mysql.connector.connect
+        mysql.connector.connect = _connect
+        try:
+            Server({'conn_info': _CONN_VALUES}).get_connection()
+            server = Server({'conn_info': dict(_CONN_VALUES,
+                                               local_infile=True)})
+            server.get_connection()
+            # The option is kept by the servers created from this one.
+            Server.fromServer(server).get_connection()
+        finally:
+            mysql.connector.connect = connect
+        self.assertFalse('allow_local_infile' in parameters[0])
+        self.assertTrue(parameters[1]['allow_local_infile'])
+        self.assertTrue(parameters[2]['allow_local_infile'])
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def test_get_release(self):
+        pool = _FakePool(('', '1', '1', '1', '1', 'db1'), {'max_idle': 1})
+        server1 = pool.get()
+        server2 = pool.get()
+        self.assertEqual((pool.created, pool.reused), (2, 0))
+        pool.release(server1)
+        self.assertEqual(server1.db_conn.statements,
+                         [_SESSION_QUERY, "RESET CONNECTION",
+                          _SESSION_QUERY])
+        # Only max_idle connections are kept.
+        pool.release(server2)
+        self.assertTrue(server1.db_conn.connected)
+        self.assertFalse(server2.db_conn.connected)
+        self.assertTrue(pool.get() is server1)
+        self.assertEqual((pool.created, pool.reused), (2, 1))
+        pool.release(server1)
+        pool.close()
+        self.assertFalse(server1.db_conn.connected)
+        self.assertTrue(pool.get() is not server1)
+
+    def test_reset_session(self):
+        pool = _FakePool(('', '1', '1', '1', '1', 'db1'))
+        server = pool.get()
+        server.select_variable('SQL_MODE')
+        # The session variables and current database are restored.
+        server.db_conn.results[_SESSION_QUERY] = [
+            ('ANSI', '0', '1', '1', '1', 'db2')]
+        server.db_conn.statements = []
+        pool.release(server)
+        self.assertEqual(server.db_conn.statements,
+                         ["RESET CONNECTION", _SESSION_QUERY, "USE `db1`",
+                          "SET @@SESSION.SQL_MODE = '', "
+                          "@@SESSION.FOREIGN_KEY_CHECKS = 1"])
+        self.assertEqual(server.get_cache_stats()['entries'], 0)
+        self.assertTrue(pool.get() is server)
+        # The user is changed if the connection cannot be reset.
+        server.db_conn.reset_supported = False
+        server.charset = 'utf8'
+        server.db_conn.results[_SESSION_QUERY] = [pool.state]
+        server.db_conn.statements = []
+        pool.release(server)
+        self.assertEqual(server.db_conn.statements,
+                         ["CHANGE USER root  'db1'", "SET NAMES utf8",
+                          _SESSION_QUERY])
+        self.assertTrue(pool.get() is server)
+
+    def test_reset_session_no_database(self):
+        pool = _FakePool(('', '1', '1', '1', '1', None))
+        server = pool.get()
+        server.db_conn.results[_SESSION_QUERY] = [
+            ('', '1', '1', '1', '1', 'db1')]
+        # The connection is closed if the database cannot be reset.
+        pool.release(server)
+        self.assertFalse(server.db_conn.connected)
+        self.assertTrue(pool.get() is not server)
+
+    def test_get_connection_pool(self):
+        try:
+            pool = get_connection_pool(_CONN_VALUES, {'version': "5.1.30"})
+            self.assertTrue(
+                get_connection_pool(dict(_CONN_VALUES),
+                                    {'version': "5.1.30"}) is pool)
+            # Pools with different options are not shared.
+            self.assertTrue(
+                get_connection_pool(_CONN_VALUES, {'name': "thread"})
+                is not pool)
+            self.assertTrue(get_connection_pool(_CONN_VALUES) is not pool)
+        finally:
+            close_connection_pools()
+
+    def test_close_connection_pools_on_exit(self):
+        # The pools of a process are closed when it exits.
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_get_pool_task,
+                                          args=(child_conn,))
+        process.start()
+        process.join()
+        self.assertTrue(parent_conn.poll(5))
+        self.assertEqual(parent_conn.recv(), 'closed')
+
+
+if __name__ == '__main__':
+    unittest.main()
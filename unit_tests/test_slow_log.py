@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the slow query log digest
+(mysql.utilities.command.slow_log module).
+"""
+
+import os.path
+import unittest
+
+from mysql.utilities.command.slow_log import (get_fingerprint, QueryStats,
+                                              SlowLogDigest)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SAMPLE_SLOW_LOG = os.path.join(_HERE, 'sample-slow.log')
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def test_literals(self):
+        self.assertEqual(
+            get_fingerprint("SELECT * FROM t1 WHERE a = 10 AND b = 'x\\'y' "
+                            "AND c > -1.5e3 AND d = 0x1F AND e IS NULL;"),
+            "select * from t1 where a = ? and b = ? and c > -? and d = ? "
+            "and e is ?")
+        # Numbers that are part of identifiers are kept.
+        self.assertEqual(get_fingerprint("SELECT c1 FROM `t2` LIMIT 5"),
+                         "select c1 from `t2` limit ?")
+
+    def test_lists(self):
+        self.assertEqual(get_fingerprint("SELECT a FROM t WHERE b IN (1, 2, "
+                                         "3) OR c IN ('a')"),
+                         "select a from t where b in (?+) or c in (?+)")
+        self.assertEqual(get_fingerprint("INSERT INTO t VALUES (1, 'a', NULL)"
+                                         ",\n(2, 'b', NULL)"),
+                         "insert into t values (?+)")
+
+    def test_comments_and_spacing(self):
+        self.assertEqual(
+            get_fingerprint("use db1;\nSET timestamp=1320234530;\n"
+                            "SELECT /* it's a comment */ a\n  FROM t  "
+                            "WHERE b = '# not a comment' -- comment\n"),
+            "select a from t where b = ?")
+        self.assertEqual(get_fingerprint("SET timestamp=1;\n"
+                                         "# administrator command: Quit;"),
+                         "")
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def test_aggregates(self):
+        stats = QueryStats("select ?")
+        for i in range(1, 101):
+            stats.add({'query_time': i / 100.0, 'lock_time': 0.0,
+                       'rows_examined': i}, "select {0}".format(i))
+        self.assertEqual(stats.count, 100)
+        self.assertEqual(stats.example, "select 1")
+        self.assertAlmostEqual(stats.average('query_time'), 0.505)
+        self.assertEqual(stats.average('rows_examined'), 50.5)
+        # Percentiles are approximated within 5%.
+        self.assertTrue(abs(stats.percentile('query_time') - 0.95) <= 0.0475)
+        self.assertTrue(abs(stats.percentile('rows_examined') - 95) <= 4.75)
+        self.assertEqual(stats.percentile('lock_time'), 0.0)
+        self.assertEqual(stats.percentile('query_time', 1), 1.0)
+
+
+class TestSlowLogDigest(unittest.TestCase):
+
+    def _read_sample(self, options=None):
+        digest = SlowLogDigest(options)
+        with open(_SAMPLE_SLOW_LOG) as stream:
+            num_queries = digest.read_log(stream)
+        return digest, num_queries
+
+    def test_read_log(self):
+        digest, num_queries = self._read_sample()
+        self.assertEqual(num_queries, digest.num_queries)
+        self.assertTrue(num_queries > len(digest.stats))
+        show_databases = digest.stats['show databases']
+        self.assertEqual(show_databases.count, 2)
+        self.assertEqual(show_databases.totals['rows_examined'], 6)
+        self.assertAlmostEqual(show_databases.totals['query_time'], 0.001701)
+        # Entries without query (administrator commands) are skipped.
+        self.assertFalse([fingerprint for fingerprint in digest.stats
+                          if 'administrator' in fingerprint])
+
+    def test_top(self):
+        digest, _ = self._read_sample({'top': 2, 'sort': 'count',
+                                       'verbosity': 1})
+        top = digest.get_top()
+        self.assertEqual(len(top), 2)
+        self.assertTrue(top[0].count >= top[1].count)
+        columns, rows = digest.get_rows()
+        self.assertEqual(columns[0], 'count')
+        self.assertEqual(columns[-1], 'example')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][-2], top[0].fingerprint)
+        self.assertFalse(rows[0][-1].startswith('SET timestamp'))
+        # All the fingerprints are returned with top = 0.
+        digest.top = 0
+        self.assertEqual(len(digest.get_top()), len(digest.stats))
+
+
+if __name__ == '__main__':
+    unittest.main()
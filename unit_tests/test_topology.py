@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2017, Oracle and/or its affiliates. All rights reserved.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; version 2 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+#
+"""
+This file contains unit tests for the checks of the GTID sets of the slaves
+of the Topology class (mysql.utilities.common.topology module), computed
+without a connection to the servers.
+"""
+
+import unittest
+
+from mysql.utilities.common.topology import Topology
+
+_UUID_M = 'cfb4dd08-588e-11e4-89aa-606720440b68'
+_UUID_A = 'd4f8eb6e-588e-11e4-89aa-606720440b68'
+_UUID_B = 'e2a3c1f0-588e-11e4-89aa-606720440b68'
+
+
+class _FakeSlave(object):
+    """Minimal slave returning the given GTID sets and query results.
+    """
+
+    def __init__(self, port, gtid_executed, query_result=None):
+        self.host = 'localhost'
+        self.port = port
+        self.gtid_executed = gtid_executed
+        self.query_result = query_result or []
+        self.queries = []
+
+    def is_alive(self):
+        return True
+
+    def get_gtid_executed(self):
+        return self.gtid_executed
+
+    def get_executed_gtid_set(self):
+        return self.gtid_executed
+
+    @staticmethod
+    def get_retrieved_gtid_set():
+        return ''
+
+    @staticmethod
+    def get_master_uuid():
+        return _UUID_M
+
+    def exec_query(self, query):
+        self.queries.append(query)
+        return self.query_result
+
+
+def _get_topology(slaves):
+    """Get a Topology with the given slaves, without connecting to them.
+    """
+    topology = Topology.__new__(Topology)
+    topology.master = None
+    topology.verbose = False
+    topology.quiet = True
+    topology.logging = False
+    topology.slaves = [{'host': slave.host, 'port': slave.port,
+                        'instance': slave} for slave in slaves]
+    return topology
+
+
+class TestTopologyGtid(unittest.TestCase):
+
+    def test_find_errant_transactions(self):
+        slave1 = _FakeSlave(3311, '{0}:1-10,{1}:1-3'.format(_UUID_M,
+                                                            _UUID_A.upper()))
+        slave2 = _FakeSlave(3312, '{0}:1-8'.format(_UUID_M))
+        slave3 = _FakeSlave(3313, '{0}:1-10,{1}:2'.format(_UUID_M, _UUID_B))
+        topology = _get_topology([slave1, slave2, slave3])
+        self.assertEqual(
+            topology.find_errant_transactions(),
+            [('localhost', 3311, set(['{0}:1-3'.format(_UUID_A)])),
+             ('localhost', 3313, set(['{0}:2'.format(_UUID_B)]))])
+        # The sets are compared locally.
+        for slave in (slave1, slave2, slave3):
+            self.assertEqual(slave.queries, [])
+        slave3.gtid_executed = '{0}:1-10'.format(_UUID_M)
+        self.assertEqual(len(topology.find_errant_transactions()), 1)
+
+    def test_find_errant_transactions_fallback(self):
+        errant = '{0}:1-3'.format(_UUID_A)
+        slave1 = _FakeSlave(3311, '{0}:1-10,{1}:x'.format(_UUID_M, _UUID_A),
+                            [(errant,)])
+        slave2 = _FakeSlave(3312, '{0}:1-8'.format(_UUID_M), [(errant,)])
+        topology = _get_topology([slave1, slave2])
+        self.assertEqual(topology.find_errant_transactions(),
+                         [('localhost', 3311, set([errant])),
+                          ('localhost', 3312, set([errant]))])
+        # The sets are compared by the other slaves.
+        self.assertEqual(len(slave1.queries), 1)
+        self.assertEqual(len(slave2.queries), 1)
+        self.assertTrue('GTID_SUBTRACT' in slave1.queries[0])
+
+    def test_has_missing_transactions(self):
+        # pylint: disable=W0212
+        slave = _FakeSlave(3311, '{0}:1-10'.format(_UUID_M), [('1',)])
+        candidate = _FakeSlave(3312, '{0}:1-8'.format(_UUID_M))
+        topology = _get_topology([slave, candidate])
+        fetched = []
+
+        def _get_executed_gtid_set(server):
+            fetched.append(server)
+            return server.get_executed_gtid_set()
+        topology._get_executed_gtid_set = _get_executed_gtid_set
+        self.assertTrue(topology._has_missing_transactions(candidate, slave))
+        self.assertEqual(fetched, [candidate])
+        # The given executed set of the candidate is used.
+        self.assertFalse(topology._has_missing_transactions(
+            candidate, slave, '{0}:1-12'.format(_UUID_M)))
+        self.assertEqual(fetched, [candidate])
+        self.assertEqual(slave.queries, [])
+        # The check is done by the slave if the sets cannot be parsed.
+        self.assertFalse(topology._has_missing_transactions(
+            candidate, slave, '{0}:x'.format(_UUID_M)))
+        self.assertTrue('gtid_subset' in slave.queries[0])
+
+
+if __name__ == '__main__':
+    unittest.main()